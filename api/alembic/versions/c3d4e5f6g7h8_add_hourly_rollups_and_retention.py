@@ -0,0 +1,66 @@
+"""add hourly rollups and retention policies
+
+Revision ID: c3d4e5f6g7h8
+Revises: b2c3d4e5f6g7
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d4e5f6g7h8'
+down_revision: Union[str, None] = 'b2c3d4e5f6g7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'readings_hourly',
+        sa.Column('sensor_id', sa.Uuid(), nullable=False),
+        sa.Column('hour', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('reading_count', sa.Integer(), nullable=False),
+        sa.Column('temperature_avg', sa.Float(), nullable=True),
+        sa.Column('temperature_max', sa.Float(), nullable=True),
+        sa.Column('x_rms_ACC_G_avg', sa.Float(), nullable=True),
+        sa.Column('x_rms_ACC_G_max', sa.Float(), nullable=True),
+        sa.Column('y_rms_ACC_G_avg', sa.Float(), nullable=True),
+        sa.Column('y_rms_ACC_G_max', sa.Float(), nullable=True),
+        sa.Column('z_rms_ACC_G_avg', sa.Float(), nullable=True),
+        sa.Column('z_rms_ACC_G_max', sa.Float(), nullable=True),
+        sa.Column('x_velocity_mm_sec_avg', sa.Float(), nullable=True),
+        sa.Column('x_velocity_mm_sec_max', sa.Float(), nullable=True),
+        sa.Column('y_velocity_mm_sec_avg', sa.Float(), nullable=True),
+        sa.Column('y_velocity_mm_sec_max', sa.Float(), nullable=True),
+        sa.Column('z_velocity_mm_sec_avg', sa.Float(), nullable=True),
+        sa.Column('z_velocity_mm_sec_max', sa.Float(), nullable=True),
+        sa.Column('battery_percent_min', sa.SmallInteger(), nullable=True),
+        sa.ForeignKeyConstraint(['sensor_id'], ['sensors.id']),
+        sa.PrimaryKeyConstraint('sensor_id', 'hour'),
+    )
+
+    op.create_table(
+        'retention_policies',
+        sa.Column('org_id', sa.Uuid(), nullable=False),
+        sa.Column('raw_days', sa.Integer(), nullable=False),
+        sa.Column('fft_days', sa.Integer(), nullable=False),
+        sa.Column('hourly_days', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['org_id'], ['organizations.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('org_id'),
+    )
+
+    # Retention deletes walk (sensor_id, timestamp) ranges in small batches
+    op.create_index('ix_readings_sensor_id_timestamp', 'readings', ['sensor_id', 'timestamp'])
+    op.create_index('ix_fft_captures_sensor_id_timestamp', 'fft_captures', ['sensor_id', 'timestamp'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_fft_captures_sensor_id_timestamp', table_name='fft_captures')
+    op.drop_index('ix_readings_sensor_id_timestamp', table_name='readings')
+    op.drop_table('retention_policies')
+    op.drop_table('readings_hourly')
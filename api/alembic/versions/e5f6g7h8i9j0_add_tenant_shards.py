@@ -0,0 +1,47 @@
+"""add tenant shards, widen time-series ids to bigint
+
+Revision ID: e5f6g7h8i9j0
+Revises: d4e5f6g7h8i9
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6g7h8i9j0'
+down_revision: Union[str, None] = 'd4e5f6g7h8i9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tenant_shards',
+        sa.Column('org_id', sa.Uuid(), nullable=False),
+        sa.Column('shard', sa.String(50), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='active'),
+        sa.Column('target_shard', sa.String(50), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['org_id'], ['organizations.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('org_id'),
+    )
+
+    # BIGSERIAL per the PRD schema; shards own disjoint id ranges so tenant moves keep ids
+    op.alter_column('readings', 'id', type_=sa.BigInteger())
+    op.execute('ALTER SEQUENCE readings_id_seq AS bigint')
+    op.alter_column('fft_captures', 'id', type_=sa.BigInteger())
+    op.execute('ALTER SEQUENCE fft_captures_id_seq AS bigint')
+    op.alter_column('alerts', 'reading_id', type_=sa.BigInteger())
+
+
+def downgrade() -> None:
+    op.alter_column('alerts', 'reading_id', type_=sa.Integer())
+    op.execute('ALTER SEQUENCE fft_captures_id_seq AS integer')
+    op.alter_column('fft_captures', 'id', type_=sa.Integer())
+    op.execute('ALTER SEQUENCE readings_id_seq AS integer')
+    op.alter_column('readings', 'id', type_=sa.Integer())
+    op.drop_table('tenant_shards')
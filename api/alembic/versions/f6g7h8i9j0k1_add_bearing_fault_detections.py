@@ -0,0 +1,53 @@
+"""add bearing fault detections
+
+Revision ID: f6g7h8i9j0k1
+Revises: e5f6g7h8i9j0
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6g7h8i9j0k1'
+down_revision: Union[str, None] = 'e5f6g7h8i9j0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('fft_captures', sa.Column('analyzed_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        'ix_fft_captures_unanalyzed', 'fft_captures', ['id'],
+        postgresql_where=sa.text('analyzed_at IS NULL'),
+    )
+
+    op.create_table('bearing_fault_detections',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('fft_capture_id', sa.BigInteger(), nullable=False),
+        sa.Column('sensor_id', sa.Uuid(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('bearing_spec_id', sa.Uuid(), nullable=False),
+        sa.Column('fault_type', sa.String(length=4), nullable=False),
+        sa.Column('frequency_hz', sa.Float(), nullable=False),
+        sa.Column('harmonics', sa.SmallInteger(), nullable=False),
+        sa.Column('amplitude', sa.Float(), nullable=False),
+        sa.Column('confidence', sa.String(length=6), nullable=False),
+        sa.ForeignKeyConstraint(['fft_capture_id'], ['fft_captures.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['sensor_id'], ['sensors.id'], ),
+        sa.ForeignKeyConstraint(['bearing_spec_id'], ['bearing_specs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_bearing_fault_detections_fft_capture_id'), 'bearing_fault_detections', ['fft_capture_id'], unique=False)
+    op.create_index('ix_bearing_fault_detections_sensor_id_timestamp', 'bearing_fault_detections', ['sensor_id', 'timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bearing_fault_detections_sensor_id_timestamp', table_name='bearing_fault_detections')
+    op.drop_index(op.f('ix_bearing_fault_detections_fft_capture_id'), table_name='bearing_fault_detections')
+    op.drop_table('bearing_fault_detections')
+    op.drop_index('ix_fft_captures_unanalyzed', table_name='fft_captures')
+    op.drop_column('fft_captures', 'analyzed_at')
@@ -0,0 +1,45 @@
+"""add fft features
+
+Revision ID: g7h8i9j0k1l2
+Revises: f6g7h8i9j0k1
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'g7h8i9j0k1l2'
+down_revision: Union[str, None] = 'f6g7h8i9j0k1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('fft_features',
+        sa.Column('fft_capture_id', sa.BigInteger(), nullable=False),
+        sa.Column('sensor_id', sa.Uuid(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('axis', sa.String(length=1), nullable=False),
+        sa.Column('rpm', sa.Integer(), nullable=True),
+        sa.Column('overall_rms', sa.Float(), nullable=False),
+        sa.Column('peak_frequencies_hz', postgresql.ARRAY(sa.Float()), nullable=False),
+        sa.Column('peak_amplitudes', postgresql.ARRAY(sa.Float()), nullable=False),
+        sa.Column('band_energies', postgresql.ARRAY(sa.Float()), nullable=False),
+        sa.Column('amp_1x', sa.Float(), nullable=True),
+        sa.Column('amp_2x', sa.Float(), nullable=True),
+        sa.Column('amp_3x', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['fft_capture_id'], ['fft_captures.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['sensor_id'], ['sensors.id'], ),
+        sa.PrimaryKeyConstraint('fft_capture_id')
+    )
+    op.create_index('ix_fft_features_sensor_id_timestamp', 'fft_features', ['sensor_id', 'timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_fft_features_sensor_id_timestamp', table_name='fft_features')
+    op.drop_table('fft_features')
@@ -0,0 +1,39 @@
+"""add anomaly models
+
+Revision ID: h8i9j0k1l2m3
+Revises: g7h8i9j0k1l2
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'h8i9j0k1l2m3'
+down_revision: Union[str, None] = 'g7h8i9j0k1l2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('readings', sa.Column('anomaly_score', sa.Float(), nullable=True))
+    op.create_table('anomaly_models',
+        sa.Column('sensor_id', sa.Uuid(), nullable=False),
+        sa.Column('features', postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column('training_rows', sa.Integer(), nullable=False),
+        sa.Column('training_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('training_end', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('model', sa.LargeBinary(), nullable=False),
+        sa.Column('trained_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['sensor_id'], ['sensors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('sensor_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('anomaly_models')
+    op.drop_column('readings', 'anomaly_score')
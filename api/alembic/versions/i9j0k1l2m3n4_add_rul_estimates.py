@@ -0,0 +1,44 @@
+"""add rul estimates
+
+Revision ID: i9j0k1l2m3n4
+Revises: h8i9j0k1l2m3
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'i9j0k1l2m3n4'
+down_revision: Union[str, None] = 'h8i9j0k1l2m3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('rul_estimates',
+        sa.Column('sensor_id', sa.Uuid(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('fitted_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('data_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('data_end', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('points', sa.Integer(), nullable=False),
+        sa.Column('threshold', sa.Float(), nullable=False),
+        sa.Column('level', sa.Float(), nullable=True),
+        sa.Column('rate', sa.Float(), nullable=True),
+        sa.Column('covariance', postgresql.ARRAY(sa.Float()), nullable=True),
+        sa.Column('threshold_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('threshold_earliest', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('threshold_latest', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('curve', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.ForeignKeyConstraint(['sensor_id'], ['sensors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('sensor_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rul_estimates')
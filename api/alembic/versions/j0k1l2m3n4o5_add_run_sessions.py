@@ -0,0 +1,63 @@
+"""add run sessions and crane operating hours
+
+Revision ID: j0k1l2m3n4o5
+Revises: i9j0k1l2m3n4
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'j0k1l2m3n4o5'
+down_revision: Union[str, None] = 'i9j0k1l2m3n4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('run_sessions',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('sensor_id', sa.Uuid(), nullable=False),
+        sa.Column('crane_id', sa.Uuid(), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('ended_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('duration_seconds', sa.Float(), nullable=False),
+        sa.Column('open', sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(['sensor_id'], ['sensors.id'], ),
+        sa.ForeignKeyConstraint(['crane_id'], ['cranes.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_run_sessions_sensor_id_started_at', 'run_sessions', ['sensor_id', 'started_at'], unique=False)
+    op.create_index('ix_run_sessions_crane_id_started_at', 'run_sessions', ['crane_id', 'started_at'], unique=False)
+    op.create_table('run_states',
+        sa.Column('sensor_id', sa.Uuid(), nullable=False),
+        sa.Column('crane_id', sa.Uuid(), nullable=False),
+        sa.Column('last_timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_running', sa.Boolean(), nullable=False),
+        sa.Column('session_id', sa.BigInteger(), nullable=True),
+        sa.Column('dirty_since', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['sensor_id'], ['sensors.id'], ),
+        sa.ForeignKeyConstraint(['crane_id'], ['cranes.id'], ),
+        sa.PrimaryKeyConstraint('sensor_id')
+    )
+    op.create_table('crane_operating_hours',
+        sa.Column('crane_id', sa.Uuid(), nullable=False),
+        sa.Column('operating_seconds', sa.Float(), nullable=False),
+        sa.Column('covered_until', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('utilization_30d', sa.Float(), nullable=True),
+        sa.Column('rebuilt_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['crane_id'], ['cranes.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('crane_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('crane_operating_hours')
+    op.drop_table('run_states')
+    op.drop_index('ix_run_sessions_crane_id_started_at', table_name='run_sessions')
+    op.drop_index('ix_run_sessions_sensor_id_started_at', table_name='run_sessions')
+    op.drop_table('run_sessions')
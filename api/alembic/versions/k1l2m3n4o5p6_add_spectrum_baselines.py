@@ -0,0 +1,59 @@
+"""add spectrum baselines and baseline scores
+
+Revision ID: k1l2m3n4o5p6
+Revises: j0k1l2m3n4o5
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'k1l2m3n4o5p6'
+down_revision: Union[str, None] = 'j0k1l2m3n4o5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('spectrum_baselines',
+        sa.Column('sensor_id', sa.Uuid(), nullable=False),
+        sa.Column('axis', sa.String(length=1), nullable=False),
+        sa.Column('window_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('window_end', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('odr', sa.Integer(), nullable=True),
+        sa.Column('num_bins', sa.Integer(), nullable=True),
+        sa.Column('captures', sa.Integer(), nullable=False),
+        sa.Column('histogram', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['sensor_id'], ['sensors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('sensor_id', 'axis')
+    )
+    op.create_table('fft_baseline_scores',
+        sa.Column('fft_capture_id', sa.BigInteger(), nullable=False),
+        sa.Column('sensor_id', sa.Uuid(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('axis', sa.String(length=1), nullable=False),
+        sa.Column('learning', sa.Boolean(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=True),
+        sa.Column('max_ratio', sa.Float(), nullable=True),
+        sa.Column('max_ratio_hz', sa.Float(), nullable=True),
+        sa.Column('bands_over_envelope', sa.Integer(), nullable=True),
+        sa.Column('band_ratios', postgresql.ARRAY(sa.Float()), nullable=True),
+        sa.Column('baseline_captures', sa.Integer(), nullable=True),
+        sa.Column('scored_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['fft_capture_id'], ['fft_captures.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['sensor_id'], ['sensors.id'], ),
+        sa.PrimaryKeyConstraint('fft_capture_id')
+    )
+    op.create_index('ix_fft_baseline_scores_sensor_id_timestamp', 'fft_baseline_scores', ['sensor_id', 'timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_fft_baseline_scores_sensor_id_timestamp', table_name='fft_baseline_scores')
+    op.drop_table('fft_baseline_scores')
+    op.drop_table('spectrum_baselines')
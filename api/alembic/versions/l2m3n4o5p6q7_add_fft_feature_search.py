@@ -0,0 +1,56 @@
+"""add fft feature peaks and search indexes
+
+Revision ID: l2m3n4o5p6q7
+Revises: k1l2m3n4o5p6
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'l2m3n4o5p6q7'
+down_revision: Union[str, None] = 'k1l2m3n4o5p6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('fft_feature_peaks',
+        sa.Column('fft_capture_id', sa.BigInteger(), nullable=False),
+        sa.Column('rank', sa.SmallInteger(), nullable=False),
+        sa.Column('sensor_id', sa.Uuid(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('frequency_hz', sa.Float(), nullable=False),
+        sa.Column('shaft_order', sa.Float(), nullable=True),
+        sa.Column('amplitude', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['fft_capture_id'], ['fft_features.fft_capture_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['sensor_id'], ['sensors.id'], ),
+        sa.PrimaryKeyConstraint('fft_capture_id', 'rank')
+    )
+    # Peaks of features extracted before this table existed
+    op.execute("""
+        INSERT INTO fft_feature_peaks (fft_capture_id, rank, sensor_id, timestamp, frequency_hz, shaft_order, amplitude)
+        SELECT f.fft_capture_id, p.rank, f.sensor_id, f.timestamp, p.frequency_hz,
+               p.frequency_hz / NULLIF(f.rpm / 60.0, 0), p.amplitude
+        FROM fft_features f,
+             unnest(f.peak_frequencies_hz, f.peak_amplitudes) WITH ORDINALITY AS p(frequency_hz, amplitude, rank)
+    """)
+    op.create_index('ix_fft_feature_peaks_frequency_hz_timestamp', 'fft_feature_peaks', ['frequency_hz', 'timestamp'], unique=False)
+    op.create_index('ix_fft_feature_peaks_shaft_order_timestamp', 'fft_feature_peaks', ['shaft_order', 'timestamp'], unique=False)
+    op.create_index('ix_fft_features_timestamp_overall_rms', 'fft_features', ['timestamp', 'overall_rms'], unique=False)
+    for column in ('amp_1x', 'amp_2x', 'amp_3x'):
+        op.create_index(f'ix_fft_features_timestamp_{column}', 'fft_features', ['timestamp', column], unique=False,
+                        postgresql_where=sa.text(f'{column} IS NOT NULL'))
+
+
+def downgrade() -> None:
+    for column in ('amp_1x', 'amp_2x', 'amp_3x'):
+        op.drop_index(f'ix_fft_features_timestamp_{column}', table_name='fft_features')
+    op.drop_index('ix_fft_features_timestamp_overall_rms', table_name='fft_features')
+    op.drop_index('ix_fft_feature_peaks_shaft_order_timestamp', table_name='fft_feature_peaks')
+    op.drop_index('ix_fft_feature_peaks_frequency_hz_timestamp', table_name='fft_feature_peaks')
+    op.drop_table('fft_feature_peaks')
@@ -0,0 +1,46 @@
+"""add cohort members and cohort stats
+
+Revision ID: m3n4o5p6q7r8
+Revises: l2m3n4o5p6q7
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'm3n4o5p6q7r8'
+down_revision: Union[str, None] = 'l2m3n4o5p6q7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('cohort_members',
+        sa.Column('sensor_id', sa.Uuid(), nullable=False),
+        sa.Column('cohort', sa.String(length=255), nullable=False),
+        sa.Column('values', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('data_through', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['sensor_id'], ['sensors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('sensor_id')
+    )
+    op.create_index('ix_cohort_members_cohort', 'cohort_members', ['cohort'], unique=False)
+    op.create_table('cohort_stats',
+        sa.Column('cohort', sa.String(length=255), nullable=False),
+        sa.Column('metric', sa.String(length=50), nullable=False),
+        sa.Column('members', sa.Integer(), nullable=False),
+        sa.Column('histogram', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('cohort', 'metric')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('cohort_stats')
+    op.drop_index('ix_cohort_members_cohort', table_name='cohort_members')
+    op.drop_table('cohort_members')
@@ -0,0 +1,30 @@
+"""add reading current-loop, tilt and channel columns
+
+Revision ID: n4o5p6q7r8s9
+Revises: m3n4o5p6q7r8
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'n4o5p6q7r8s9'
+down_revision: Union[str, None] = 'm3n4o5p6q7r8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ('mA1', 'mA2', 'roll', 'pitch', 'channel_1', 'channel_2', 'channel_3')
+
+
+def upgrade() -> None:
+    for name in COLUMNS:
+        op.add_column('readings', sa.Column(name, sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    for name in reversed(COLUMNS):
+        op.drop_column('readings', name)
@@ -0,0 +1,34 @@
+"""add per-metric reading counts to readings_hourly
+
+Revision ID: o5p6q7r8s9t0
+Revises: n4o5p6q7r8s9
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'o5p6q7r8s9t0'
+down_revision: Union[str, None] = 'n4o5p6q7r8s9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+METRICS = (
+    'temperature',
+    'x_rms_ACC_G', 'y_rms_ACC_G', 'z_rms_ACC_G',
+    'x_velocity_mm_sec', 'y_velocity_mm_sec', 'z_velocity_mm_sec',
+)
+
+
+def upgrade() -> None:
+    for metric in METRICS:
+        op.add_column('readings_hourly', sa.Column(f'{metric}_count', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    for metric in reversed(METRICS):
+        op.drop_column('readings_hourly', f'{metric}_count')
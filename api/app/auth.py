@@ -1,4 +1,7 @@
+import secrets
+import time
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 
 from fastapi import Depends, HTTPException, Header
@@ -12,6 +15,7 @@ from app.config import settings
 from app.db import get_db
 from app.models.user import User
 from app.models.api_key import ApiKey
+from app.services import tracing
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
@@ -31,48 +35,132 @@ def create_token(data: dict, expires_delta: timedelta) -> str:
     return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
 
 
-def create_access_token(user_id: uuid.UUID, org_id: uuid.UUID) -> str:
+def create_access_token(user_id: uuid.UUID, org_id: uuid.UUID, token_version: int = 0) -> str:
     return create_token(
-        {"sub": str(user_id), "org_id": str(org_id), "type": "access"},
+        {"sub": str(user_id), "org_id": str(org_id), "ver": token_version, "type": "access"},
         timedelta(minutes=settings.access_token_expire_minutes),
     )
 
 
-def create_refresh_token(user_id: uuid.UUID, org_id: uuid.UUID) -> str:
+def create_refresh_token(user_id: uuid.UUID, org_id: uuid.UUID, token_version: int = 0) -> str:
     return create_token(
-        {"sub": str(user_id), "org_id": str(org_id), "type": "refresh"},
+        {"sub": str(user_id), "org_id": str(org_id), "ver": token_version, "type": "refresh"},
         timedelta(days=settings.refresh_token_expire_days),
     )
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db),
-) -> User:
+@dataclass(frozen=True, slots=True)
+class Claims:
+    """Verified identity from an access token — enough for org-scoped endpoints."""
+    id: uuid.UUID
+    org_id: uuid.UUID
+    token_version: int
+
+
+class UserCache:
+    """Short-TTL cache of users so authenticated requests don't SELECT the user every time."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._users: dict[uuid.UUID, tuple[User, float]] = {}
+
+    async def get(self, user_id: uuid.UUID, db: AsyncSession) -> User | None:
+        hit = self._users.get(user_id)
+        if hit is not None and hit[1] > time.monotonic():
+            return hit[0]
+
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if user is None:
+            self._users.pop(user_id, None)
+            return None
+        # Detach so the cached instance can be shared read-only across sessions
+        db.expunge(user)
+        self._users[user_id] = (user, time.monotonic() + self.ttl_seconds)
+        return user
+
+    def invalidate(self, user_id: uuid.UUID):
+        self._users.pop(user_id, None)
+
+
+user_cache = UserCache(settings.user_cache_ttl_seconds)
+
+
+def decode_claims(token: str, token_type: str = "access") -> Claims:
     try:
-        payload = jwt.decode(credentials.credentials, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
-        if payload.get("type") != "access":
+        payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+        if payload.get("type") != token_type:
             raise HTTPException(status_code=401, detail="Invalid token type")
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-    except JWTError:
+        return Claims(
+            id=uuid.UUID(payload["sub"]),
+            org_id=uuid.UUID(payload["org_id"]),
+            token_version=int(payload.get("ver", 0)),
+        )
+    except (JWTError, KeyError, TypeError, ValueError):
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
-    user = result.scalar_one_or_none()
+
+async def _current_user_for(claims: Claims, db: AsyncSession) -> User:
+    user = await user_cache.get(claims.id, db)
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
+    if user.token_version != claims.token_version:
+        raise HTTPException(status_code=401, detail="Token revoked")
     return user
 
 
+async def get_current_claims(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> Claims:
+    """Identity and org scope straight from the verified token.
+
+    The revocation check reads the cached user, so it costs a query only on a cache miss.
+    """
+    claims = decode_claims(credentials.credentials)
+    await _current_user_for(claims, db)
+    return claims
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """The full (cached, detached, read-only) `User` for endpoints that need more than ids."""
+    return await _current_user_for(decode_claims(credentials.credentials), db)
+
+
+async def require_operator(credentials: HTTPAuthorizationCredentials = Depends(security)) -> None:
+    """Platform operators only: `Authorization: Bearer <OPERATOR_TOKEN>`.
+
+    Org roles don't qualify — an org admin must not see other tenants' requests or tune a
+    shared worker. With no OPERATOR_TOKEN configured, operator endpoints are closed.
+    """
+    if not settings.operator_token or not secrets.compare_digest(
+        credentials.credentials.encode(), settings.operator_token.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Operator token required")
+
+
+async def revoke_user_tokens(user_id: uuid.UUID, db: AsyncSession) -> None:
+    """Invalidate every token issued to a user. Other workers notice within the cache TTL."""
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one()
+    user.token_version += 1
+    await db.commit()
+    user_cache.invalidate(user_id)
+
+
 async def verify_api_key(
     x_api_key: str = Header(...),
     db: AsyncSession = Depends(get_db),
 ) -> ApiKey:
-    result = await db.execute(select(ApiKey).where(ApiKey.revoked_at.is_(None)))
-    keys = result.scalars().all()
-    for key in keys:
-        if pwd_context.verify(x_api_key, key.key_hash):
-            return key
+    with tracing.span("ingest.auth") as span:
+        result = await db.execute(select(ApiKey).where(ApiKey.revoked_at.is_(None)))
+        keys = result.scalars().all()
+        for checked, key in enumerate(keys, 1):
+            if pwd_context.verify(x_api_key, key.key_hash):
+                if span is not None:
+                    span.attributes["api_keys.checked"] = checked
+                return key
     raise HTTPException(status_code=401, detail="Invalid API key")
@@ -1,15 +1,112 @@
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 
 
+class EngineSettings(BaseModel):
+    """Connection settings for one named engine. An empty url falls back to DATABASE_URL."""
+    url: str = ""
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    command_timeout: float | None = 60.0
+    # asyncpg prepared-statement cache; None = auto (0 behind a pgbouncer / Neon "-pooler" host)
+    statement_cache_size: int | None = None
+
+
 class Settings(BaseSettings):
     database_url: str = ""
+    # Named engines, e.g. DB_REPLICA__URL=... DB_REPLICA__POOL_SIZE=10
+    db_primary: EngineSettings = EngineSettings()
+    db_replica: EngineSettings = EngineSettings(pool_size=10)
+    db_timeseries: EngineSettings = EngineSettings()
+    # Read replica of the time-series database, used by read-only endpoints
+    db_timeseries_replica: EngineSettings = EngineSettings(pool_size=10)
+    # Time-series shards keyed by name, as JSON: TIMESERIES_SHARDS='{"ts1": {"url": "..."}}'.
+    # When set, readings / FFT / rollups are routed per org via tenant_shards.
+    timeseries_shards: dict[str, EngineSettings] = {}
+    # Read replicas of those shards, keyed by the same names; a shard without one is read from itself
+    timeseries_shard_replicas: dict[str, EngineSettings] = {}
+    shard_map_ttl_seconds: int = 60
     jwt_secret: str = ""
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
+    # Bearer token for the platform-operator endpoints (/api/v1/admin/*, /metrics); unset closes them
+    operator_token: str = ""
+
+    # Claims-based auth: users are cached briefly; bumping users.token_version revokes tokens
+    user_cache_ttl_seconds: int = 60
+
+    # Retention defaults (PRD §5.2), overridable per org via retention_policies
+    retention_raw_days: int = 90
+    retention_fft_days: int = 90
+    retention_hourly_days: int = 730
+    retention_batch_size: int = 5000
+    retention_batch_pause_seconds: float = 0.1
+
+    # In-process cache of sensor/crane -> org ownership used for authorization
+    ownership_cache_ttl_seconds: int = 300
+
+    # In-process table of bearing fault orders per component
+    fault_frequency_cache_ttl_seconds: int = 300
+
+    # Background FFT feature extraction after ingest
+    fft_feature_workers: int = 2
+    fft_feature_queue_size: int = 1000
+
+    # Compiled alert rules are reloaded at least this often (edits reload immediately)
+    alert_rules_ttl_seconds: int = 60
+
+    # Readings queued for the run-session state machine (app.services.operating_hours)
+    run_state_queue_size: int = 5000
+
+    # Hours of per-sensor hourly buckets kept in memory for rolling-window trends
+    rolling_window_hours: int = 15 * 24
+
+    # Per-sensor anomaly models kept in memory (LRU) and how often a cached entry is re-read
+    anomaly_model_cache_size: int = 2000
+    anomaly_model_ttl_seconds: int = 900
+
+    # Stored RUL estimates served from memory for this long
+    rul_cache_ttl_seconds: int = 300
+
+    # Baseline spectra (median / envelope) served from memory for this long; folds reload immediately
+    baseline_cache_ttl_seconds: int = 300
+
+    # Fleet cohort histograms served from memory for this long (manage.py cohorts clears them)
+    cohort_stats_ttl_seconds: int = 600
+
+    # Decimated spectra kept in memory (LRU) for the FFT viewer
+    spectrum_pyramid_cache_size: int = 500
+
+    # Per-route SQL statement budgets (app.db.query_budget): over-budget requests are logged and
+    # counted; with enforcement on (CI) the statement that crosses the budget raises instead
+    query_budget_enforce: bool = False
+
+    # Request profiler (app.services.profiler) defaults; operators change these at runtime per process.
+    # Enabled, it keeps requests slower than the threshold plus every Nth request (0 = none)
+    profiler_enabled: bool = False
+    profiler_threshold_ms: float = 1000.0
+    profiler_sample_one_in: int = 0
+    profiler_interval_ms: float = 5.0
+    profiler_buffer_size: int = 50
+
+    # Tracing (app.services.tracing): "" = off, "console" = stderr, "file" = OTLP/JSON lines in
+    # tracing_file. Requests without a gateway traceparent are sampled at tracing_sample_ratio
+    tracing_exporter: str = ""
+    tracing_file: str = "traces.jsonl"
+    tracing_sample_ratio: float = 0.01
+    tracing_service_name: str = "crane-api"
+
+    # Startup warmup (app.services.warmup): pooled connections opened per engine and whether the
+    # ownership / shard registries are preloaded; /health/ready answers 503 until it finishes
+    warmup_connections: int = 2
+    warmup_caches: bool = True
+    warmup_timeout_seconds: float = 30.0
 
     class Config:
         env_file = ".env"
+        env_nested_delimiter = "__"
 
 
 settings = Settings()
@@ -1,16 +1,295 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+"""Database engines and session routing.
 
-from app.config import settings
+Three named engines share one session factory:
 
-engine = create_async_engine(settings.database_url, echo=False)
-async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+- ``primary``    — writes and anything that must read its own writes
+- ``replica``    — read-only GET endpoints (falls back to primary when no URL is set)
+- ``timeseries`` — models marked with the ``TimeSeries`` mixin (readings, FFT, rollups);
+                   falls back to primary, per the PRD Phase 3 "different connection string"
+
+Read-only sessions send time-series models to ``timeseries_replica``, which falls back to
+``timeseries`` when that has its own URL and to ``replica`` otherwise. When
+TIMESERIES_SHARDS is configured, time-series models go to the shard named in the session's
+``info["shard"]`` instead (see ``app.services.sharding.bind_tenant``), or to that shard's
+entry in TIMESERIES_SHARD_REPLICAS for read-only sessions.
+
+Locally, pointing DB_REPLICA__URL / DB_TIMESERIES__URL at a second database is enough to
+exercise the routing.
+
+Engines are created on first use, so importing the models (alembic, manage.py) loads no
+driver and opens nothing; ``warm_pools`` pre-opens connections at startup.
+
+Every engine counts the statements, rows and database time of the current request (or
+``track_queries`` block) into a ``QueryStats`` held in a context variable; routes declare a
+statement ceiling with ``query_budget``. Each statement of a traced request also gets a
+``db.query`` span (app.services.tracing).
+"""
+
+import asyncio
+import time
+import uuid
+from collections.abc import Mapping
+from contextlib import AsyncExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Session
+
+from app.config import EngineSettings, Settings, settings
+from app.services import tracing
 
 
 class Base(DeclarativeBase):
     pass
 
 
+class TimeSeries:
+    """Mixin for models that live on the time-series engine. Such tables carry `sensor_id`."""
+
+
+class ShardNotSelected(RuntimeError):
+    pass
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+# ── Statement accounting ──
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    rows: int = 0  # rows returned or affected, where the driver reports them
+    db_seconds: float = 0.0
+    budget: int | None = None
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.statements > self.budget
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _query_stats.get()
+
+
+@contextmanager
+def track_queries(budget: int | None = None) -> Iterator[QueryStats]:
+    """Count statements run in this context (and tasks started from it) into a fresh QueryStats.
+
+    A nested block's totals are added to the enclosing one when it exits, so a test wrapped
+    around an in-process request also sees what the request's middleware counted. With
+    `budget`, leaving the block having run more statements raises QueryBudgetExceeded, so a
+    test can pin the query count of a code path.
+    """
+    parent = _query_stats.get()
+    stats = QueryStats(budget=budget)
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+        if parent is not None:
+            parent.statements += stats.statements
+            parent.rows += stats.rows
+            parent.db_seconds += stats.db_seconds
+    if budget is not None and stats.statements > budget:
+        raise QueryBudgetExceeded(f"{stats.statements} statements, budget {budget}")
+
+
+# Statements a request can add when caches are cold: the user lookup behind token auth (1)
+# and, on sharded deployments, placing a tenant seen for the first time (read, insert, re-read)
+COLD_CACHE_STATEMENTS = 4
+
+
+def query_budget(statements: int):
+    """Route dependency declaring the most SQL statements one request may run:
+    `@router.get(..., dependencies=[Depends(query_budget(6))])`."""
+    async def declare():
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.budget = statements
+    return declare
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is None:
+        return
+    stats = _query_stats.get()
+    if stats is not None:
+        if settings.query_budget_enforce and stats.budget is not None and stats.statements >= stats.budget:
+            raise QueryBudgetExceeded(f"Statement {stats.statements + 1} exceeds the budget of {stats.budget}: {statement[:200]}")
+        context._query_started = time.perf_counter()
+    if tracing.current_span() is not None:
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+        context._trace_span = tracing.start_span(
+            f"db.query {operation}", tracing.CLIENT,
+            **{"db.system": "postgresql", "db.name": conn.engine.url.database, "db.operation": operation,
+               "db.statement": statement[:2000], "db.executemany": executemany},
+        )
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = getattr(context, "_trace_span", None)
+    if span is not None:
+        span.attributes["db.rows"] = cursor.rowcount if cursor.rowcount >= 0 else None
+        tracing.end_span(span)
+    stats = _query_stats.get()
+    started = getattr(context, "_query_started", None)
+    if stats is None or started is None:
+        return
+    stats.statements += 1
+    stats.db_seconds += time.perf_counter() - started
+    if cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+
+
+def _handle_error(exception_context):
+    span = getattr(exception_context.execution_context, "_trace_span", None)
+    if span is not None:
+        tracing.end_span(span, exception_context.original_exception)
+
+
+def _statement_cache_size(url: str, configured: int | None) -> int:
+    if configured is not None:
+        return configured
+    host = make_url(url).host or ""
+    return 0 if "-pooler" in host else 100
+
+
+def _create_engine(config: EngineSettings) -> AsyncEngine:
+    url = config.url or settings.database_url
+    cache_size = _statement_cache_size(url, config.statement_cache_size)
+    connect_args = {
+        "statement_cache_size": cache_size,
+        "prepared_statement_cache_size": cache_size,
+    }
+    if cache_size == 0:
+        # Transaction-mode pgbouncer hands each transaction a different server connection,
+        # so prepared statement names must never repeat
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+    if config.command_timeout is not None:
+        connect_args["command_timeout"] = config.command_timeout
+    engine = create_async_engine(
+        url,
+        echo=False,
+        pool_size=config.pool_size,
+        max_overflow=config.max_overflow,
+        pool_timeout=config.pool_timeout,
+        pool_pre_ping=True,
+        connect_args=connect_args,
+    )
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+    return engine
+
+
+class LazyEngines(Mapping[str, AsyncEngine]):
+    """Named engines, each created on first use. A str config aliases another name."""
+
+    def __init__(self, configs: dict[str, EngineSettings | str]):
+        self._configs = configs
+        self._engines: dict[str, AsyncEngine] = {}
+
+    def __getitem__(self, name: str) -> AsyncEngine:
+        engine = self._engines.get(name)
+        if engine is None:
+            config = self._configs[name]
+            engine = self[config] if isinstance(config, str) else _create_engine(config)
+            self._engines[name] = engine
+        return engine
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._configs)
+
+    def __len__(self) -> int:
+        return len(self._configs)
+
+    def created(self) -> list[AsyncEngine]:
+        return list({id(e): e for e in self._engines.values()}.values())
+
+
+def engine_configs(config: Settings) -> dict[str, EngineSettings | str]:
+    """Named engine configs; an engine without a URL aliases its nearest configured one."""
+    if config.db_timeseries_replica.url:
+        timeseries_replica = config.db_timeseries_replica
+    else:
+        # A dedicated time-series database has no replica of its own; otherwise the
+        # time-series tables live on the primary and its replica has them too
+        timeseries_replica = "timeseries" if config.db_timeseries.url else "replica"
+    return {
+        "primary": config.db_primary,
+        "replica": config.db_replica if config.db_replica.url else "primary",
+        "timeseries": config.db_timeseries if config.db_timeseries.url else "primary",
+        "timeseries_replica": timeseries_replica,
+    }
+
+
+engines = LazyEngines(engine_configs(settings))
+shard_engines = LazyEngines(dict(settings.timeseries_shards))
+shard_replica_engines = LazyEngines({
+    name: config for name, config in settings.timeseries_shard_replicas.items() if name in shard_engines
+})
+
+
+async def warm_pools(connections: int) -> int:
+    """Open `connections` pooled connections on every engine (at most its pool size) and
+    return them to the pool. Returns how many were opened."""
+    async def warm(engine: AsyncEngine) -> int:
+        count = min(connections, engine.pool.size())
+        async with AsyncExitStack() as stack:
+            await asyncio.gather(*(stack.enter_async_context(engine.connect()) for _ in range(count)))
+        return count
+
+    targets = {id(e): e for e in (*engines.values(), *shard_engines.values(), *shard_replica_engines.values())}
+    return sum(await asyncio.gather(*(warm(e) for e in targets.values())))
+
+
+async def dispose_engines() -> None:
+    created = (*engines.created(), *shard_engines.created(), *shard_replica_engines.created())
+    for engine in {id(e): e for e in created}.values():
+        await engine.dispose()
+
+
+class RoutingSession(Session):
+    """Picks an engine per statement: time-series models by mixin, the rest by session role."""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        # `mapper` is a Mapper for ORM statements, or a class passed via bind_arguments
+        if mapper is not None and issubclass(getattr(mapper, "class_", mapper), TimeSeries):
+            replica = self.info.get("role") == "replica"
+            if not shard_engines:
+                return engines["timeseries_replica" if replica else "timeseries"].sync_engine
+            shard = self.info.get("shard")
+            if shard is None:
+                raise ShardNotSelected("Time-series query on a sharded deployment without bind_tenant()")
+            if replica and shard in shard_replica_engines:
+                return shard_replica_engines[shard].sync_engine
+            return shard_engines[shard].sync_engine
+        return engines[self.info.get("role", "primary")].sync_engine
+
+
+async_session = async_sessionmaker(class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False)
+
+
+def async_read_session() -> AsyncSession:
+    return async_session(info={"role": "replica"})
+
+
 async def get_db():
     async with async_session() as session:
         yield session
+
+
+async def get_read_db():
+    """Session for read-only endpoints; asset queries go to the replica."""
+    async with async_read_session() as session:
+        yield session
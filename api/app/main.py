@@ -1,36 +1,88 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-from app.routers import auth, ingest, assets, readings, customer
+from app.auth import require_operator
+from app.db import dispose_engines
+from app.middleware import ProfilerMiddleware, QueryStatsMiddleware, TracingMiddleware
+from app.routers import auth, ingest, assets, readings, customer, alerts, analysis, fft, admin
+from app.services.fft_features import fft_pipeline
+from app.services.operating_hours import run_states
+from app.services.request_metrics import request_metrics
+from app.services.rolling_stats import rolling_stats
+from app.services.warmup import warmup
 from app.websocket import manager
 
-app = FastAPI(title="Crane Predictive Maintenance API", version="1.0.0")
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    fft_pipeline.start()
+    run_states.start()
+    # Trend history loads in the background; trend alert conditions stay quiet until it's ready
+    rebuild = asyncio.create_task(rolling_stats.rebuild())
+    # Pool connections and registry caches warm in the background; /health/ready waits for them
+    warm = asyncio.create_task(warmup.run())
+    yield
+    warm.cancel()
+    rebuild.cancel()
+    await fft_pipeline.stop()
+    await run_states.stop()
+    await dispose_engines()
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(title="Crane Predictive Maintenance API", version="1.0.0", lifespan=lifespan)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["Server-Timing", "traceresponse", *fft.WATERFALL_HEADERS],
+    )
+    app.add_middleware(ProfilerMiddleware)
+    app.add_middleware(QueryStatsMiddleware)
+    app.add_middleware(TracingMiddleware)
+
+    app.include_router(auth.router)
+    app.include_router(ingest.router)
+    app.include_router(customer.router)
+    app.include_router(assets.router)
+    app.include_router(readings.router)
+    app.include_router(alerts.router)
+    app.include_router(analysis.router)
+    app.include_router(fft.router)
+    app.include_router(admin.router)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/health/ready")
+    async def ready():
+        """503 until startup warmup has finished (or given up), for platform health checks."""
+        body = {"status": "ready" if warmup.ready else "warming", **vars(warmup)}
+        return JSONResponse(body, status_code=200 if warmup.ready else 503)
 
-app.include_router(auth.router)
-app.include_router(ingest.router)
-app.include_router(customer.router)
-app.include_router(assets.router)
-app.include_router(readings.router)
+    @app.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(require_operator)])
+    async def metrics():
+        """Per-route request and SQL counters; route names and traffic are operator-only."""
+        return PlainTextResponse(request_metrics.render(), media_type="text/plain; version=0.0.4")
 
+    @app.websocket("/ws")
+    async def websocket_endpoint(websocket: WebSocket):
+        await manager.connect(websocket)
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            manager.disconnect(websocket)
 
-@app.get("/health")
-async def health():
-    return {"status": "ok"}
+    return app
 
 
-@app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
-    try:
-        while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
+app = create_app()
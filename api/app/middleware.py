@@ -0,0 +1,122 @@
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+
+from app.db import current_query_stats, track_queries
+from app.services import tracing
+from app.services.profiler import profiler
+from app.services.request_metrics import request_metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """Counts each HTTP request's SQL statements, rows and database time.
+
+    The totals so far go out in a `Server-Timing` header when the response starts (statements
+    run while a body streams only reach the metrics), and the final numbers are folded into
+    `request_metrics` under the matched route template.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        with track_queries() as stats:
+            async def send_with_timing(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    elapsed = (time.perf_counter() - started) * 1000
+                    MutableHeaders(scope=message).append("Server-Timing", (
+                        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.statements} statements, {stats.rows} rows", '
+                        f"app;dur={elapsed:.1f}"
+                    ))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                route = getattr(scope.get("route"), "path", None) or "unmatched"
+                request_metrics.observe(scope["method"], route, status, time.perf_counter() - started, stats)
+                if stats.over_budget:
+                    logger.warning(
+                        "%s %s ran %d SQL statements, budget %d", scope["method"], route, stats.statements, stats.budget,
+                    )
+
+
+class ProfilerMiddleware:
+    """Records requests with the sampling profiler while it is enabled (app.services.profiler)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        recording = profiler.begin() if scope["type"] == "http" else None
+        if recording is None:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            profiler.end(recording, scope["method"], route, status, time.perf_counter() - started, current_query_stats())
+
+
+class TracingMiddleware:
+    """Opens the server span of each HTTP request, continuing the caller's `traceparent`.
+
+    The span is renamed to the matched route once routing is done and is echoed back to the
+    caller in a `traceresponse` header when sampled.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or tracing.exporter is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        traceparent = headers.get(b"traceparent", b"").decode("latin-1") or None
+        with tracing.trace(scope["method"], traceparent, **{"http.method": scope["method"], "http.target": scope["path"]}) as span:
+            if span is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_with_context(message):
+                if message["type"] == "http.response.start":
+                    span.attributes["http.status_code"] = message["status"]
+                    MutableHeaders(scope=message).append("traceresponse", span.traceparent)
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_context)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                endpoint = scope.get("endpoint")
+                span.name = f"{scope['method']} {route or 'unmatched'}"
+                span.attributes["http.route"] = route
+                span.attributes["code.function"] = getattr(endpoint, "__qualname__", None)
+                if span.attributes.get("http.status_code", 500) >= 500 and span.error is None:
+                    span.error = "HTTP 5xx"
@@ -14,10 +14,29 @@ from app.models.crane_health_override import CraneHealthOverride
 from app.models.pm_schedule import PMSchedule
 from app.models.log_entry import LogEntry
 from app.models.service_call import ServiceCall
+from app.models.reading_hourly import ReadingHourly
+from app.models.retention_policy import RetentionPolicy
+from app.models.tenant_shard import TenantShard
+from app.models.bearing_fault_detection import BearingFaultDetection
+from app.models.fft_feature import FFTFeature
+from app.models.anomaly_model import AnomalyModel
+from app.models.rul_estimate import RulEstimate
+from app.models.run_session import RunSession
+from app.models.run_state import RunState
+from app.models.crane_operating_hours import CraneOperatingHours
+from app.models.spectrum_baseline import SpectrumBaseline
+from app.models.baseline_score import BaselineScore
+from app.models.fft_feature_peak import FFTFeaturePeak
+from app.models.cohort_member import CohortMember
+from app.models.cohort_stat import CohortStat
 
 __all__ = [
     "Organization", "User", "ApiKey", "Facility", "Crane",
     "Component", "Sensor", "BearingSpec", "Reading", "FFTCapture",
     "AlertRule", "Alert", "CraneHealthOverride", "PMSchedule",
-    "LogEntry", "ServiceCall",
+    "LogEntry", "ServiceCall", "ReadingHourly", "RetentionPolicy",
+    "TenantShard", "BearingFaultDetection", "FFTFeature", "AnomalyModel",
+    "RulEstimate", "RunSession", "RunState", "CraneOperatingHours",
+    "SpectrumBaseline", "BaselineScore", "FFTFeaturePeak",
+    "CohortMember", "CohortStat",
 ]
@@ -0,0 +1,20 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+
+class AnomalyModel(Base):
+    __tablename__ = "anomaly_models"
+
+    sensor_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("sensors.id", ondelete="CASCADE"), primary_key=True)
+    features: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False)
+    training_rows: Mapped[int] = mapped_column(Integer, nullable=False)
+    training_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    training_end: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    model: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # FlatForest.to_bytes()
+    trained_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base, TimeSeries
+
+
+class BaselineScore(TimeSeries, Base):
+    __tablename__ = "fft_baseline_scores"  # one capture compared against its axis baseline
+    __table_args__ = (Index("ix_fft_baseline_scores_sensor_id_timestamp", "sensor_id", "timestamp"),)
+
+    fft_capture_id: Mapped[int] = mapped_column(ForeignKey("fft_captures.id", ondelete="CASCADE"), primary_key=True)
+    sensor_id: Mapped[str] = mapped_column(ForeignKey("sensors.id"), nullable=False)
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    axis: Mapped[str] = mapped_column(String(1), nullable=False)
+    learning: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)  # folded into the baseline, not scored
+    score: Mapped[float | None] = mapped_column(Float)
+    max_ratio: Mapped[float | None] = mapped_column(Float)
+    max_ratio_hz: Mapped[float | None] = mapped_column(Float)
+    bands_over_envelope: Mapped[int | None] = mapped_column(Integer)
+    band_ratios: Mapped[list[float] | None] = mapped_column(ARRAY(Float))
+    baseline_captures: Mapped[int | None] = mapped_column(Integer)
+    scored_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
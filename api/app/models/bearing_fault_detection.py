@@ -0,0 +1,23 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Float, SmallInteger, String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base, TimeSeries
+
+
+class BearingFaultDetection(TimeSeries, Base):
+    __tablename__ = "bearing_fault_detections"
+    __table_args__ = (Index("ix_bearing_fault_detections_sensor_id_timestamp", "sensor_id", "timestamp"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    fft_capture_id: Mapped[int] = mapped_column(ForeignKey("fft_captures.id", ondelete="CASCADE"), nullable=False, index=True)
+    sensor_id: Mapped[str] = mapped_column(ForeignKey("sensors.id"), nullable=False)
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    bearing_spec_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("bearing_specs.id", ondelete="CASCADE"), nullable=False)
+    fault_type: Mapped[str] = mapped_column(String(4), nullable=False)  # ftf | bpfo | bpfi | bsf
+    frequency_hz: Mapped[float] = mapped_column(Float, nullable=False)
+    harmonics: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    amplitude: Mapped[float] = mapped_column(Float, nullable=False)
+    confidence: Mapped[str] = mapped_column(String(6), nullable=False)  # low | medium | high
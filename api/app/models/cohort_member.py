@@ -0,0 +1,19 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+
+class CohortMember(Base):
+    __tablename__ = "cohort_members"  # each active sensor's recent per-metric means and its peer cohort
+    __table_args__ = (Index("ix_cohort_members_cohort", "cohort"),)
+
+    sensor_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("sensors.id", ondelete="CASCADE"), primary_key=True)
+    cohort: Mapped[str] = mapped_column(String(255), nullable=False)  # services/cohorts.cohort_key
+    values: Mapped[dict] = mapped_column(JSONB, nullable=False)  # metric -> mean over the cohort window
+    data_through: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)  # last hourly bucket included
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
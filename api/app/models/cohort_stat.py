@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+
+class CohortStat(Base):
+    __tablename__ = "cohort_stats"  # histogram of one metric over one cohort's members
+
+    cohort: Mapped[str] = mapped_column(String(255), primary_key=True)
+    metric: Mapped[str] = mapped_column(String(50), primary_key=True)
+    members: Mapped[int] = mapped_column(Integer, nullable=False)
+    histogram: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # services/cohorts.COHORT_LEVELS counts
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
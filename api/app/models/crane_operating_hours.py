@@ -0,0 +1,17 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+
+class CraneOperatingHours(Base):
+    __tablename__ = "crane_operating_hours"
+
+    crane_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("cranes.id", ondelete="CASCADE"), primary_key=True)
+    operating_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    covered_until: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)  # union watermark
+    utilization_30d: Mapped[float | None] = mapped_column(Float)  # running fraction, set by rebuilds
+    rebuilt_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
@@ -1,20 +1,25 @@
 from datetime import datetime
 
-from sqlalchemy import Integer, String, DateTime, ForeignKey, LargeBinary
+from sqlalchemy import BigInteger, Index, text, Integer, String, DateTime, ForeignKey, LargeBinary
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.db import Base
+from app.db import Base, TimeSeries
 
 
-class FFTCapture(Base):
+class FFTCapture(TimeSeries, Base):
     __tablename__ = "fft_captures"
+    __table_args__ = (
+        Index("ix_fft_captures_sensor_id_timestamp", "sensor_id", "timestamp"),
+        Index("ix_fft_captures_unanalyzed", "id", postgresql_where=text("analyzed_at IS NULL")),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     sensor_id: Mapped[str] = mapped_column(ForeignKey("sensors.id"), nullable=False, index=True)
     timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, index=True)
     axis: Mapped[str] = mapped_column(String(1), nullable=False)
     odr: Mapped[int] = mapped_column(Integer, nullable=False)
     num_bins: Mapped[int] = mapped_column(Integer, nullable=False)
     spectrum_data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    analyzed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     sensor = relationship("Sensor", back_populates="fft_captures")
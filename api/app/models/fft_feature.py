@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from sqlalchemy import Float, Integer, String, DateTime, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base, TimeSeries
+
+
+class FFTFeature(TimeSeries, Base):
+    __tablename__ = "fft_features"
+    __table_args__ = (
+        Index("ix_fft_features_sensor_id_timestamp", "sensor_id", "timestamp"),
+        # Fleet search (services/fft_search): time-bounded range scans per metric
+        Index("ix_fft_features_timestamp_overall_rms", "timestamp", "overall_rms"),
+        Index("ix_fft_features_timestamp_amp_1x", "timestamp", "amp_1x", postgresql_where=text("amp_1x IS NOT NULL")),
+        Index("ix_fft_features_timestamp_amp_2x", "timestamp", "amp_2x", postgresql_where=text("amp_2x IS NOT NULL")),
+        Index("ix_fft_features_timestamp_amp_3x", "timestamp", "amp_3x", postgresql_where=text("amp_3x IS NOT NULL")),
+    )
+
+    fft_capture_id: Mapped[int] = mapped_column(ForeignKey("fft_captures.id", ondelete="CASCADE"), primary_key=True)
+    sensor_id: Mapped[str] = mapped_column(ForeignKey("sensors.id"), nullable=False)
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    axis: Mapped[str] = mapped_column(String(1), nullable=False)
+    rpm: Mapped[int | None] = mapped_column(Integer)
+    overall_rms: Mapped[float] = mapped_column(Float, nullable=False)
+    peak_frequencies_hz: Mapped[list[float]] = mapped_column(ARRAY(Float), nullable=False)
+    peak_amplitudes: Mapped[list[float]] = mapped_column(ARRAY(Float), nullable=False)
+    band_energies: Mapped[list[float]] = mapped_column(ARRAY(Float), nullable=False)  # one per FEATURE_BANDS_HZ band
+    amp_1x: Mapped[float | None] = mapped_column(Float)
+    amp_2x: Mapped[float | None] = mapped_column(Float)
+    amp_3x: Mapped[float | None] = mapped_column(Float)
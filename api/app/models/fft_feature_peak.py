@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base, TimeSeries
+
+
+class FFTFeaturePeak(TimeSeries, Base):
+    __tablename__ = "fft_feature_peaks"  # fft_features peaks, one row each, for frequency / order search
+    __table_args__ = (
+        Index("ix_fft_feature_peaks_frequency_hz_timestamp", "frequency_hz", "timestamp"),
+        Index("ix_fft_feature_peaks_shaft_order_timestamp", "shaft_order", "timestamp"),
+    )
+
+    fft_capture_id: Mapped[int] = mapped_column(ForeignKey("fft_features.fft_capture_id", ondelete="CASCADE"), primary_key=True)
+    rank: Mapped[int] = mapped_column(SmallInteger, primary_key=True)  # 1 = strongest
+    sensor_id: Mapped[str] = mapped_column(ForeignKey("sensors.id"), nullable=False)
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    frequency_hz: Mapped[float] = mapped_column(Float, nullable=False)
+    shaft_order: Mapped[float | None] = mapped_column(Float)  # frequency / running speed, when RPM is known
+    amplitude: Mapped[float] = mapped_column(Float, nullable=False)
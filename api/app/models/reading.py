@@ -1,15 +1,16 @@
 from datetime import datetime
 
-from sqlalchemy import Integer, Float, SmallInteger, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Index, Integer, Float, SmallInteger, DateTime, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.db import Base
+from app.db import Base, TimeSeries
 
 
-class Reading(Base):
+class Reading(TimeSeries, Base):
     __tablename__ = "readings"
+    __table_args__ = (Index("ix_readings_sensor_id_timestamp", "sensor_id", "timestamp"),)
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     sensor_id: Mapped[str] = mapped_column(ForeignKey("sensors.id"), nullable=False, index=True)
     timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, index=True)
     counter: Mapped[int | None] = mapped_column(Integer)
@@ -47,5 +48,6 @@ class Reading(Base):
     channel_1: Mapped[float | None] = mapped_column(Float)
     channel_2: Mapped[float | None] = mapped_column(Float)
     channel_3: Mapped[float | None] = mapped_column(Float)
+    anomaly_score: Mapped[float | None] = mapped_column(Float)  # 0-100, set at ingest when the sensor has a model
 
     sensor = relationship("Sensor", back_populates="readings")
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from sqlalchemy import Integer, Float, SmallInteger, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base, TimeSeries
+
+
+class ReadingHourly(TimeSeries, Base):
+    __tablename__ = "readings_hourly"
+
+    sensor_id: Mapped[str] = mapped_column(ForeignKey("sensors.id"), primary_key=True)
+    hour: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    reading_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    temperature_avg: Mapped[float | None] = mapped_column(Float)
+    temperature_max: Mapped[float | None] = mapped_column(Float)
+    x_rms_ACC_G_avg: Mapped[float | None] = mapped_column(Float)
+    x_rms_ACC_G_max: Mapped[float | None] = mapped_column(Float)
+    y_rms_ACC_G_avg: Mapped[float | None] = mapped_column(Float)
+    y_rms_ACC_G_max: Mapped[float | None] = mapped_column(Float)
+    z_rms_ACC_G_avg: Mapped[float | None] = mapped_column(Float)
+    z_rms_ACC_G_max: Mapped[float | None] = mapped_column(Float)
+    x_velocity_mm_sec_avg: Mapped[float | None] = mapped_column(Float)
+    x_velocity_mm_sec_max: Mapped[float | None] = mapped_column(Float)
+    y_velocity_mm_sec_avg: Mapped[float | None] = mapped_column(Float)
+    y_velocity_mm_sec_max: Mapped[float | None] = mapped_column(Float)
+    z_velocity_mm_sec_avg: Mapped[float | None] = mapped_column(Float)
+    z_velocity_mm_sec_max: Mapped[float | None] = mapped_column(Float)
+    battery_percent_min: Mapped[int | None] = mapped_column(SmallInteger)
+    # Readings that carried each metric; NULL on hours rolled up before these were added
+    temperature_count: Mapped[int | None] = mapped_column(Integer)
+    x_rms_ACC_G_count: Mapped[int | None] = mapped_column(Integer)
+    y_rms_ACC_G_count: Mapped[int | None] = mapped_column(Integer)
+    z_rms_ACC_G_count: Mapped[int | None] = mapped_column(Integer)
+    x_velocity_mm_sec_count: Mapped[int | None] = mapped_column(Integer)
+    y_velocity_mm_sec_count: Mapped[int | None] = mapped_column(Integer)
+    z_velocity_mm_sec_count: Mapped[int | None] = mapped_column(Integer)
@@ -0,0 +1,17 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+
+class RetentionPolicy(Base):
+    __tablename__ = "retention_policies"
+
+    org_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True)
+    raw_days: Mapped[int] = mapped_column(Integer, nullable=False)
+    fft_days: Mapped[int] = mapped_column(Integer, nullable=False)
+    hourly_days: Mapped[int] = mapped_column(Integer, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,28 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+
+class RulEstimate(Base):
+    __tablename__ = "rul_estimates"
+
+    sensor_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("sensors.id", ondelete="CASCADE"), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)  # degrading | stable | exceeded | no_fit
+    fitted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    data_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    data_end: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)  # last hourly bucket used
+    points: Mapped[int] = mapped_column(Integer, nullable=False)
+    threshold: Mapped[float] = mapped_column(Float, nullable=False)
+    # velocity = level * exp(rate * hours since data_end)
+    level: Mapped[float | None] = mapped_column(Float)
+    rate: Mapped[float | None] = mapped_column(Float)
+    covariance: Mapped[list[float] | None] = mapped_column(ARRAY(Float))  # 2x2, row-major
+    threshold_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    threshold_earliest: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    threshold_latest: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    curve: Mapped[dict] = mapped_column(JSONB, nullable=False)  # {"history": [...], "projection": [...]}
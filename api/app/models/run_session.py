@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base, TimeSeries
+
+
+class RunSession(TimeSeries, Base):
+    __tablename__ = "run_sessions"
+    __table_args__ = (
+        Index("ix_run_sessions_sensor_id_started_at", "sensor_id", "started_at"),
+        Index("ix_run_sessions_crane_id_started_at", "crane_id", "started_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    sensor_id: Mapped[str] = mapped_column(ForeignKey("sensors.id"), nullable=False)
+    crane_id: Mapped[str] = mapped_column(ForeignKey("cranes.id"), nullable=False)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    ended_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)  # run time credited so far
+    duration_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    open: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
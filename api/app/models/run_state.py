@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base, TimeSeries
+
+
+class RunState(TimeSeries, Base):
+    __tablename__ = "run_states"  # where each sensor's run-session state machine stands
+
+    sensor_id: Mapped[str] = mapped_column(ForeignKey("sensors.id"), primary_key=True)
+    crane_id: Mapped[str] = mapped_column(ForeignKey("cranes.id"), nullable=False)
+    last_timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_running: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    session_id: Mapped[int | None] = mapped_column(BigInteger)  # open session, if running
+    dirty_since: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))  # oldest late reading not applied
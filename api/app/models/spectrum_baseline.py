@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base, TimeSeries
+
+
+class SpectrumBaseline(TimeSeries, Base):
+    __tablename__ = "spectrum_baselines"  # healthy reference spectrum per sensor axis
+
+    sensor_id: Mapped[str] = mapped_column(ForeignKey("sensors.id", ondelete="CASCADE"), primary_key=True)
+    axis: Mapped[str] = mapped_column(String(1), primary_key=True)
+    window_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    window_end: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    odr: Mapped[int | None] = mapped_column(Integer)  # layout of the captures it learns from
+    num_bins: Mapped[int | None] = mapped_column(Integer)
+    captures: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    histogram: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # services/baselines.BaselineHistogram
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
@@ -0,0 +1,58 @@
+"""Operator endpoints: runtime control of the request profiler and its captured profiles.
+
+Gated on OPERATOR_TOKEN, not on an org role: profiles span every tenant served by the worker.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.auth import require_operator
+from app.schemas.admin import ProfileSummaryOut, ProfilerConfigIn, ProfilerConfigOut
+from app.services.profiler import profiler
+
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"], dependencies=[Depends(require_operator)])
+
+
+def _config() -> ProfilerConfigOut:
+    return ProfilerConfigOut(
+        enabled=profiler.enabled,
+        threshold_ms=profiler.threshold_ms,
+        sample_one_in=profiler.sample_one_in,
+        interval_ms=profiler.interval_ms,
+        buffer_size=profiler.profiles.maxlen,
+        profiles=len(profiler.profiles),
+    )
+
+
+# ── Profiler ──
+
+@router.get("/profiler", response_model=ProfilerConfigOut)
+async def get_profiler():
+    return _config()
+
+
+@router.put("/profiler", response_model=ProfilerConfigOut)
+async def configure_profiler(body: ProfilerConfigIn):
+    """Change this worker's profiler settings; omitted fields keep their value."""
+    profiler.configure(**body.model_dump(exclude_none=True))
+    return _config()
+
+
+@router.get("/profiles", response_model=list[ProfileSummaryOut])
+async def list_profiles():
+    """Captured profiles, newest first."""
+    return [ProfileSummaryOut(**{f: getattr(p, f) for f in ProfileSummaryOut.model_fields}) for p in reversed(profiler.profiles)]
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: int):
+    """Collapsed stacks, one `frame;frame;... samples` line each — feed to flamegraph.pl or speedscope."""
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found (the buffer keeps only the most recent)")
+    return PlainTextResponse(profile.folded())
+
+
+@router.delete("/profiles", status_code=204)
+async def clear_profiles():
+    profiler.clear()
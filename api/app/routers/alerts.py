@@ -0,0 +1,179 @@
+"""Alert inbox and alert rule management."""
+
+import uuid
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import Claims, get_current_claims
+from app.db import get_db, get_read_db
+from app.models.alert import Alert
+from app.models.alert_rule import AlertRule
+from app.models.component import Component
+from app.models.crane import Crane
+from app.models.facility import Facility
+from app.models.sensor import Sensor
+from app.schemas.alerts import AlertCondition, AlertOut, AlertRuleCreate, AlertRuleOut, AlertRuleUpdate
+from app.services.alert_engine import ALERT_FIELDS, TREND_FIELDS, alert_engine
+from app.services.ownership import sensor_in_org
+from app.websocket import manager
+
+router = APIRouter(prefix="/api/v1/alerts", tags=["alerts"])
+
+
+# ── Helpers ──
+
+def _check_conditions(conditions: list[AlertCondition]) -> list[dict]:
+    unknown = sorted({c.field for c in conditions} - ALERT_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown reading field(s): {', '.join(unknown)}")
+    no_trend = sorted({c.field for c in conditions if c.trend_days} - TREND_FIELDS)
+    if no_trend:
+        raise HTTPException(status_code=422, detail=f"Trends are not tracked for: {', '.join(no_trend)}")
+    return [c.model_dump(exclude_none=True) for c in conditions]
+
+
+async def _check_sensor(sensor_id: uuid.UUID | None, user: Claims, db: AsyncSession) -> None:
+    if sensor_id is not None and not await sensor_in_org(sensor_id, user.org_id, db):
+        raise HTTPException(status_code=404, detail="Sensor not found")
+
+
+async def _get_rule_or_404(rule_id: uuid.UUID, user: Claims, db: AsyncSession) -> AlertRule:
+    result = await db.execute(select(AlertRule).where(AlertRule.id == rule_id, AlertRule.org_id == user.org_id))
+    rule = result.scalar_one_or_none()
+    if rule is None:
+        raise HTTPException(status_code=404, detail="Alert rule not found")
+    return rule
+
+
+async def _get_alert_or_404(alert_id: uuid.UUID, user: Claims, db: AsyncSession) -> Alert:
+    alert = await db.get(Alert, alert_id)
+    if alert is None or not await sensor_in_org(alert.sensor_id, user.org_id, db):
+        raise HTTPException(status_code=404, detail="Alert not found")
+    return alert
+
+
+# ── Alert Rules ──
+
+@router.get("/rules", response_model=list[AlertRuleOut])
+async def list_alert_rules(user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_read_db)):
+    result = await db.execute(
+        select(AlertRule).where(AlertRule.org_id == user.org_id).order_by(AlertRule.created_at)
+    )
+    return result.scalars().all()
+
+
+@router.post("/rules", response_model=AlertRuleOut, status_code=201)
+async def create_alert_rule(body: AlertRuleCreate, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
+    conditions = _check_conditions(body.conditions)
+    await _check_sensor(body.sensor_id, user, db)
+    rule = AlertRule(
+        org_id=user.org_id,
+        sensor_id=body.sensor_id,
+        name=body.name,
+        conditions=conditions,
+        channels=body.channels,
+        recipients=body.recipients,
+        cooldown_minutes=body.cooldown_minutes,
+        enabled=body.enabled,
+    )
+    db.add(rule)
+    await db.commit()
+    alert_engine.invalidate(user.org_id)
+    await db.refresh(rule)
+    return rule
+
+
+@router.put("/rules/{rule_id}", response_model=AlertRuleOut)
+async def update_alert_rule(
+    rule_id: uuid.UUID,
+    body: AlertRuleUpdate,
+    user: Claims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_db),
+):
+    rule = await _get_rule_or_404(rule_id, user, db)
+    if body.conditions is not None:
+        rule.conditions = _check_conditions(body.conditions)
+    if body.sensor_id is not None:
+        await _check_sensor(body.sensor_id, user, db)
+        rule.sensor_id = body.sensor_id
+    if body.name is not None:
+        rule.name = body.name
+    if body.channels is not None:
+        rule.channels = body.channels
+    if body.recipients is not None:
+        rule.recipients = body.recipients
+    if body.cooldown_minutes is not None:
+        rule.cooldown_minutes = body.cooldown_minutes
+    if body.enabled is not None:
+        rule.enabled = body.enabled
+    await db.commit()
+    alert_engine.invalidate(user.org_id)
+    await db.refresh(rule)
+    return rule
+
+
+@router.delete("/rules/{rule_id}", status_code=204)
+async def delete_alert_rule(rule_id: uuid.UUID, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
+    rule = await _get_rule_or_404(rule_id, user, db)
+    # Alert history outlives its rule (PRD: alerts are kept indefinitely)
+    await db.execute(update(Alert).where(Alert.rule_id == rule_id).values(rule_id=None))
+    await db.delete(rule)
+    await db.commit()
+    alert_engine.invalidate(user.org_id)
+    alert_engine.forget_rule(rule_id)
+
+
+# ── Alerts ──
+
+@router.get("", response_model=list[AlertOut])
+async def list_alerts(
+    status: str | None = None,
+    severity: str | None = None,
+    limit: int = Query(default=100, le=1000),
+    user: Claims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db),
+):
+    query = (
+        select(Alert)
+        .join(Sensor, Sensor.id == Alert.sensor_id)
+        .join(Component).join(Crane).join(Facility)
+        .where(Facility.org_id == user.org_id)
+    )
+    if status:
+        query = query.where(Alert.status == status)
+    if severity:
+        query = query.where(Alert.severity == severity)
+    result = await db.execute(query.order_by(Alert.created_at.desc()).limit(limit))
+    return result.scalars().all()
+
+
+@router.put("/{alert_id}/acknowledge", response_model=AlertOut)
+async def acknowledge_alert(alert_id: uuid.UUID, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
+    alert = await _get_alert_or_404(alert_id, user, db)
+    if alert.status == "open":
+        alert.status = "acknowledged"
+        alert.acknowledged_by = user.id
+        alert.acknowledged_at = datetime.now(timezone.utc)
+        await db.commit()
+        await db.refresh(alert)
+        await manager.broadcast({
+            "event": "alert.acknowledged",
+            "alert_id": str(alert.id),
+            "acknowledged_by": str(user.id),
+        })
+    return alert
+
+
+@router.put("/{alert_id}/resolve", response_model=AlertOut)
+async def resolve_alert(alert_id: uuid.UUID, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
+    alert = await _get_alert_or_404(alert_id, user, db)
+    if alert.status != "resolved":
+        alert.status = "resolved"
+        alert.resolved_by = user.id
+        alert.resolved_at = datetime.now(timezone.utc)
+        await db.commit()
+        await db.refresh(alert)
+    return alert
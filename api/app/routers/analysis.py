@@ -0,0 +1,136 @@
+"""Analysis results computed offline and served as stored (PRD §6.1 Analysis)."""
+
+import math
+import uuid
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import Claims, get_current_claims
+from app.db import get_read_db
+from app.models.crane_operating_hours import CraneOperatingHours
+from app.models.run_session import RunSession
+from app.schemas.analysis import CohortMetricRank, CohortRankOut, OperatingHoursOut, RulOut, RunSessionOut
+from app.services.cohorts import MIN_COHORT_MEMBERS, cohort_rank, parse_cohort_key
+from app.services.ownership import crane_in_org, ownership, sensor_in_org
+from app.services.rul import rul_estimates
+from app.services.sharding import bind_tenant
+
+router = APIRouter(prefix="/api/v1/analysis", tags=["analysis"])
+
+
+def _hours_until(ts: datetime | None, now: datetime) -> float | None:
+    return max(0.0, (ts - now).total_seconds() / 3600) if ts is not None else None
+
+
+# ── RUL ──
+
+@router.get("/rul/{sensor_id}", response_model=RulOut)
+async def get_rul(sensor_id: uuid.UUID, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_read_db)):
+    if not await sensor_in_org(sensor_id, user.org_id, db):
+        raise HTTPException(status_code=404, detail="Sensor not found")
+    estimate = await rul_estimates.get(sensor_id, db)
+    if estimate is None:
+        raise HTTPException(status_code=404, detail="No RUL estimate yet (needs 30+ days of hourly data)")
+
+    now = datetime.now(timezone.utc)
+    rul_hours = _hours_until(estimate.threshold_at, now)
+    owner = await ownership.sensor(sensor_id, db)
+    hours = await db.get(CraneOperatingHours, owner.crane_id)
+    utilization = hours.utilization_30d if hours is not None else None
+    return RulOut(
+        sensor_id=sensor_id,
+        status=estimate.status,
+        fitted_at=estimate.fitted_at,
+        data_start=estimate.data_start,
+        data_end=estimate.data_end,
+        threshold_mm_sec=estimate.threshold,
+        current_mm_sec=estimate.level,
+        growth_percent_per_day=math.expm1(estimate.rate * 24) * 100 if estimate.rate is not None else None,
+        rul_hours=rul_hours,
+        rul_hours_low=_hours_until(estimate.threshold_earliest, now),
+        rul_hours_high=_hours_until(estimate.threshold_latest, now),
+        rul_operating_hours=rul_hours * utilization if rul_hours is not None and utilization is not None else None,
+        threshold_at=estimate.threshold_at,
+        history=estimate.curve["history"],
+        projection=estimate.curve["projection"],
+    )
+
+
+# ── Operating Hours ──
+
+@router.get("/operating-hours/{crane_id}", response_model=OperatingHoursOut)
+async def get_operating_hours(crane_id: uuid.UUID, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_read_db)):
+    if not await crane_in_org(crane_id, user.org_id, db):
+        raise HTTPException(status_code=404, detail="Crane not found")
+    hours = await db.get(CraneOperatingHours, crane_id)
+    if hours is None:
+        return OperatingHoursOut(crane_id=crane_id, operating_hours=0.0, utilization_30d=None, covered_until=None, rebuilt_at=None)
+    return OperatingHoursOut(
+        crane_id=crane_id,
+        operating_hours=hours.operating_seconds / 3600,
+        utilization_30d=hours.utilization_30d,
+        covered_until=hours.covered_until,
+        rebuilt_at=hours.rebuilt_at,
+    )
+
+
+@router.get("/run-sessions/{sensor_id}", response_model=list[RunSessionOut])
+async def list_run_sessions(
+    sensor_id: uuid.UUID,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    limit: int = Query(default=100, le=1000),
+    user: Claims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if not await sensor_in_org(sensor_id, user.org_id, db):
+        raise HTTPException(status_code=404, detail="Sensor not found")
+    await bind_tenant(db, user.org_id)
+
+    query = select(RunSession).where(RunSession.sensor_id == sensor_id)
+    if start:
+        query = query.where(RunSession.ended_at >= start)
+    if end:
+        query = query.where(RunSession.started_at <= end)
+    result = await db.execute(query.order_by(RunSession.started_at.desc()).limit(limit))
+    return result.scalars().all()
+
+
+# ── Cohorts ──
+
+@router.get("/cohort-rank/{sensor_id}", response_model=CohortRankOut)
+async def get_cohort_rank(sensor_id: uuid.UUID, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_read_db)):
+    """Where the sensor's recent means sit among sensors on the same component, crane and sensor type fleet-wide."""
+    if not await sensor_in_org(sensor_id, user.org_id, db):
+        raise HTTPException(status_code=404, detail="Sensor not found")
+    found = await cohort_rank(sensor_id, db)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Sensor has no recent hourly data in a cohort yet")
+    member, distributions = found
+
+    metrics = []
+    for metric, value in member.values.items():
+        cohort = distributions.get(metric)
+        if cohort is None:
+            continue
+        enough = cohort.members >= MIN_COHORT_MEMBERS
+        quantiles = {f"p{int(q * 100)}": cohort.quantile(q) if enough else None for q in (0.25, 0.5, 0.75, 0.95)}
+        metrics.append(CohortMetricRank(
+            metric=metric,
+            value=value,
+            percentile=cohort.percentile_rank(value) if enough else None,
+            members=cohort.members,
+            **quantiles,
+        ))
+    component_type, crane_type, sensor_type = parse_cohort_key(member.cohort)
+    return CohortRankOut(
+        sensor_id=sensor_id,
+        component_type=component_type,
+        crane_type=crane_type,
+        sensor_type=sensor_type,
+        data_through=member.data_through,
+        metrics=metrics,
+    )
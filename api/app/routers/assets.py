@@ -1,12 +1,11 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth import get_current_user
-from app.db import get_db
-from app.models.user import User
+from app.auth import Claims, get_current_claims
+from app.db import get_db, get_read_db
 from app.models.facility import Facility
 from app.models.crane import Crane
 from app.models.component import Component
@@ -17,8 +16,12 @@ from app.schemas.assets import (
     CraneCreate, CraneUpdate, CraneOut,
     ComponentCreate, ComponentUpdate, ComponentOut,
     SensorCreate, SensorUpdate, SensorOut,
-    BearingSpecCreate, BearingSpecOut,
+    BearingSpecCreate, BearingSpecUpdate, BearingSpecOut,
+    BearingFaultFrequencies, FaultFrequenciesOut,
 )
+from app.services.fault_frequencies import FAULT_TYPES, GEOMETRY_FIELDS, fault_frequencies, fill_orders
+from app.services.ownership import crane_in_org, ownership
+from app.services.rolling_stats import rolling_stats
 
 router = APIRouter(prefix="/api/v1", tags=["assets"])
 
@@ -26,13 +29,13 @@ router = APIRouter(prefix="/api/v1", tags=["assets"])
 # ── Facilities ──────────────────────────────────────────
 
 @router.get("/facilities", response_model=list[FacilityOut])
-async def list_facilities(user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def list_facilities(user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(Facility).where(Facility.org_id == user.org_id))
     return result.scalars().all()
 
 
 @router.post("/facilities", response_model=FacilityOut, status_code=201)
-async def create_facility(body: FacilityCreate, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def create_facility(body: FacilityCreate, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
     facility = Facility(org_id=user.org_id, name=body.name, location=body.location)
     db.add(facility)
     await db.commit()
@@ -41,7 +44,7 @@ async def create_facility(body: FacilityCreate, user: User = Depends(get_current
 
 
 @router.get("/facilities/{facility_id}", response_model=FacilityOut)
-async def get_facility(facility_id: uuid.UUID, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def get_facility(facility_id: uuid.UUID, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(Facility).where(Facility.id == facility_id, Facility.org_id == user.org_id))
     facility = result.scalar_one_or_none()
     if facility is None:
@@ -50,7 +53,7 @@ async def get_facility(facility_id: uuid.UUID, user: User = Depends(get_current_
 
 
 @router.put("/facilities/{facility_id}", response_model=FacilityOut)
-async def update_facility(facility_id: uuid.UUID, body: FacilityUpdate, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def update_facility(facility_id: uuid.UUID, body: FacilityUpdate, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Facility).where(Facility.id == facility_id, Facility.org_id == user.org_id))
     facility = result.scalar_one_or_none()
     if facility is None:
@@ -65,19 +68,20 @@ async def update_facility(facility_id: uuid.UUID, body: FacilityUpdate, user: Us
 
 
 @router.delete("/facilities/{facility_id}", status_code=204)
-async def delete_facility(facility_id: uuid.UUID, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def delete_facility(facility_id: uuid.UUID, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Facility).where(Facility.id == facility_id, Facility.org_id == user.org_id))
     facility = result.scalar_one_or_none()
     if facility is None:
         raise HTTPException(status_code=404, detail="Facility not found")
     await db.delete(facility)
     await db.commit()
+    ownership.invalidate_facility(facility_id)
 
 
 # ── Cranes ──────────────────────────────────────────────
 
 @router.get("/cranes", response_model=list[CraneOut])
-async def list_cranes(facility_id: uuid.UUID | None = None, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def list_cranes(facility_id: uuid.UUID | None = None, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_read_db)):
     query = select(Crane).join(Facility).where(Facility.org_id == user.org_id)
     if facility_id:
         query = query.where(Crane.facility_id == facility_id)
@@ -86,7 +90,7 @@ async def list_cranes(facility_id: uuid.UUID | None = None, user: User = Depends
 
 
 @router.post("/cranes", response_model=CraneOut, status_code=201)
-async def create_crane(body: CraneCreate, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def create_crane(body: CraneCreate, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
     # Verify facility belongs to user's org
     result = await db.execute(select(Facility).where(Facility.id == body.facility_id, Facility.org_id == user.org_id))
     if result.scalar_one_or_none() is None:
@@ -99,7 +103,7 @@ async def create_crane(body: CraneCreate, user: User = Depends(get_current_user)
 
 
 @router.get("/cranes/{crane_id}", response_model=CraneOut)
-async def get_crane(crane_id: uuid.UUID, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def get_crane(crane_id: uuid.UUID, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(Crane).join(Facility).where(Crane.id == crane_id, Facility.org_id == user.org_id))
     crane = result.scalar_one_or_none()
     if crane is None:
@@ -108,7 +112,7 @@ async def get_crane(crane_id: uuid.UUID, user: User = Depends(get_current_user),
 
 
 @router.put("/cranes/{crane_id}", response_model=CraneOut)
-async def update_crane(crane_id: uuid.UUID, body: CraneUpdate, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def update_crane(crane_id: uuid.UUID, body: CraneUpdate, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Crane).join(Facility).where(Crane.id == crane_id, Facility.org_id == user.org_id))
     crane = result.scalar_one_or_none()
     if crane is None:
@@ -125,19 +129,20 @@ async def update_crane(crane_id: uuid.UUID, body: CraneUpdate, user: User = Depe
 
 
 @router.delete("/cranes/{crane_id}", status_code=204)
-async def delete_crane(crane_id: uuid.UUID, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def delete_crane(crane_id: uuid.UUID, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Crane).join(Facility).where(Crane.id == crane_id, Facility.org_id == user.org_id))
     crane = result.scalar_one_or_none()
     if crane is None:
         raise HTTPException(status_code=404, detail="Crane not found")
     await db.delete(crane)
     await db.commit()
+    ownership.invalidate_crane(crane_id)
 
 
 # ── Components ──────────────────────────────────────────
 
 @router.get("/components", response_model=list[ComponentOut])
-async def list_components(crane_id: uuid.UUID | None = None, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def list_components(crane_id: uuid.UUID | None = None, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_read_db)):
     query = select(Component).join(Crane).join(Facility).where(Facility.org_id == user.org_id)
     if crane_id:
         query = query.where(Component.crane_id == crane_id)
@@ -146,7 +151,7 @@ async def list_components(crane_id: uuid.UUID | None = None, user: User = Depend
 
 
 @router.post("/components", response_model=ComponentOut, status_code=201)
-async def create_component(body: ComponentCreate, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def create_component(body: ComponentCreate, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Crane).join(Facility).where(Crane.id == body.crane_id, Facility.org_id == user.org_id))
     if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Crane not found")
@@ -158,19 +163,46 @@ async def create_component(body: ComponentCreate, user: User = Depends(get_curre
 
 
 @router.delete("/components/{component_id}", status_code=204)
-async def delete_component(component_id: uuid.UUID, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def delete_component(component_id: uuid.UUID, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Component).join(Crane).join(Facility).where(Component.id == component_id, Facility.org_id == user.org_id))
     component = result.scalar_one_or_none()
     if component is None:
         raise HTTPException(status_code=404, detail="Component not found")
     await db.delete(component)
     await db.commit()
+    ownership.invalidate_component(component_id)
+    fault_frequencies.invalidate(component_id)
+
+
+@router.get("/components/{component_id}/fault-frequencies", response_model=FaultFrequenciesOut)
+async def get_fault_frequencies(
+    component_id: uuid.UUID,
+    rpm: float = Query(gt=0),
+    user: Claims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db),
+):
+    bearings = await fault_frequencies.get(component_id, db)
+    if bearings is None or not await crane_in_org(bearings.crane_id, user.org_id, db):
+        raise HTTPException(status_code=404, detail="Component not found")
+    return FaultFrequenciesOut(
+        component_id=component_id,
+        rpm=rpm,
+        bearings=[
+            BearingFaultFrequencies(
+                bearing_spec_id=spec.id,
+                manufacturer=spec.manufacturer,
+                model=spec.model,
+                **{f"{fault}_hz": float(hz) for fault, hz in zip(FAULT_TYPES, row)},
+            )
+            for spec, row in zip(bearings.specs, bearings.frequencies(rpm))
+        ],
+    )
 
 
 # ── Sensors ─────────────────────────────────────────────
 
 @router.get("/sensors", response_model=list[SensorOut])
-async def list_sensors(component_id: uuid.UUID | None = None, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def list_sensors(component_id: uuid.UUID | None = None, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_read_db)):
     query = select(Sensor).join(Component).join(Crane).join(Facility).where(Facility.org_id == user.org_id)
     if component_id:
         query = query.where(Sensor.component_id == component_id)
@@ -179,7 +211,7 @@ async def list_sensors(component_id: uuid.UUID | None = None, user: User = Depen
 
 
 @router.post("/sensors", response_model=SensorOut, status_code=201)
-async def create_sensor(body: SensorCreate, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def create_sensor(body: SensorCreate, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Component).join(Crane).join(Facility).where(Component.id == body.component_id, Facility.org_id == user.org_id))
     if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Component not found")
@@ -191,7 +223,7 @@ async def create_sensor(body: SensorCreate, user: User = Depends(get_current_use
 
 
 @router.get("/sensors/{sensor_id}", response_model=SensorOut)
-async def get_sensor(sensor_id: uuid.UUID, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def get_sensor(sensor_id: uuid.UUID, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(Sensor).join(Component).join(Crane).join(Facility).where(Sensor.id == sensor_id, Facility.org_id == user.org_id))
     sensor = result.scalar_one_or_none()
     if sensor is None:
@@ -200,7 +232,7 @@ async def get_sensor(sensor_id: uuid.UUID, user: User = Depends(get_current_user
 
 
 @router.put("/sensors/{sensor_id}", response_model=SensorOut)
-async def update_sensor(sensor_id: uuid.UUID, body: SensorUpdate, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def update_sensor(sensor_id: uuid.UUID, body: SensorUpdate, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Sensor).join(Component).join(Crane).join(Facility).where(Sensor.id == sensor_id, Facility.org_id == user.org_id))
     sensor = result.scalar_one_or_none()
     if sensor is None:
@@ -210,29 +242,71 @@ async def update_sensor(sensor_id: uuid.UUID, body: SensorUpdate, user: User = D
     if body.component_id is not None:
         sensor.component_id = body.component_id
     await db.commit()
+    ownership.invalidate_sensor(sensor_id)
     await db.refresh(sensor)
     return sensor
 
 
 @router.delete("/sensors/{sensor_id}", status_code=204)
-async def delete_sensor(sensor_id: uuid.UUID, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def delete_sensor(sensor_id: uuid.UUID, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Sensor).join(Component).join(Crane).join(Facility).where(Sensor.id == sensor_id, Facility.org_id == user.org_id))
     sensor = result.scalar_one_or_none()
     if sensor is None:
         raise HTTPException(status_code=404, detail="Sensor not found")
     await db.delete(sensor)
     await db.commit()
+    ownership.invalidate_sensor(sensor_id)
+    rolling_stats.forget(sensor_id)
 
 
 # ── Bearing Specs ───────────────────────────────────────
 
 @router.post("/bearing-specs", response_model=BearingSpecOut, status_code=201)
-async def create_bearing_spec(body: BearingSpecCreate, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def create_bearing_spec(body: BearingSpecCreate, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Component).join(Crane).join(Facility).where(Component.id == body.component_id, Facility.org_id == user.org_id))
     if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Component not found")
     spec = BearingSpec(**body.model_dump())
+    fill_orders(spec)
     db.add(spec)
     await db.commit()
     await db.refresh(spec)
+    await fault_frequencies.refresh(spec.component_id)
+    return spec
+
+
+async def _get_bearing_spec_or_404(spec_id: uuid.UUID, user: Claims, db: AsyncSession) -> BearingSpec:
+    result = await db.execute(
+        select(BearingSpec).join(Component).join(Crane).join(Facility)
+        .where(BearingSpec.id == spec_id, Facility.org_id == user.org_id)
+    )
+    spec = result.scalar_one_or_none()
+    if spec is None:
+        raise HTTPException(status_code=404, detail="Bearing spec not found")
+    return spec
+
+
+@router.put("/bearing-specs/{spec_id}", response_model=BearingSpecOut)
+async def update_bearing_spec(spec_id: uuid.UUID, body: BearingSpecUpdate, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
+    spec = await _get_bearing_spec_or_404(spec_id, user, db)
+    changes = body.model_dump(exclude_none=True)
+    for field, value in changes.items():
+        setattr(spec, field, value)
+    # New geometry re-derives every order the request didn't set explicitly
+    if any(f in changes for f in GEOMETRY_FIELDS):
+        fill_orders(spec, overwrite=True)
+        for fault in FAULT_TYPES:
+            if fault in changes:
+                setattr(spec, fault, changes[fault])
+    await db.commit()
+    await db.refresh(spec)
+    await fault_frequencies.refresh(spec.component_id)
     return spec
+
+
+@router.delete("/bearing-specs/{spec_id}", status_code=204)
+async def delete_bearing_spec(spec_id: uuid.UUID, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_db)):
+    spec = await _get_bearing_spec_or_404(spec_id, user, db)
+    await db.delete(spec)
+    await db.commit()
+    await fault_frequencies.refresh(spec.component_id)
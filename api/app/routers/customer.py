@@ -4,13 +4,12 @@ import uuid
 from datetime import datetime, date, timezone
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, func, case as sa_case
+from sqlalchemy import Uuid, column, select, func, true, values, case as sa_case
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth import get_current_user
-from app.db import get_db
-from app.models.user import User
+from app.auth import Claims, get_current_claims
+from app.db import COLD_CACHE_STATEMENTS, get_db, get_read_db, query_budget
 from app.models.facility import Facility
 from app.models.crane import Crane
 from app.models.component import Component
@@ -20,7 +19,9 @@ from app.models.crane_health_override import CraneHealthOverride
 from app.models.pm_schedule import PMSchedule
 from app.models.log_entry import LogEntry
 from app.models.service_call import ServiceCall
-from app.services.health import sensor_health, crane_health
+from app.services.health import HEALTH_COLUMNS, classify_batch, crane_health, labels, reading_columns
+from app.services.ownership import crane_in_org
+from app.services.sharding import bind_tenant
 from app.schemas.customer import (
     FleetResponse, CraneFleetItem, CraneDetailResponse,
     SensorSummary, HealthOverrideIn, HealthOverrideOut,
@@ -34,26 +35,43 @@ router = APIRouter(prefix="/api/v1/cranes", tags=["customer"])
 
 # ── Helpers ──
 
-async def _get_crane_or_404(crane_id: uuid.UUID, user: User, db: AsyncSession) -> Crane:
-    result = await db.execute(
-        select(Crane)
-        .join(Facility)
-        .where(Crane.id == crane_id, Facility.org_id == user.org_id)
-    )
-    crane = result.scalar_one_or_none()
+async def _check_crane_access(crane_id: uuid.UUID, user: Claims, db: AsyncSession) -> None:
+    if not await crane_in_org(crane_id, user.org_id, db):
+        raise HTTPException(status_code=404, detail="Crane not found")
+
+
+async def _get_crane_or_404(crane_id: uuid.UUID, user: Claims, db: AsyncSession) -> Crane:
+    await _check_crane_access(crane_id, user, db)
+    crane = await db.get(Crane, crane_id)
     if crane is None:
         raise HTTPException(status_code=404, detail="Crane not found")
     return crane
 
 
-async def _latest_reading_for_sensor(sensor_id: uuid.UUID, db: AsyncSession) -> Reading | None:
-    result = await db.execute(
-        select(Reading)
-        .where(Reading.sensor_id == str(sensor_id))
+async def _sensor_health(sensors: list[Sensor], db: AsyncSession) -> list[tuple[str, datetime | None]]:
+    """(health, last_reading_at) per sensor: one latest-reading query, one batch classification.
+
+    The latest reading is a LATERAL top-1 per sensor id, so each sensor costs one probe of
+    the (sensor_id, timestamp) index however much history it has.
+    """
+    if not sensors:
+        return []
+    ids = values(column("id", Uuid), name="sensor_ids").data([(s.id,) for s in sensors])
+    latest = (
+        select(Reading.sensor_id, Reading.timestamp, *[getattr(Reading, c) for c in HEALTH_COLUMNS])
+        .where(Reading.sensor_id == ids.c.id)
         .order_by(Reading.timestamp.desc())
         .limit(1)
+        .lateral("latest")
     )
-    return result.scalar_one_or_none()
+    result = await db.execute(
+        select(latest).select_from(ids).join(latest, true()), bind_arguments={"mapper": Reading},
+    )
+    latest = {row.sensor_id: row for row in result.all()}
+    readings = [latest.get(s.id) for s in sensors]
+    timestamps, columns = reading_columns(readings)
+    codes = classify_batch([s.sensor_type for s in sensors], timestamps, columns)
+    return list(zip(labels(codes), [r.timestamp if r is not None else None for r in readings]))
 
 
 async def _sensors_for_crane(crane_id: uuid.UUID, org_id: uuid.UUID, db: AsyncSession) -> list[Sensor]:
@@ -67,14 +85,6 @@ async def _sensors_for_crane(crane_id: uuid.UUID, org_id: uuid.UUID, db: AsyncSe
     return list(result.scalars().all())
 
 
-async def _next_pm_due(crane_id: uuid.UUID, db: AsyncSession) -> date | None:
-    result = await db.execute(
-        select(func.min(PMSchedule.due_date))
-        .where(PMSchedule.crane_id == crane_id, PMSchedule.status == "pending")
-    )
-    return result.scalar_one_or_none()
-
-
 async def _override_for_crane(crane_id: uuid.UUID, db: AsyncSession) -> CraneHealthOverride | None:
     result = await db.execute(
         select(CraneHealthOverride).where(CraneHealthOverride.crane_id == crane_id)
@@ -84,8 +94,11 @@ async def _override_for_crane(crane_id: uuid.UUID, db: AsyncSession) -> CraneHea
 
 # ── Fleet ──
 
-@router.get("/fleet", response_model=FleetResponse)
-async def get_fleet(user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+# Cranes, overrides, next PMs, sensors, latest readings
+@router.get("/fleet", response_model=FleetResponse, dependencies=[Depends(query_budget(5 + COLD_CACHE_STATEMENTS))])
+async def get_fleet(user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_read_db)):
+    await bind_tenant(db, user.org_id)
+
     # Get all cranes for user's org with facility info
     result = await db.execute(
         select(Crane, Facility.name.label("facility_name"))
@@ -94,21 +107,40 @@ async def get_fleet(user: User = Depends(get_current_user), db: AsyncSession = D
         .order_by(Facility.name, Crane.name)
     )
     rows = result.all()
+    crane_ids = [crane.id for crane, _ in rows]
+
+    # Overrides and next pending PM for every crane, one query each
+    override_result = await db.execute(
+        select(CraneHealthOverride).where(CraneHealthOverride.crane_id.in_(crane_ids))
+    )
+    overrides = {o.crane_id: o for o in override_result.scalars().all()}
+    pm_result = await db.execute(
+        select(PMSchedule.crane_id, func.min(PMSchedule.due_date))
+        .where(PMSchedule.crane_id.in_(crane_ids), PMSchedule.status == "pending")
+        .group_by(PMSchedule.crane_id)
+    )
+    next_pm_due = dict(pm_result.all())
+
+    # Every sensor in the org, scored in one batch
+    sensor_result = await db.execute(
+        select(Sensor, Component.crane_id)
+        .join(Component)
+        .join(Crane)
+        .join(Facility)
+        .where(Facility.org_id == user.org_id)
+    )
+    sensor_rows = sensor_result.all()
+    scored = await _sensor_health([s for s, _ in sensor_rows], db)
+    by_crane: dict[uuid.UUID, list[tuple[str, datetime | None]]] = {}
+    for (_, crane_id), score in zip(sensor_rows, scored):
+        by_crane.setdefault(crane_id, []).append(score)
 
     items = []
     for crane, facility_name in rows:
-        sensors = await _sensors_for_crane(crane.id, user.org_id, db)
-        override = await _override_for_crane(crane.id, db)
-        next_pm = await _next_pm_due(crane.id, db)
-
-        sensor_statuses = []
-        last_reading_at = None
-        for s in sensors:
-            reading = await _latest_reading_for_sensor(s.id, db)
-            status = sensor_health(s.sensor_type, reading)
-            sensor_statuses.append(status)
-            if reading and (last_reading_at is None or reading.timestamp > last_reading_at):
-                last_reading_at = reading.timestamp
+        override = overrides.get(crane.id)
+        crane_scores = by_crane.get(crane.id, [])
+        sensor_statuses = [status for status, _ in crane_scores]
+        last_reading_at = max((ts for _, ts in crane_scores if ts is not None), default=None)
 
         health = crane_health(sensor_statuses, override.status if override else None)
 
@@ -123,9 +155,9 @@ async def get_fleet(user: User = Depends(get_current_user), db: AsyncSession = D
             health_override=HealthOverrideOut(
                 status=override.status, note=override.note, updated_at=override.updated_at
             ) if override else None,
-            sensor_count=len(sensors),
+            sensor_count=len(crane_scores),
             last_reading_at=last_reading_at,
-            next_pm_due=next_pm,
+            next_pm_due=next_pm_due.get(crane.id),
         ))
 
     return FleetResponse(cranes=items)
@@ -133,9 +165,14 @@ async def get_fleet(user: User = Depends(get_current_user), db: AsyncSession = D
 
 # ── Crane Detail ──
 
-@router.get("/{crane_id}/detail", response_model=CraneDetailResponse)
-async def get_crane_detail(crane_id: uuid.UUID, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+# Ownership (cached), crane, facility, sensors, override, latest readings, PMs, log, service calls
+@router.get(
+    "/{crane_id}/detail", response_model=CraneDetailResponse,
+    dependencies=[Depends(query_budget(9 + COLD_CACHE_STATEMENTS))],
+)
+async def get_crane_detail(crane_id: uuid.UUID, user: Claims = Depends(get_current_claims), db: AsyncSession = Depends(get_read_db)):
     crane = await _get_crane_or_404(crane_id, user, db)
+    await bind_tenant(db, user.org_id)
 
     # Facility name
     fac_result = await db.execute(select(Facility.name).where(Facility.id == crane.facility_id))
@@ -146,16 +183,14 @@ async def get_crane_detail(crane_id: uuid.UUID, user: User = Depends(get_current
 
     sensor_summaries = []
     sensor_statuses = []
-    for s in sensors:
-        reading = await _latest_reading_for_sensor(s.id, db)
-        status = sensor_health(s.sensor_type, reading)
+    for s, (status, last_reading_at) in zip(sensors, await _sensor_health(sensors, db)):
         sensor_statuses.append(status)
         sensor_summaries.append(SensorSummary(
             id=s.id,
             label=s.label,
             sensor_type=s.sensor_type,
             health=status,
-            last_reading_at=reading.timestamp if reading else None,
+            last_reading_at=last_reading_at,
         ))
 
     health = crane_health(sensor_statuses, override.status if override else None)
@@ -241,10 +276,10 @@ async def get_crane_detail(crane_id: uuid.UUID, user: User = Depends(get_current
 async def set_health_override(
     crane_id: uuid.UUID,
     body: HealthOverrideIn,
-    user: User = Depends(get_current_user),
+    user: Claims = Depends(get_current_claims),
     db: AsyncSession = Depends(get_db),
 ):
-    await _get_crane_or_404(crane_id, user, db)
+    await _check_crane_access(crane_id, user, db)
 
     if body.status not in ("good", "fair", "needs_attention"):
         raise HTTPException(status_code=422, detail="Status must be good, fair, or needs_attention")
@@ -274,10 +309,10 @@ async def set_health_override(
 @router.delete("/{crane_id}/health-override", status_code=204)
 async def delete_health_override(
     crane_id: uuid.UUID,
-    user: User = Depends(get_current_user),
+    user: Claims = Depends(get_current_claims),
     db: AsyncSession = Depends(get_db),
 ):
-    await _get_crane_or_404(crane_id, user, db)
+    await _check_crane_access(crane_id, user, db)
     override = await _override_for_crane(crane_id, db)
     if override:
         await db.delete(override)
@@ -289,10 +324,10 @@ async def delete_health_override(
 @router.get("/{crane_id}/pm-schedules", response_model=list[PMScheduleOut])
 async def list_pm_schedules(
     crane_id: uuid.UUID,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    user: Claims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    await _get_crane_or_404(crane_id, user, db)
+    await _check_crane_access(crane_id, user, db)
     result = await db.execute(
         select(PMSchedule)
         .where(PMSchedule.crane_id == crane_id)
@@ -320,10 +355,10 @@ async def list_pm_schedules(
 async def create_pm_schedule(
     crane_id: uuid.UUID,
     body: PMScheduleCreate,
-    user: User = Depends(get_current_user),
+    user: Claims = Depends(get_current_claims),
     db: AsyncSession = Depends(get_db),
 ):
-    await _get_crane_or_404(crane_id, user, db)
+    await _check_crane_access(crane_id, user, db)
     pm = PMSchedule(
         crane_id=crane_id,
         title=body.title,
@@ -355,10 +390,10 @@ async def update_pm_schedule(
     crane_id: uuid.UUID,
     pm_id: uuid.UUID,
     body: PMScheduleUpdate,
-    user: User = Depends(get_current_user),
+    user: Claims = Depends(get_current_claims),
     db: AsyncSession = Depends(get_db),
 ):
-    await _get_crane_or_404(crane_id, user, db)
+    await _check_crane_access(crane_id, user, db)
     result = await db.execute(
         select(PMSchedule).where(PMSchedule.id == pm_id, PMSchedule.crane_id == crane_id)
     )
@@ -402,10 +437,10 @@ async def update_pm_schedule(
 async def delete_pm_schedule(
     crane_id: uuid.UUID,
     pm_id: uuid.UUID,
-    user: User = Depends(get_current_user),
+    user: Claims = Depends(get_current_claims),
     db: AsyncSession = Depends(get_db),
 ):
-    await _get_crane_or_404(crane_id, user, db)
+    await _check_crane_access(crane_id, user, db)
     result = await db.execute(
         select(PMSchedule).where(PMSchedule.id == pm_id, PMSchedule.crane_id == crane_id)
     )
@@ -421,10 +456,10 @@ async def delete_pm_schedule(
 @router.get("/{crane_id}/log-entries", response_model=list[LogEntryOut])
 async def list_log_entries(
     crane_id: uuid.UUID,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    user: Claims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    await _get_crane_or_404(crane_id, user, db)
+    await _check_crane_access(crane_id, user, db)
     result = await db.execute(
         select(LogEntry)
         .where(LogEntry.crane_id == crane_id)
@@ -443,10 +478,10 @@ async def list_log_entries(
 async def create_log_entry(
     crane_id: uuid.UUID,
     body: LogEntryCreate,
-    user: User = Depends(get_current_user),
+    user: Claims = Depends(get_current_claims),
     db: AsyncSession = Depends(get_db),
 ):
-    await _get_crane_or_404(crane_id, user, db)
+    await _check_crane_access(crane_id, user, db)
     le = LogEntry(
         crane_id=crane_id,
         title=body.title,
@@ -467,10 +502,10 @@ async def update_log_entry(
     crane_id: uuid.UUID,
     entry_id: uuid.UUID,
     body: LogEntryUpdate,
-    user: User = Depends(get_current_user),
+    user: Claims = Depends(get_current_claims),
     db: AsyncSession = Depends(get_db),
 ):
-    await _get_crane_or_404(crane_id, user, db)
+    await _check_crane_access(crane_id, user, db)
     result = await db.execute(
         select(LogEntry).where(LogEntry.id == entry_id, LogEntry.crane_id == crane_id)
     )
@@ -495,10 +530,10 @@ async def update_log_entry(
 async def delete_log_entry(
     crane_id: uuid.UUID,
     entry_id: uuid.UUID,
-    user: User = Depends(get_current_user),
+    user: Claims = Depends(get_current_claims),
     db: AsyncSession = Depends(get_db),
 ):
-    await _get_crane_or_404(crane_id, user, db)
+    await _check_crane_access(crane_id, user, db)
     result = await db.execute(
         select(LogEntry).where(LogEntry.id == entry_id, LogEntry.crane_id == crane_id)
     )
@@ -514,10 +549,10 @@ async def delete_log_entry(
 @router.get("/{crane_id}/service-calls", response_model=list[ServiceCallOut])
 async def list_service_calls(
     crane_id: uuid.UUID,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    user: Claims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    await _get_crane_or_404(crane_id, user, db)
+    await _check_crane_access(crane_id, user, db)
     result = await db.execute(
         select(ServiceCall)
         .where(ServiceCall.crane_id == crane_id)
@@ -541,10 +576,10 @@ async def list_service_calls(
 async def create_service_call(
     crane_id: uuid.UUID,
     body: ServiceCallCreate,
-    user: User = Depends(get_current_user),
+    user: Claims = Depends(get_current_claims),
     db: AsyncSession = Depends(get_db),
 ):
-    await _get_crane_or_404(crane_id, user, db)
+    await _check_crane_access(crane_id, user, db)
     sc = ServiceCall(
         crane_id=crane_id,
         title=body.title,
@@ -570,10 +605,10 @@ async def update_service_call(
     crane_id: uuid.UUID,
     call_id: uuid.UUID,
     body: ServiceCallUpdate,
-    user: User = Depends(get_current_user),
+    user: Claims = Depends(get_current_claims),
     db: AsyncSession = Depends(get_db),
 ):
-    await _get_crane_or_404(crane_id, user, db)
+    await _check_crane_access(crane_id, user, db)
     result = await db.execute(
         select(ServiceCall).where(ServiceCall.id == call_id, ServiceCall.crane_id == crane_id)
     )
@@ -610,10 +645,10 @@ async def update_service_call(
 async def delete_service_call(
     crane_id: uuid.UUID,
     call_id: uuid.UUID,
-    user: User = Depends(get_current_user),
+    user: Claims = Depends(get_current_claims),
     db: AsyncSession = Depends(get_db),
 ):
-    await _get_crane_or_404(crane_id, user, db)
+    await _check_crane_access(crane_id, user, db)
     result = await db.execute(
         select(ServiceCall).where(ServiceCall.id == call_id, ServiceCall.crane_id == crane_id)
     )
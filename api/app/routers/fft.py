@@ -0,0 +1,264 @@
+"""FFT capture views built from stored spectra."""
+
+import base64
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import Claims, get_current_claims
+from app.db import get_db, get_read_db
+from app.models.fft_capture import FFTCapture
+from app.models.spectrum_baseline import SpectrumBaseline
+from app.schemas.fft import (
+    BaselineIn, BaselineOut, BaselineScoreOut, FFTCaptureOut, FFTSearchHit, SpectrumOut, WaterfallOut,
+)
+from app.services.baselines import Reference, band_centers_hz, score_capture, set_baseline
+from app.services.fft_search import SEARCH_METRICS, SearchQuery, search_features
+from app.services.ownership import crane_in_org, sensor_in_org
+from app.services.sharding import bind_tenant
+from app.services.spectrum_pyramid import spectrum_pyramids
+from app.services.waterfall import build_waterfall, encode
+
+router = APIRouter(prefix="/api/v1", tags=["fft"])
+
+DEFAULT_WATERFALL_SPAN = timedelta(days=7)
+DEFAULT_BASELINE_SPAN = timedelta(days=14)
+DEFAULT_SEARCH_SPAN = timedelta(days=30)
+# Metadata of a binary waterfall; browsers only let clients read them if CORS exposes them
+WATERFALL_HEADERS = (
+    "X-Waterfall-Shape", "X-Waterfall-Time", "X-Waterfall-Frequency",
+    "X-Waterfall-Encoding", "X-Waterfall-Amplitude", "X-Waterfall-Captures",
+)
+
+
+# ── Helpers ──
+
+def _utc(ts: datetime) -> datetime:
+    return ts if ts.tzinfo is not None else ts.replace(tzinfo=timezone.utc)
+
+
+async def _check_sensor(sensor_id: uuid.UUID, user: Claims, db: AsyncSession) -> None:
+    if not await sensor_in_org(sensor_id, user.org_id, db):
+        raise HTTPException(status_code=404, detail="Sensor not found")
+    await bind_tenant(db, user.org_id)
+
+
+# ── Captures ──
+
+@router.get("/sensors/{sensor_id}/fft/captures", response_model=list[FFTCaptureOut])
+async def list_captures(
+    sensor_id: uuid.UUID,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    axis: Literal["x", "y", "z"] | None = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    user: Claims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Capture metadata, newest first; spectra are fetched per capture."""
+    await _check_sensor(sensor_id, user, db)
+    query = select(FFTCapture.id, FFTCapture.timestamp, FFTCapture.axis, FFTCapture.odr, FFTCapture.num_bins).where(
+        FFTCapture.sensor_id == sensor_id
+    )
+    if start:
+        query = query.where(FFTCapture.timestamp >= start)
+    if end:
+        query = query.where(FFTCapture.timestamp < end)
+    if axis:
+        query = query.where(FFTCapture.axis == axis)
+    result = await db.execute(query.order_by(FFTCapture.timestamp.desc()).limit(limit))
+    return [FFTCaptureOut.model_validate(row) for row in result.all()]
+
+
+@router.get("/sensors/{sensor_id}/fft/captures/{capture_id}/spectrum", response_model=SpectrumOut)
+async def get_spectrum(
+    sensor_id: uuid.UUID,
+    capture_id: int,
+    f_min: float = Query(default=0.0, ge=0),
+    f_max: float | None = Query(default=None, gt=0),
+    width: int = Query(default=1024, ge=1, le=8192),
+    user: Claims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """The capture's [f_min, f_max] band at the coarsest resolution that still fills `width` pixels."""
+    await _check_sensor(sensor_id, user, db)
+    pyramid = await spectrum_pyramids.get(capture_id, db)
+    if pyramid is None or pyramid.sensor_id != sensor_id:
+        raise HTTPException(status_code=404, detail="Capture not found")
+
+    f_max = min(f_max or pyramid.nyquist, pyramid.nyquist)
+    if f_max <= f_min:
+        raise HTTPException(status_code=422, detail="f_max must be above f_min and below Nyquist")
+    band = pyramid.slice(f_min, f_max, width)
+    return SpectrumOut(
+        capture_id=capture_id,
+        sensor_id=sensor_id,
+        timestamp=pyramid.timestamp,
+        axis=pyramid.axis,
+        level=band.level,
+        f_start=band.f_start,
+        bin_width=band.bin_width,
+        amplitudes=band.amplitudes.tolist(),
+    )
+
+
+# ── Fleet search ──
+
+@router.get("/fft/search", response_model=list[FFTSearchHit])
+async def search_fft(
+    metric: Literal[SEARCH_METRICS] = "amp_1x",
+    min_value: float | None = Query(default=None, ge=0),
+    frequency_hz: float | None = Query(default=None, gt=0),
+    order: float | None = Query(default=None, gt=0),
+    tolerance: float = Query(default=0.02, gt=0, le=0.5),
+    start: datetime | None = None,
+    end: datetime | None = None,
+    axis: Literal["x", "y", "z"] | None = None,
+    crane_id: uuid.UUID | None = None,
+    component_type: str | None = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    user: Claims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Captures across the org ranked by a feature, e.g. metric=peak&order=2&min_value=0.5 for 2× running-speed peaks."""
+    end = _utc(end) if end else datetime.now(timezone.utc)
+    start = _utc(start) if start else end - DEFAULT_SEARCH_SPAN
+    if start >= end:
+        raise HTTPException(status_code=422, detail="start must be before end")
+    if metric == "peak" and (frequency_hz is None) == (order is None):
+        raise HTTPException(status_code=422, detail="A peak search needs exactly one of frequency_hz or order")
+    if crane_id is not None and not await crane_in_org(crane_id, user.org_id, db):
+        raise HTTPException(status_code=404, detail="Crane not found")
+    await bind_tenant(db, user.org_id)
+    query = SearchQuery(
+        metric=metric, start=start, end=end, min_value=min_value,
+        frequency_hz=frequency_hz, order=order, tolerance=tolerance,
+        axis=axis, crane_id=crane_id, component_type=component_type, limit=limit,
+    )
+    return [FFTSearchHit(**hit) for hit in await search_features(user.org_id, query, db)]
+
+
+# ── Baselines ──
+
+def _baseline_out(sensor_id: uuid.UUID, axis: str, reference: Reference, updated_at: datetime) -> BaselineOut:
+    learned = reference.captures > 0 and reference.odr is not None
+    return BaselineOut(
+        sensor_id=sensor_id,
+        axis=axis,
+        window_start=reference.window_start,
+        window_end=reference.window_end,
+        odr=reference.odr,
+        num_bins=reference.num_bins,
+        captures=reference.captures,
+        ready=reference.ready,
+        updated_at=updated_at,
+        band_centers_hz=band_centers_hz(reference.odr, reference.num_bins).tolist() if learned else [],
+        median=reference.median.tolist() if learned else [],
+        envelope=reference.envelope.tolist() if learned else [],
+    )
+
+
+@router.put("/sensors/{sensor_id}/fft/baselines/{axis}", response_model=BaselineOut)
+async def put_baseline(
+    sensor_id: uuid.UUID,
+    axis: Literal["x", "y", "z"],
+    body: BaselineIn,
+    user: Claims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_db),
+):
+    """Learn the axis baseline from captures in [start, end); later captures in the window are added as they arrive."""
+    start = _utc(body.start)
+    end = _utc(body.end) if body.end else start + DEFAULT_BASELINE_SPAN
+    if start >= end:
+        raise HTTPException(status_code=422, detail="start must be before end")
+    await _check_sensor(sensor_id, user, db)
+    row = await set_baseline(sensor_id, axis, start, end, db)
+    return _baseline_out(sensor_id, axis, Reference.from_row(row), row.updated_at)
+
+
+@router.get("/sensors/{sensor_id}/fft/baselines/{axis}", response_model=BaselineOut)
+async def get_baseline(
+    sensor_id: uuid.UUID,
+    axis: Literal["x", "y", "z"],
+    user: Claims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db),
+):
+    await _check_sensor(sensor_id, user, db)
+    row = await db.get(SpectrumBaseline, (sensor_id, axis))
+    if row is None:
+        raise HTTPException(status_code=404, detail="No baseline for this axis")
+    return _baseline_out(sensor_id, axis, Reference.from_row(row), row.updated_at)
+
+
+@router.get("/sensors/{sensor_id}/fft/captures/{capture_id}/baseline-score", response_model=BaselineScoreOut)
+async def get_baseline_score(
+    sensor_id: uuid.UUID,
+    capture_id: int,
+    user: Claims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_db),
+):
+    """The capture compared against its axis baseline, scored on first request if the pipeline hasn't."""
+    await _check_sensor(sensor_id, user, db)
+    score = await score_capture(sensor_id, capture_id, db)
+    if score is None:
+        raise HTTPException(status_code=404, detail="No baseline score for this capture")
+    return score
+
+
+# ── Waterfall ──
+
+@router.get("/sensors/{sensor_id}/fft/waterfall", response_model=WaterfallOut)
+async def fft_waterfall(
+    sensor_id: uuid.UUID,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    axis: Literal["x", "y", "z"] | None = None,
+    f_min: float = Query(default=0.0, ge=0),
+    f_max: float | None = Query(default=None, gt=0),
+    width: int = Query(default=512, ge=1, le=4096),
+    height: int = Query(default=256, ge=1, le=2048),
+    encoding: Literal["float32", "uint8"] = "float32",
+    format: Literal["json", "binary"] = "json",
+    user: Claims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Max-pooled amplitude matrix of every capture in [start, end) between f_min and f_max."""
+    end = _utc(end) if end else datetime.now(timezone.utc)
+    start = _utc(start) if start else end - DEFAULT_WATERFALL_SPAN
+    if start >= end:
+        raise HTTPException(status_code=422, detail="start must be before end")
+    if f_max is not None and f_max <= f_min:
+        raise HTTPException(status_code=422, detail="f_max must be above f_min")
+    await _check_sensor(sensor_id, user, db)
+
+    waterfall = await build_waterfall(sensor_id, start, end, axis, f_min, f_max, width, height, db)
+    data, lo, hi = encode(waterfall.matrix, encoding)
+
+    if format == "binary":
+        return Response(content=data, media_type="application/octet-stream", headers={
+            "X-Waterfall-Shape": f"{height},{width}",
+            "X-Waterfall-Time": f"{start.isoformat()},{end.isoformat()}",
+            "X-Waterfall-Frequency": f"{waterfall.f_min},{waterfall.f_max}",
+            "X-Waterfall-Encoding": encoding,
+            "X-Waterfall-Amplitude": f"{lo},{hi}" if lo is not None else "",
+            "X-Waterfall-Captures": str(waterfall.captures),
+        })
+    return WaterfallOut(
+        sensor_id=sensor_id,
+        start=start,
+        end=end,
+        axis=axis,
+        f_min=waterfall.f_min,
+        f_max=waterfall.f_max,
+        width=width,
+        height=height,
+        captures=waterfall.captures,
+        encoding=encoding,
+        amplitude_min=lo,
+        amplitude_max=hi,
+        data=base64.b64encode(data).decode("ascii"),
+    )
@@ -12,6 +12,14 @@ from app.models.sensor import Sensor
 from app.models.reading import Reading
 from app.models.fft_capture import FFTCapture
 from app.schemas.ingest import SensorReading, IngestResponse
+from app.services import tracing
+from app.services.alert_engine import alert_engine
+from app.services.anomaly import score_readings
+from app.services.fft_features import fft_pipeline
+from app.services.operating_hours import submit_reading
+from app.services.ownership import ownership
+from app.services.rolling_stats import rolling_stats
+from app.services.sharding import bind_tenant
 from app.websocket import manager
 
 router = APIRouter(prefix="/api/v1", tags=["ingest"])
@@ -24,23 +32,28 @@ async def ingest(
     db: AsyncSession = Depends(get_db),
 ):
     # Look up sensor by MAC address
-    result = await db.execute(select(Sensor).where(Sensor.mac_address == body.addr))
-    sensor = result.scalar_one_or_none()
-    if sensor is None:
-        raise HTTPException(status_code=404, detail=f"Sensor with addr {body.addr} not registered")
+    with tracing.span("ingest.lookup"):
+        result = await db.execute(select(Sensor).where(Sensor.mac_address == body.addr))
+        sensor = result.scalar_one_or_none()
+        if sensor is None:
+            raise HTTPException(status_code=404, detail=f"Sensor with addr {body.addr} not registered")
+        owner = await ownership.sensor(sensor.id, db)
+        org_id = owner.org_id
+        await bind_tenant(db, org_id)
 
     # Check for duplicate (same sensor + counter within last 10 minutes)
-    if body.counter is not None:
-        recent_cutoff = datetime.now(timezone.utc) - timedelta(minutes=10)
-        dup = await db.execute(
-            select(Reading.id).where(
-                Reading.sensor_id == sensor.id,
-                Reading.counter == body.counter,
-                Reading.timestamp >= recent_cutoff,
+    with tracing.span("ingest.dedup"):
+        if body.counter is not None:
+            recent_cutoff = datetime.now(timezone.utc) - timedelta(minutes=10)
+            dup = await db.execute(
+                select(Reading.id).where(
+                    Reading.sensor_id == sensor.id,
+                    Reading.counter == body.counter,
+                    Reading.timestamp >= recent_cutoff,
+                )
             )
-        )
-        if dup.scalar_one_or_none() is not None:
-            raise HTTPException(status_code=409, detail="Duplicate reading")
+            if dup.scalar_one_or_none() is not None:
+                raise HTTPException(status_code=409, detail="Duplicate reading")
 
     # Extract fields from nested sensor_data if present
     sd = body.sensor_data or {}
@@ -54,79 +67,91 @@ async def ingest(
     temperature = body.temperature or sd.get("temperature")
 
     # Store summary reading
-    reading = Reading(
-        sensor_id=sensor.id,
-        counter=body.counter,
-        firmware=body.firmware,
-        battery_percent=body.battery_percent,
-        odr=body.odr,
-        temperature=temperature,
-        x_rms_ACC_G=body.x_rms_ACC_G,
-        x_max_ACC_G=body.x_max_ACC_G,
-        x_velocity_mm_sec=body.x_velocity_mm_sec,
-        x_displacement_mm=body.x_displacement_mm,
-        x_peak_one_Hz=body.x_peak_one_Hz,
-        x_peak_two_Hz=body.x_peak_two_Hz,
-        x_peak_three_Hz=body.x_peak_three_Hz,
-        y_rms_ACC_G=body.y_rms_ACC_G,
-        y_max_ACC_G=body.y_max_ACC_G,
-        y_velocity_mm_sec=body.y_velocity_mm_sec,
-        y_displacement_mm=body.y_displacement_mm,
-        y_peak_one_Hz=body.y_peak_one_Hz,
-        y_peak_two_Hz=body.y_peak_two_Hz,
-        y_peak_three_Hz=body.y_peak_three_Hz,
-        z_rms_ACC_G=body.z_rms_ACC_G,
-        z_max_ACC_G=body.z_max_ACC_G,
-        z_velocity_mm_sec=body.z_velocity_mm_sec,
-        z_displacement_mm=body.z_displacement_mm,
-        z_peak_one_Hz=body.z_peak_one_Hz,
-        z_peak_two_Hz=body.z_peak_two_Hz,
-        z_peak_three_Hz=body.z_peak_three_Hz,
-        rpm=body.rpm,
-        rssi=body.rssi,
-        mA1=mA1,
-        mA2=mA2,
-        roll=roll,
-        pitch=pitch,
-        channel_1=channel_1,
-        channel_2=channel_2,
-        channel_3=channel_3,
-    )
-    db.add(reading)
-    await db.flush()
-
-    # Store FFT if present
-    if body.fft is not None:
-        spectrum_bytes = struct.pack(f"{len(body.fft.data)}f", *body.fft.data)
-        fft = FFTCapture(
+    with tracing.span("ingest.write"):
+        reading = Reading(
             sensor_id=sensor.id,
-            axis=body.fft.axis,
-            odr=body.fft.odr,
-            num_bins=body.fft.num_bins,
-            spectrum_data=spectrum_bytes,
+            counter=body.counter,
+            firmware=body.firmware,
+            battery_percent=body.battery_percent,
+            odr=body.odr,
+            temperature=temperature,
+            x_rms_ACC_G=body.x_rms_ACC_G,
+            x_max_ACC_G=body.x_max_ACC_G,
+            x_velocity_mm_sec=body.x_velocity_mm_sec,
+            x_displacement_mm=body.x_displacement_mm,
+            x_peak_one_Hz=body.x_peak_one_Hz,
+            x_peak_two_Hz=body.x_peak_two_Hz,
+            x_peak_three_Hz=body.x_peak_three_Hz,
+            y_rms_ACC_G=body.y_rms_ACC_G,
+            y_max_ACC_G=body.y_max_ACC_G,
+            y_velocity_mm_sec=body.y_velocity_mm_sec,
+            y_displacement_mm=body.y_displacement_mm,
+            y_peak_one_Hz=body.y_peak_one_Hz,
+            y_peak_two_Hz=body.y_peak_two_Hz,
+            y_peak_three_Hz=body.y_peak_three_Hz,
+            z_rms_ACC_G=body.z_rms_ACC_G,
+            z_max_ACC_G=body.z_max_ACC_G,
+            z_velocity_mm_sec=body.z_velocity_mm_sec,
+            z_displacement_mm=body.z_displacement_mm,
+            z_peak_one_Hz=body.z_peak_one_Hz,
+            z_peak_two_Hz=body.z_peak_two_Hz,
+            z_peak_three_Hz=body.z_peak_three_Hz,
+            rpm=body.rpm,
+            rssi=body.rssi,
+            mA1=mA1,
+            mA2=mA2,
+            roll=roll,
+            pitch=pitch,
+            channel_1=channel_1,
+            channel_2=channel_2,
+            channel_3=channel_3,
         )
-        db.add(fft)
+        await score_readings([reading], db)
+        db.add(reading)
+        await db.flush()
 
-    await db.commit()
-    await db.refresh(reading)
+        # Store FFT if present
+        fft = None
+        if body.fft is not None:
+            spectrum_bytes = struct.pack(f"{len(body.fft.data)}f", *body.fft.data)
+            fft = FFTCapture(
+                sensor_id=sensor.id,
+                axis=body.fft.axis,
+                odr=body.fft.odr,
+                num_bins=body.fft.num_bins,
+                spectrum_data=spectrum_bytes,
+            )
+            db.add(fft)
+
+    with tracing.span("ingest.commit"):
+        await db.commit()
+        await db.refresh(reading)
+        if fft is not None:
+            fft_pipeline.submit((fft.id, db.info.get("shard")))
 
     # Broadcast via WebSocket
-    await manager.broadcast({
-        "event": "sensor.reading",
-        "sensor_id": str(sensor.id),
-        "reading_id": reading.id,
-        "temperature": temperature,
-        "x_velocity_mm_sec": body.x_velocity_mm_sec,
-        "y_velocity_mm_sec": body.y_velocity_mm_sec,
-        "z_velocity_mm_sec": body.z_velocity_mm_sec,
-        "battery_percent": body.battery_percent,
-        "mA1": mA1,
-        "mA2": mA2,
-        "roll": roll,
-        "pitch": pitch,
-        "channel_1": channel_1,
-        "channel_2": channel_2,
-        "channel_3": channel_3,
-    })
+    with tracing.span("ingest.broadcast", **{"websocket.connections": len(manager.active_connections)}):
+        await manager.broadcast({
+            "event": "sensor.reading",
+            "sensor_id": str(sensor.id),
+            "reading_id": reading.id,
+            "temperature": temperature,
+            "x_velocity_mm_sec": body.x_velocity_mm_sec,
+            "y_velocity_mm_sec": body.y_velocity_mm_sec,
+            "z_velocity_mm_sec": body.z_velocity_mm_sec,
+            "battery_percent": body.battery_percent,
+            "mA1": mA1,
+            "mA2": mA2,
+            "roll": roll,
+            "pitch": pitch,
+            "channel_1": channel_1,
+            "channel_2": channel_2,
+            "channel_3": channel_3,
+        })
+
+    with tracing.span("ingest.evaluate"):
+        rolling_stats.add(reading)
+        await submit_reading(reading, owner.crane_id, db.info.get("shard"))
+        await alert_engine.evaluate(org_id, [reading], db)
 
     return IngestResponse(status="ok", reading_id=reading.id)
@@ -5,35 +5,32 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth import get_current_user
-from app.db import get_db
-from app.models.user import User
+from app.auth import Claims, get_current_claims
+from app.db import COLD_CACHE_STATEMENTS, get_read_db, query_budget
 from app.models.reading import Reading
-from app.models.sensor import Sensor
-from app.models.component import Component
-from app.models.crane import Crane
-from app.models.facility import Facility
-from app.schemas.readings import ReadingOut
+from app.schemas.readings import ReadingOut, TrendOut, WindowStatsOut
+from app.services.ownership import sensor_in_org
+from app.services.rolling_stats import rolling_stats
+from app.services.rollup import ROLLUP_METRICS
+from app.services.sharding import bind_tenant
 
 router = APIRouter(prefix="/api/v1", tags=["readings"])
 
 
-@router.get("/readings", response_model=list[ReadingOut])
+# Ownership (cached), readings
+@router.get("/readings", response_model=list[ReadingOut], dependencies=[Depends(query_budget(2 + COLD_CACHE_STATEMENTS))])
 async def list_readings(
     sensor_id: uuid.UUID,
     start: datetime | None = None,
     end: datetime | None = None,
     limit: int = Query(default=100, le=10000),
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    user: Claims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db),
 ):
     # Verify sensor belongs to user's org
-    result = await db.execute(
-        select(Sensor).join(Component).join(Crane).join(Facility)
-        .where(Sensor.id == sensor_id, Facility.org_id == user.org_id)
-    )
-    if result.scalar_one_or_none() is None:
+    if not await sensor_in_org(sensor_id, user.org_id, db):
         raise HTTPException(status_code=404, detail="Sensor not found")
+    await bind_tenant(db, user.org_id)
 
     query = select(Reading).where(Reading.sensor_id == sensor_id)
     if start:
@@ -49,16 +46,13 @@ async def list_readings(
 @router.get("/readings/{sensor_id}/latest", response_model=ReadingOut)
 async def latest_reading(
     sensor_id: uuid.UUID,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    user: Claims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db),
 ):
     # Verify sensor belongs to user's org
-    result = await db.execute(
-        select(Sensor).join(Component).join(Crane).join(Facility)
-        .where(Sensor.id == sensor_id, Facility.org_id == user.org_id)
-    )
-    if result.scalar_one_or_none() is None:
+    if not await sensor_in_org(sensor_id, user.org_id, db):
         raise HTTPException(status_code=404, detail="Sensor not found")
+    await bind_tenant(db, user.org_id)
 
     result = await db.execute(
         select(Reading).where(Reading.sensor_id == sensor_id)
@@ -68,3 +62,34 @@ async def latest_reading(
     if reading is None:
         raise HTTPException(status_code=404, detail="No readings found")
     return reading
+
+
+@router.get("/readings/{sensor_id}/trend", response_model=TrendOut)
+async def reading_trend(
+    sensor_id: uuid.UUID,
+    metric: str,
+    days: int = Query(default=7, ge=1, le=14),
+    window_hours: int = Query(default=24, ge=1, le=72),
+    user: Claims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Mean / max of `metric` over the last `window_hours`, against the same window `days` ago."""
+    if metric not in ROLLUP_METRICS:
+        raise HTTPException(status_code=422, detail=f"Trends are not tracked for {metric}")
+    if days * 24 + window_hours > rolling_stats.window_hours:
+        raise HTTPException(status_code=422, detail=f"Trend history covers {rolling_stats.window_hours} hours")
+    if not await sensor_in_org(sensor_id, user.org_id, db):
+        raise HTTPException(status_code=404, detail="Sensor not found")
+    if not rolling_stats.ready:
+        raise HTTPException(status_code=503, detail="Trend history is still loading")
+
+    trend = rolling_stats.trend(sensor_id, metric, days, window_hours)
+    return TrendOut(
+        sensor_id=sensor_id,
+        metric=metric,
+        days=days,
+        window_hours=window_hours,
+        current=WindowStatsOut(count=trend.current.count, mean=trend.current.mean, max=trend.current.max),
+        previous=WindowStatsOut(count=trend.previous.count, mean=trend.previous.mean, max=trend.previous.max),
+        change_percent=trend.change_percent,
+    )
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class ProfilerConfigIn(BaseModel):
+    enabled: bool | None = None
+    threshold_ms: float | None = Field(default=None, ge=0)
+    sample_one_in: int | None = Field(default=None, ge=0)  # 0 = only slow requests
+    interval_ms: float | None = Field(default=None, ge=1, le=1000)
+    buffer_size: int | None = Field(default=None, ge=1, le=1000)
+
+
+class ProfilerConfigOut(BaseModel):
+    enabled: bool
+    threshold_ms: float
+    sample_one_in: int
+    interval_ms: float
+    buffer_size: int
+    profiles: int
+
+
+class ProfileSummaryOut(BaseModel):
+    id: int
+    started_at: datetime
+    method: str
+    route: str
+    status: int
+    duration_ms: float
+    reason: str
+    interval_ms: float
+    samples: int
+    statements: int
+    db_ms: float
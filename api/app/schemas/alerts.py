@@ -0,0 +1,70 @@
+"""Schemas for alert rules and the alert inbox."""
+
+import uuid
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+# ── Alert Rules ──
+
+class AlertCondition(BaseModel):
+    field: str
+    operator: Literal[">", ">=", "<", "<=", "==", "!="]
+    value: float
+    severity: Literal["info", "warning", "critical"] | None = None
+    trend_days: int | None = Field(default=None, ge=1, le=14)  # compare % change vs N days ago
+
+
+class AlertRuleCreate(BaseModel):
+    name: str
+    sensor_id: uuid.UUID | None = None  # None = every sensor in the org
+    conditions: list[AlertCondition] = Field(min_length=1)
+    channels: list[str] = []
+    recipients: list[str] = []
+    cooldown_minutes: int = Field(default=60, ge=0)
+    enabled: bool = True
+
+
+class AlertRuleUpdate(BaseModel):
+    name: str | None = None
+    sensor_id: uuid.UUID | None = None
+    conditions: list[AlertCondition] | None = Field(default=None, min_length=1)
+    channels: list[str] | None = None
+    recipients: list[str] | None = None
+    cooldown_minutes: int | None = Field(default=None, ge=0)
+    enabled: bool | None = None
+
+
+class AlertRuleOut(BaseModel):
+    id: uuid.UUID
+    sensor_id: uuid.UUID | None
+    name: str
+    conditions: list[dict]
+    channels: list[str]
+    recipients: list[str]
+    cooldown_minutes: int
+    enabled: bool
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+# ── Alerts ──
+
+class AlertOut(BaseModel):
+    id: uuid.UUID
+    rule_id: uuid.UUID | None
+    sensor_id: uuid.UUID
+    severity: str
+    status: str
+    message: str
+    reading_id: int | None
+    acknowledged_by: uuid.UUID | None
+    acknowledged_at: datetime | None
+    resolved_by: uuid.UUID | None
+    resolved_at: datetime | None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,83 @@
+"""Schemas for analysis endpoints (PRD §6.1 Analysis)."""
+
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+# ── RUL ──
+
+class RulHistoryPoint(BaseModel):
+    t: datetime
+    observed: float
+    fitted: float | None
+
+
+class RulProjectionPoint(BaseModel):
+    t: datetime
+    value: float
+    lower: float
+    upper: float
+
+
+class RulOut(BaseModel):
+    sensor_id: uuid.UUID
+    status: str  # degrading | stable | exceeded | no_fit
+    fitted_at: datetime
+    data_start: datetime
+    data_end: datetime
+    threshold_mm_sec: float
+    current_mm_sec: float | None
+    growth_percent_per_day: float | None
+    rul_hours: float | None
+    rul_hours_low: float | None
+    rul_hours_high: float | None
+    rul_operating_hours: float | None  # rul_hours scaled by the crane's 30-day utilization
+    threshold_at: datetime | None
+    history: list[RulHistoryPoint]
+    projection: list[RulProjectionPoint]
+
+
+# ── Operating Hours ──
+
+class RunSessionOut(BaseModel):
+    id: int
+    sensor_id: uuid.UUID
+    crane_id: uuid.UUID
+    started_at: datetime
+    ended_at: datetime
+    duration_seconds: float
+    open: bool
+
+    model_config = {"from_attributes": True}
+
+
+class OperatingHoursOut(BaseModel):
+    crane_id: uuid.UUID
+    operating_hours: float
+    utilization_30d: float | None
+    covered_until: datetime | None
+    rebuilt_at: datetime | None
+
+
+# ── Cohorts ──
+
+class CohortMetricRank(BaseModel):
+    metric: str
+    value: float  # the sensor's mean over the cohort window
+    percentile: float | None  # percent of cohort members below; None when the cohort is too small
+    members: int
+    p25: float | None
+    p50: float | None
+    p75: float | None
+    p95: float | None
+
+
+class CohortRankOut(BaseModel):
+    sensor_id: uuid.UUID
+    component_type: str | None
+    crane_type: str | None
+    sensor_type: int
+    data_through: datetime
+    metrics: list[CohortMetricRank]
@@ -131,14 +131,47 @@ class BearingSpecCreate(BaseModel):
     ftf: float | None = None
 
 
+class BearingSpecUpdate(BaseModel):
+    manufacturer: str | None = None
+    model: str | None = None
+    num_rolling_elements: int | None = None
+    rolling_element_diameter_mm: float | None = None
+    pitch_diameter_mm: float | None = None
+    contact_angle_degrees: float | None = None
+    bpfo: float | None = None
+    bpfi: float | None = None
+    bsf: float | None = None
+    ftf: float | None = None
+
+
 class BearingSpecOut(BaseModel):
     id: uuid.UUID
     component_id: uuid.UUID
     manufacturer: str | None
     model: str | None
+    num_rolling_elements: int | None
+    rolling_element_diameter_mm: float | None
+    pitch_diameter_mm: float | None
+    contact_angle_degrees: float | None
     bpfo: float | None
     bpfi: float | None
     bsf: float | None
     ftf: float | None
 
     model_config = {"from_attributes": True}
+
+
+class BearingFaultFrequencies(BaseModel):
+    bearing_spec_id: uuid.UUID
+    manufacturer: str | None
+    model: str | None
+    ftf_hz: float
+    bpfo_hz: float
+    bpfi_hz: float
+    bsf_hz: float
+
+
+class FaultFrequenciesOut(BaseModel):
+    component_id: uuid.UUID
+    rpm: float
+    bearings: list[BearingFaultFrequencies]
@@ -0,0 +1,92 @@
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class WaterfallOut(BaseModel):
+    sensor_id: uuid.UUID
+    start: datetime
+    end: datetime
+    axis: str | None
+    f_min: float
+    f_max: float
+    width: int  # frequency columns
+    height: int  # time rows, oldest first
+    captures: int
+    encoding: str  # float32 (NaN = no data) | uint8 (255 = no data)
+    amplitude_min: float | None  # uint8: amplitude of level 0
+    amplitude_max: float | None  # uint8: amplitude of level 254
+    data: str  # base64, row-major, little-endian
+
+
+class FFTCaptureOut(BaseModel):
+    id: int
+    timestamp: datetime
+    axis: str
+    odr: int
+    num_bins: int
+
+    model_config = {"from_attributes": True}
+
+
+class SpectrumOut(BaseModel):
+    capture_id: int
+    sensor_id: uuid.UUID
+    timestamp: datetime
+    axis: str
+    level: int  # decimation: each amplitude is the max of 2^level capture bins
+    f_start: float  # lower edge of the first bin, Hz
+    bin_width: float  # Hz; bin i starts at f_start + i * bin_width
+    amplitudes: list[float]
+
+
+class BaselineIn(BaseModel):
+    start: datetime
+    end: datetime | None = None  # default: start + 14 days; may lie in the future
+
+
+class BaselineOut(BaseModel):
+    sensor_id: uuid.UUID
+    axis: str
+    window_start: datetime
+    window_end: datetime
+    odr: int | None
+    num_bins: int | None
+    captures: int
+    ready: bool  # enough captures to score against
+    updated_at: datetime
+    band_centers_hz: list[float]
+    median: list[float]
+    envelope: list[float]  # ENVELOPE_PERCENTILE per band
+
+
+class BaselineScoreOut(BaseModel):
+    fft_capture_id: int
+    sensor_id: uuid.UUID
+    timestamp: datetime
+    axis: str
+    learning: bool  # part of the baseline itself, not scored
+    score: float | None  # RMS over bands of dB above the baseline median
+    max_ratio: float | None
+    max_ratio_hz: float | None
+    bands_over_envelope: int | None
+    band_ratios: list[float] | None
+    baseline_captures: int | None
+    scored_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class FFTSearchHit(BaseModel):
+    fft_capture_id: int
+    sensor_id: uuid.UUID
+    sensor_label: str | None
+    crane_id: uuid.UUID
+    component_name: str
+    component_type: str | None
+    timestamp: datetime
+    axis: str
+    rpm: int | None
+    value: float  # the searched metric, or the matching peak's amplitude
+    frequency_hz: float | None  # peak searches: frequency of the matching peak
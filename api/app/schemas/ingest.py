@@ -1,11 +1,18 @@
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class FFTPayload(BaseModel):
     axis: str
-    odr: int
+    odr: int = Field(gt=0)
     num_bins: int
-    data: list[float]
+    data: list[float] = Field(min_length=1)
+
+    @model_validator(mode="after")
+    def check_num_bins(self):
+        # Consumers size spectra by the stored blob; a different declared count would split layouts
+        if self.num_bins != len(self.data):
+            raise ValueError(f"num_bins is {self.num_bins} but data has {len(self.data)} values")
+        return self
 
 
 class SensorReading(BaseModel):
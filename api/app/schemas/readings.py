@@ -40,5 +40,22 @@ class ReadingOut(BaseModel):
     channel_1: float | None
     channel_2: float | None
     channel_3: float | None
+    anomaly_score: float | None
 
     model_config = {"from_attributes": True}
+
+
+class WindowStatsOut(BaseModel):
+    count: int
+    mean: float | None
+    max: float | None
+
+
+class TrendOut(BaseModel):
+    sensor_id: uuid.UUID
+    metric: str
+    days: int
+    window_hours: int
+    current: WindowStatsOut
+    previous: WindowStatsOut
+    change_percent: float | None
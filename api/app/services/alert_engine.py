@@ -0,0 +1,272 @@
+"""Alert rule engine evaluated on the ingest stream (PRD FR-005).
+
+Each org's enabled rules are compiled into a `CompiledRules` the first time they are needed:
+every condition becomes an interval over one reading field, laid out in (slot, rule) arrays,
+so a batch of readings is checked against every rule with a handful of elementwise NumPy
+operations instead of a Python loop per rule. A rule fires for a reading when all of its conditions hold (AND) and it applies to
+that sensor.
+
+Cooldown / dedup state — the last time each (rule, sensor) pair fired — lives in memory and
+is seeded from recent alerts on load, so restarts don't re-fire. Rule edits call
+`alert_engine.invalidate`; the TTL bounds staleness across workers.
+
+A condition is `{"field": "x_velocity_mm_sec", "operator": ">", "value": 4.5}` with an
+optional `"severity"`; a rule's severity is the highest of its conditions (default warning).
+Adding `"trend_days": 7` compares the percent change of the field's 24-hour mean against the
+same window 7 days earlier instead (from `rolling_stats`), e.g. "velocity up >20% in 7 days".
+"""
+
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.alert import Alert
+from app.models.alert_rule import AlertRule
+from app.models.reading import Reading
+from app.services.rolling_stats import rolling_stats
+from app.services.rollup import ROLLUP_METRICS
+from app.websocket import manager
+
+
+OPERATORS = (">", ">=", "<", "<=", "==", "!=")
+SEVERITIES = ("info", "warning", "critical")
+DEFAULT_SEVERITY = "warning"
+
+# Numeric reading columns a condition may reference
+ALERT_FIELDS = frozenset(
+    attr.key for attr in Reading.__mapper__.column_attrs
+    if attr.key not in ("id", "sensor_id", "timestamp", "counter", "firmware")
+)
+TREND_FIELDS = frozenset(ROLLUP_METRICS)
+TREND_WINDOW_HOURS = 24
+
+
+def trend_field(field: str, days: int) -> str:
+    """Pseudo-field name for the percent change of `field` over `days`."""
+    return f"{field}:{days}d"
+
+
+def _parse_trend_field(key: str) -> tuple[str, int] | None:
+    field, sep, days = key.partition(":")
+    return (field, int(days[:-1])) if sep else None
+
+
+def _condition_field(condition: dict) -> str | None:
+    field, days = condition.get("field"), condition.get("trend_days")
+    if days:
+        return trend_field(field, int(days)) if field in TREND_FIELDS else None
+    return field if field in ALERT_FIELDS else None
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRule:
+    id: uuid.UUID
+    name: str
+    sensor_id: uuid.UUID | None
+    conditions: tuple[tuple[str, str, float], ...]
+    severity: str
+    cooldown: timedelta
+
+    def message(self, values: dict[str, float]) -> str:
+        parts = []
+        for field, op, value in self.conditions:
+            trend = _parse_trend_field(field)
+            if trend:
+                parts.append(f"{trend[0]} {trend[1]}-day change = {values[field]:+.1f}% ({op} {value:g})")
+            else:
+                parts.append(f"{field} = {values[field]:.2f} ({op} {value:g})")
+        return f"{self.name}: " + ", ".join(parts)
+
+
+def _severity(conditions: list[dict]) -> str:
+    levels = [c.get("severity") for c in conditions if c.get("severity") in SEVERITIES]
+    return max(levels, key=SEVERITIES.index) if levels else DEFAULT_SEVERITY
+
+
+class CompiledRules:
+    """One org's rules as (condition slot, rule) arrays."""
+
+    def __init__(self, rules: list[AlertRule]):
+        self.rules: list[CompiledRule] = []
+        for rule in rules:
+            conditions = tuple(
+                (field, c["operator"], float(c["value"]))
+                for c in (rule.conditions or [])
+                if (field := _condition_field(c)) and c.get("operator") in OPERATORS
+            )
+            if not conditions:
+                continue
+            self.rules.append(CompiledRule(
+                id=rule.id,
+                name=rule.name,
+                sensor_id=rule.sensor_id,
+                conditions=conditions,
+                severity=_severity(rule.conditions),
+                cooldown=timedelta(minutes=rule.cooldown_minutes or 0),
+            ))
+
+        self._sensor_index = {s: i for i, s in enumerate({r.sensor_id for r in self.rules} - {None})}
+        self.scope = np.array(
+            [self._sensor_index[r.sensor_id] if r.sensor_id else -1 for r in self.rules], dtype=np.int32
+        )
+
+        # Condition k of every rule sits in slot k, as an open interval lo < x < hi over one
+        # field (negated for !=). Rules with fewer conditions are padded with always-true slots,
+        # so evaluation is a few elementwise operations over (slots, rules) arrays.
+        self.fields = sorted({field for r in self.rules for field, _, _ in r.conditions})
+        position = {field: i for i, field in enumerate(self.fields)}
+        slots = max((len(r.conditions) for r in self.rules), default=0)
+        shape = (slots, len(self.rules))
+        self.field_index = np.zeros(shape, dtype=np.intp)
+        self.lo = np.full(shape, -np.inf)
+        self.hi = np.full(shape, np.inf)
+        self.negate = np.zeros(shape, dtype=bool)
+        self.padding = np.ones(shape, dtype=bool)
+        for j, rule in enumerate(self.rules):
+            for k, (field, op, value) in enumerate(rule.conditions):
+                self.field_index[k, j] = position[field]
+                self.lo[k, j], self.hi[k, j] = _interval(op, value)
+                self.negate[k, j] = op == "!="
+                self.padding[k, j] = False
+
+    def evaluate(self, sensor_ids: list, columns: dict[str, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+        """(reading_index, rule_index) pairs for every rule that fires.
+
+        `columns` maps each name in `self.fields` to a float array (NaN = missing); a missing
+        value never satisfies a condition.
+        """
+        if not self.rules:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        readings = np.stack([np.asarray(columns[f], dtype=float) for f in self.fields], axis=1)
+        values = readings.take(self.field_index, axis=1)  # (readings, slots, rules)
+        satisfied = ((values > self.lo) & (values < self.hi)) ^ self.negate
+        satisfied &= ~np.isnan(values)
+        satisfied |= self.padding
+        fired = satisfied.all(axis=1)
+
+        sensors = np.array([self._sensor_index.get(s, -2) for s in sensor_ids], dtype=np.int32)
+        fired &= (self.scope == -1) | (self.scope == sensors[:, None])
+        return np.nonzero(fired)
+
+
+def _interval(op: str, value: float) -> tuple[float, float]:
+    """Open interval (lo, hi) equivalent to `x <op> value`; != is the negation of ==."""
+    below, above = np.nextafter(value, -np.inf), np.nextafter(value, np.inf)
+    return {
+        ">": (value, np.inf),
+        ">=": (below, np.inf),
+        "<": (-np.inf, value),
+        "<=": (-np.inf, above),
+        "==": (below, above),
+        "!=": (below, above),
+    }[op]
+
+
+class AlertEngine:
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._orgs: dict[uuid.UUID, tuple[CompiledRules, float]] = {}
+        self._last_fired: dict[tuple[uuid.UUID, uuid.UUID], datetime] = {}
+        self._seeded: set[uuid.UUID] = set()
+
+    async def rules_for(self, org_id: uuid.UUID, db: AsyncSession) -> CompiledRules:
+        hit = self._orgs.get(org_id)
+        if hit is not None and hit[1] > time.monotonic():
+            return hit[0]
+
+        result = await db.execute(select(AlertRule).where(AlertRule.org_id == org_id, AlertRule.enabled.is_(True)))
+        compiled = CompiledRules(list(result.scalars().all()))
+        await self._seed_cooldowns(compiled, db)
+        self._orgs[org_id] = (compiled, time.monotonic() + self.ttl_seconds)
+        return compiled
+
+    async def _seed_cooldowns(self, compiled: CompiledRules, db: AsyncSession):
+        cooling = [r for r in compiled.rules if r.cooldown and r.id not in self._seeded]
+        if not cooling:
+            return
+        self._seeded.update(r.id for r in cooling)
+        since = datetime.now(timezone.utc) - max(r.cooldown for r in cooling)
+        result = await db.execute(
+            select(Alert.rule_id, Alert.sensor_id, func.max(Alert.created_at))
+            .where(Alert.rule_id.in_([r.id for r in cooling]), Alert.created_at >= since)
+            .group_by(Alert.rule_id, Alert.sensor_id)
+        )
+        for rule_id, sensor_id, created_at in result.all():
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            self._last_fired[(rule_id, sensor_id)] = created_at
+
+    def invalidate(self, org_id: uuid.UUID):
+        self._orgs.pop(org_id, None)
+
+    def forget_rule(self, rule_id: uuid.UUID):
+        self._seeded.discard(rule_id)
+        for key in [k for k in self._last_fired if k[0] == rule_id]:
+            del self._last_fired[key]
+
+    def _cooling_down(self, rule: CompiledRule, sensor_id: uuid.UUID, now: datetime) -> bool:
+        last = self._last_fired.get((rule.id, sensor_id))
+        if last is not None and now - last < rule.cooldown:
+            return True
+        self._last_fired[(rule.id, sensor_id)] = now
+        return False
+
+    @staticmethod
+    def _column(field: str, readings: list[Reading]) -> np.ndarray:
+        trend = _parse_trend_field(field)
+        if trend is None:
+            return np.array([getattr(r, field) for r in readings], dtype=float)
+        if not rolling_stats.ready:  # history still loading: trend conditions can't hold yet
+            return np.full(len(readings), np.nan)
+        metric, days = trend
+        changes = [
+            rolling_stats.trend(r.sensor_id, metric, days, TREND_WINDOW_HOURS, r.timestamp).change_percent
+            for r in readings
+        ]
+        return np.array(changes, dtype=float)
+
+    async def evaluate(self, org_id: uuid.UUID, readings: list[Reading], db: AsyncSession) -> list[Alert]:
+        """Evaluate readings against the org's rules; store and broadcast the alerts that fire."""
+        compiled = await self.rules_for(org_id, db)
+        if not compiled.rules or not readings:
+            return []
+
+        columns = {field: self._column(field, readings) for field in compiled.fields}
+        now = datetime.now(timezone.utc)
+        alerts = []
+        for row, index in zip(*compiled.evaluate([r.sensor_id for r in readings], columns)):
+            rule, reading = compiled.rules[index], readings[row]
+            if self._cooling_down(rule, reading.sensor_id, now):
+                continue
+            values = {field: float(columns[field][row]) for field, _, _ in rule.conditions}
+            alerts.append(Alert(
+                rule_id=rule.id,
+                sensor_id=reading.sensor_id,
+                severity=rule.severity,
+                message=rule.message(values),
+                reading_id=reading.id,
+                created_at=now,
+            ))
+        if not alerts:
+            return []
+
+        db.add_all(alerts)
+        await db.commit()
+        for alert in alerts:
+            await manager.broadcast({
+                "event": "alert.triggered",
+                "alert_id": str(alert.id),
+                "sensor_id": str(alert.sensor_id),
+                "severity": alert.severity,
+                "message": alert.message,
+            })
+        return alerts
+
+
+alert_engine = AlertEngine(settings.alert_rules_ttl_seconds)
@@ -0,0 +1,307 @@
+"""Per-sensor anomaly scoring with Isolation Forests (PRD FR-008).
+
+Training (`train_models`, run from `manage.py anomaly-train`) pulls an evenly spaced sample
+of each eligible sensor's last `TRAINING_WINDOW` of readings in one windowed query per batch
+of sensors, and fits one scikit-learn IsolationForest per sensor in a process pool. The
+fitted forest is flattened into NumPy arrays (`FlatForest`) and stored in anomaly_models, so
+scikit-learn is only needed where models are trained.
+
+Scoring (`score_readings`, called by ingest before the reading is stored) walks every tree
+of a sensor's forest at once for the whole batch. Models come from an in-memory LRU
+(`anomaly_models`) that also remembers which sensors have no model.
+
+The score is Liu et al.'s anomaly score 2^(−E[h(x)] / c(ψ)) — the value scikit-learn's
+`score_samples` negates — scaled to 0–100: around 50 and below is normal, above 80 is a
+strong outlier.
+"""
+
+import asyncio
+import io
+import math
+import os
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.anomaly_model import AnomalyModel
+from app.models.reading import Reading
+from app.models.reading_hourly import ReadingHourly
+
+
+ANOMALY_FEATURES = (
+    "temperature",
+    "x_rms_ACC_G", "y_rms_ACC_G", "z_rms_ACC_G",
+    "x_velocity_mm_sec", "y_velocity_mm_sec", "z_velocity_mm_sec",
+)
+MIN_TRAINING_ROWS = 200
+MIN_TRAINING_SPAN = timedelta(days=14)
+TRAINING_WINDOW = timedelta(days=30)
+MAX_TRAINING_ROWS = 4096
+N_ESTIMATORS = 100
+MAX_SAMPLES = 256
+
+
+def average_path_length(n: np.ndarray) -> np.ndarray:
+    """c(n): mean path length of an unsuccessful BST search among n points."""
+    n = np.asarray(n, dtype=np.float64)
+    c = np.zeros_like(n)
+    c[n == 2] = 1.0
+    big = n > 2
+    c[big] = 2.0 * (np.log(n[big] - 1.0) + np.euler_gamma) - 2.0 * (n[big] - 1.0) / n[big]
+    return c
+
+
+@dataclass(frozen=True)
+class FlatForest:
+    """An isolation forest as padded (trees, nodes) arrays.
+
+    Leaves point at themselves with an infinite threshold, so walking every tree a fixed
+    `depth` steps lands each sample on its leaf without per-tree branching.
+    """
+
+    feature: np.ndarray      # (trees, nodes) column index tested at each node
+    threshold: np.ndarray    # (trees, nodes) go left when x <= threshold
+    left: np.ndarray         # (trees, nodes) child indices
+    right: np.ndarray
+    path_length: np.ndarray  # (trees, nodes) depth + c(samples) at leaves
+    fill: np.ndarray         # (features,) training medians substituted for missing values
+    depth: int
+    norm: float              # c(max_samples)
+
+    @classmethod
+    def from_sklearn(cls, forest, fill: np.ndarray) -> "FlatForest":
+        trees = [est.tree_ for est in forest.estimators_]
+        shape = (len(trees), max(t.node_count for t in trees))
+        feature = np.zeros(shape, dtype=np.intp)
+        threshold = np.full(shape, np.inf)
+        left = np.tile(np.arange(shape[1]), (shape[0], 1))
+        right = left.copy()
+        path_length = np.zeros(shape)
+        depth = 0
+        for i, (tree, columns) in enumerate(zip(trees, forest.estimators_features_)):
+            n = tree.node_count
+            split = tree.children_left[:n] >= 0
+            feature[i, :n][split] = np.asarray(columns)[tree.feature[:n][split]]
+            threshold[i, :n][split] = tree.threshold[:n][split]
+            left[i, :n][split] = tree.children_left[:n][split]
+            right[i, :n][split] = tree.children_right[:n][split]
+
+            node_depth = np.zeros(n, dtype=np.intp)
+            for node in range(n):  # children always come after their parent
+                if split[node]:
+                    node_depth[tree.children_left[node]] = node_depth[tree.children_right[node]] = node_depth[node] + 1
+            path_length[i, :n] = node_depth + average_path_length(tree.n_node_samples[:n])
+            depth = max(depth, int(node_depth.max()))
+        return cls(
+            feature, threshold, left, right, path_length, np.asarray(fill, dtype=np.float64),
+            depth, float(average_path_length([forest.max_samples_])[0]),
+        )
+
+    def score(self, matrix: np.ndarray) -> np.ndarray:
+        """0–100 anomaly score for each row of `matrix` (NaN = missing)."""
+        x = np.where(np.isnan(matrix), self.fill, matrix).astype(np.float32)  # trees split in float32
+        trees, nodes = self.feature.shape
+        offset = np.arange(trees) * nodes
+        feature, threshold = self.feature.ravel(), self.threshold.ravel()
+        left, right = self.left.ravel(), self.right.ravel()
+
+        rows = np.arange(len(x))[:, None]
+        node = np.broadcast_to(offset, (len(x), trees))  # flat index, (samples, trees)
+        for _ in range(self.depth):
+            go_left = x[rows, feature[node]] <= threshold[node]
+            node = np.where(go_left, left[node], right[node]) + offset
+        mean_path = self.path_length.ravel()[node].mean(axis=1)
+        return 100.0 * np.exp2(-mean_path / self.norm)
+
+    def to_bytes(self) -> bytes:
+        buf = io.BytesIO()
+        np.savez(
+            buf, feature=self.feature, threshold=self.threshold, left=self.left, right=self.right,
+            path_length=self.path_length, fill=self.fill, meta=np.array([self.depth, self.norm]),
+        )
+        return buf.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "FlatForest":
+        arrays = np.load(io.BytesIO(data))
+        depth, norm = arrays["meta"]
+        return cls(
+            arrays["feature"], arrays["threshold"], arrays["left"], arrays["right"],
+            arrays["path_length"], arrays["fill"], int(depth), float(norm),
+        )
+
+
+def fit_forest(matrix: np.ndarray) -> FlatForest:
+    """Fit an IsolationForest on `matrix` (no all-NaN columns) and flatten it."""
+    from sklearn.ensemble import IsolationForest  # only training processes need scikit-learn
+
+    fill = np.nanmedian(matrix, axis=0)
+    x = np.where(np.isnan(matrix), fill, matrix)
+    forest = IsolationForest(n_estimators=N_ESTIMATORS, max_samples=min(MAX_SAMPLES, len(x)), random_state=0)
+    return FlatForest.from_sklearn(forest.fit(x), fill)
+
+
+def train_chunk(jobs: list[tuple[uuid.UUID, np.ndarray]]) -> list[tuple[uuid.UUID, bytes]]:
+    """Process-pool entry point: fit and serialize one forest per (sensor_id, matrix)."""
+    return [(sensor_id, fit_forest(matrix).to_bytes()) for sensor_id, matrix in jobs]
+
+
+# ── Model cache ──
+
+class AnomalyModelCache:
+    """LRU of sensor -> (features, FlatForest) or None when the sensor has no model."""
+
+    def __init__(self, size: int, ttl_seconds: float):
+        self.size = size
+        self.ttl_seconds = ttl_seconds
+        self._models: OrderedDict[uuid.UUID, tuple[tuple[tuple[str, ...], FlatForest] | None, float]] = OrderedDict()
+
+    async def get_many(self, sensor_ids: list[uuid.UUID], db: AsyncSession) -> dict:
+        now = time.monotonic()
+        found, missing = {}, []
+        for sensor_id in sensor_ids:
+            hit = self._models.get(sensor_id)
+            if hit is not None and hit[1] > now:
+                self._models.move_to_end(sensor_id)
+                found[sensor_id] = hit[0]
+            else:
+                missing.append(sensor_id)
+        if missing:
+            result = await db.execute(
+                select(AnomalyModel.sensor_id, AnomalyModel.features, AnomalyModel.model)
+                .where(AnomalyModel.sensor_id.in_(missing))
+            )
+            loaded = {row.sensor_id: (tuple(row.features), FlatForest.from_bytes(row.model)) for row in result.all()}
+            for sensor_id in missing:
+                found[sensor_id] = loaded.get(sensor_id)
+                self._models[sensor_id] = (found[sensor_id], now + self.ttl_seconds)
+                self._models.move_to_end(sensor_id)
+            while len(self._models) > self.size:
+                self._models.popitem(last=False)
+        return found
+
+    def invalidate(self, sensor_id: uuid.UUID):
+        self._models.pop(sensor_id, None)
+
+
+anomaly_models = AnomalyModelCache(settings.anomaly_model_cache_size, settings.anomaly_model_ttl_seconds)
+
+
+async def score_readings(readings: list[Reading], db: AsyncSession) -> None:
+    """Set `anomaly_score` on each reading whose sensor has a model, one pass per sensor."""
+    by_sensor = defaultdict(list)
+    for reading in readings:
+        by_sensor[reading.sensor_id].append(reading)
+    models = await anomaly_models.get_many(list(by_sensor), db)
+    for sensor_id, group in by_sensor.items():
+        if models.get(sensor_id) is None:
+            continue
+        features, forest = models[sensor_id]
+        matrix = np.array([[getattr(r, f) for f in features] for r in group], dtype=np.float64)
+        scores = forest.score(matrix)
+        for reading, row, score in zip(group, matrix, scores):
+            if not np.isnan(row).all():
+                reading.anomaly_score = round(float(score), 1)
+
+
+# ── Training ──
+
+async def _eligible_sensors(db: AsyncSession, now: datetime) -> list[uuid.UUID]:
+    """Sensors on this shard with enough history, judged from readings_hourly."""
+    result = await db.execute(
+        select(ReadingHourly.sensor_id)
+        .where(ReadingHourly.hour >= now - TRAINING_WINDOW)
+        .group_by(ReadingHourly.sensor_id)
+        .having(
+            func.sum(ReadingHourly.reading_count) >= MIN_TRAINING_ROWS,
+            func.min(ReadingHourly.hour) <= now - MIN_TRAINING_SPAN,
+        )
+    )
+    return list(result.scalars().all())
+
+
+async def _training_matrices(db: AsyncSession, sensor_ids: list[uuid.UUID], now: datetime) -> dict:
+    """Up to MAX_TRAINING_ROWS readings per sensor, evenly spaced over the training window."""
+    columns = [getattr(Reading, f) for f in ANOMALY_FEATURES]
+    ranked = (
+        select(
+            Reading.sensor_id, *columns,
+            func.row_number().over(partition_by=Reading.sensor_id, order_by=Reading.timestamp).label("n"),
+            func.count().over(partition_by=Reading.sensor_id).label("total"),
+        )
+        .where(Reading.sensor_id.in_(sensor_ids), Reading.timestamp >= now - TRAINING_WINDOW)
+        .subquery()
+    )
+    stride = (ranked.c.total + MAX_TRAINING_ROWS - 1) // MAX_TRAINING_ROWS
+    result = await db.execute(
+        select(ranked.c.sensor_id, *(ranked.c[f] for f in ANOMALY_FEATURES))
+        .where((ranked.c.n - 1) % stride == 0),
+        bind_arguments={"mapper": Reading},
+    )
+    rows = defaultdict(list)
+    for row in result.all():
+        rows[row[0]].append(row[1:])
+    return {sensor_id: np.array(values, dtype=np.float64) for sensor_id, values in rows.items()}
+
+
+async def train_models(
+    db: AsyncSession,
+    sensor_ids: list[uuid.UUID] | None = None,
+    batch_size: int = 200,
+    workers: int | None = None,
+) -> int:
+    """Train and store models for eligible sensors on this session's shard. Returns how many."""
+    from concurrent.futures import ProcessPoolExecutor  # only the training job starts processes
+
+    now = datetime.now(timezone.utc)
+    if sensor_ids is None:
+        sensor_ids = await _eligible_sensors(db, now)
+    workers = workers or os.cpu_count() or 1
+    loop = asyncio.get_running_loop()
+    trained = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for i in range(0, len(sensor_ids), batch_size):
+            matrices = await _training_matrices(db, sensor_ids[i:i + batch_size], now)
+            jobs, features = [], {}
+            for sensor_id, matrix in matrices.items():
+                keep = ~np.isnan(matrix).all(axis=0)
+                if len(matrix) < MIN_TRAINING_ROWS or not keep.any():
+                    continue
+                jobs.append((sensor_id, matrix[:, keep]))
+                features[sensor_id] = [f for f, k in zip(ANOMALY_FEATURES, keep) if k]
+            if not jobs:
+                continue
+
+            size = max(1, math.ceil(len(jobs) / workers))
+            chunks = [jobs[j:j + size] for j in range(0, len(jobs), size)]
+            fitted = [m for models in await asyncio.gather(
+                *(loop.run_in_executor(pool, train_chunk, chunk) for chunk in chunks)
+            ) for m in models]
+
+            rows = [{
+                "sensor_id": sensor_id,
+                "features": features[sensor_id],
+                "training_rows": len(matrices[sensor_id]),
+                "training_start": now - TRAINING_WINDOW,
+                "training_end": now,
+                "model": model,
+                "trained_at": now,
+            } for sensor_id, model in fitted]
+            stmt = insert(AnomalyModel).values(rows)
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=[AnomalyModel.sensor_id],
+                set_={c: stmt.excluded[c] for c in rows[0] if c != "sensor_id"},
+            ))
+            await db.commit()
+            for sensor_id, _ in fitted:
+                anomaly_models.invalidate(sensor_id)
+            trained += len(fitted)
+    return trained
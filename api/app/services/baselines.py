@@ -0,0 +1,328 @@
+"""Healthy baseline spectra per sensor axis and band-wise scoring against them.
+
+A baseline is learned from the captures in a chosen window [window_start, window_end) —
+typically a period just after commissioning or an overhaul. Each capture is reduced to
+`BASELINE_BANDS` equal-width band RMS amplitudes, and the baseline keeps a histogram of
+log10 amplitude per band (`BaselineHistogram`) instead of the captures themselves: folding a
+capture in is one `np.add.at`, the median and the `ENVELOPE_PERCENTILE` envelope are read
+off the cumulative counts, and nothing is ever re-decoded. Captures in the window are folded
+in as the FFT pipeline sees them; setting a baseline folds the captures already stored.
+
+Every other capture on that axis is scored once it has `MIN_BASELINE_CAPTURES` behind it:
+band ratios to the median, how many bands exceed the envelope, and `score`, the RMS over
+bands of the dB excess above the median (0 for a capture at or below baseline). Results go
+to fft_baseline_scores, which doubles as the per-capture cache; learning captures get a row
+too, so a capture is never folded twice.
+"""
+
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import numpy as np
+from sqlalchemy import Integer, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.baseline_score import BaselineScore
+from app.models.fft_capture import FFTCapture
+from app.models.spectrum_baseline import SpectrumBaseline
+from app.services.spectrum import SPECTRUM_DTYPE, bin_width_hz
+
+
+BASELINE_BANDS = 128
+HISTOGRAM_LEVELS = 64
+LOG_MIN, LOG_MAX = -6.0, 2.0  # log10 amplitude range the histogram covers
+MIN_BASELINE_CAPTURES = 20
+ENVELOPE_PERCENTILE = 95
+CHUNK_SIZE = 256
+
+
+@lru_cache(maxsize=64)
+def _band_starts(bins: int) -> tuple[np.ndarray, np.ndarray]:
+    """First bin of each band and the band sizes; bands of a short spectrum may repeat a bin."""
+    starts = np.arange(BASELINE_BANDS) * bins // BASELINE_BANDS
+    sizes = np.maximum(np.diff(np.append(starts, bins)), 1)
+    return np.minimum(starts, bins - 1), sizes
+
+
+def band_amplitudes(block: np.ndarray) -> np.ndarray:
+    """(captures, bins) spectra -> (captures, BASELINE_BANDS) band RMS amplitudes."""
+    starts, sizes = _band_starts(block.shape[1])
+    power = np.square(block, dtype=np.float64)
+    return np.sqrt(np.add.reduceat(power, starts, axis=1) / sizes)
+
+
+def band_centers_hz(odr: int, bins: int) -> np.ndarray:
+    starts, sizes = _band_starts(bins)
+    return (starts + sizes / 2) * bin_width_hz(odr, bins)
+
+
+class BaselineHistogram:
+    """(BASELINE_BANDS, HISTOGRAM_LEVELS) counts of log10 band amplitude."""
+
+    STEP = (LOG_MAX - LOG_MIN) / HISTOGRAM_LEVELS
+
+    def __init__(self, counts: np.ndarray | None = None):
+        self.counts = counts if counts is not None else np.zeros((BASELINE_BANDS, HISTOGRAM_LEVELS), dtype=np.uint32)
+
+    def add(self, bands: np.ndarray) -> None:
+        """Fold in (captures, BASELINE_BANDS) band amplitudes."""
+        log = np.log10(np.maximum(bands, 10 ** LOG_MIN))
+        levels = np.clip(((log - LOG_MIN) / self.STEP).astype(np.intp), 0, HISTOGRAM_LEVELS - 1)
+        columns = np.broadcast_to(np.arange(BASELINE_BANDS), levels.shape)
+        np.add.at(self.counts, (columns, levels), 1)
+
+    def quantile(self, q: float) -> np.ndarray:
+        """Per-band amplitude at quantile `q`, interpolated log-linearly within a level."""
+        cumulative = np.cumsum(self.counts, axis=1, dtype=np.float64)
+        target = q * cumulative[:, -1:]
+        level = np.minimum((cumulative < target).sum(axis=1), HISTOGRAM_LEVELS - 1)
+        rows = np.arange(BASELINE_BANDS)
+        below = np.where(level > 0, cumulative[rows, level - 1], 0.0)
+        inside = np.maximum(self.counts[rows, level], 1)
+        fraction = np.clip((target[:, 0] - below) / inside, 0.0, 1.0)
+        return 10 ** (LOG_MIN + (level + fraction) * self.STEP)
+
+    def to_bytes(self) -> bytes:
+        return self.counts.astype("<u4").tobytes()
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "BaselineHistogram":
+        counts = np.frombuffer(blob, dtype="<u4").reshape(BASELINE_BANDS, HISTOGRAM_LEVELS)
+        return cls(counts.astype(np.uint32))
+
+
+@dataclass(frozen=True)
+class Reference:
+    """What scoring needs from a baseline, read once from its histogram."""
+    window_start: datetime
+    window_end: datetime
+    odr: int | None
+    num_bins: int | None
+    captures: int
+    median: np.ndarray
+    envelope: np.ndarray
+
+    @classmethod
+    def from_row(cls, row: SpectrumBaseline) -> "Reference":
+        histogram = BaselineHistogram.from_bytes(row.histogram)
+        return cls(
+            window_start=row.window_start,
+            window_end=row.window_end,
+            odr=row.odr,
+            num_bins=row.num_bins,
+            captures=row.captures,
+            median=histogram.quantile(0.5),
+            envelope=histogram.quantile(ENVELOPE_PERCENTILE / 100),
+        )
+
+    @property
+    def ready(self) -> bool:
+        return self.captures >= MIN_BASELINE_CAPTURES
+
+    def learns(self, timestamp: datetime) -> bool:
+        return self.window_start <= timestamp < self.window_end
+
+    def matches(self, odr: int, bins: int) -> bool:
+        return self.odr is None or (self.odr == odr and self.num_bins == bins)
+
+
+def score_bands(bands: np.ndarray, reference: Reference) -> dict:
+    """Score (captures, BASELINE_BANDS) band amplitudes against a ready reference, vectorized."""
+    floor = 10 ** LOG_MIN
+    ratios = np.maximum(bands, floor) / np.maximum(reference.median, floor)
+    excess_db = np.maximum(20 * np.log10(ratios), 0.0)
+    worst = ratios.argmax(axis=1)
+    centers = band_centers_hz(reference.odr, reference.num_bins)
+    return {
+        "score": np.sqrt(np.mean(excess_db ** 2, axis=1)),
+        "max_ratio": ratios[np.arange(len(bands)), worst],
+        "max_ratio_hz": centers[worst],
+        "bands_over_envelope": (bands > reference.envelope).sum(axis=1),
+        "band_ratios": ratios,
+    }
+
+
+def _decode_block(captures) -> np.ndarray:
+    return np.stack([np.frombuffer(c.spectrum_data, dtype=SPECTRUM_DTYPE) for c in captures])
+
+
+# ── Reference cache ──
+
+class ReferenceCache:
+    """TTL cache of (shard, sensor, axis) -> Reference or None."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._references: dict[tuple, tuple[Reference | None, float]] = {}
+
+    async def get(self, sensor_id: uuid.UUID, axis: str, db: AsyncSession) -> Reference | None:
+        key = (db.info.get("shard"), sensor_id, axis)
+        hit = self._references.get(key)
+        if hit is not None and hit[1] > time.monotonic():
+            return hit[0]
+        row = await db.get(SpectrumBaseline, (sensor_id, axis))
+        reference = Reference.from_row(row) if row is not None else None
+        self._references[key] = (reference, time.monotonic() + self.ttl_seconds)
+        return reference
+
+    def invalidate(self, sensor_id: uuid.UUID, axis: str, shard: str | None):
+        self._references.pop((shard, sensor_id, axis), None)
+
+
+baseline_references = ReferenceCache(settings.baseline_cache_ttl_seconds)
+
+
+# ── Folding and scoring ──
+
+async def _fold(sensor_id, axis: str, captures: list, db: AsyncSession) -> int:
+    """Fold captures into the baseline under a row lock; captures already recorded are skipped."""
+    row = (await db.execute(
+        select(SpectrumBaseline)
+        .where(SpectrumBaseline.sensor_id == sensor_id, SpectrumBaseline.axis == axis)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )).scalar_one_or_none()
+    if row is None:
+        return 0
+    odr, bins = row.odr, row.num_bins
+    if odr is None:
+        odr, bins = captures[0].odr, len(captures[0].spectrum_data) // SPECTRUM_DTYPE().itemsize
+    captures = [c for c in captures if c.odr == odr and len(c.spectrum_data) // SPECTRUM_DTYPE().itemsize == bins]
+    if not captures:
+        return 0
+
+    result = await db.execute(
+        insert(BaselineScore).values([
+            {"fft_capture_id": c.id, "sensor_id": sensor_id, "timestamp": c.timestamp, "axis": axis, "learning": True}
+            for c in captures
+        ]).on_conflict_do_nothing().returning(BaselineScore.fft_capture_id)
+    )
+    new = set(result.scalars().all())
+    captures = [c for c in captures if c.id in new]
+    if not captures:
+        return 0
+
+    histogram = BaselineHistogram.from_bytes(row.histogram)
+    histogram.add(band_amplitudes(_decode_block(captures)))
+    row.histogram = histogram.to_bytes()
+    row.odr, row.num_bins = odr, bins
+    row.captures += len(captures)
+    row.updated_at = datetime.now(timezone.utc)
+    return len(captures)
+
+
+async def _score(sensor_id, axis: str, captures: list, reference: Reference, db: AsyncSession) -> None:
+    scores = score_bands(band_amplitudes(_decode_block(captures)), reference)
+    rows = [
+        {
+            "fft_capture_id": c.id, "sensor_id": sensor_id, "timestamp": c.timestamp, "axis": axis,
+            "learning": False,
+            "score": float(scores["score"][i]),
+            "max_ratio": float(scores["max_ratio"][i]),
+            "max_ratio_hz": float(scores["max_ratio_hz"][i]),
+            "bands_over_envelope": int(scores["bands_over_envelope"][i]),
+            "band_ratios": scores["band_ratios"][i].tolist(),
+            "baseline_captures": reference.captures,
+        }
+        for i, c in enumerate(captures)
+    ]
+    await db.execute(insert(BaselineScore).values(rows).on_conflict_do_nothing())
+
+
+async def apply_baselines(captures, db: AsyncSession) -> None:
+    """Fold or score captures (rows with id, sensor_id, timestamp, axis, odr, spectrum_data) and commit."""
+    groups: dict[tuple, list] = {}
+    for c in captures:
+        groups.setdefault((c.sensor_id, c.axis), []).append(c)
+
+    for (sensor_id, axis), group in groups.items():
+        reference = await baseline_references.get(sensor_id, axis, db)
+        if reference is None:
+            continue
+        learning = [c for c in group if reference.learns(c.timestamp)]
+        if learning and await _fold(sensor_id, axis, learning, db):
+            baseline_references.invalidate(sensor_id, axis, db.info.get("shard"))
+        if reference.ready:
+            bins = lambda c: len(c.spectrum_data) // SPECTRUM_DTYPE().itemsize  # noqa: E731
+            scored = [c for c in group if not reference.learns(c.timestamp) and reference.matches(c.odr, bins(c))]
+            if scored:
+                await _score(sensor_id, axis, scored, reference, db)
+    await db.commit()
+
+
+async def score_capture(sensor_id: uuid.UUID, capture_id: int, db: AsyncSession) -> BaselineScore | None:
+    """Stored score of one of the sensor's captures, scoring it now if its baseline is ready and it has none yet."""
+    stored = await db.get(BaselineScore, capture_id)
+    if stored is not None:
+        return stored if stored.sensor_id == sensor_id else None
+    result = await db.execute(
+        select(FFTCapture.id, FFTCapture.sensor_id, FFTCapture.timestamp, FFTCapture.axis,
+               FFTCapture.odr, FFTCapture.spectrum_data)
+        .where(FFTCapture.id == capture_id, FFTCapture.sensor_id == sensor_id)
+    )
+    capture = result.one_or_none()
+    if capture is None:
+        return None
+    reference = await baseline_references.get(capture.sensor_id, capture.axis, db)
+    bins = len(capture.spectrum_data) // SPECTRUM_DTYPE().itemsize
+    if reference is None or not reference.ready or reference.learns(capture.timestamp) or not reference.matches(capture.odr, bins):
+        return None
+    await _score(capture.sensor_id, capture.axis, [capture], reference, db)
+    await db.commit()
+    return await db.get(BaselineScore, capture_id)
+
+
+async def set_baseline(sensor_id: uuid.UUID, axis: str, start: datetime, end: datetime, db: AsyncSession) -> SpectrumBaseline:
+    """(Re)define the axis baseline as the captures in [start, end) and fold the ones already
+    stored, `CHUNK_SIZE` blobs at a time.
+
+    Existing scores for the axis are dropped; captures are re-scored as they are viewed or arrive.
+    """
+    # Layout by blob length, as _fold and Reference.matches see it (not the declared num_bins)
+    bins = func.octet_length(FFTCapture.spectrum_data, type_=Integer) // SPECTRUM_DTYPE().itemsize
+    result = await db.execute(
+        select(FFTCapture.odr, bins.label("num_bins"), func.count())
+        .where(FFTCapture.sensor_id == sensor_id, FFTCapture.axis == axis,
+               FFTCapture.timestamp >= start, FFTCapture.timestamp < end)
+        .group_by(FFTCapture.odr, bins)
+        .order_by(func.count().desc())
+        .limit(1)
+    )
+    layout = result.one_or_none()
+
+    await db.execute(delete(BaselineScore).where(BaselineScore.sensor_id == sensor_id, BaselineScore.axis == axis))
+    values = {
+        "sensor_id": sensor_id, "axis": axis, "window_start": start, "window_end": end,
+        "odr": layout.odr if layout else None, "num_bins": layout.num_bins if layout else None,
+        "captures": 0, "histogram": BaselineHistogram().to_bytes(), "updated_at": datetime.now(timezone.utc),
+    }
+    stmt = insert(SpectrumBaseline).values(values)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[SpectrumBaseline.sensor_id, SpectrumBaseline.axis],
+        set_={k: stmt.excluded[k] for k in values if k not in ("sensor_id", "axis")},
+    ))
+
+    last_id = 0
+    while layout is not None:
+        result = await db.execute(
+            select(FFTCapture.id, FFTCapture.timestamp, FFTCapture.odr, FFTCapture.spectrum_data)
+            .where(FFTCapture.sensor_id == sensor_id, FFTCapture.axis == axis,
+                   FFTCapture.timestamp >= start, FFTCapture.timestamp < end,
+                   FFTCapture.odr == layout.odr, bins == layout.num_bins,
+                   FFTCapture.id > last_id)
+            .order_by(FFTCapture.id)
+            .limit(CHUNK_SIZE)
+        )
+        chunk = result.all()
+        if not chunk:
+            break
+        await _fold(sensor_id, axis, chunk, db)
+        last_id = chunk[-1].id
+    await db.commit()
+    baseline_references.invalidate(sensor_id, axis, db.info.get("shard"))
+    return await db.get(SpectrumBaseline, (sensor_id, axis))
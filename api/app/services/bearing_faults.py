@@ -0,0 +1,189 @@
+"""Bearing fault detection on stored FFT captures (PRD FR-006).
+
+Fault frequencies are bearing orders (multiples of shaft speed) scaled by the rpm of the
+capture's nearest reading. Every bearing on the sensor's component is searched at once:
+the fundamental and harmonics of FTF/BPFO/BPFI/BSF become one array of ±2% windows
+searched in a single `window_peaks` pass. A harmonic counts
+as detected when its peak stands `PEAK_FACTOR` above the spectrum's median noise floor.
+
+Confidence is the number of detected harmonics: 3+ high, 2 medium, 1 low.
+"""
+
+import asyncio
+import math
+import os
+from concurrent.futures import Executor
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.bearing_fault_detection import BearingFaultDetection
+from app.models.bearing_spec import BearingSpec
+from app.models.fft_capture import FFTCapture
+from app.models.reading import Reading
+from app.models.sensor import Sensor
+from app.services.fault_frequencies import FAULT_TYPES, spec_orders
+from app.services.spectrum import decode_spectrum, noise_floor, window_peaks
+
+
+WINDOW = 0.02
+MAX_HARMONICS = 5
+PEAK_FACTOR = 4.0
+RPM_LOOKBACK = timedelta(minutes=10)
+
+
+def confidence(harmonics: int) -> str | None:
+    if harmonics >= 3:
+        return "high"
+    if harmonics == 2:
+        return "medium"
+    if harmonics == 1:
+        return "low"
+    return None
+
+
+def detect_faults(
+    spectrum: np.ndarray,
+    odr: int,
+    rpm: float,
+    orders: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Search one spectrum for every bearing's fault frequencies.
+
+    `orders` is (bearings, 4) in FAULT_TYPES order. Returns (fundamental_hz, harmonics,
+    amplitude), each shaped like `orders`: the number of detected harmonics and the peak
+    amplitude in the fundamental's window.
+    """
+    fundamental = orders * (rpm / 60.0)
+    targets = fundamental[..., None] * np.arange(1, MAX_HARMONICS + 1)
+    peaks, valid = window_peaks(spectrum, odr, targets, WINDOW)
+    hits = valid & (peaks > max(noise_floor(spectrum), np.finfo(np.float32).tiny) * PEAK_FACTOR)
+    return fundamental, hits.sum(axis=-1), peaks[..., 0]
+
+
+def analyze_chunk(jobs: list[tuple]) -> list[tuple]:
+    """Process-pool entry point. Each job is (capture_id, blob, odr, rpm, orders, spec_ids).
+
+    Returns (capture_id, spec_id, fault_type, frequency_hz, harmonics, amplitude) for
+    every fault with at least one detected harmonic.
+    """
+    found = []
+    for capture_id, blob, odr, rpm, orders, spec_ids in jobs:
+        fundamental, harmonics, amplitude = detect_faults(decode_spectrum(blob), odr, rpm, orders)
+        for b, f in zip(*np.nonzero(harmonics)):
+            found.append((
+                capture_id, spec_ids[b], FAULT_TYPES[f],
+                float(fundamental[b, f]), int(harmonics[b, f]), float(amplitude[b, f]),
+            ))
+    return found
+
+
+# ── Backlog ──
+
+def capture_rpm():
+    """Correlated subquery: rpm of the latest reading at or shortly before the capture."""
+    return (
+        select(Reading.rpm)
+        .where(
+            Reading.sensor_id == FFTCapture.sensor_id,
+            Reading.rpm.is_not(None),
+            Reading.timestamp <= FFTCapture.timestamp,
+            Reading.timestamp > FFTCapture.timestamp - RPM_LOOKBACK,
+        )
+        .order_by(Reading.timestamp.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+async def _bearing_orders(sensor_ids: set, db: AsyncSession) -> dict:
+    """sensor_id -> (orders array, spec ids) for every bearing on the sensor's component."""
+    result = await db.execute(
+        select(Sensor.id, BearingSpec)
+        .join(BearingSpec, BearingSpec.component_id == Sensor.component_id)
+        .where(Sensor.id.in_(sensor_ids))
+    )
+    grouped: dict = {}
+    for sensor_id, spec in result.all():
+        orders = spec_orders(spec)
+        if orders is not None:
+            grouped.setdefault(sensor_id, []).append((orders, spec.id))
+    return {
+        sensor_id: (np.array([o for o, _ in specs], dtype=np.float64), [s for _, s in specs])
+        for sensor_id, specs in grouped.items()
+    }
+
+
+async def analyze_backlog(
+    db: AsyncSession, pool: Executor, batch_size: int = 500, workers: int = 1, after: int = 0,
+) -> tuple[int, int | None]:
+    """Analyze one batch of not-yet-analyzed captures with ids above `after`.
+
+    Only captures that could be analyzed — an rpm near the capture and bearing specs on the
+    component — are stamped; the rest stay in the backlog for when those turn up. Returns
+    (captures analyzed, last id scanned), the id being None once the backlog is exhausted.
+    """
+    result = await db.execute(
+        select(FFTCapture.id, FFTCapture.sensor_id, FFTCapture.timestamp, FFTCapture.odr, capture_rpm().label("rpm"))
+        .where(FFTCapture.analyzed_at.is_(None), FFTCapture.id > after)
+        .order_by(FFTCapture.id)
+        .limit(batch_size)
+    )
+    captures = result.all()
+    if not captures:
+        return 0, None
+
+    bearings = await _bearing_orders({c.sensor_id for c in captures}, db)
+    ready = {c.id: c for c in captures if c.rpm and c.odr and c.sensor_id in bearings}
+    if not ready:
+        return 0, captures[-1].id
+    blobs = dict((await db.execute(
+        select(FFTCapture.id, FFTCapture.spectrum_data).where(FFTCapture.id.in_(list(ready)))
+    )).all())
+    jobs = [(c.id, blobs[c.id], c.odr, c.rpm, *bearings[c.sensor_id]) for c in ready.values()]
+
+    loop = asyncio.get_running_loop()
+    size = max(1, math.ceil(len(jobs) / workers))
+    chunks = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+    found = [row for rows in await asyncio.gather(
+        *[loop.run_in_executor(pool, analyze_chunk, chunk) for chunk in chunks]
+    ) for row in rows]
+
+    if found:
+        await db.execute(insert(BearingFaultDetection), [
+            {
+                "fft_capture_id": capture_id,
+                "sensor_id": ready[capture_id].sensor_id,
+                "timestamp": ready[capture_id].timestamp,
+                "bearing_spec_id": spec_id,
+                "fault_type": fault_type,
+                "frequency_hz": frequency,
+                "harmonics": harmonics,
+                "amplitude": amplitude,
+                "confidence": confidence(harmonics),
+            }
+            for capture_id, spec_id, fault_type, frequency, harmonics, amplitude in found
+        ])
+    await db.execute(
+        update(FFTCapture)
+        .where(FFTCapture.id.in_(list(ready)))
+        .values(analyzed_at=datetime.now(timezone.utc))
+    )
+    await db.commit()
+    return len(ready), captures[-1].id
+
+
+async def run_backlog(db: AsyncSession, batch_size: int = 500, workers: int | None = None) -> int:
+    """Drain the capture backlog on this session's shard with a process pool."""
+    from concurrent.futures import ProcessPoolExecutor  # only the backlog job starts processes
+
+    workers = workers or os.cpu_count() or 1
+    total, after = 0, 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            analyzed, after = await analyze_backlog(db, pool, batch_size, workers, after)
+            if after is None:
+                return total
+            total += analyzed
@@ -0,0 +1,252 @@
+"""Fleet peer comparison: where a sensor sits among similar components.
+
+A cohort is every active sensor with the same component type, crane type and sensor type
+(`cohort_key`), across all orgs — only aggregates leave the cohort. Each member's value per
+metric is the reading-weighted mean of its hourly averages over the last `COHORT_WINDOW`,
+kept in cohort_members. `update_members` is incremental: a sensor is only recomputed (from
+at most a window of readings_hourly rows) when it has new hourly buckets or its cohort
+changed. `recount` then rebuilds each (cohort, metric) histogram from member rows — one row
+per sensor, never raw data — and drops members that stopped reporting.
+
+Histograms have `COHORT_LEVELS` fixed levels per metric (log-spaced for vibration, linear
+for temperature), so a percentile rank is one level lookup into the cached cumulative
+counts: constant time, whatever the cohort size.
+"""
+
+import math
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.cohort_member import CohortMember
+from app.models.cohort_stat import CohortStat
+from app.models.component import Component
+from app.models.crane import Crane
+from app.models.reading_hourly import ReadingHourly
+from app.models.sensor import Sensor
+from app.services.rollup import ROLLUP_METRICS
+
+
+COHORT_WINDOW = timedelta(days=7)
+COHORT_LEVELS = 200
+MIN_COHORT_MEMBERS = 5  # below this a rank says more about one peer than about the fleet
+# metric -> (scale, lo, hi); log scales are in log10 units
+METRIC_SCALES = {
+    metric: ("linear", -40.0, 160.0) if metric == "temperature" else ("log", -4.0, 2.0)
+    for metric in ROLLUP_METRICS
+}
+
+
+def cohort_key(component_type: str | None, crane_type: str | None, sensor_type: int) -> str:
+    return f"{(component_type or '*').lower()}|{(crane_type or '*').lower()}|{sensor_type}"
+
+
+def parse_cohort_key(key: str) -> tuple[str | None, str | None, int]:
+    component_type, crane_type, sensor_type = key.rsplit("|", 2)
+    return (None if component_type == "*" else component_type), (None if crane_type == "*" else crane_type), int(sensor_type)
+
+
+def level_position(metric: str, values: np.ndarray) -> np.ndarray:
+    """Continuous histogram position of each value in [0, COHORT_LEVELS)."""
+    scale, lo, hi = METRIC_SCALES[metric]
+    x = np.asarray(values, dtype=np.float64)
+    if scale == "log":
+        x = np.log10(np.maximum(x, 10 ** lo))
+    return np.clip((x - lo) / (hi - lo) * COHORT_LEVELS, 0, COHORT_LEVELS - 1e-9)
+
+
+def level_value(metric: str, position: np.ndarray) -> np.ndarray:
+    scale, lo, hi = METRIC_SCALES[metric]
+    x = lo + np.asarray(position) / COHORT_LEVELS * (hi - lo)
+    return 10 ** x if scale == "log" else x
+
+
+def histogram(metric: str, values: np.ndarray) -> np.ndarray:
+    levels = level_position(metric, values).astype(np.intp)
+    return np.bincount(levels, minlength=COHORT_LEVELS).astype(np.uint32)
+
+
+@dataclass(frozen=True)
+class CohortDistribution:
+    """One cohort metric, ready for O(1) rank lookups."""
+    metric: str
+    members: int
+    counts: np.ndarray
+    below: np.ndarray  # members in lower levels, per level
+
+    @classmethod
+    def from_row(cls, row: CohortStat) -> "CohortDistribution":
+        counts = np.frombuffer(row.histogram, dtype="<u4").astype(np.int64)
+        return cls(row.metric, row.members, counts, np.concatenate([[0], np.cumsum(counts)[:-1]]))
+
+    def percentile_rank(self, value: float) -> float:
+        """Percent of members below `value`, interpolated within its level (mid-rank for ties)."""
+        position = float(level_position(self.metric, value))
+        level = int(position)
+        return 100.0 * (self.below[level] + (position - level) * self.counts[level]) / self.members
+
+    def quantile(self, q: float) -> float:
+        target = q * self.members
+        level = min(int(np.searchsorted(self.below + self.counts, target)), COHORT_LEVELS - 1)
+        fraction = (target - self.below[level]) / max(self.counts[level], 1)
+        return float(level_value(self.metric, level + min(max(fraction, 0.0), 1.0)))
+
+
+# ── Incremental members ──
+
+async def _latest_hours(db: AsyncSession, since: datetime) -> dict:
+    result = await db.execute(
+        select(ReadingHourly.sensor_id, func.max(ReadingHourly.hour))
+        .where(ReadingHourly.hour >= since)
+        .group_by(ReadingHourly.sensor_id)
+    )
+    return dict(result.all())
+
+
+async def _cohorts(sensor_ids: list, db: AsyncSession) -> dict:
+    result = await db.execute(
+        select(Sensor.id, Component.component_type, Crane.crane_type, Sensor.sensor_type)
+        .join(Component, Component.id == Sensor.component_id)
+        .join(Crane, Crane.id == Component.crane_id)
+        .where(Sensor.id.in_(sensor_ids))
+    )
+    return {row.id: cohort_key(row.component_type, row.crane_type, row.sensor_type) for row in result.all()}
+
+
+async def _window_means(sensor_ids: list, db: AsyncSession) -> dict:
+    """sensor -> {metric: reading-weighted mean of hourly averages} over each sensor's last window."""
+    latest = (
+        select(ReadingHourly.sensor_id, func.max(ReadingHourly.hour).label("hour"))
+        .where(ReadingHourly.sensor_id.in_(sensor_ids))
+        .group_by(ReadingHourly.sensor_id)
+        .subquery()
+    )
+    weight = ReadingHourly.reading_count
+    columns = []
+    for metric in ROLLUP_METRICS:
+        avg = getattr(ReadingHourly, f"{metric}_avg")
+        weights = func.sum(case((avg.is_not(None), weight), else_=0))
+        columns.append((func.sum(avg * weight) / func.nullif(weights, 0)).label(metric))
+    result = await db.execute(
+        select(ReadingHourly.sensor_id, *columns)
+        .join(latest, latest.c.sensor_id == ReadingHourly.sensor_id)
+        .where(ReadingHourly.hour > latest.c.hour - COHORT_WINDOW)
+        .group_by(ReadingHourly.sensor_id),
+        bind_arguments={"mapper": ReadingHourly},
+    )
+    return {
+        row.sensor_id: {m: getattr(row, m) for m in ROLLUP_METRICS if getattr(row, m) is not None}
+        for row in result.all()
+    }
+
+
+async def update_members(db: AsyncSession, full: bool = False, batch_size: int = 500) -> int:
+    """Refresh cohort_members for this session's shard; only sensors with new hourly data or
+    a changed cohort are recomputed (every active sensor with `full`). Returns how many."""
+    now = datetime.now(timezone.utc)
+    latest = await _latest_hours(db, now - COHORT_WINDOW)
+    if not latest:
+        return 0
+
+    updated = 0
+    sensor_ids = list(latest)
+    for i in range(0, len(sensor_ids), batch_size):
+        batch = sensor_ids[i:i + batch_size]
+        cohorts = await _cohorts(batch, db)
+        result = await db.execute(
+            select(CohortMember.sensor_id, CohortMember.cohort, CohortMember.data_through)
+            .where(CohortMember.sensor_id.in_(batch))
+        )
+        members = {row.sensor_id: row for row in result.all()}
+        due = [
+            s for s in batch
+            if s in cohorts and (
+                full or s not in members
+                or members[s].data_through < latest[s] or members[s].cohort != cohorts[s]
+            )
+        ]
+        if not due:
+            continue
+
+        means = await _window_means(due, db)
+        rows = [
+            {"sensor_id": s, "cohort": cohorts[s], "values": means[s], "data_through": latest[s], "updated_at": now}
+            for s in due if means.get(s)
+        ]
+        if rows:
+            stmt = insert(CohortMember).values(rows)
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=[CohortMember.sensor_id],
+                set_={c: stmt.excluded[c] for c in ("cohort", "values", "data_through", "updated_at")},
+            ))
+            await db.commit()
+        updated += len(rows)
+    return updated
+
+
+async def recount(db: AsyncSession) -> int:
+    """Drop members that stopped reporting and rebuild every cohort histogram. Returns the cohort count."""
+    now = datetime.now(timezone.utc)
+    await db.execute(delete(CohortMember).where(CohortMember.data_through < now - COHORT_WINDOW))
+    result = await db.execute(select(CohortMember.cohort, CohortMember.values))
+    by_cohort: dict[str, dict[str, list[float]]] = {}
+    for cohort, values in result.all():
+        metrics = by_cohort.setdefault(cohort, {})
+        for metric, value in values.items():
+            if metric in METRIC_SCALES and value is not None and math.isfinite(value):
+                metrics.setdefault(metric, []).append(value)
+
+    rows = [
+        {
+            "cohort": cohort, "metric": metric, "members": len(values),
+            "histogram": histogram(metric, np.array(values)).astype("<u4").tobytes(), "updated_at": now,
+        }
+        for cohort, metrics in by_cohort.items()
+        for metric, values in metrics.items()
+    ]
+    await db.execute(delete(CohortStat))
+    for i in range(0, len(rows), 1000):
+        await db.execute(insert(CohortStat).values(rows[i:i + 1000]))
+    await db.commit()
+    cohort_stats.clear()
+    return len(by_cohort)
+
+
+# ── Read cache ──
+
+class CohortStatsCache:
+    """TTL cache of cohort -> {metric: CohortDistribution}."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._cohorts: dict[str, tuple[dict[str, CohortDistribution], float]] = {}
+
+    async def get(self, cohort: str, db: AsyncSession) -> dict[str, CohortDistribution]:
+        hit = self._cohorts.get(cohort)
+        if hit is not None and hit[1] > time.monotonic():
+            return hit[0]
+        result = await db.execute(select(CohortStat).where(CohortStat.cohort == cohort))
+        distributions = {row.metric: CohortDistribution.from_row(row) for row in result.scalars().all()}
+        self._cohorts[cohort] = (distributions, time.monotonic() + self.ttl_seconds)
+        return distributions
+
+    def clear(self):
+        self._cohorts.clear()
+
+
+cohort_stats = CohortStatsCache(settings.cohort_stats_ttl_seconds)
+
+
+async def cohort_rank(sensor_id: uuid.UUID, db: AsyncSession) -> tuple[CohortMember, dict[str, CohortDistribution]] | None:
+    """The sensor's member row and its cohort's distributions, or None if it isn't a member."""
+    member = await db.get(CohortMember, sensor_id)
+    if member is None:
+        return None
+    return member, await cohort_stats.get(member.cohort, db)
@@ -0,0 +1,151 @@
+"""Bearing fault orders (FTF, BPFO, BPFI, BSF) and a per-component lookup table.
+
+Orders are fault frequencies per shaft revolution, so they depend only on bearing geometry.
+They are derived once when a spec is created or its geometry changes, stored on the
+bearing_specs row, and kept in memory per component as a (bearings, 4) array. Markers for
+any rpm are then a single multiplication. The table is loaded whole at startup (see
+services/warmup) and reloaded per component when its specs are written; the TTL only
+bounds how long other workers serve a component edited elsewhere.
+"""
+
+import math
+import time
+import uuid
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db import async_session
+from app.models.bearing_spec import BearingSpec
+from app.models.component import Component
+
+
+FAULT_TYPES = ("ftf", "bpfo", "bpfi", "bsf")
+GEOMETRY_FIELDS = ("num_rolling_elements", "rolling_element_diameter_mm", "pitch_diameter_mm", "contact_angle_degrees")
+
+
+def derive_orders(
+    num_rolling_elements: int | None,
+    rolling_element_diameter_mm: float | None,
+    pitch_diameter_mm: float | None,
+    contact_angle_degrees: float | None,
+) -> dict[str, float] | None:
+    """Standard kinematic fault orders, or None when the geometry is incomplete."""
+    n, d, pd = num_rolling_elements, rolling_element_diameter_mm, pitch_diameter_mm
+    if not n or not d or not pd:
+        return None
+    d, pd = float(d), float(pd)
+    ratio = d / pd * math.cos(math.radians(float(contact_angle_degrees or 0)))
+    return {
+        "ftf": 0.5 * (1 - ratio),
+        "bpfo": n / 2 * (1 - ratio),
+        "bpfi": n / 2 * (1 + ratio),
+        "bsf": pd / (2 * d) * (1 - ratio ** 2),
+    }
+
+
+def fill_orders(spec: BearingSpec, overwrite: bool = False) -> None:
+    """Store derived orders on the spec. Explicit values are kept unless `overwrite`."""
+    orders = derive_orders(*(getattr(spec, f) for f in GEOMETRY_FIELDS))
+    if orders is None:
+        return
+    for fault, value in orders.items():
+        if overwrite or getattr(spec, fault) is None:
+            setattr(spec, fault, value)
+
+
+def spec_orders(spec: BearingSpec) -> tuple[float, float, float, float] | None:
+    """Orders in FAULT_TYPES order, derived on the fly for rows stored before derivation."""
+    stored = tuple(getattr(spec, f) for f in FAULT_TYPES)
+    if all(v is not None for v in stored):
+        return tuple(float(v) for v in stored)
+    orders = derive_orders(*(getattr(spec, f) for f in GEOMETRY_FIELDS))
+    return tuple(orders[f] for f in FAULT_TYPES) if orders else None
+
+
+# ── Per-component table ──
+
+@dataclass(frozen=True, slots=True)
+class ComponentBearings:
+    crane_id: uuid.UUID
+    specs: tuple[BearingSpec, ...]
+    orders: np.ndarray  # (len(specs), 4) in FAULT_TYPES order
+
+    def frequencies(self, rpm: float) -> np.ndarray:
+        """Fault frequencies in Hz at `rpm`, shaped like `orders`."""
+        return self.orders * (rpm / 60.0)
+
+
+class FaultFrequencyTable:
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._components: dict[uuid.UUID, tuple[ComponentBearings, float]] = {}
+
+    async def get(self, component_id: uuid.UUID, db: AsyncSession) -> ComponentBearings | None:
+        hit = self._components.get(component_id)
+        if hit is not None and hit[1] > time.monotonic():
+            return hit[0]
+        return await self._load(component_id, db)
+
+    async def _load(self, component_id: uuid.UUID, db: AsyncSession) -> ComponentBearings | None:
+        result = await db.execute(
+            select(Component.crane_id, BearingSpec)
+            .outerjoin(BearingSpec, BearingSpec.component_id == Component.id)
+            .where(Component.id == component_id)
+            .order_by(BearingSpec.id)
+        )
+        rows = result.all()
+        if not rows:
+            self._components.pop(component_id, None)
+            return None
+        entry = self._entry(rows[0][0], [spec for _, spec in rows], db)
+        self._components[component_id] = (entry, time.monotonic() + self.ttl_seconds)
+        return entry
+
+    @staticmethod
+    def _entry(crane_id: uuid.UUID, rows: list[BearingSpec | None], db: AsyncSession) -> ComponentBearings:
+        specs, orders = [], []
+        for spec in rows:
+            if spec is None or (o := spec_orders(spec)) is None:
+                continue
+            db.expunge(spec)
+            specs.append(spec)
+            orders.append(o)
+        return ComponentBearings(
+            crane_id=crane_id,
+            specs=tuple(specs),
+            orders=np.array(orders, dtype=np.float64).reshape(len(orders), len(FAULT_TYPES)),
+        )
+
+    async def warm(self, db: AsyncSession) -> int:
+        """Load every component's bearings in one query. Returns how many components."""
+        result = await db.execute(
+            select(Component.id, Component.crane_id, BearingSpec)
+            .outerjoin(BearingSpec, BearingSpec.component_id == Component.id)
+            .order_by(Component.id, BearingSpec.id)
+        )
+        grouped: dict[uuid.UUID, tuple[uuid.UUID, list]] = {}
+        for component_id, crane_id, spec in result.all():
+            grouped.setdefault(component_id, (crane_id, []))[1].append(spec)
+        expires = time.monotonic() + self.ttl_seconds
+        for component_id, (crane_id, specs) in grouped.items():
+            self._components[component_id] = (self._entry(crane_id, specs, db), expires)
+        return len(grouped)
+
+    async def refresh(self, component_id: uuid.UUID) -> None:
+        """Reload a component after its specs change, instead of waiting out the TTL."""
+        # Own session: the caller's spec objects stay attached to the request's session
+        async with async_session() as db:
+            await self._load(component_id, db)
+
+    def invalidate(self, component_id: uuid.UUID):
+        self._components.pop(component_id, None)
+
+    def clear(self):
+        self._components.clear()
+
+
+fault_frequencies = FaultFrequencyTable(settings.fault_frequency_cache_ttl_seconds)
@@ -0,0 +1,148 @@
+"""Compact features extracted from each FFT capture into fft_features.
+
+Dashboards and analytics read these instead of decoding spectrum blobs. Extraction runs
+in the background after ingest commits a capture (`fft_pipeline`), which also folds or scores
+it against its axis baseline (services/baselines); anything the pipeline missed — a full
+queue, a restart — is picked up by `backfill_features`.
+"""
+
+import asyncio
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db import async_session
+from app.models.fft_capture import FFTCapture
+from app.models.fft_feature import FFTFeature
+from app.models.fft_feature_peak import FFTFeaturePeak
+from app.services.baselines import apply_baselines
+from app.services.bearing_faults import capture_rpm
+from app.services.spectrum import SPECTRUM_DTYPE, bin_width_hz, decode_spectrum, window_peaks
+from app.services.work_queue import WorkQueue
+
+
+PEAK_COUNT = 10
+# Band edges in Hz; the last band runs to Nyquist
+FEATURE_BANDS_HZ = (0, 10, 100, 500, 1000, 2000)
+RPM_TOLERANCE = 0.02
+
+
+def extract_features(spectrum: np.ndarray, odr: int, rpm: int | None) -> dict:
+    """Peaks, band energies, running-speed amplitudes and overall RMS of one spectrum."""
+    amps = spectrum.astype(np.float64)
+    bins = len(amps)
+    width = bin_width_hz(odr, bins)
+
+    # Local maxima (DC excluded), strongest first
+    interior = amps[1:-1]
+    local = np.flatnonzero((interior > amps[:-2]) & (interior >= amps[2:])) + 1
+    if len(local) > PEAK_COUNT:
+        local = local[np.argpartition(amps[local], -PEAK_COUNT)[-PEAK_COUNT:]]
+    local = local[np.argsort(amps[local])[::-1]]
+
+    edges = np.maximum(np.searchsorted(np.arange(bins) * width, FEATURE_BANDS_HZ), 1)  # DC in no band
+    ends = np.append(edges[1:], bins)
+    power = amps ** 2
+    energies = np.add.reduceat(np.append(power, 0.0), edges)[:len(FEATURE_BANDS_HZ)]
+    energies[ends <= edges] = 0.0  # bands narrower than a bin, or starting above Nyquist
+
+    orders = {}
+    if rpm:
+        peaks, valid = window_peaks(amps, odr, np.arange(1, 4) * rpm / 60.0, RPM_TOLERANCE)
+        orders = {f"amp_{k}x": float(p) if ok else None for k, p, ok in zip((1, 2, 3), peaks, valid)}
+
+    return {
+        "overall_rms": float(np.sqrt(power[1:].sum())),
+        "peak_frequencies_hz": (local * width).tolist(),
+        "peak_amplitudes": amps[local].tolist(),
+        "band_energies": energies.tolist(),
+        "amp_1x": orders.get("amp_1x"),
+        "amp_2x": orders.get("amp_2x"),
+        "amp_3x": orders.get("amp_3x"),
+    }
+
+
+def _peak_rows(row: dict) -> list[dict]:
+    """fft_feature_peaks rows for one fft_features row (the search index of its peaks)."""
+    speed_hz = row["rpm"] / 60.0 if row["rpm"] else None
+    return [
+        {
+            "fft_capture_id": row["fft_capture_id"], "rank": rank, "sensor_id": row["sensor_id"],
+            "timestamp": row["timestamp"], "frequency_hz": frequency, "amplitude": amplitude,
+            "shaft_order": frequency / speed_hz if speed_hz else None,
+        }
+        for rank, (frequency, amplitude) in enumerate(zip(row["peak_frequencies_hz"], row["peak_amplitudes"]), 1)
+    ]
+
+
+def _capture_query():
+    return select(
+        FFTCapture.id, FFTCapture.sensor_id, FFTCapture.timestamp, FFTCapture.axis,
+        FFTCapture.odr, FFTCapture.spectrum_data, capture_rpm().label("rpm"),
+    )
+
+
+def _usable(capture) -> bool:
+    """A capture with a sample rate and a whole, non-empty spectrum (older rows were unchecked)."""
+    size = len(capture.spectrum_data)
+    itemsize = np.dtype(SPECTRUM_DTYPE).itemsize
+    return capture.odr > 0 and size > 0 and size % itemsize == 0
+
+
+async def _store(captures, db: AsyncSession) -> int:
+    """Store features for the usable captures; degenerate ones are skipped, never retried here."""
+    loop = asyncio.get_running_loop()
+    captures = [c for c in captures if _usable(c)]
+    rows = []
+    for c in captures:
+        features = await loop.run_in_executor(None, extract_features, decode_spectrum(c.spectrum_data), c.odr, c.rpm)
+        rows.append({
+            "fft_capture_id": c.id, "sensor_id": c.sensor_id, "timestamp": c.timestamp,
+            "axis": c.axis, "rpm": c.rpm, **features,
+        })
+    if rows:
+        await db.execute(insert(FFTFeature).values(rows).on_conflict_do_nothing())
+        peaks = [peak for row in rows for peak in _peak_rows(row)]
+        if peaks:
+            await db.execute(insert(FFTFeaturePeak).values(peaks).on_conflict_do_nothing())
+        await db.commit()
+        await apply_baselines(captures, db)
+    return len(rows)
+
+
+async def process_capture(item: tuple[int, str | None]) -> None:
+    """Pipeline handler: extract and store features for one committed capture."""
+    capture_id, shard = item
+    async with async_session(info={"shard": shard}) as db:
+        result = await db.execute(_capture_query().where(FFTCapture.id == capture_id))
+        await _store(result.all(), db)
+
+
+fft_pipeline = WorkQueue(
+    "fft-features", process_capture,
+    workers=settings.fft_feature_workers, maxsize=settings.fft_feature_queue_size,
+)
+
+
+async def backfill_features(db: AsyncSession, batch_size: int = 500) -> int:
+    """Extract features for every capture on this session's shard that has none yet.
+
+    Pages by capture id, so captures `_store` skips can't hold a batch up.
+    """
+    total, after = 0, 0
+    while True:
+        result = await db.execute(
+            _capture_query()
+            .outerjoin(FFTFeature, FFTFeature.fft_capture_id == FFTCapture.id)
+            .where(FFTFeature.fft_capture_id.is_(None), FFTCapture.id > after)
+            .order_by(FFTCapture.id)
+            .limit(batch_size)
+        )
+        captures = result.all()
+        if not captures:
+            return total
+        total += await _store(captures, db)
+        after = captures[-1].id
@@ -0,0 +1,150 @@
+"""Fleet-wide search over extracted FFT features, without touching spectrum blobs.
+
+Scalar metrics (overall RMS, 1×/2×/3× running-speed amplitudes) are range scans on the
+(timestamp, metric) indexes of fft_features. Peak searches — "a peak near 2× RPM above X" —
+go through fft_feature_peaks, one row per extracted peak indexed by frequency and by shaft
+order; the strongest matching peak of each capture is its value. The org's sensors (and any
+crane / component filters) are resolved on the central database first, so the shard query
+is a single indexed statement.
+
+`limit` only bounds what is returned, not what is read. A scalar search ranks every feature
+row in the time range that passes the filters. A peak search reads every peak inside the
+frequency / order window first: DISTINCT ON keeps each capture's strongest one, and only
+then are captures ranked and cut to `limit`. A window around 1× or 2× running speed matches
+most captures, so its cost grows with the number of captures in the time range.
+`python -m bench.load` times both kinds of search over --fft-captures captures.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import null, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.component import Component
+from app.models.crane import Crane
+from app.models.facility import Facility
+from app.models.fft_feature import FFTFeature
+from app.models.fft_feature_peak import FFTFeaturePeak
+from app.models.sensor import Sensor
+
+
+SCALAR_METRICS = ("overall_rms", "amp_1x", "amp_2x", "amp_3x")
+SEARCH_METRICS = (*SCALAR_METRICS, "peak")
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    metric: str
+    start: datetime
+    end: datetime
+    min_value: float | None = None
+    frequency_hz: float | None = None  # peak: centre of the frequency window
+    order: float | None = None         # peak: centre of the shaft-order window (needs RPM)
+    tolerance: float = 0.02            # peak: relative half-width of the window
+    axis: str | None = None
+    crane_id: uuid.UUID | None = None
+    component_type: str | None = None
+    limit: int = 100
+
+
+@dataclass(frozen=True)
+class SensorInfo:
+    label: str | None
+    crane_id: uuid.UUID
+    component_name: str
+    component_type: str | None
+
+
+async def _org_sensors(org_id: uuid.UUID, query: SearchQuery, db: AsyncSession) -> dict[uuid.UUID, SensorInfo]:
+    stmt = (
+        select(Sensor.id, Sensor.label, Component.crane_id, Component.name, Component.component_type)
+        .join(Component).join(Crane).join(Facility)
+        .where(Facility.org_id == org_id)
+    )
+    if query.crane_id:
+        stmt = stmt.where(Component.crane_id == query.crane_id)
+    if query.component_type:
+        stmt = stmt.where(Component.component_type.ilike(query.component_type))
+    result = await db.execute(stmt)
+    return {row.id: SensorInfo(row.label, row.crane_id, row.name, row.component_type) for row in result.all()}
+
+
+def _scalar_statement(sensor_ids: list, query: SearchQuery):
+    value = getattr(FFTFeature, query.metric)
+    stmt = (
+        select(
+            FFTFeature.fft_capture_id, FFTFeature.sensor_id, FFTFeature.timestamp, FFTFeature.axis,
+            FFTFeature.rpm, value.label("value"), null().label("frequency_hz"),
+        )
+        .where(
+            FFTFeature.sensor_id.in_(sensor_ids),
+            FFTFeature.timestamp >= query.start, FFTFeature.timestamp < query.end,
+            value.is_not(None),
+        )
+    )
+    if query.min_value is not None:
+        stmt = stmt.where(value >= query.min_value)
+    if query.axis:
+        stmt = stmt.where(FFTFeature.axis == query.axis)
+    return stmt.order_by(value.desc()).limit(query.limit)
+
+
+def _peak_statement(sensor_ids: list, query: SearchQuery):
+    if query.order is not None:
+        column, centre = FFTFeaturePeak.shaft_order, query.order
+    else:
+        column, centre = FFTFeaturePeak.frequency_hz, query.frequency_hz
+    strongest = (
+        select(
+            FFTFeaturePeak.fft_capture_id, FFTFeaturePeak.sensor_id, FFTFeaturePeak.timestamp,
+            FFTFeaturePeak.amplitude.label("value"), FFTFeaturePeak.frequency_hz,
+        )
+        .where(
+            column.between(centre * (1 - query.tolerance), centre * (1 + query.tolerance)),
+            FFTFeaturePeak.timestamp >= query.start, FFTFeaturePeak.timestamp < query.end,
+            FFTFeaturePeak.sensor_id.in_(sensor_ids),
+        )
+        .distinct(FFTFeaturePeak.fft_capture_id)
+        .order_by(FFTFeaturePeak.fft_capture_id, FFTFeaturePeak.amplitude.desc())
+    )
+    if query.min_value is not None:
+        strongest = strongest.where(FFTFeaturePeak.amplitude >= query.min_value)
+    peaks = strongest.subquery()
+    stmt = (
+        select(
+            peaks.c.fft_capture_id, peaks.c.sensor_id, peaks.c.timestamp, FFTFeature.axis,
+            FFTFeature.rpm, peaks.c.value, peaks.c.frequency_hz,
+        )
+        .join(FFTFeature, FFTFeature.fft_capture_id == peaks.c.fft_capture_id)
+    )
+    if query.axis:
+        stmt = stmt.where(FFTFeature.axis == query.axis)
+    return stmt.order_by(peaks.c.value.desc()).limit(query.limit)
+
+
+async def search_features(org_id: uuid.UUID, query: SearchQuery, db: AsyncSession) -> list[dict]:
+    """Captures across the org matching `query`, strongest first. `db` must be bound to the org's tenant."""
+    sensors = await _org_sensors(org_id, query, db)
+    if not sensors:
+        return []
+    stmt = _peak_statement(list(sensors), query) if query.metric == "peak" else _scalar_statement(list(sensors), query)
+    result = await db.execute(stmt, bind_arguments={"mapper": FFTFeature})
+    hits = []
+    for row in result.all():
+        info = sensors[row.sensor_id]
+        hits.append({
+            "fft_capture_id": row.fft_capture_id,
+            "sensor_id": row.sensor_id,
+            "sensor_label": info.label,
+            "crane_id": info.crane_id,
+            "component_name": info.component_name,
+            "component_type": info.component_type,
+            "timestamp": row.timestamp,
+            "axis": row.axis,
+            "rpm": row.rpm,
+            "value": row.value,
+            "frequency_hz": row.frequency_hz,
+        })
+    return hits
@@ -1,83 +1,185 @@
-"""Health scoring service for sensors and cranes."""
+"""Health scoring service for sensors and cranes.
 
+Per-sensor-type rules live in `RULES`. Each rule scores a whole batch of readings as NumPy
+column arrays (`classify_batch`) and can also be compiled into a SQL CASE expression
+(`health_case`), so scoring thousands of readings is one call either in Python or in the
+database. Missing values are NaN in the arrays and NULL in SQL.
+"""
+
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from typing import Iterable, Mapping
 
+import numpy as np
+from sqlalchemy import case, func, literal, or_
 
-STALE_MINUTES = 60
 
+STALE_MINUTES = 60
 
-def sensor_health(sensor_type: int, reading) -> str:
+GOOD, FAIR, NEEDS_ATTENTION, OFFLINE = 0, 1, 2, 3
+HEALTH_LABELS = ("good", "fair", "needs_attention", "offline")
+
+
+# ── Rules ──
+
+@dataclass(frozen=True)
+class ThresholdRule:
+    """Worst of `columns` (ignoring missing ones) against fair / needs_attention limits."""
+    columns: tuple[str, ...]
+    fair: float
+    attention: float
+    absolute: bool = False
+
+    def evaluate(self, cols: Mapping[str, np.ndarray]) -> np.ndarray:
+        values = np.vstack([cols[c] for c in self.columns])
+        if self.absolute:
+            values = np.abs(values)
+        worst = np.fmax.reduce(values, axis=0)  # NaN only when every column is missing
+        codes = np.select([worst >= self.attention, worst >= self.fair], [NEEDS_ATTENTION, FAIR], GOOD)
+        return np.where(np.isnan(worst), OFFLINE, codes)
+
+    def sql(self, model):
+        values = [getattr(model, c) for c in self.columns]
+        if self.absolute:
+            values = [func.abs(v) for v in values]
+        worst = func.greatest(*values) if len(values) > 1 else values[0]  # GREATEST skips NULLs
+        return case(
+            (worst.is_(None), "offline"),
+            (worst >= self.attention, "needs_attention"),
+            (worst >= self.fair, "fair"),
+            else_="good",
+        )
+
+
+@dataclass(frozen=True)
+class BandRule:
+    """Good inside [low, high], needs_attention outside."""
+    column: str
+    low: float
+    high: float
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (self.column,)
+
+    def evaluate(self, cols: Mapping[str, np.ndarray]) -> np.ndarray:
+        value = cols[self.column]
+        codes = np.where((value >= self.low) & (value <= self.high), GOOD, NEEDS_ATTENTION)
+        return np.where(np.isnan(value), OFFLINE, codes)
+
+    def sql(self, model):
+        value = getattr(model, self.column)
+        return case(
+            (value.is_(None), "offline"),
+            (value.between(self.low, self.high), "good"),
+            else_="needs_attention",
+        )
+
+
+@dataclass(frozen=True)
+class AllLiveRule:
+    """Needs attention when any of `columns` is missing or zero."""
+    columns: tuple[str, ...]
+
+    def evaluate(self, cols: Mapping[str, np.ndarray]) -> np.ndarray:
+        dead = np.zeros(len(cols[self.columns[0]]), dtype=bool)
+        for c in self.columns:
+            dead |= np.isnan(cols[c]) | (cols[c] == 0)
+        return np.where(dead, NEEDS_ATTENTION, GOOD)
+
+    def sql(self, model):
+        dead = or_(*[or_(getattr(model, c).is_(None), getattr(model, c) == 0) for c in self.columns])
+        return case((dead, "needs_attention"), else_="good")
+
+
+RULES = {
+    114: ThresholdRule(("x_velocity_mm_sec", "y_velocity_mm_sec", "z_velocity_mm_sec"), fair=0.71, attention=1.12),  # vibration
+    39: ThresholdRule(("temperature",), fair=60, attention=80),  # temperature
+    47: ThresholdRule(("roll", "pitch"), fair=2, attention=5, absolute=True),  # tilt
+    52: BandRule("mA1", 4.0, 20.0),  # 4-20mA
+    28: AllLiveRule(("channel_1", "channel_2", "channel_3")),  # 3-channel current monitor
+}
+
+# Every reading column some rule looks at
+HEALTH_COLUMNS = tuple(sorted({c for rule in RULES.values() for c in rule.columns}))
+
+
+# ── Batch scoring ──
+
+def _to_utc(ts: datetime) -> datetime:
+    return ts if ts.tzinfo is not None else ts.replace(tzinfo=timezone.utc)
+
+
+def reading_columns(readings: Iterable, columns: Iterable[str] = HEALTH_COLUMNS) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Turn readings (ORM objects, Rows or None) into (timestamps, {column: float array}).
+
+    Missing readings get a NaT timestamp; missing values become NaN.
+    """
+    readings = list(readings)
+    timestamps = np.array(
+        [np.datetime64(_to_utc(r.timestamp).replace(tzinfo=None), "us") if r is not None else np.datetime64("NaT", "us")
+         for r in readings],
+        dtype="datetime64[us]",
+    )
+    cols = {
+        c: np.array([getattr(r, c) if r is not None else None for r in readings], dtype=float)
+        for c in columns
+    }
+    return timestamps, cols
+
+
+def classify_batch(
+    sensor_types: np.ndarray,
+    timestamps: np.ndarray,
+    columns: Mapping[str, np.ndarray],
+    now: datetime | None = None,
+) -> np.ndarray:
+    """Score many readings at once. Returns an int8 array of GOOD/FAIR/NEEDS_ATTENTION/OFFLINE.
+
+    `timestamps` are naive UTC datetime64 (NaT for "no reading"); `columns` maps reading
+    column names to float arrays aligned with `sensor_types`.
+    """
+    sensor_types = np.asarray(sensor_types)
+    codes = np.full(len(sensor_types), GOOD, dtype=np.int8)
+    for sensor_type in np.unique(sensor_types):
+        rule = RULES.get(int(sensor_type))
+        if rule is None:  # unknown sensor type — good if a fresh reading exists
+            continue
+        mask = sensor_types == sensor_type
+        codes[mask] = rule.evaluate({c: np.asarray(columns[c], dtype=float)[mask] for c in rule.columns})
+
+    now = _to_utc(now or datetime.now(timezone.utc)).replace(tzinfo=None)
+    cutoff = np.datetime64(now - timedelta(minutes=STALE_MINUTES), "us")
+    timestamps = np.asarray(timestamps, dtype="datetime64[us]")
+    codes[np.isnat(timestamps) | (timestamps < cutoff)] = OFFLINE
+    return codes
+
+
+def labels(codes: np.ndarray) -> list[str]:
+    return [HEALTH_LABELS[c] for c in codes]
+
+
+def health_case(model, sensor_type, now: datetime | None = None):
+    """SQL CASE expression equivalent to `classify_batch`, for use in queries and backfills.
+
+    `model` supplies the reading columns (the Reading class or an alias); `sensor_type` is
+    the column or literal carrying the sensor type.
+    """
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(minutes=STALE_MINUTES)
+    by_type = case(
+        *[(sensor_type == t, rule.sql(model)) for t, rule in RULES.items()],
+        else_=literal("good"),
+    )
+    return case(
+        (or_(model.timestamp.is_(None), model.timestamp < cutoff), "offline"),
+        else_=by_type,
+    )
+
+
+def sensor_health(sensor_type: int, reading, now: datetime | None = None) -> str:
     """Compute health status from a single reading. Returns good/fair/needs_attention/offline."""
-    if reading is None:
-        return "offline"
-
-    ts = reading.timestamp
-    if ts.tzinfo is None:
-        ts = ts.replace(tzinfo=timezone.utc)
-    if datetime.now(timezone.utc) - ts > timedelta(minutes=STALE_MINUTES):
-        return "offline"
-
-    if sensor_type == 114:
-        # Vibration — max velocity across axes
-        vels = [
-            v for v in [
-                reading.x_velocity_mm_sec,
-                reading.y_velocity_mm_sec,
-                reading.z_velocity_mm_sec,
-            ] if v is not None
-        ]
-        if not vels:
-            return "offline"
-        max_vel = max(vels)
-        if max_vel >= 1.12:
-            return "needs_attention"
-        if max_vel >= 0.71:
-            return "fair"
-        return "good"
-
-    if sensor_type == 39:
-        # Temperature
-        temp = reading.temperature
-        if temp is None:
-            return "offline"
-        if temp >= 80:
-            return "needs_attention"
-        if temp >= 60:
-            return "fair"
-        return "good"
-
-    if sensor_type == 47:
-        # Tilt
-        roll = abs(reading.roll) if reading.roll is not None else None
-        pitch = abs(reading.pitch) if reading.pitch is not None else None
-        vals = [v for v in [roll, pitch] if v is not None]
-        if not vals:
-            return "offline"
-        worst = max(vals)
-        if worst >= 5:
-            return "needs_attention"
-        if worst >= 2:
-            return "fair"
-        return "good"
-
-    if sensor_type == 52:
-        # 4-20mA
-        ma1 = reading.mA1
-        if ma1 is None:
-            return "offline"
-        if 4.0 <= ma1 <= 20.0:
-            return "good"
-        return "needs_attention"
-
-    if sensor_type == 28:
-        # 3-channel current monitor
-        channels = [reading.channel_1, reading.channel_2, reading.channel_3]
-        if any(c is None or c == 0 for c in channels):
-            return "needs_attention"
-        return "good"
-
-    # Unknown sensor type — default good if reading exists
-    return "good"
+    timestamps, cols = reading_columns([reading])
+    return HEALTH_LABELS[classify_batch(np.array([sensor_type]), timestamps, cols, now)[0]]
 
 
 _SEVERITY = {"good": 0, "fair": 1, "needs_attention": 2}
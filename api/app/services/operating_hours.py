@@ -0,0 +1,324 @@
+"""Run sessions and cumulative operating hours per crane (PRD FR-010).
+
+A sensor is running when any axis' RMS acceleration exceeds `RUNNING_ACCEL_G`. Each
+reading's state holds until the next reading, for at most `MAX_GAP`: a running reading is
+credited min(next − t, MAX_GAP) of run time, and consecutive running readings no more than
+`MAX_GAP` apart form one run session.
+
+Ingest only queues each stored reading (`run_states`); a background worker advances the
+sensor's state machine (`advance_run_state`) with O(1) work per reading: the run_states
+row remembers the previous reading and the open session, and `transition` is the single
+rule both paths share. Run state and sessions live on the sensor's shard and change in one
+transaction there.
+
+A reading older than its sensor's last one can't be applied in order; it marks the sensor
+dirty instead, and so does a reading the queue loses (full, handler error, or still pending
+at shutdown). `rebuild` (manage.py operating-hours, run periodically) re-derives dirty
+sensors from the session before the late reading with vectorized NumPy passes
+(`derive_sessions`) and then recomputes crane totals in crane_operating_hours from the
+shard's sessions: a crane's operating time is the union of its sensors' run time — two
+components running at once count once (`union_seconds`). Totals are therefore as fresh as
+the last rebuild; `rebuild(full=True)` backfills all history.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import delete, func, select, union, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db import async_session
+from app.models.component import Component
+from app.models.crane_operating_hours import CraneOperatingHours
+from app.models.reading import Reading
+from app.models.reading_hourly import ReadingHourly
+from app.models.run_session import RunSession
+from app.models.run_state import RunState
+from app.models.sensor import Sensor
+from app.services.work_queue import WorkQueue
+
+
+RUNNING_ACCEL_G = 0.05
+ACCEL_COLUMNS = ("x_rms_ACC_G", "y_rms_ACC_G", "z_rms_ACC_G")
+MAX_GAP = timedelta(minutes=2)  # sensors report every 30 s
+UTILIZATION_WINDOW = timedelta(days=30)
+UTILIZATION_REFRESH = timedelta(days=1)  # idle cranes' 30-day utilization still decays
+
+
+def is_running(reading) -> bool | None:
+    """Running state of one reading; None when it carries no acceleration."""
+    values = [v for c in ACCEL_COLUMNS if (v := getattr(reading, c)) is not None]
+    return max(values) > RUNNING_ACCEL_G if values else None
+
+
+@dataclass(frozen=True, slots=True)
+class Transition:
+    credit: timedelta          # run time credited to the previous reading (ends its hold)
+    continues: bool            # this reading extends the previous reading's session
+    starts: bool               # this reading opens a new session
+
+
+def transition(last_timestamp: datetime, last_running: bool, timestamp: datetime, running: bool) -> Transition:
+    gap = timestamp - last_timestamp
+    credit = min(gap, MAX_GAP) if last_running else timedelta(0)
+    continues = running and last_running and gap <= MAX_GAP
+    return Transition(credit, continues, running and not continues)
+
+
+# ── Vectorized passes ──
+
+@dataclass(frozen=True)
+class DerivedSessions:
+    start: np.ndarray     # epoch seconds
+    end: np.ndarray
+    duration: np.ndarray  # seconds
+    open: bool            # the last session is still running
+
+
+def derive_sessions(t: np.ndarray, running: np.ndarray, max_gap: float = MAX_GAP.total_seconds()) -> DerivedSessions:
+    """Sessions of one sensor's time-ordered readings (epoch seconds, running flags) — the same
+    result as feeding them through `transition` one at a time."""
+    gap = np.diff(t)
+    credit = np.zeros(len(t))
+    credit[:-1] = np.where(running[:-1], np.minimum(gap, max_gap), 0.0)
+    continues = np.zeros(len(t), dtype=bool)
+    continues[1:] = running[1:] & running[:-1] & (gap <= max_gap)
+
+    first = np.flatnonzero(running & ~continues)
+    last = np.flatnonzero(running & ~np.append(continues[1:], False))
+    total = np.concatenate([[0.0], np.cumsum(credit)])
+    return DerivedSessions(
+        start=t[first],
+        end=t[last] + credit[last],
+        duration=total[last + 1] - total[first],
+        open=bool(len(t) and running[-1]),
+    )
+
+
+def union_seconds(start: np.ndarray, end: np.ndarray) -> float:
+    """Total length of the union of intervals [start, end)."""
+    order = np.argsort(start, kind="stable")
+    start, end = start[order], end[order]
+    covered = np.maximum.accumulate(np.concatenate([[-np.inf], end[:-1]]))
+    return float(np.maximum(0.0, end - np.maximum(start, covered)).sum())
+
+
+# ── Ingest path ──
+
+async def advance_run_state(sensor_id, crane_id, ts: datetime, running: bool, db: AsyncSession) -> None:
+    """Feed one stored reading to its sensor's state machine and commit."""
+    locked = select(RunState).where(RunState.sensor_id == sensor_id).with_for_update()
+    state = (await db.execute(locked)).scalar_one_or_none()
+    fresh = False
+    if state is None:
+        result = await db.execute(insert(RunState).values(
+            sensor_id=sensor_id, crane_id=crane_id, last_timestamp=ts, last_running=False,
+        ).on_conflict_do_nothing().returning(RunState.sensor_id))
+        fresh = result.scalar_one_or_none() is not None
+        state = (await db.execute(locked)).scalar_one()
+
+    if ts <= state.last_timestamp and not fresh:
+        state.dirty_since = min(state.dirty_since or ts, ts)
+        await db.commit()
+        return
+
+    step = transition(state.last_timestamp, state.last_running, ts, running)
+    session = await db.get(RunSession, state.session_id) if state.session_id is not None else None
+    if session is not None and step.credit:
+        session.ended_at = state.last_timestamp + step.credit
+        session.duration_seconds += step.credit.total_seconds()
+    if session is not None and not step.continues:
+        session.open = False
+        state.session_id = None
+    if step.starts:
+        session = RunSession(sensor_id=sensor_id, crane_id=crane_id, started_at=ts, ended_at=ts, duration_seconds=0.0, open=True)
+        db.add(session)
+        await db.flush()
+        state.session_id = session.id
+
+    state.last_timestamp, state.last_running, state.crane_id = ts, running, crane_id
+    await db.commit()
+
+
+async def mark_dirty(item: tuple) -> None:
+    """Leave a reading the state machine never saw to the next `rebuild`, in one statement."""
+    sensor_id, crane_id, ts, _, shard = item
+    async with async_session(info={"shard": shard}) as db:
+        stmt = insert(RunState).values(
+            sensor_id=sensor_id, crane_id=crane_id, last_timestamp=ts, last_running=False, dirty_since=ts,
+        )
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[RunState.sensor_id],
+            set_={"dirty_since": func.least(func.coalesce(RunState.dirty_since, ts), ts)},
+        ))
+        await db.commit()
+
+
+async def submit_reading(reading: Reading, crane_id: uuid.UUID, shard: str | None) -> None:
+    """Queue a committed reading for its sensor's state machine (no-op without acceleration)."""
+    running = is_running(reading)
+    if running is None:
+        return
+    item = (reading.sensor_id, crane_id, reading.timestamp, running, shard)
+    if not run_states.submit(item):
+        await mark_dirty(item)
+
+
+async def process_reading(item: tuple) -> None:
+    sensor_id, crane_id, ts, running, shard = item
+    try:
+        async with async_session(info={"shard": shard}) as db:
+            await advance_run_state(sensor_id, crane_id, ts, running, db)
+    except Exception:
+        await mark_dirty(item)
+        raise
+
+
+async def _mark_abandoned(items: list[tuple]) -> None:
+    for item in items:
+        await mark_dirty(item)
+
+
+# One worker keeps each sensor's readings in arrival order; readings it loses mark the sensor
+# dirty, so the periodic rebuild fills the gap
+run_states = WorkQueue(
+    "run-states", process_reading, workers=1, maxsize=settings.run_state_queue_size, on_abandoned=_mark_abandoned,
+)
+
+
+# ── Rebuild ──
+
+async def _sensor_cranes(sensor_ids: list, db: AsyncSession) -> dict:
+    result = await db.execute(
+        select(Sensor.id, Component.crane_id).join(Component).where(Sensor.id.in_(sensor_ids))
+    )
+    return dict(result.all())
+
+
+async def _rebuild_sensor(sensor_id, crane_id, since: datetime | None, db: AsyncSession) -> None:
+    """Replace the sensor's sessions from the one in progress at `since` (all, if None) onwards."""
+    await db.execute(select(RunState).where(RunState.sensor_id == sensor_id).with_for_update())
+    if since is not None:
+        result = await db.execute(
+            select(func.max(RunSession.started_at))
+            .where(RunSession.sensor_id == sensor_id, RunSession.started_at <= since)
+        )
+        since = result.scalar_one_or_none()
+
+    query = select(Reading.timestamp, *(getattr(Reading, c) for c in ACCEL_COLUMNS)).where(Reading.sensor_id == sensor_id)
+    if since is not None:
+        query = query.where(Reading.timestamp >= since)
+    result = await db.execute(query.order_by(Reading.timestamp))
+    rows = result.all()
+
+    delete_stmt = delete(RunSession).where(RunSession.sensor_id == sensor_id)
+    if since is not None:
+        delete_stmt = delete_stmt.where(RunSession.started_at >= since)
+    await db.execute(delete_stmt)
+
+    accel = np.array([r[1:] for r in rows], dtype=np.float64).reshape(len(rows), len(ACCEL_COLUMNS))
+    keep = ~np.isnan(accel).all(axis=1)
+    if not keep.any():
+        await db.execute(update(RunState).where(RunState.sensor_id == sensor_id).values(dirty_since=None))
+        return
+    t = np.array([r[0].timestamp() for r in rows])[keep]
+    running = np.nanmax(accel[keep], axis=1) > RUNNING_ACCEL_G
+    sessions = derive_sessions(t, running)
+
+    as_time = lambda s: datetime.fromtimestamp(s, timezone.utc)  # noqa: E731
+    values = [
+        {
+            "sensor_id": sensor_id, "crane_id": crane_id,
+            "started_at": as_time(s), "ended_at": as_time(e), "duration_seconds": float(d),
+            "open": sessions.open and i == len(sessions.start) - 1,
+        }
+        for i, (s, e, d) in enumerate(zip(sessions.start, sessions.end, sessions.duration))
+    ]
+    open_id = None
+    if values:
+        result = await db.execute(insert(RunSession).values(values).returning(RunSession.id))
+        ids = result.scalars().all()
+        open_id = ids[-1] if sessions.open else None
+
+    state = {
+        "sensor_id": sensor_id, "crane_id": crane_id, "last_timestamp": as_time(t[-1]),
+        "last_running": bool(running[-1]), "session_id": open_id, "dirty_since": None,
+    }
+    stmt = insert(RunState).values(state)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[RunState.sensor_id], set_={k: stmt.excluded[k] for k in state if k != "sensor_id"},
+    ))
+
+
+async def _stale_cranes(db: AsyncSession, now: datetime) -> set:
+    """Cranes whose sessions moved past their stored total, or whose utilization is a day old."""
+    result = await db.execute(select(RunSession.crane_id, func.max(RunSession.ended_at)).group_by(RunSession.crane_id))
+    latest = dict(result.all())
+    result = await db.execute(
+        select(CraneOperatingHours.crane_id, CraneOperatingHours.covered_until, CraneOperatingHours.rebuilt_at)
+        .where(CraneOperatingHours.crane_id.in_(list(latest)))
+    )
+    stored = {crane_id: (covered, rebuilt) for crane_id, covered, rebuilt in result.all()}
+    refresh_before = now - UTILIZATION_REFRESH
+    return {
+        crane_id for crane_id, ended in latest.items()
+        if crane_id not in stored or ended > stored[crane_id][0]
+        or (stored[crane_id][1] is None or stored[crane_id][1] < refresh_before)
+    }
+
+
+async def _rebuild_cranes(crane_ids: set, db: AsyncSession) -> None:
+    """Recompute crane totals from this shard's sessions (the only writer of crane_operating_hours)."""
+    now = datetime.now(timezone.utc)
+    window_start = (now - UTILIZATION_WINDOW).timestamp()
+    for crane_id in crane_ids:
+        result = await db.execute(
+            select(RunSession.started_at, RunSession.ended_at).where(RunSession.crane_id == crane_id)
+        )
+        rows = result.all()
+        if not rows:
+            continue
+        spans = np.array([(s.timestamp(), e.timestamp()) for s, e in rows])
+        recent = spans[spans[:, 1] > window_start]
+        recent = np.column_stack([np.maximum(recent[:, 0], window_start), recent[:, 1]])
+        values = {
+            "crane_id": crane_id,
+            "operating_seconds": union_seconds(spans[:, 0], spans[:, 1]),
+            "covered_until": datetime.fromtimestamp(spans[:, 1].max(), timezone.utc),
+            "utilization_30d": union_seconds(recent[:, 0], recent[:, 1]) / UTILIZATION_WINDOW.total_seconds(),
+            "rebuilt_at": now,
+        }
+        stmt = insert(CraneOperatingHours).values(values)
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[CraneOperatingHours.crane_id],
+            set_={k: stmt.excluded[k] for k in values if k != "crane_id"},
+        ))
+
+
+async def rebuild(db: AsyncSession, full: bool = False) -> int:
+    """Re-derive dirty sensors (or every sensor with `full`) on this session's shard, then bring
+    crane totals up to date. Returns how many sensors were re-derived."""
+    if full:
+        result = await db.execute(union(
+            select(ReadingHourly.sensor_id).distinct(),
+            select(RunState.sensor_id),
+        ), bind_arguments={"mapper": RunState})
+        targets = {sensor_id: None for sensor_id in result.scalars().all()}
+    else:
+        result = await db.execute(
+            select(RunState.sensor_id, RunState.dirty_since).where(RunState.dirty_since.is_not(None))
+        )
+        targets = dict(result.all())
+
+    cranes = await _sensor_cranes(list(targets), db) if targets else {}
+    for sensor_id, since in targets.items():
+        if sensor_id in cranes:
+            await _rebuild_sensor(sensor_id, cranes[sensor_id], since, db)
+            await db.commit()
+    await _rebuild_cranes(set(cranes.values()) | await _stale_cranes(db, datetime.now(timezone.utc)), db)
+    await db.commit()
+    return len(cranes)
@@ -0,0 +1,142 @@
+"""Cached tenant-ownership resolution for sensors and cranes.
+
+Authorization only needs `Facility.org_id` for a sensor or crane, which otherwise costs a
+3–4 table join per request. Ownership is resolved once, kept in a per-process dictionary
+and dropped by the asset mutation endpoints; the TTL bounds staleness across workers.
+"""
+
+import time
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.component import Component
+from app.models.crane import Crane
+from app.models.facility import Facility
+from app.models.sensor import Sensor
+
+
+@dataclass(frozen=True, slots=True)
+class SensorOwner:
+    component_id: uuid.UUID
+    crane_id: uuid.UUID
+    facility_id: uuid.UUID
+    org_id: uuid.UUID
+
+
+@dataclass(frozen=True, slots=True)
+class CraneOwner:
+    facility_id: uuid.UUID
+    org_id: uuid.UUID
+
+
+def _key(value) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+class OwnershipCache:
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._sensors: dict[uuid.UUID, tuple[SensorOwner, float]] = {}
+        self._cranes: dict[uuid.UUID, tuple[CraneOwner, float]] = {}
+
+    async def sensor(self, sensor_id, db: AsyncSession) -> SensorOwner | None:
+        key = _key(sensor_id)
+        hit = self._sensors.get(key)
+        if hit is not None and hit[1] > time.monotonic():
+            return hit[0]
+
+        result = await db.execute(
+            select(Sensor.component_id, Component.crane_id, Crane.facility_id, Facility.org_id)
+            .select_from(Sensor).join(Component).join(Crane).join(Facility)
+            .where(Sensor.id == key)
+        )
+        row = result.one_or_none()
+        if row is None:
+            self._sensors.pop(key, None)
+            return None
+        owner = SensorOwner(*row)
+        self._sensors[key] = (owner, time.monotonic() + self.ttl_seconds)
+        return owner
+
+    async def crane(self, crane_id, db: AsyncSession) -> CraneOwner | None:
+        key = _key(crane_id)
+        hit = self._cranes.get(key)
+        if hit is not None and hit[1] > time.monotonic():
+            return hit[0]
+
+        result = await db.execute(
+            select(Crane.facility_id, Facility.org_id).select_from(Crane).join(Facility).where(Crane.id == key)
+        )
+        row = result.one_or_none()
+        if row is None:
+            self._cranes.pop(key, None)
+            return None
+        owner = CraneOwner(*row)
+        self._cranes[key] = (owner, time.monotonic() + self.ttl_seconds)
+        return owner
+
+    async def sensor_org(self, sensor_id, db: AsyncSession) -> uuid.UUID | None:
+        owner = await self.sensor(sensor_id, db)
+        return owner.org_id if owner else None
+
+    async def crane_org(self, crane_id, db: AsyncSession) -> uuid.UUID | None:
+        owner = await self.crane(crane_id, db)
+        return owner.org_id if owner else None
+
+    async def warm(self, db: AsyncSession) -> tuple[int, int]:
+        """Load every sensor's and crane's ownership in two queries. Returns (sensors, cranes)."""
+        expires = time.monotonic() + self.ttl_seconds
+        sensors = await db.execute(
+            select(Sensor.id, Sensor.component_id, Component.crane_id, Crane.facility_id, Facility.org_id)
+            .select_from(Sensor).join(Component).join(Crane).join(Facility)
+        )
+        for sensor_id, *owner in sensors:
+            self._sensors[sensor_id] = (SensorOwner(*owner), expires)
+        cranes = await db.execute(
+            select(Crane.id, Crane.facility_id, Facility.org_id).select_from(Crane).join(Facility)
+        )
+        for crane_id, *owner in cranes:
+            self._cranes[crane_id] = (CraneOwner(*owner), expires)
+        return len(self._sensors), len(self._cranes)
+
+    # ── Invalidation (called by the asset mutation endpoints) ──
+
+    def invalidate_sensor(self, sensor_id):
+        self._sensors.pop(_key(sensor_id), None)
+
+    def invalidate_component(self, component_id):
+        component_id = _key(component_id)
+        for key in [k for k, (o, _) in self._sensors.items() if o.component_id == component_id]:
+            del self._sensors[key]
+
+    def invalidate_crane(self, crane_id):
+        crane_id = _key(crane_id)
+        self._cranes.pop(crane_id, None)
+        for key in [k for k, (o, _) in self._sensors.items() if o.crane_id == crane_id]:
+            del self._sensors[key]
+
+    def invalidate_facility(self, facility_id):
+        facility_id = _key(facility_id)
+        for key in [k for k, (o, _) in self._cranes.items() if o.facility_id == facility_id]:
+            del self._cranes[key]
+        for key in [k for k, (o, _) in self._sensors.items() if o.facility_id == facility_id]:
+            del self._sensors[key]
+
+    def clear(self):
+        self._sensors.clear()
+        self._cranes.clear()
+
+
+ownership = OwnershipCache(settings.ownership_cache_ttl_seconds)
+
+
+async def sensor_in_org(sensor_id, org_id: uuid.UUID, db: AsyncSession) -> bool:
+    return await ownership.sensor_org(sensor_id, db) == org_id
+
+
+async def crane_in_org(crane_id, org_id: uuid.UUID, db: AsyncSession) -> bool:
+    return await ownership.crane_org(crane_id, db) == org_id
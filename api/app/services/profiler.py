@@ -0,0 +1,178 @@
+"""Opt-in sampling profiler for slow requests.
+
+While any request is being recorded, one daemon thread wakes every `interval_ms`, asks which
+asyncio task the event loop is running and, if that task is a recorded request, folds the
+loop thread's current stack into the request's counts. Nothing is traced per call, so the
+cost is a few microseconds per sample and zero when no request is recorded.
+
+With the profiler enabled every request is recorded; on completion it is kept when it took
+at least `threshold_ms`, or when it is the 1-in-`sample_one_in` pick, and dropped otherwise.
+Kept profiles go into a ring buffer of the most recent `buffer_size`. Stacks are on-CPU
+samples of the loop thread: time spent awaiting the database shows up in `db_ms` and the
+statement count, not in the stacks. Work pushed to the thread pool (sync dependencies) is
+not sampled. Configuration is per process and changes at runtime via the admin endpoints.
+"""
+
+import asyncio
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from app.config import settings
+from app.db import QueryStats
+
+
+MAX_STACK_DEPTH = 128
+
+
+@dataclass
+class Recording:
+    task: asyncio.Task
+    sampled: bool  # the 1-in-N pick; kept whatever its duration
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    stacks: Counter = field(default_factory=Counter)
+    samples: int = 0
+
+
+@dataclass(frozen=True)
+class Profile:
+    id: int
+    started_at: datetime
+    method: str
+    route: str
+    status: int
+    duration_ms: float
+    reason: str  # "slow" or "sampled"
+    interval_ms: float
+    samples: int
+    statements: int
+    db_ms: float
+    stacks: tuple[tuple[str, int], ...]  # (folded stack, samples), heaviest first
+
+    def folded(self) -> str:
+        """Collapsed stacks (`frame;frame;frame count`), as read by flamegraph.pl, speedscope and inferno."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks)
+
+
+def _frame_label(code) -> str:
+    path = code.co_filename
+    for root in sys.path:
+        if root and path.startswith(root):
+            path = os.path.relpath(path, root)
+            break
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({path}:{code.co_firstlineno})"
+
+
+def _is_loop_frame(code) -> bool:
+    """The event loop's Handle._run: everything below it is loop machinery, not the request."""
+    return code.co_name == "_run" and code.co_filename.endswith(os.path.join("asyncio", "events.py"))
+
+
+class SamplingProfiler:
+    def __init__(self, enabled: bool, threshold_ms: float, sample_one_in: int, interval_ms: float, buffer_size: int):
+        self.enabled = enabled
+        self.threshold_ms = threshold_ms
+        self.sample_one_in = sample_one_in
+        self.interval_ms = interval_ms
+        self.profiles: deque[Profile] = deque(maxlen=buffer_size)
+        self._active: dict[asyncio.Task, Recording] = {}
+        self._requests = itertools.count(1)
+        self._ids = itertools.count(1)
+        self._labels: dict = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def configure(self, **changes) -> None:
+        buffer_size = changes.pop("buffer_size", None)
+        for name, value in changes.items():
+            setattr(self, name, value)
+        if buffer_size is not None and buffer_size != self.profiles.maxlen:
+            self.profiles = deque(self.profiles, maxlen=buffer_size)
+
+    # ── Recording (event loop thread) ──
+
+    def begin(self) -> Recording | None:
+        task = asyncio.current_task()
+        if not self.enabled or task is None:
+            return None
+        sampled = self.sample_one_in > 0 and next(self._requests) % self.sample_one_in == 0
+        recording = Recording(task, sampled)
+        self._loop, self._loop_thread = asyncio.get_running_loop(), threading.get_ident()
+        with self._lock:
+            self._active[task] = recording
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample, name="request-profiler", daemon=True)
+                self._thread.start()
+        return recording
+
+    def end(self, recording: Recording, method: str, route: str, status: int, seconds: float, stats: QueryStats | None) -> Profile | None:
+        with self._lock:  # the sampler writes counts under the lock
+            self._active.pop(recording.task, None)
+        duration_ms = seconds * 1000
+        slow = duration_ms >= self.threshold_ms
+        if not (slow or recording.sampled):
+            return None
+        profile = Profile(
+            id=next(self._ids),
+            started_at=recording.started_at,
+            method=method,
+            route=route,
+            status=status,
+            duration_ms=round(duration_ms, 1),
+            reason="slow" if slow else "sampled",
+            interval_ms=self.interval_ms,
+            samples=recording.samples,
+            statements=stats.statements if stats else 0,
+            db_ms=round(stats.db_seconds * 1000, 1) if stats else 0.0,
+            stacks=tuple((";".join(self._label(c) for c in stack), n) for stack, n in recording.stacks.most_common()),
+        )
+        self.profiles.append(profile)
+        return profile
+
+    def get(self, profile_id: int) -> Profile | None:
+        return next((p for p in self.profiles if p.id == profile_id), None)
+
+    def clear(self) -> None:
+        self.profiles.clear()
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = _frame_label(code)
+        return label
+
+    # ── Sampling (profiler thread) ──
+
+    def _sample(self) -> None:
+        while True:
+            time.sleep(self.interval_ms / 1000)
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                recording = self._active.get(asyncio.current_task(self._loop))
+                frame = sys._current_frames().get(self._loop_thread) if recording is not None else None
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH and not _is_loop_frame(frame.f_code):
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                recording.stacks[tuple(reversed(stack))] += 1
+                recording.samples += 1
+
+
+profiler = SamplingProfiler(
+    enabled=settings.profiler_enabled,
+    threshold_ms=settings.profiler_threshold_ms,
+    sample_one_in=settings.profiler_sample_one_in,
+    interval_ms=settings.profiler_interval_ms,
+    buffer_size=settings.profiler_buffer_size,
+)
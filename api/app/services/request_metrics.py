@@ -0,0 +1,87 @@
+"""Per-route request and SQL accounting, exposed in the Prometheus text format at /metrics
+(operator token required, like /api/v1/admin/*).
+
+`QueryStatsMiddleware` (app.middleware) calls `observe` once per HTTP request with the
+route template, so label cardinality is bounded by the number of routes. Counters are plain
+per-process integers; each worker reports its own.
+"""
+
+import bisect
+from dataclasses import dataclass, field
+
+from app.db import QueryStats
+
+
+STATEMENT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.5, 1.0, 2.5, 5.0)
+
+
+@dataclass
+class RouteMetrics:
+    requests: int = 0
+    server_errors: int = 0
+    seconds: float = 0.0
+    statements: int = 0
+    rows: int = 0
+    db_seconds: float = 0.0
+    over_budget: int = 0
+    seconds_counts: list[int] = field(default_factory=lambda: [0] * (len(SECONDS_BUCKETS) + 1))
+    statement_counts: list[int] = field(default_factory=lambda: [0] * (len(STATEMENT_BUCKETS) + 1))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+class RequestMetrics:
+    def __init__(self):
+        self._routes: dict[tuple[str, str], RouteMetrics] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: QueryStats) -> None:
+        m = self._routes.get((method, route))
+        if m is None:
+            m = self._routes[(method, route)] = RouteMetrics()
+        m.requests += 1
+        m.server_errors += status >= 500
+        m.seconds += seconds
+        m.statements += stats.statements
+        m.rows += stats.rows
+        m.db_seconds += stats.db_seconds
+        m.over_budget += stats.over_budget
+        m.seconds_counts[bisect.bisect_left(SECONDS_BUCKETS, seconds)] += 1
+        m.statement_counts[bisect.bisect_left(STATEMENT_BUCKETS, stats.statements)] += 1
+
+    def _histogram(self, lines: list[str], name: str, labels: str, bounds, counts: list[int], total: float, n: int):
+        cumulative = 0
+        for bound, count in zip((*bounds, "+Inf"), counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {total}")
+        lines.append(f"{name}_count{{{labels}}} {n}")
+
+    def render(self) -> str:
+        counters = {
+            "api_requests_total": ("Requests handled", lambda m: m.requests),
+            "api_server_errors_total": ("Responses with a 5xx status", lambda m: m.server_errors),
+            "api_db_rows_total": ("Rows returned or affected by SQL statements", lambda m: m.rows),
+            "api_db_seconds_total": ("Time spent executing SQL statements", lambda m: m.db_seconds),
+            "api_query_budget_exceeded_total": ("Requests that ran more statements than their route's budget", lambda m: m.over_budget),
+        }
+        routes = sorted(self._routes.items())
+        lines = []
+        for name, (help_text, value) in counters.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines += [f'{name}{{method="{method}",route="{_escape(route)}"}} {value(m)}' for (method, route), m in routes]
+
+        lines += ["# HELP api_request_seconds Request handling time", "# TYPE api_request_seconds histogram"]
+        for (method, route), m in routes:
+            labels = f'method="{method}",route="{_escape(route)}"'
+            self._histogram(lines, "api_request_seconds", labels, SECONDS_BUCKETS, m.seconds_counts, m.seconds, m.requests)
+        lines += ["# HELP api_db_statements SQL statements per request", "# TYPE api_db_statements histogram"]
+        for (method, route), m in routes:
+            labels = f'method="{method}",route="{_escape(route)}"'
+            self._histogram(lines, "api_db_statements", labels, STATEMENT_BUCKETS, m.statement_counts, m.statements, m.requests)
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
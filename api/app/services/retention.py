@@ -0,0 +1,242 @@
+"""Retention engine for the PRD §5.2 tiers: raw readings, FFT captures, hourly summaries.
+
+Raw readings are only deleted once the hour that covers them exists in readings_hourly.
+Deletes run in bounded batches with a commit (and a short pause) between each one, so no
+statement holds row locks for long or produces a large WAL burst. When a time-series table
+is range-partitioned, partitions that are entirely past every org's cutoff are detached
+concurrently and dropped instead. Alerts are kept indefinitely and never touched here.
+"""
+
+import asyncio
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import column, delete, func, literal_column, select, table as sa_table, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.component import Component
+from app.models.crane import Crane
+from app.models.facility import Facility
+from app.models.fft_capture import FFTCapture
+from app.models.organization import Organization
+from app.models.reading import Reading
+from app.models.reading_hourly import ReadingHourly
+from app.models.retention_policy import RetentionPolicy
+from app.models.sensor import Sensor
+from app.services.rollup import rollup_exists_clause
+from app.services.sharding import bind_tenant
+
+
+@dataclass
+class TierResult:
+    table: str
+    cutoff: datetime
+    rows: int = 0
+    bytes: int = 0
+    uncovered_rows: int = 0  # raw rows past the cutoff still waiting on an hourly rollup
+
+
+@dataclass
+class RetentionReport:
+    org_id: uuid.UUID | None
+    dry_run: bool
+    tiers: list[TierResult] = field(default_factory=list)
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        return sum(t.bytes for t in self.tiers)
+
+
+@dataclass
+class PartitionResult:
+    table: str
+    partition: str
+    upper_bound: datetime
+    bytes: int
+    dropped: bool = False
+
+
+async def policy_for_org(org_id: uuid.UUID, db: AsyncSession) -> RetentionPolicy:
+    result = await db.execute(select(RetentionPolicy).where(RetentionPolicy.org_id == org_id))
+    policy = result.scalar_one_or_none()
+    if policy is None:
+        policy = RetentionPolicy(
+            org_id=org_id,
+            raw_days=settings.retention_raw_days,
+            fft_days=settings.retention_fft_days,
+            hourly_days=settings.retention_hourly_days,
+        )
+    return policy
+
+
+async def _org_sensor_ids(org_id: uuid.UUID, db: AsyncSession) -> list[uuid.UUID]:
+    result = await db.execute(
+        select(Sensor.id).join(Component).join(Crane).join(Facility).where(Facility.org_id == org_id)
+    )
+    return list(result.scalars().all())
+
+
+def _row_size(model):
+    # Whole-row reference, e.g. pg_column_size(readings.*) — logical bytes of the tuple
+    return func.pg_column_size(literal_column(f"{model.__tablename__}.*"))
+
+
+async def _purge(
+    db: AsyncSession,
+    model,
+    conditions: list,
+    keys: tuple,
+    dry_run: bool,
+    tier: TierResult,
+) -> None:
+    if dry_run:
+        result = await db.execute(
+            select(func.count(), func.coalesce(func.sum(_row_size(model)), 0))
+            .select_from(model)
+            .where(*conditions)
+        )
+        tier.rows, tier.bytes = result.one()
+        return
+
+    batch_size = settings.retention_batch_size
+    while True:
+        batch = select(*keys).where(*conditions).limit(batch_size)
+        result = await db.execute(delete(model).where(tuple_(*keys).in_(batch)).returning(_row_size(model)))
+        sizes = result.scalars().all()
+        await db.commit()
+        tier.rows += len(sizes)
+        tier.bytes += sum(sizes)
+        if len(sizes) < batch_size:
+            return
+        await asyncio.sleep(settings.retention_batch_pause_seconds)
+
+
+async def apply_retention(org_id: uuid.UUID, db: AsyncSession, dry_run: bool = True) -> RetentionReport:
+    """Enforce one org's retention policy. With dry_run, only count what would be removed."""
+    policy = await policy_for_org(org_id, db)
+    sensor_ids = await _org_sensor_ids(org_id, db)
+    report = RetentionReport(org_id=org_id, dry_run=dry_run)
+    if not sensor_ids:
+        return report
+    await bind_tenant(db, org_id)
+
+    now = datetime.now(timezone.utc)
+
+    raw = TierResult("readings", now - timedelta(days=policy.raw_days))
+    old_raw = [Reading.sensor_id.in_(sensor_ids), Reading.timestamp < raw.cutoff]
+    await _purge(db, Reading, old_raw + [rollup_exists_clause()], (Reading.id,), dry_run, raw)
+    if dry_run:
+        result = await db.execute(
+            select(func.count()).select_from(Reading).where(*old_raw, ~rollup_exists_clause())
+        )
+        raw.uncovered_rows = result.scalar_one()
+    report.tiers.append(raw)
+
+    fft = TierResult("fft_captures", now - timedelta(days=policy.fft_days))
+    await _purge(
+        db, FFTCapture,
+        [FFTCapture.sensor_id.in_(sensor_ids), FFTCapture.timestamp < fft.cutoff],
+        (FFTCapture.id,), dry_run, fft,
+    )
+    report.tiers.append(fft)
+
+    hourly = TierResult("readings_hourly", now - timedelta(days=policy.hourly_days))
+    await _purge(
+        db, ReadingHourly,
+        [ReadingHourly.sensor_id.in_(sensor_ids), ReadingHourly.hour < hourly.cutoff],
+        (ReadingHourly.sensor_id, ReadingHourly.hour), dry_run, hourly,
+    )
+    report.tiers.append(hourly)
+
+    return report
+
+
+# ── Partitions ──
+
+def _partition_table(name: str):
+    return sa_table(name, column("sensor_id"), column("timestamp"))
+
+
+_UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+
+async def _partitions(table: str, db: AsyncSession) -> list[tuple[str, datetime, int]]:
+    result = await db.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), pg_total_relation_size(c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ),
+        {"parent": table},
+        bind_arguments={"mapper": Reading},
+    )
+    partitions = []
+    for name, bound, size in result.all():
+        match = _UPPER_BOUND.search(bound or "")
+        if match is None:  # DEFAULT partition or MAXVALUE bound
+            continue
+        try:
+            upper = datetime.fromisoformat(match.group(1))
+        except ValueError:
+            continue
+        if upper.tzinfo is None:
+            upper = upper.replace(tzinfo=timezone.utc)
+        partitions.append((name, upper, size))
+    return partitions
+
+
+async def detach_expired_partitions(db: AsyncSession, dry_run: bool = True) -> list[PartitionResult]:
+    """Detach and drop time-series partitions that every org's policy has expired.
+
+    Runs against the shard in ``db.info["shard"]`` on sharded deployments.
+
+    A partition qualifies when its upper bound is older than the most generous org cutoff.
+    Raw reading partitions additionally require every row to be covered by a rollup.
+    No-op for tables that are not partitioned.
+    """
+    result = await db.execute(select(Organization.id))
+    policies = [await policy_for_org(org_id, db) for org_id in result.scalars().all()]
+    now = datetime.now(timezone.utc)
+    raw_days = max([p.raw_days for p in policies], default=settings.retention_raw_days)
+    fft_days = max([p.fft_days for p in policies], default=settings.retention_fft_days)
+    cutoffs = {
+        Reading.__tablename__: now - timedelta(days=raw_days),
+        FFTCapture.__tablename__: now - timedelta(days=fft_days),
+    }
+
+    results = []
+    for table, cutoff in cutoffs.items():
+        for name, upper, size in await _partitions(table, db):
+            if upper > cutoff:
+                continue
+            if table == Reading.__tablename__:
+                partition = _partition_table(name)
+                uncovered = await db.execute(
+                    select(literal_column("1")).select_from(partition)
+                    .where(~rollup_exists_clause(partition))
+                    .limit(1),
+                    bind_arguments={"mapper": Reading},
+                )
+                if uncovered.first() is not None:
+                    continue
+            results.append(PartitionResult(table, name, upper, size))
+
+    await db.commit()
+    if dry_run or not results:
+        return results
+
+    # DETACH ... CONCURRENTLY cannot run inside a transaction block
+    conn = await db.connection(
+        bind_arguments={"mapper": Reading},
+        execution_options={"isolation_level": "AUTOCOMMIT"},
+    )
+    quote = conn.dialect.identifier_preparer.quote
+    for part in results:
+        await conn.execute(text(f"ALTER TABLE {quote(part.table)} DETACH PARTITION {quote(part.partition)} CONCURRENTLY"))
+        await conn.execute(text(f"DROP TABLE {quote(part.partition)}"))
+        part.dropped = True
+    await db.commit()
+    return results
@@ -0,0 +1,208 @@
+"""Per-sensor rolling-window statistics from hourly buckets.
+
+Each sensor keeps a ring of `rolling_window_hours` hourly buckets (count, sum, max per
+ROLLUP_METRICS metric). A reading updates one bucket in O(1); a window query ("mean / max
+over the last 24 h, now vs 7 days ago") reduces at most a few hundred buckets with NumPy,
+so trend alerts and the trend API never scan raw readings.
+
+State is per process: `rebuild` reloads it from readings_hourly plus the not-yet-rolled-up
+raw readings at startup, and ingest feeds new readings in. Readings added while a rebuild
+runs are folded into the rebuilt state at the swap, unless its snapshot already saw them.
+With several workers each one only adds the readings it ingested itself on top of the
+rebuilt history, so live means are sampled estimates until the next rebuild.
+"""
+
+import uuid
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import BigInteger, any_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.config import settings
+from app.db import async_session
+from app.models.reading import Reading
+from app.models.reading_hourly import ReadingHourly
+from app.services.rollup import ROLLUP_METRICS, hour_floor, hourly_select
+from app.services.sharding import shard_names
+
+
+def _hour_number(ts: datetime) -> int:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return int(ts.timestamp() // 3600)
+
+
+@dataclass(frozen=True, slots=True)
+class WindowStats:
+    count: int
+    mean: float | None
+    max: float | None
+
+
+@dataclass(frozen=True, slots=True)
+class Trend:
+    current: WindowStats
+    previous: WindowStats
+
+    @property
+    def change_percent(self) -> float | None:
+        if self.current.mean is None or not self.previous.mean:
+            return None
+        return (self.current.mean - self.previous.mean) / abs(self.previous.mean) * 100
+
+
+class _SensorBuckets:
+    __slots__ = ("hours", "count", "total", "peak")
+
+    def __init__(self, metrics: int, size: int):
+        self.hours = np.full(size, -1, dtype=np.int64)
+        self.count = np.zeros((metrics, size), dtype=np.int32)
+        self.total = np.zeros((metrics, size), dtype=np.float64)
+        self.peak = np.full((metrics, size), -np.inf, dtype=np.float32)
+
+    def slot(self, hour: int) -> int | None:
+        """Ring slot for `hour`, recycling it if it still holds an older hour."""
+        s = hour % len(self.hours)
+        if self.hours[s] == hour:
+            return s
+        if self.hours[s] > hour:  # older than the ring covers
+            return None
+        self.hours[s] = hour
+        self.count[:, s] = 0
+        self.total[:, s] = 0.0
+        self.peak[:, s] = -np.inf
+        return s
+
+
+class RollingStats:
+    def __init__(self, window_hours: int, metrics: tuple[str, ...] = ROLLUP_METRICS):
+        self.window_hours = window_hours
+        self.metrics = metrics
+        self._index = {m: i for i, m in enumerate(metrics)}
+        self._sensors: dict[uuid.UUID, _SensorBuckets] = {}
+        self._pending: list | None = None  # readings added during a rebuild
+        self.ready = False
+
+    def _buckets(self, sensors: dict, sensor_id) -> _SensorBuckets:
+        buckets = sensors.get(sensor_id)
+        if buckets is None:
+            buckets = sensors[sensor_id] = _SensorBuckets(len(self.metrics), self.window_hours)
+        return buckets
+
+    def add(self, reading) -> None:
+        """Fold one reading into its sensor's current bucket."""
+        if self._pending is not None:
+            self._pending.append(reading)
+        self._fold(self._sensors, reading)
+
+    def _fold(self, sensors: dict, reading) -> None:
+        buckets = self._buckets(sensors, reading.sensor_id)
+        s = buckets.slot(_hour_number(reading.timestamp))
+        if s is None:
+            return
+        for i, metric in enumerate(self.metrics):
+            value = getattr(reading, metric)
+            if value is None:
+                continue
+            buckets.count[i, s] += 1
+            buckets.total[i, s] += value
+            if value > buckets.peak[i, s]:
+                buckets.peak[i, s] = value
+
+    def window(self, sensor_id, metric: str, hours: int, end: datetime | None = None) -> WindowStats:
+        """Stats over the `hours` hourly buckets ending with the one containing `end` (default now)."""
+        buckets = self._sensors.get(sensor_id)
+        if buckets is None:
+            return WindowStats(0, None, None)
+        last = _hour_number(end or datetime.now(timezone.utc))
+        inside = (buckets.hours > last - hours) & (buckets.hours <= last)
+        i = self._index[metric]
+        count = int(buckets.count[i, inside].sum())
+        if not count:
+            return WindowStats(0, None, None)
+        return WindowStats(
+            count,
+            float(buckets.total[i, inside].sum() / count),
+            float(buckets.peak[i, inside].max()),
+        )
+
+    def trend(self, sensor_id, metric: str, days: int, window_hours: int = 24, now: datetime | None = None) -> Trend:
+        """The last `window_hours` compared with the same-length window `days` earlier."""
+        now = now or datetime.now(timezone.utc)
+        return Trend(
+            current=self.window(sensor_id, metric, window_hours, now),
+            previous=self.window(sensor_id, metric, window_hours, now - timedelta(days=days)),
+        )
+
+    # ── Rebuild ──
+
+    def _merge(self, sensors: dict, row) -> None:
+        buckets = self._buckets(sensors, row.sensor_id)
+        s = buckets.slot(_hour_number(row.hour))
+        if s is None:
+            return
+        for i, metric in enumerate(self.metrics):
+            avg, peak = getattr(row, f"{metric}_avg"), getattr(row, f"{metric}_max")
+            if avg is None:
+                continue
+            count = getattr(row, f"{metric}_count")
+            if count is None:  # rolled up before per-metric counts existed
+                count = row.reading_count
+            buckets.count[i, s] = count
+            buckets.total[i, s] = avg * count
+            buckets.peak[i, s] = peak
+
+    async def rebuild(self) -> None:
+        """Reload every sensor from readings_hourly, plus raw readings not yet rolled up."""
+        now = datetime.now(timezone.utc)
+        start = hour_floor(now) - timedelta(hours=self.window_hours - 1)
+        sensors: dict[uuid.UUID, _SensorBuckets] = {}
+        self._pending = []
+        try:
+            async with AsyncExitStack() as stack:
+                snapshots = []
+                for shard in shard_names():
+                    db = await stack.enter_async_context(async_session(info={"shard": shard}))
+                    # One snapshot per shard, kept open to tell which later adds it already saw
+                    await db.connection(
+                        bind_arguments={"mapper": Reading},
+                        execution_options={"isolation_level": "REPEATABLE READ"},
+                    )
+                    snapshots.append(db)
+                    result = await db.execute(select(ReadingHourly).where(ReadingHourly.hour >= start))
+                    for row in result.scalars():
+                        self._merge(sensors, row)
+
+                    latest = await db.execute(select(func.max(ReadingHourly.hour)))
+                    rolled_until = latest.scalar_one_or_none()
+                    raw_start = max(start, rolled_until + timedelta(hours=1)) if rolled_until else start
+                    query, _ = hourly_select(raw_start, now + timedelta(hours=1), None)
+                    result = await db.execute(query)
+                    for row in result.all():
+                        self._merge(sensors, row)
+
+                seen, checked = set(), 0
+                while checked < len(self._pending):
+                    ids = [r.id for r in self._pending[checked:]]
+                    checked = len(self._pending)
+                    for db in snapshots:
+                        result = await db.execute(select(Reading.id).where(Reading.id == any_(
+                            bindparam("ids", ids, type_=ARRAY(BigInteger))
+                        )))
+                        seen.update(result.scalars())
+            for reading in self._pending:
+                if reading.id not in seen:
+                    self._fold(sensors, reading)
+            self._sensors = sensors
+        finally:
+            self._pending = None
+        self.ready = True
+
+    def forget(self, sensor_id) -> None:
+        self._sensors.pop(sensor_id, None)
+
+
+rolling_stats = RollingStats(settings.rolling_window_hours)
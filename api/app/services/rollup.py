@@ -0,0 +1,90 @@
+"""Hourly rollups of raw readings into readings_hourly (PRD §3.4, Phase 2)."""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.reading import Reading
+from app.models.reading_hourly import ReadingHourly
+
+
+ROLLUP_METRICS = (
+    "temperature",
+    "x_rms_ACC_G", "y_rms_ACC_G", "z_rms_ACC_G",
+    "x_velocity_mm_sec", "y_velocity_mm_sec", "z_velocity_mm_sec",
+)
+
+
+def hour_floor(ts: datetime) -> datetime:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def hourly_select(start: datetime, end: datetime, sensor_ids: list | None):
+    hour = func.date_trunc("hour", Reading.timestamp).label("hour")
+    columns = [Reading.sensor_id.label("sensor_id"), hour, func.count().label("reading_count")]
+    for metric in ROLLUP_METRICS:
+        col = getattr(Reading, metric)
+        columns.append(func.avg(col).label(f"{metric}_avg"))
+        columns.append(func.max(col).label(f"{metric}_max"))
+    columns.append(func.min(Reading.battery_percent).label("battery_percent_min"))
+    for metric in ROLLUP_METRICS:
+        columns.append(func.count(getattr(Reading, metric)).label(f"{metric}_count"))
+
+    query = (
+        select(*columns)
+        .where(Reading.timestamp >= start, Reading.timestamp < end)
+        .group_by(Reading.sensor_id, hour)
+    )
+    if sensor_ids is not None:
+        query = query.where(Reading.sensor_id.in_(sensor_ids))
+    return query, [c.name for c in columns]
+
+
+async def rollup_hours(
+    db: AsyncSession,
+    start: datetime,
+    end: datetime,
+    sensor_ids: list | None = None,
+) -> int:
+    """Upsert hourly summaries for [start, end), one day per statement. Returns rows written.
+
+    Only complete hours are rolled up — `end` is clamped to the start of the current hour.
+    Re-running over the same range is safe and picks up late-arriving readings.
+    """
+    start = hour_floor(start)
+    end = min(hour_floor(end), hour_floor(datetime.now(timezone.utc)))
+    written = 0
+    while start < end:
+        chunk_end = min(start + timedelta(days=1), end)
+        query, names = hourly_select(start, chunk_end, sensor_ids)
+        stmt = insert(ReadingHourly).from_select(names, query)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ReadingHourly.sensor_id, ReadingHourly.hour],
+            set_={name: stmt.excluded[name] for name in names[2:]},
+        )
+        result = await db.execute(stmt)
+        await db.commit()
+        written += max(result.rowcount, 0)
+        start = chunk_end
+    return written
+
+
+def rollup_exists_clause(source=None):
+    """Correlated EXISTS: the hour covering a raw reading row has been rolled up.
+
+    `source` defaults to the readings table; pass another FROM (e.g. a partition) to reuse
+    the check against it.
+    """
+    source = Reading.__table__ if source is None else source
+    return (
+        select(ReadingHourly.sensor_id)
+        .where(
+            ReadingHourly.sensor_id == source.c.sensor_id,
+            ReadingHourly.hour == func.date_trunc("hour", source.c.timestamp),
+        )
+        .exists()
+    )
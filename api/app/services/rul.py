@@ -0,0 +1,279 @@
+"""Remaining-useful-life estimates from hourly velocity trends (PRD FR-009).
+
+Each sensor's worst-axis hourly mean velocity over the last `FIT_WINDOW` of readings_hourly
+is fitted with an exponential degradation curve v(t) = level · e^(rate·t), t in hours since
+the last bucket, and projected to the ISO 10816 Zone C boundary. Fits run in a process pool
+from `manage.py rul`: each starts from the sensor's previous parameters shifted to the new
+anchor, and a sensor is only refitted once `REFIT_AFTER` of new hourly data has arrived.
+
+Everything the chart needs — parameters, the daily curve with its 90% band, and the times
+the fit and the band cross the threshold — is stored in rul_estimates, so the API only
+reads rows (through the `rul_estimates` cache). RUL is in calendar hours; the API also
+scales it to operating hours with the crane's 30-day utilization (services/operating_hours).
+"""
+
+import asyncio
+import math
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.reading_hourly import ReadingHourly
+from app.models.rul_estimate import RulEstimate
+from app.services.health import RULES
+
+
+ZONE_C_MM_SEC = RULES[114].attention  # ISO 10816 Class II B/C boundary (PRD Appendix A)
+VELOCITY_COLUMNS = ("x_velocity_mm_sec_avg", "y_velocity_mm_sec_avg", "z_velocity_mm_sec_avg")
+FIT_WINDOW = timedelta(days=90)
+MIN_SPAN = timedelta(days=30)
+MIN_POINTS = 7 * 24
+REFIT_AFTER = timedelta(hours=24)
+HORIZON_HOURS = 365 * 24
+MIN_PROJECTION_HOURS = 30 * 24
+BAND_Z = 1.645  # two-sided 90%
+
+
+def _hour_time(hour: float) -> datetime:
+    return datetime.fromtimestamp(hour * 3600, timezone.utc)
+
+
+def _iso(hour: float) -> str:
+    return _hour_time(hour).isoformat()
+
+
+def _curve(t: np.ndarray, level: float, rate: float, covariance: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Fitted values and their standard error (delta method) at hours `t`."""
+    growth = np.exp(rate * t)
+    jacobian = np.stack([growth, level * t * growth], axis=1)
+    variance = np.einsum("ij,jk,ik->i", jacobian, covariance, jacobian)
+    return level * growth, np.sqrt(np.maximum(variance, 0.0))
+
+
+def _initial_guess(t: np.ndarray, y: np.ndarray, counts: np.ndarray) -> tuple[float, float]:
+    """Log-linear least squares, used when there is no previous fit to start from."""
+    positive = y > 0
+    rate, log_level = np.polyfit(t[positive], np.log(y[positive]), 1, w=np.sqrt(counts[positive]))
+    return float(np.exp(log_level)), float(rate)
+
+
+def _daily(t: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Mean hour offset and mean value per calendar day of the fit window."""
+    _, index = np.unique(np.floor(t / 24), return_inverse=True)
+    size = np.bincount(index)
+    return np.bincount(index, weights=t) / size, np.bincount(index, weights=y) / size
+
+
+def fit_degradation(
+    sensor_id: uuid.UUID,
+    hours: np.ndarray,
+    values: np.ndarray,
+    counts: np.ndarray,
+    warm: tuple[float, float] | None,
+) -> dict:
+    """Fit one sensor's hourly series (epoch hours, mm/s, readings per hour) into a rul_estimates row."""
+    from scipy.optimize import curve_fit  # only the fitting processes need SciPy
+
+    end = float(hours[-1])
+    t = hours - end
+    row = {
+        "sensor_id": sensor_id,
+        "data_start": _hour_time(hours[0]),
+        "data_end": _hour_time(end),
+        "points": len(hours),
+        "threshold": ZONE_C_MM_SEC,
+        "status": "no_fit",
+        "level": None, "rate": None, "covariance": None,
+        "threshold_at": None, "threshold_earliest": None, "threshold_latest": None,
+    }
+    day_t, day_y = _daily(t, values)
+    history = [{"t": _iso(end + dt), "observed": float(v), "fitted": None} for dt, v in zip(day_t, day_y)]
+
+    try:
+        with np.errstate(over="ignore", invalid="ignore"):
+            (level, rate), covariance = curve_fit(
+                lambda x, a, b: a * np.exp(b * x), t, values,
+                p0=warm or _initial_guess(t, values, counts),
+                sigma=1.0 / np.sqrt(counts), maxfev=2000,
+            )
+    except (RuntimeError, ValueError, TypeError):
+        return {**row, "curve": {"history": history, "projection": []}}
+    if not (np.isfinite(covariance).all() and np.isfinite([level, rate]).all()):
+        return {**row, "curve": {"history": history, "projection": []}}
+
+    fitted, _ = _curve(day_t, level, rate, covariance)
+    for point, value in zip(history, fitted):
+        point["fitted"] = float(value)
+
+    # Band crossings on an hourly grid; the fit itself crosses analytically
+    grid = np.arange(HORIZON_HOURS + 1, dtype=np.float64)
+    mean, error = _curve(grid, level, rate, covariance)
+    upper, lower = mean + BAND_Z * error, np.maximum(mean - BAND_Z * error, 0.0)
+    earliest = np.flatnonzero(upper >= ZONE_C_MM_SEC)
+    latest = np.flatnonzero(lower >= ZONE_C_MM_SEC)
+    crossing = math.log(ZONE_C_MM_SEC / level) / rate if level > 0 and rate > 0 else None
+
+    if level >= ZONE_C_MM_SEC:
+        status, crossing = "exceeded", 0.0
+    elif crossing is not None and crossing <= HORIZON_HOURS:
+        status = "degrading"
+    else:
+        status, crossing = "stable", None
+
+    span = int(max(MIN_PROJECTION_HOURS, latest[0] if len(latest) else HORIZON_HOURS))
+    days = grid[:min(span, HORIZON_HOURS) + 1:24]
+    projection = [
+        {"t": _iso(end + h), "value": float(mean[int(h)]), "lower": float(lower[int(h)]), "upper": float(upper[int(h)])}
+        for h in days
+    ]
+    return {
+        **row,
+        "status": status,
+        "level": float(level),
+        "rate": float(rate),
+        "covariance": [float(c) for c in covariance.ravel()],
+        "threshold_at": _hour_time(end + crossing) if crossing is not None else None,
+        "threshold_earliest": _hour_time(end + earliest[0]) if len(earliest) else None,
+        "threshold_latest": _hour_time(end + latest[0]) if len(latest) else None,
+        "curve": {"history": history, "projection": projection},
+    }
+
+
+def fit_chunk(jobs: list[tuple]) -> list[dict]:
+    """Process-pool entry point: `fit_degradation` over a list of argument tuples."""
+    return [fit_degradation(*job) for job in jobs]
+
+
+# ── Refit job ──
+
+async def _due_sensors(db: AsyncSession, now: datetime, force: bool) -> list[tuple[uuid.UUID, tuple[float, float] | None]]:
+    """Sensors with enough history whose estimate is missing or `REFIT_AFTER` behind,
+    with the warm-start parameters of their previous fit."""
+    result = await db.execute(
+        select(ReadingHourly.sensor_id, func.max(ReadingHourly.hour))
+        .where(ReadingHourly.hour >= now - FIT_WINDOW)
+        .group_by(ReadingHourly.sensor_id)
+        .having(
+            func.min(ReadingHourly.hour) <= now - MIN_SPAN,
+            func.count(ReadingHourly.x_velocity_mm_sec_avg) >= MIN_POINTS,
+        )
+    )
+    latest = dict(result.all())
+    if not latest:
+        return []
+
+    result = await db.execute(
+        select(RulEstimate.sensor_id, RulEstimate.data_end, RulEstimate.level, RulEstimate.rate)
+        .where(RulEstimate.sensor_id.in_(list(latest)))
+    )
+    previous = {row.sensor_id: row for row in result.all()}
+
+    due = []
+    for sensor_id, last_hour in latest.items():
+        prev = previous.get(sensor_id)
+        if prev is not None and not force and last_hour - prev.data_end < REFIT_AFTER:
+            continue
+        warm = None
+        if prev is not None and prev.level is not None and prev.rate is not None:
+            shift = (last_hour - prev.data_end).total_seconds() / 3600
+            warm = (prev.level * math.exp(min(prev.rate * shift, 50.0)), prev.rate)
+        due.append((sensor_id, warm))
+    return due
+
+
+async def _hourly_series(db: AsyncSession, sensor_ids: list[uuid.UUID], now: datetime) -> dict:
+    """sensor -> (epoch hours, worst-axis mean velocity, readings per hour), hours with no velocity dropped."""
+    result = await db.execute(
+        select(
+            ReadingHourly.sensor_id, ReadingHourly.hour, ReadingHourly.reading_count,
+            *(getattr(ReadingHourly, c) for c in VELOCITY_COLUMNS),
+        )
+        .where(ReadingHourly.sensor_id.in_(sensor_ids), ReadingHourly.hour >= now - FIT_WINDOW)
+        .order_by(ReadingHourly.sensor_id, ReadingHourly.hour)
+    )
+    rows: dict[uuid.UUID, list] = {}
+    for sensor_id, hour, count, *velocity in result.all():
+        rows.setdefault(sensor_id, []).append((hour.timestamp() / 3600, count, *velocity))
+
+    series = {}
+    for sensor_id, values in rows.items():
+        data = np.array(values, dtype=np.float64)
+        velocity = data[:, 2:]
+        keep = ~np.isnan(velocity).all(axis=1)
+        if keep.sum() < MIN_POINTS:
+            continue
+        series[sensor_id] = (data[keep, 0], np.nanmax(velocity[keep], axis=1), np.maximum(data[keep, 1], 1.0))
+    return series
+
+
+async def refit_estimates(
+    db: AsyncSession,
+    batch_size: int = 200,
+    workers: int | None = None,
+    force: bool = False,
+) -> int:
+    """Refit every due sensor on this session's shard and store the estimates. Returns how many."""
+    from concurrent.futures import ProcessPoolExecutor  # only the refit job starts processes
+
+    now = datetime.now(timezone.utc)
+    due = await _due_sensors(db, now, force)
+    workers = workers or os.cpu_count() or 1
+    loop = asyncio.get_running_loop()
+    fitted = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for i in range(0, len(due), batch_size):
+            batch = dict(due[i:i + batch_size])
+            series = await _hourly_series(db, list(batch), now)
+            jobs = [(sensor_id, *data, batch[sensor_id]) for sensor_id, data in series.items()]
+            if not jobs:
+                continue
+
+            size = max(1, math.ceil(len(jobs) / workers))
+            chunks = [jobs[j:j + size] for j in range(0, len(jobs), size)]
+            rows = [r for results in await asyncio.gather(
+                *(loop.run_in_executor(pool, fit_chunk, chunk) for chunk in chunks)
+            ) for r in results]
+            for row in rows:
+                row["fitted_at"] = now
+
+            stmt = insert(RulEstimate).values(rows)
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=[RulEstimate.sensor_id],
+                set_={c: stmt.excluded[c] for c in rows[0] if c != "sensor_id"},
+            ))
+            await db.commit()
+            for row in rows:
+                rul_estimates.invalidate(row["sensor_id"])
+            fitted += len(rows)
+    return fitted
+
+
+# ── Read cache ──
+
+class RulCache:
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._estimates: dict[uuid.UUID, tuple[RulEstimate | None, float]] = {}
+
+    async def get(self, sensor_id: uuid.UUID, db: AsyncSession) -> RulEstimate | None:
+        hit = self._estimates.get(sensor_id)
+        if hit is not None and hit[1] > time.monotonic():
+            return hit[0]
+        estimate = await db.get(RulEstimate, sensor_id)
+        if estimate is not None:
+            db.expunge(estimate)
+        self._estimates[sensor_id] = (estimate, time.monotonic() + self.ttl_seconds)
+        return estimate
+
+    def invalidate(self, sensor_id: uuid.UUID):
+        self._estimates.pop(sensor_id, None)
+
+
+rul_estimates = RulCache(settings.rul_cache_ttl_seconds)
@@ -0,0 +1,311 @@
+"""Tenant-aware sharding of the time-series tables by org_id.
+
+Asset tables stay on the central (primary) database. Time-series tables — every model with
+the `TimeSeries` mixin — live on one of the TIMESERIES_SHARDS, chosen per org through the
+tenant_shards map. New orgs are placed by rendezvous hashing and the choice is persisted,
+so adding a shard never silently re-homes existing tenants.
+
+Each shard owns a disjoint id range (`SHARD_ID_STRIDE * index`, set by `init_shard`), which
+lets `move_tenant` copy rows between shards with their ids intact.
+"""
+
+import asyncio
+import hashlib
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import MetaData, delete, func, or_, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db import Base, TimeSeries, async_session, shard_engines
+from app.models.component import Component
+from app.models.crane import Crane
+from app.models.facility import Facility
+from app.models.run_state import RunState
+from app.models.sensor import Sensor
+from app.models.tenant_shard import TenantShard
+from app.services.rollup import rollup_hours
+
+
+SHARD_ID_STRIDE = 1 << 40
+ROLLUP_REACH = timedelta(hours=48)  # how far back `manage.py rollup` rewrites hours by default
+
+
+def shard_names() -> list[str | None]:
+    """Configured shard names, or [None] for an unsharded deployment."""
+    return list(shard_engines) or [None]
+
+
+def time_series_models() -> list[type]:
+    """TimeSeries models in foreign-key dependency order (parents first)."""
+    by_table = {
+        m.class_.__table__: m.class_
+        for m in Base.registry.mappers
+        if issubclass(m.class_, TimeSeries)
+    }
+    return [by_table[t] for t in Base.metadata.sorted_tables if t in by_table]
+
+
+def _rendezvous(org_id: uuid.UUID, names: list[str]) -> str:
+    return max(names, key=lambda name: hashlib.blake2b(f"{org_id}:{name}".encode()).digest())
+
+
+class ShardMap:
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._shards: dict[uuid.UUID, tuple[str, float]] = {}
+
+    async def shard_for(self, org_id: uuid.UUID) -> str | None:
+        if not shard_engines:
+            return None
+        hit = self._shards.get(org_id)
+        if hit is not None and hit[1] > time.monotonic():
+            return hit[0]
+
+        # Own primary session: the first lookup for an org persists its placement
+        async with async_session() as db:
+            row = await db.get(TenantShard, org_id)
+            if row is None:
+                await db.execute(
+                    insert(TenantShard)
+                    .values(org_id=org_id, shard=_rendezvous(org_id, list(shard_engines)), status="active")
+                    .on_conflict_do_nothing()
+                )
+                await db.commit()
+                row = await db.get(TenantShard, org_id)
+            shard = row.shard
+
+        self._shards[org_id] = (shard, time.monotonic() + self.ttl_seconds)
+        return shard
+
+    async def warm(self) -> int:
+        """Load every persisted placement. Returns how many orgs are mapped."""
+        if not shard_engines:
+            return 0
+        async with async_session() as db:
+            result = await db.execute(select(TenantShard.org_id, TenantShard.shard))
+            expires = time.monotonic() + self.ttl_seconds
+            for org_id, shard in result:
+                self._shards[org_id] = (shard, expires)
+        return len(self._shards)
+
+    def invalidate(self, org_id: uuid.UUID):
+        self._shards.pop(org_id, None)
+
+
+shard_map = ShardMap(settings.shard_map_ttl_seconds)
+
+
+async def bind_tenant(db: AsyncSession, org_id: uuid.UUID) -> None:
+    """Route this session's time-series statements to the org's shard."""
+    db.info["shard"] = await shard_map.shard_for(org_id)
+
+
+# ── Shard administration ──
+
+async def init_shard(name: str) -> None:
+    """Create the time-series tables on a shard and move its id sequences into its range.
+
+    Foreign keys to central (asset) tables are dropped — those rows live elsewhere.
+    """
+    index = list(shard_engines).index(name)
+    models = time_series_models()
+    local = {m.__tablename__ for m in models}
+    metadata = MetaData()
+    tables = []
+    for model in models:
+        table = model.__table__.to_metadata(metadata)
+        for fk in list(table.foreign_key_constraints):
+            if fk.elements[0].target_fullname.split(".")[0] not in local:
+                table.constraints.discard(fk)
+                for element in fk.elements:
+                    element.parent.foreign_keys.discard(element)
+                    table.foreign_keys.discard(element)
+        tables.append(table)
+
+    async with shard_engines[name].begin() as conn:
+        await conn.run_sync(metadata.create_all)
+        quote = conn.dialect.identifier_preparer.quote
+        for table in tables:
+            pk = list(table.primary_key.columns)
+            if len(pk) != 1 or pk[0].autoincrement is not True:
+                continue
+            await conn.execute(
+                text(
+                    "SELECT setval(pg_get_serial_sequence(:table, :column), "
+                    f"GREATEST(:start, (SELECT COALESCE(max({quote(pk[0].name)}), 0) + 1 FROM {quote(table.name)})), false)"
+                ),
+                {"table": table.name, "column": pk[0].name, "start": index * SHARD_ID_STRIDE + 1},
+            )
+
+
+async def _org_sensor_ids(org_id: uuid.UUID) -> list[uuid.UUID]:
+    async with async_session() as db:
+        result = await db.execute(
+            select(Sensor.id).join(Component).join(Crane).join(Facility).where(Facility.org_id == org_id)
+        )
+        return list(result.scalars().all())
+
+
+async def _copy_table(
+    model, sensor_ids, source: str, target: str, after, batch_size: int,
+    changed: str | None = None, since: datetime | None = None,
+) -> tuple:
+    """Copy rows past the `after` primary-key watermark. Returns the new watermark.
+
+    With `changed`, copy only rows whose `changed` column is at or past `since`, and overwrite
+    a target row only where that column is older there (or unset) — newer target writes win.
+    """
+    pk = list(model.__table__.primary_key.columns)
+    columns = list(model.__table__.columns)
+    async with async_session(info={"shard": source}) as src, async_session(info={"shard": target}) as dst:
+        while True:
+            query = (
+                select(*columns)
+                .where(model.__table__.c.sensor_id.in_(sensor_ids))
+                .order_by(*pk)
+                .limit(batch_size)
+            )
+            if after is not None:
+                query = query.where(tuple_(*pk) > tuple_(*after))
+            if changed is not None:
+                query = query.where(model.__table__.c[changed] >= since)
+            rows = (await src.execute(query, bind_arguments={"mapper": model})).mappings().all()
+            if not rows:
+                return after
+            stmt = insert(model).values([dict(r) for r in rows])
+            if changed is not None:
+                column = model.__table__.c[changed]
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=pk,
+                    set_={c.name: stmt.excluded[c.name] for c in columns if not c.primary_key},
+                    where=or_(column.is_(None), column < stmt.excluded[changed]),
+                )
+            elif len(columns) > len(pk):
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=pk,
+                    set_={c.name: stmt.excluded[c.name] for c in columns if not c.primary_key},
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing()
+            await dst.execute(stmt)
+            await dst.commit()
+            after = tuple(rows[-1][c.name] for c in pk)
+
+
+async def _resync_rollups(sensor_ids, target: str, since: datetime) -> None:
+    """Recompute the hours a rollup may have rewritten on the source, from the moved readings."""
+    async with async_session(info={"shard": target}) as dst:
+        await rollup_hours(dst, since - ROLLUP_REACH, datetime.now(timezone.utc), sensor_ids)
+
+
+async def _resync_run_states(sensor_ids, target: str, since: datetime) -> None:
+    """Have the operating-hours batch re-derive sessions from the moved readings."""
+    async with async_session(info={"shard": target}) as dst:
+        await dst.execute(
+            update(RunState)
+            .where(RunState.sensor_id.in_(sensor_ids))
+            .values(dirty_since=func.least(func.coalesce(RunState.dirty_since, since), since))
+        )
+        await dst.commit()
+
+
+# How move_tenant catches up rows the source changed in place while the tenant was moving;
+# the primary-key tail copy only sees inserts. None marks an append-only table. A column name
+# re-copies rows whose column is at or past the move's start, where the source's value is the
+# newer one. Derived tables are recomputed on the target from the moved rows instead, once
+# every copy is done. move_tenant refuses to run while a TimeSeries table is missing here.
+IN_PLACE_UPDATES: dict[str, str | Callable | None] = {
+    "readings": None,
+    "readings_hourly": _resync_rollups,
+    "fft_captures": "analyzed_at",
+    "fft_features": None,
+    "fft_feature_peaks": None,
+    "bearing_fault_detections": None,
+    "spectrum_baselines": "updated_at",
+    "fft_baseline_scores": None,
+    "run_states": _resync_run_states,
+    "run_sessions": "ended_at",
+}
+
+
+async def _purge_source(model, sensor_ids, source: str, batch_size: int) -> int:
+    pk = list(model.__table__.primary_key.columns)
+    deleted = 0
+    async with async_session(info={"shard": source}) as src:
+        while True:
+            batch = select(*pk).where(model.__table__.c.sensor_id.in_(sensor_ids)).limit(batch_size)
+            result = await src.execute(delete(model).where(tuple_(*pk).in_(batch)))
+            await src.commit()
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                return deleted
+            await asyncio.sleep(settings.retention_batch_pause_seconds)
+
+
+async def move_tenant(
+    org_id: uuid.UUID,
+    target: str,
+    batch_size: int = 5000,
+    log: Callable[[str], None] = print,
+) -> None:
+    """Move an org's time-series data to another shard while ingest keeps running.
+
+    1. mark the tenant `moving` and bulk-copy every time-series table (keyset batches)
+    2. flip the map to the target, then wait out the shard-map TTL so every worker has
+       switched, and copy the tail written to the source in the meantime
+    3. catch up rows the source updated in place during the move (IN_PLACE_UPDATES)
+    4. delete the tenant's rows from the source in bounded batches
+    """
+    if target not in shard_engines:
+        raise ValueError(f"Unknown shard {target!r}")
+    models = time_series_models()
+    undeclared = [m.__tablename__ for m in models if m.__tablename__ not in IN_PLACE_UPDATES]
+    if undeclared:
+        raise ValueError(f"No move policy in IN_PLACE_UPDATES for {', '.join(undeclared)}")
+    source = await shard_map.shard_for(org_id)
+    if source == target:
+        log(f"Org {org_id} already on {target}")
+        return
+
+    async with async_session() as db:
+        await db.execute(
+            update(TenantShard).where(TenantShard.org_id == org_id).values(status="moving", target_shard=target)
+        )
+        await db.commit()
+
+    started = datetime.now(timezone.utc)
+    sensor_ids = await _org_sensor_ids(org_id)
+    watermarks = {}
+    for model in models:
+        watermarks[model] = await _copy_table(model, sensor_ids, source, target, None, batch_size)
+        log(f"  copied {model.__tablename__}")
+
+    async with async_session() as db:
+        await db.execute(
+            update(TenantShard).where(TenantShard.org_id == org_id)
+            .values(shard=target, status="active", target_shard=None)
+        )
+        await db.commit()
+    shard_map.invalidate(org_id)
+    log(f"  switched {org_id} to {target}; waiting {settings.shard_map_ttl_seconds}s for workers")
+    await asyncio.sleep(settings.shard_map_ttl_seconds)
+
+    for model in models:
+        await _copy_table(model, sensor_ids, source, target, watermarks[model], batch_size)
+    for model in models:
+        changed = IN_PLACE_UPDATES[model.__tablename__]
+        if isinstance(changed, str):
+            await _copy_table(model, sensor_ids, source, target, None, batch_size, changed, started)
+    for model in models:
+        resync = IN_PLACE_UPDATES[model.__tablename__]
+        if callable(resync):
+            await resync(sensor_ids, target, started)
+            log(f"  recomputed {model.__tablename__} on {target}")
+    for model in reversed(models):
+        deleted = await _purge_source(model, sensor_ids, source, batch_size)
+        log(f"  removed {deleted} {model.__tablename__} rows from {source}")
@@ -0,0 +1,51 @@
+"""Decoding of stored FFT spectra (fft_captures.spectrum_data)."""
+
+import numpy as np
+
+
+# Ingest packs the amplitudes with struct.pack("<n>f", ...): native-order float32
+SPECTRUM_DTYPE = np.float32
+
+
+def decode_spectrum(blob: bytes) -> np.ndarray:
+    """Amplitudes of one capture as a read-only float32 array (no copy)."""
+    return np.frombuffer(blob, dtype=SPECTRUM_DTYPE)
+
+
+def bin_width_hz(odr: int, bins: int) -> float:
+    """Bins span 0 .. odr/2 (Nyquist) evenly."""
+    return odr / 2 / bins
+
+
+def bin_frequencies(odr: int, bins: int) -> np.ndarray:
+    return np.arange(bins, dtype=np.float64) * bin_width_hz(odr, bins)
+
+
+def window_peaks(spectrum: np.ndarray, odr: int, targets_hz: np.ndarray, tolerance: float) -> tuple[np.ndarray, np.ndarray]:
+    """Largest amplitude within ±tolerance of each target frequency, in one pass.
+
+    Returns (peaks, valid), both shaped like `targets_hz`; windows that fall outside the
+    spectrum (or only on the DC bin) are invalid and report 0.
+    """
+    bins = len(spectrum)
+    width = bin_width_hz(odr, bins)
+    targets_hz = np.asarray(targets_hz, dtype=np.float64)
+
+    lo = np.floor(targets_hz * (1 - tolerance) / width).astype(np.int64)
+    hi = np.ceil(targets_hz * (1 + tolerance) / width).astype(np.int64) + 1
+    lo = np.clip(lo, 1, bins)  # never count the DC bin
+    hi = np.clip(hi, 0, bins)
+    valid = (hi > lo) & np.isfinite(targets_hz) & (targets_hz > 0)
+
+    # reduceat over interleaved [lo, hi) pairs; the padded 0 keeps index `bins` in range
+    padded = np.append(spectrum, spectrum.dtype.type(0))
+    edges = np.column_stack([lo[valid], hi[valid]]).ravel()
+    peaks = np.zeros(targets_hz.shape, dtype=np.float64)
+    if edges.size:
+        peaks[valid] = np.maximum.reduceat(padded, edges)[::2]
+    return peaks, valid
+
+
+def noise_floor(spectrum: np.ndarray) -> float:
+    """Median amplitude, ignoring the DC bin."""
+    return float(np.median(spectrum[1:])) if len(spectrum) > 1 else 0.0
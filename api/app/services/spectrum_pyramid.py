@@ -0,0 +1,109 @@
+"""Multi-resolution spectra for the FFT viewer (PRD FR-007).
+
+Each capture gets a pyramid of max-decimated copies of its spectrum: level k holds the
+maximum of every 2^k adjacent bins, so a peak survives at every zoom level. A request for
+[f_min, f_max] at `width` pixels is served from the coarsest level that still has at least
+`width` bins in the band, sliced to just that band — the payload tracks the pixel width,
+not the capture size. Pyramids are built lazily on first view (about one extra copy of the
+spectrum) and kept in an LRU; captures never change, so entries don't expire.
+"""
+
+import math
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.fft_capture import FFTCapture
+from app.services.spectrum import bin_width_hz, decode_spectrum
+
+
+MIN_LEVEL_BINS = 64  # stop decimating below this
+
+
+def build_levels(spectrum: np.ndarray) -> list[np.ndarray]:
+    """[spectrum, pairwise max of it, ...] down to `MIN_LEVEL_BINS`; an odd tail bin is kept as is."""
+    levels = [spectrum]
+    while len(levels[-1]) > MIN_LEVEL_BINS:
+        level = levels[-1]
+        even = len(level) & ~1
+        coarser = np.maximum(level[0:even:2], level[1:even:2])
+        if even < len(level):
+            coarser = np.append(coarser, level[-1])
+        levels.append(coarser)
+    return levels
+
+
+@dataclass(frozen=True)
+class SpectrumSlice:
+    level: int
+    f_start: float       # frequency of the first returned bin's lower edge
+    bin_width: float     # Hz per returned bin
+    amplitudes: np.ndarray
+
+
+@dataclass(frozen=True)
+class SpectrumPyramid:
+    sensor_id: uuid.UUID
+    timestamp: datetime
+    axis: str
+    odr: int
+    bins: int
+    levels: list[np.ndarray]
+
+    @classmethod
+    def from_capture(cls, capture: FFTCapture) -> "SpectrumPyramid":
+        spectrum = decode_spectrum(capture.spectrum_data)
+        return cls(capture.sensor_id, capture.timestamp, capture.axis, capture.odr, len(spectrum), build_levels(spectrum))
+
+    @property
+    def nyquist(self) -> float:
+        return self.odr / 2
+
+    def slice(self, f_min: float, f_max: float, width: int) -> SpectrumSlice:
+        """Bins covering [f_min, f_max] from the coarsest level with at least `width` of them."""
+        base_width = bin_width_hz(self.odr, self.bins)
+        lo = max(0, int(f_min / base_width))
+        hi = min(self.bins, max(lo + 1, math.ceil(f_max / base_width)))
+        level = int(math.log2((hi - lo) / width)) if hi - lo > width else 0
+        level = min(level, len(self.levels) - 1)
+        step = 1 << level
+        start, stop = lo >> level, -(-hi // step)
+        return SpectrumSlice(
+            level=level,
+            f_start=start * step * base_width,
+            bin_width=step * base_width,
+            amplitudes=self.levels[level][start:stop],
+        )
+
+
+class SpectrumPyramidCache:
+    """LRU of (shard, capture id) -> SpectrumPyramid."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._pyramids: OrderedDict[tuple[str | None, int], SpectrumPyramid] = OrderedDict()
+
+    async def get(self, capture_id: int, db: AsyncSession) -> SpectrumPyramid | None:
+        key = (db.info.get("shard"), capture_id)
+        pyramid = self._pyramids.get(key)
+        if pyramid is not None:
+            self._pyramids.move_to_end(key)
+            return pyramid
+        capture = await db.get(FFTCapture, capture_id)
+        if capture is None or not capture.odr:
+            return None
+        pyramid = SpectrumPyramid.from_capture(capture)
+        if pyramid.bins == 0:
+            return None
+        self._pyramids[key] = pyramid
+        while len(self._pyramids) > self.size:
+            self._pyramids.popitem(last=False)
+        return pyramid
+
+
+spectrum_pyramids = SpectrumPyramidCache(settings.spectrum_pyramid_cache_size)
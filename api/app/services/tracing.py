@@ -0,0 +1,201 @@
+"""Lightweight OpenTelemetry-compatible tracing.
+
+Spans carry W3C trace context. `TracingMiddleware` (app.middleware) continues a gateway's
+`traceparent` header — honouring its sampled flag — or starts a trace sampled with
+probability `tracing_sample_ratio`; child spans nest through a context variable. Finished
+spans go to a background thread that writes them either as OTLP/JSON (`file`: one
+ExportTraceServiceRequest per line, the format the OpenTelemetry Collector's otlpjsonfile
+receiver reads) or as one readable line each (`console`, to stderr).
+
+Unsampled requests never create span objects, so instrumentation costs one context-variable
+lookup; `tracing_exporter` empty turns tracing off entirely.
+"""
+
+import json
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from app.config import settings
+
+
+INTERNAL, SERVER, CLIENT, PRODUCER = 1, 2, 3, 4  # OTLP SpanKind
+STATUS_OK, STATUS_ERROR = 1, 2
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+def _new_id(size: int) -> str:
+    return os.urandom(size).hex()
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    kind: int = INTERNAL
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    attributes: dict = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> dict:
+        out = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in self.attributes.items() if v is not None],
+            "status": {"code": STATUS_ERROR, "message": self.error} if self.error else {"code": STATUS_OK},
+        }
+        if self.parent_id:
+            out["parentSpanId"] = self.parent_id
+        return out
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+# ── Export ──
+
+class SpanExporter:
+    """Writes finished spans from a daemon thread, batching whatever has queued up."""
+
+    def __init__(self, kind: str, path: str, service_name: str):
+        self.kind = kind
+        self.path = path
+        self.service_name = service_name
+        self._queue: queue.SimpleQueue[Span] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+
+    def export(self, span: Span) -> None:
+        self._queue.put(span)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < 512:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if self.kind == "file":
+                self._write_otlp(batch)
+            else:
+                self._write_console(batch)
+
+    def _write_otlp(self, batch: list[Span]) -> None:
+        request = {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+            "scopeSpans": [{"scope": {"name": "app.services.tracing"}, "spans": [s.to_otlp() for s in batch]}],
+        }]}
+        with open(self.path, "a") as f:
+            f.write(json.dumps(request, separators=(",", ":")) + "\n")
+
+    def _write_console(self, batch: list[Span]) -> None:
+        for s in batch:
+            attributes = " ".join(f"{k}={v}" for k, v in s.attributes.items() if v is not None)
+            sys.stderr.write(
+                f"[trace {s.trace_id[:8]}] {s.span_id} <- {s.parent_id or '-':16} "
+                f"{(s.end_ns - s.start_ns) / 1e6:9.2f} ms  {s.name}{'  ERROR ' + s.error if s.error else ''}  {attributes}\n"
+            )
+        sys.stderr.flush()
+
+
+exporter = (
+    SpanExporter(settings.tracing_exporter, settings.tracing_file, settings.tracing_service_name)
+    if settings.tracing_exporter in ("console", "file") else None
+)
+
+
+# ── Spans ──
+
+_current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Span | None:
+    return _current.get()
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str, bool] | None:
+    """(trace id, parent span id, sampled) from a W3C traceparent header, or None if absent / invalid."""
+    match = TRACEPARENT.match(header.strip().lower()) if header else None
+    if match is None or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+
+
+def start_span(name: str, kind: int = INTERNAL, **attributes) -> Span | None:
+    """A child of the current span, not made current — for leaf operations; finish with `end_span`."""
+    parent = _current.get()
+    if parent is None:
+        return None
+    return Span(name, parent.trace_id, _new_id(8), parent.span_id, kind, attributes=attributes)
+
+
+def end_span(span: Span | None, error: BaseException | str | None = None) -> None:
+    if span is None:
+        return
+    span.end_ns = time.time_ns()
+    if error is not None:
+        span.error = error if isinstance(error, str) else f"{type(error).__name__}: {error}"
+    exporter.export(span)
+
+
+@contextmanager
+def _activate(span: Span | None) -> Iterator[Span | None]:
+    if span is None:
+        yield None
+        return
+    token = _current.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        if getattr(e, "status_code", 500) >= 500:  # a 4xx HTTPException is an answer, not a failure
+            span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        end_span(span)
+
+
+def span(name: str, kind: int = INTERNAL, **attributes):
+    """Context manager for a child span of the current one (a no-op when the request isn't traced)."""
+    return _activate(start_span(name, kind, **attributes))
+
+
+def trace(name: str, traceparent: str | None = None, kind: int = SERVER, **attributes):
+    """Context manager for a root span: continues `traceparent` or starts a sampled trace."""
+    if exporter is None:
+        return _activate(None)
+    parent = parse_traceparent(traceparent)
+    if parent is not None:
+        trace_id, parent_id, sampled = parent
+    else:
+        trace_id, parent_id, sampled = _new_id(16), None, random.random() < settings.tracing_sample_ratio
+    return _activate(Span(name, trace_id, _new_id(8), parent_id, kind, attributes=attributes) if sampled else None)
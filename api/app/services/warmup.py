@@ -0,0 +1,54 @@
+"""Startup warmup: pooled database connections and the registry caches.
+
+A fresh process otherwise pays on its first requests: every engine opens connections on
+demand (TLS, auth and, on Neon, waking a suspended compute), and the ownership, shard and
+fault-frequency tables fill one miss at a time. The lifespan hook starts `warmup.run()` in the
+background; `/health/ready` answers 503 until it has finished, so a platform health check
+can hold traffic back meanwhile. Failures and the timeout are logged and leave the caches to
+fill lazily — warmup never keeps the API from serving.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from app.config import settings
+from app.db import async_session, warm_pools
+from app.services.fault_frequencies import fault_frequencies
+from app.services.ownership import ownership
+from app.services.sharding import shard_map
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Warmup:
+    ready: bool = False
+    connections: int = 0
+    sensors: int = 0
+    cranes: int = 0
+    components: int = 0
+    tenants: int = 0
+    seconds: float | None = None
+    error: str | None = None
+
+    async def run(self) -> None:
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(settings.warmup_timeout_seconds):
+                self.connections = await warm_pools(settings.warmup_connections)
+                if settings.warmup_caches:
+                    async with async_session() as db:
+                        self.sensors, self.cranes = await ownership.warm(db)
+                        self.components = await fault_frequencies.warm(db)
+                    self.tenants = await shard_map.warm()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+            logger.warning("Startup warmup incomplete: %s", self.error)
+        self.seconds = round(time.perf_counter() - started, 3)
+        self.ready = True
+
+
+warmup = Warmup()
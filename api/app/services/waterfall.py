@@ -0,0 +1,137 @@
+"""Spectral waterfalls: many FFT captures resampled onto one time × frequency grid.
+
+Captures are streamed from the database `CHUNK_SIZE` at a time and decoded into a reused
+(chunk, bins) float32 buffer. All captures in a chunk with the same (odr, bins) layout are
+pooled onto the output columns with one `np.maximum.reduceat`, then folded into the
+preallocated (rows, columns) matrix with `np.fmax.at`. Max pooling on both axes keeps narrow
+spectral lines and short events visible after downsampling. Memory is the output matrix
+plus one chunk, however many captures the range holds.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.fft_capture import FFTCapture
+from app.services.spectrum import SPECTRUM_DTYPE, bin_width_hz
+
+
+CHUNK_SIZE = 256
+NO_DATA_U8 = 255  # uint8 encoding: 0..254 are amplitude levels
+
+
+@dataclass(frozen=True)
+class ColumnLayout:
+    edges: np.ndarray    # interleaved [lo, hi) bin ranges, one pair per output column
+    narrow: np.ndarray   # columns narrower than a bin (take `nearest` instead)
+    nearest: np.ndarray  # bin under each column's center
+    outside: np.ndarray  # columns above this layout's Nyquist
+
+
+@lru_cache(maxsize=256)
+def column_layout(odr: int, bins: int, f_min: float, f_max: float, width: int) -> ColumnLayout:
+    bw = bin_width_hz(odr, bins)
+    bounds = np.linspace(f_min, f_max, width + 1)
+    lo = np.clip(np.ceil(bounds[:-1] / bw), 0, bins).astype(np.intp)
+    hi = np.clip(np.ceil(bounds[1:] / bw), 0, bins).astype(np.intp)
+    centers = (bounds[:-1] + bounds[1:]) / 2
+    return ColumnLayout(
+        edges=np.column_stack([lo, hi]).ravel(),
+        narrow=hi <= lo,
+        nearest=np.clip(np.floor(centers / bw), 0, bins - 1).astype(np.intp),
+        outside=centers >= bins * bw,
+    )
+
+
+class WaterfallBuilder:
+    """Accumulates captures into a (height, width) max-pooled amplitude matrix; NaN = no data."""
+
+    def __init__(self, start: datetime, end: datetime, f_min: float, f_max: float, width: int, height: int):
+        self.start, self.end = start, end
+        self.f_min, self.f_max = f_min, f_max
+        self.width, self.height = width, height
+        self.matrix = np.full((height, width), np.nan, dtype=np.float32)
+        self.captures = 0
+        self._span = (end - start).total_seconds()
+        self._buffer = np.empty((0, 0), dtype=SPECTRUM_DTYPE)
+
+    def _rows(self, timestamps: list[datetime]) -> np.ndarray:
+        offsets = np.array([(ts - self.start).total_seconds() for ts in timestamps])
+        return np.clip((offsets / self._span * self.height).astype(np.intp), 0, self.height - 1)
+
+    def _decode(self, blobs: list[bytes], bins: int) -> np.ndarray:
+        """Copy `blobs` into the reused buffer; returns a (len, bins + 1) view, last column 0."""
+        rows, cols = self._buffer.shape
+        if rows < len(blobs) or cols < bins + 1:
+            self._buffer = np.empty((max(rows, len(blobs)), max(cols, bins + 1)), dtype=SPECTRUM_DTYPE)
+        block = self._buffer[:len(blobs), :bins + 1]
+        for i, blob in enumerate(blobs):
+            block[i, :bins] = np.frombuffer(blob, dtype=SPECTRUM_DTYPE)
+        block[:, bins] = 0  # keeps reduceat's closing index in range
+        return block
+
+    def add(self, captures) -> None:
+        """Fold one chunk of rows with `timestamp`, `odr` and `spectrum_data`."""
+        groups: dict[tuple[int, int], list] = {}
+        for c in captures:
+            bins = len(c.spectrum_data) // SPECTRUM_DTYPE().itemsize
+            if bins and c.odr:
+                groups.setdefault((c.odr, bins), []).append(c)
+
+        for (odr, bins), group in groups.items():
+            layout = column_layout(odr, bins, self.f_min, self.f_max, self.width)
+            block = self._decode([c.spectrum_data for c in group], bins)
+            pooled = np.maximum.reduceat(block, layout.edges, axis=1)[:, ::2]
+            pooled[:, layout.narrow] = block[:, layout.nearest[layout.narrow]]
+            pooled[:, layout.outside] = np.nan
+            np.fmax.at(self.matrix, self._rows([c.timestamp for c in group]), pooled)
+            self.captures += len(group)
+
+
+def encode(matrix: np.ndarray, encoding: str) -> tuple[bytes, float | None, float | None]:
+    """Row-major little-endian bytes of `matrix` and, for uint8, the amplitude range of levels 0..254."""
+    if encoding == "float32":
+        return matrix.astype("<f4").tobytes(), None, None
+    present = ~np.isnan(matrix)
+    if not present.any():
+        return np.full(matrix.shape, NO_DATA_U8, dtype=np.uint8).tobytes(), None, None
+    lo, hi = float(matrix[present].min()), float(matrix[present].max())
+    scaled = (matrix - lo) / ((hi - lo) or 1.0) * (NO_DATA_U8 - 1)
+    levels = np.where(present, np.rint(np.nan_to_num(scaled)), NO_DATA_U8).astype(np.uint8)
+    return levels.tobytes(), lo, hi
+
+
+async def build_waterfall(
+    sensor_id,
+    start: datetime,
+    end: datetime,
+    axis: str | None,
+    f_min: float,
+    f_max: float | None,
+    width: int,
+    height: int,
+    db: AsyncSession,
+) -> WaterfallBuilder:
+    """Stream the sensor's captures in [start, end) into a waterfall; `f_max` defaults to the highest Nyquist."""
+    filters = [FFTCapture.sensor_id == sensor_id, FFTCapture.timestamp >= start, FFTCapture.timestamp < end]
+    if axis:
+        filters.append(FFTCapture.axis == axis)
+    if f_max is None:
+        result = await db.execute(select(func.max(FFTCapture.odr)).where(*filters))
+        f_max = (result.scalar_one_or_none() or 0) / 2
+
+    builder = WaterfallBuilder(start, end, f_min, max(f_max, f_min), width, height)
+    if f_max <= f_min:
+        return builder
+    result = await db.stream(
+        select(FFTCapture.timestamp, FFTCapture.odr, FFTCapture.spectrum_data)
+        .where(*filters)
+        .execution_options(yield_per=CHUNK_SIZE)
+    )
+    async for chunk in result.partitions():
+        builder.add(chunk)
+    return builder
@@ -0,0 +1,93 @@
+"""Bounded in-process background work queue.
+
+Request handlers `submit` items without waiting; a fixed number of worker tasks drain the
+queue. When the queue is full the item is dropped and counted rather than blocking the
+caller — jobs using this must be able to catch up later (e.g. from a backfill command).
+Items still queued or in flight when `stop` gives up are handed to `on_abandoned`, if set.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+
+logger = logging.getLogger(__name__)
+
+
+class WorkQueue:
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[None]],
+        workers: int,
+        maxsize: int,
+        on_abandoned: Callable[[list], Awaitable[None]] | None = None,
+    ):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.maxsize = maxsize
+        self.on_abandoned = on_abandoned
+        self.dropped = 0
+        self.failed = 0
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._in_flight: dict[asyncio.Task, Any] = {}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def submit(self, item) -> bool:
+        """Enqueue without waiting. Returns False when the queue is stopped or full."""
+        if self._queue is None:
+            return False
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("%s queue full, dropped %r", self.name, item)
+            return False
+        return True
+
+    async def _worker(self):
+        while True:
+            item = await self._queue.get()
+            self._in_flight[asyncio.current_task()] = item
+            try:
+                await self.handler(item)
+            except Exception:
+                self.failed += 1
+                logger.exception("%s failed on %r", self.name, item)
+            finally:
+                self._in_flight.pop(asyncio.current_task(), None)
+                self._queue.task_done()
+
+    def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [asyncio.create_task(self._worker(), name=f"{self.name}-{i}") for i in range(self.workers)]
+
+    async def stop(self, drain_timeout: float = 10.0):
+        """Finish queued work (up to `drain_timeout` seconds), then cancel the workers."""
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("%s stopped with %d items pending", self.name, self._queue.qsize())
+        abandoned = list(self._in_flight.values())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        while not self._queue.empty():
+            abandoned.append(self._queue.get_nowait())
+        self._tasks = []
+        self._queue = None
+        self._in_flight = {}
+        if abandoned and self.on_abandoned is not None:
+            try:
+                await self.on_abandoned(abandoned)
+            except Exception:
+                logger.exception("%s could not hand off %d abandoned items", self.name, len(abandoned))
@@ -2,6 +2,8 @@ import json
 
 from fastapi import WebSocket
 
+from app.services import tracing
+
 
 class ConnectionManager:
     def __init__(self):
@@ -18,7 +20,8 @@ class ConnectionManager:
         message = json.dumps(data, default=str)
         for connection in self.active_connections:
             try:
-                await connection.send_text(message)
+                with tracing.span("websocket.send", tracing.PRODUCER, **{"messaging.message.body.size": len(message)}):
+                    await connection.send_text(message)
             except Exception:
                 self.active_connections.remove(connection)
 
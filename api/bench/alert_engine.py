@@ -0,0 +1,187 @@
+"""Alert evaluation cost on the ingest path, with rules that fire as rarely as real ones.
+
+    python -m bench.alert_engine [--rules 5000] [--readings 10000] [--sensors 200] [--days 9]
+                                 [--batch 16] [--seed 0]
+
+Seeds a bench org with --days of hourly rollups (so 7-day trend conditions have history),
+loads them into `rolling_stats`, and generates a 30 s reading stream for every sensor. Rule
+thresholds are placed on that stream's own distribution: a rule's first condition holds for
+1 in 1,000 to 1 in 100,000 readings, later conditions narrow it further (1 in 2 to 1 in 20),
+and about a fifth of first conditions are 7-day trends. Half the rules are scoped to one
+sensor.
+
+Reports, per reading:
+
+  match         `CompiledRules.evaluate` on precomputed columns, one reading and --batch at a time
+  evaluate      `alert_engine.evaluate` as ingest calls it: trend lookups, rule matching,
+                cooldowns and storing and broadcasting the alerts, each in its own session
+  cold          the org's first evaluate, which also loads the rules and seeds cooldowns
+
+Point DATABASE_URL at a scratch, migrated database: the bench org and its alerts are left in place.
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.db import async_session, dispose_engines
+from app.models.alert_rule import AlertRule
+from app.models.reading import Reading
+from app.services.alert_engine import AlertEngine, CompiledRules, TREND_FIELDS, alert_engine, trend_field
+from app.services.rolling_stats import rolling_stats
+from app.services.sharding import bind_tenant
+from bench.load import RAW_INTERVAL, _sensor_profile, _series, seed_fleet
+
+
+SERIES_FIELDS = (
+    "temperature", "x_rms_ACC_G", "y_rms_ACC_G", "z_rms_ACC_G",
+    "x_velocity_mm_sec", "y_velocity_mm_sec", "z_velocity_mm_sec",
+)
+FIELDS = SERIES_FIELDS + ("battery_percent",)
+TREND_DAYS = 7
+COOLDOWN_MINUTES = (0, 15, 60)
+
+
+def _stream(fleet, count: int, rng) -> list[Reading]:
+    """Round-robin 30 s readings across the fleet, ending now."""
+    sensors = fleet.sensors
+    per_sensor = -(-count // sensors)
+    values = [_series(_sensor_profile(rng), per_sensor, rng) for _ in range(sensors)]
+    battery = rng.integers(5, 100, sensors)
+    start = time.time() - per_sensor * RAW_INTERVAL.total_seconds()
+    readings = []
+    for i in range(count):
+        s, n = i % sensors, i // sensors
+        readings.append(Reading(
+            id=i + 1,
+            sensor_id=fleet.sensor_ids[s],
+            timestamp=datetime.fromtimestamp(start + (n + s / sensors) * RAW_INTERVAL.total_seconds(), timezone.utc),
+            battery_percent=int(battery[s]),
+            **dict(zip(SERIES_FIELDS, values[s][n].tolist())),
+        ))
+    return readings
+
+
+async def _columns(readings: list[Reading]) -> dict[str, np.ndarray]:
+    """Every field's value as `alert_engine.evaluate` will see it, trends included.
+
+    Trend values depend on the readings folded in before them, so the stream is replayed
+    through `rolling_stats` once and then dropped again by a rebuild.
+    """
+    keys = list(FIELDS) + [trend_field(field, TREND_DAYS) for field in sorted(TREND_FIELDS)]
+    columns = {key: np.empty(len(readings)) for key in keys}
+    for i, reading in enumerate(readings):
+        rolling_stats.add(reading)
+        for key in keys:
+            columns[key][i] = AlertEngine._column(key, [reading])[0]
+    await rolling_stats.rebuild()
+    return columns
+
+
+def _condition(field: str, column: np.ndarray, selectivity: float, trend: bool = False) -> dict:
+    """A condition holding for about `selectivity` of the values in `column`."""
+    values = column[~np.isnan(column)]
+    condition = {"field": field, "severity": "warning"}
+    if field == "battery_percent":
+        condition.update(operator="<", value=float(np.quantile(values, selectivity)))
+    else:
+        condition.update(operator=">", value=float(np.quantile(values, 1 - selectivity)))
+    if trend:
+        condition["trend_days"] = TREND_DAYS
+    return condition
+
+
+def _rules(count: int, fleet, columns: dict[str, np.ndarray], rng) -> list[AlertRule]:
+    rules = []
+    for i in range(count):
+        if rng.random() < 0.2:
+            field = str(rng.choice(sorted(TREND_FIELDS)))
+            first = _condition(field, columns[trend_field(field, TREND_DAYS)], 10 ** rng.uniform(-5, -3), trend=True)
+        else:
+            field = str(rng.choice(FIELDS))
+            first = _condition(field, columns[field], 10 ** rng.uniform(-5, -3))
+        narrowing = [
+            _condition(field := str(rng.choice(FIELDS)), columns[field], rng.uniform(0.05, 0.5))
+            for _ in range(rng.integers(0, 3))
+        ]
+        rules.append(AlertRule(
+            org_id=fleet.org_id,
+            sensor_id=fleet.sensor_ids[rng.integers(fleet.sensors)] if rng.random() < 0.5 else None,
+            name=f"bench rule {i}",
+            conditions=[first, *narrowing],
+            channels=["in_app"],
+            recipients={},
+            cooldown_minutes=int(rng.choice(COOLDOWN_MINUTES)),
+            enabled=True,
+        ))
+    return rules
+
+
+def _percentiles(samples: list[float]) -> str:
+    us = np.array(samples) * 1e6
+    return f"p50 {np.percentile(us, 50):.0f} µs, p95 {np.percentile(us, 95):.0f} µs, mean {us.mean():.0f} µs"
+
+
+async def run(args) -> None:
+    rng = np.random.default_rng(args.seed)
+    print(f"Seeding {args.sensors} sensors with {args.days} days of rollups ...", flush=True)
+    fleet = await seed_fleet(args.sensors, args.days, 0, 0, rng)
+    await rolling_stats.rebuild()
+
+    readings = _stream(fleet, args.readings, rng)
+    columns = await _columns(readings)
+    rules = _rules(args.rules, fleet, columns, rng)
+    async with async_session() as db:
+        db.add_all(rules)
+        await db.commit()
+
+    start = time.perf_counter()
+    compiled = CompiledRules(rules)
+    print(f"compile {len(compiled.rules)} rules: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    sensor_ids = [r.sensor_id for r in readings]
+    matched = 0
+    start = time.perf_counter()
+    for i in range(len(readings)):
+        rows, _ = compiled.evaluate(sensor_ids[i:i + 1], {f: columns[f][i:i + 1] for f in compiled.fields})
+        matched += len(rows)
+    single = (time.perf_counter() - start) / len(readings) * 1e6
+    print(f"match, one at a time: {single:.1f} µs/reading ({matched / len(readings):.3f} rules match per reading)")
+
+    start = time.perf_counter()
+    for i in range(0, len(readings), args.batch):
+        compiled.evaluate(sensor_ids[i:i + args.batch], {f: columns[f][i:i + args.batch] for f in compiled.fields})
+    batched = (time.perf_counter() - start) / len(readings) * 1e6
+    print(f"match, batches of {args.batch}: {batched:.1f} µs/reading")
+
+    # Ingest folds each reading into the rolling stats, then evaluates it in the request's session
+    timings, alerts = [], 0
+    for reading in readings:
+        rolling_stats.add(reading)
+        async with async_session() as db:
+            await bind_tenant(db, fleet.org_id)
+            start = time.perf_counter()
+            alerts += len(await alert_engine.evaluate(fleet.org_id, [reading], db))
+            timings.append(time.perf_counter() - start)
+    print(f"cold evaluate (loads {len(compiled.rules)} rules, seeds cooldowns): {timings[0] * 1000:.1f} ms")
+    print(f"evaluate: {_percentiles(timings[1:])}")
+    print(f"  {alerts} alerts stored ({alerts / len(readings):.4f} per reading) after cooldowns")
+    await dispose_engines()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", type=int, default=5000)
+    parser.add_argument("--readings", type=int, default=10000)
+    parser.add_argument("--sensors", type=int, default=200)
+    parser.add_argument("--days", type=int, default=9, help="Days of hourly rollups (trends need 8)")
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed for generated data")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Anomaly model training time and scoring cost on synthetic sensor data.
+
+    python -m bench.anomaly [--sensors 20] [--rows 4096] [--batch 16] [--workers N]
+
+Fits one forest per synthetic sensor in a process pool (PRD FR-008: < 5 s per model),
+checks the flattened forest against scikit-learn's own scores, and reports µs per reading
+for single readings and batches plus the mean score of normal vs injected outlier rows.
+No database needed.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from app.services.anomaly import ANOMALY_FEATURES, MAX_SAMPLES, N_ESTIMATORS, FlatForest, train_chunk
+
+
+def _sensor_data(rows: int, rng) -> np.ndarray:
+    """Correlated vibration features around a per-sensor operating point."""
+    base = rng.uniform(0.5, 5.0, len(ANOMALY_FEATURES))
+    load = rng.normal(1.0, 0.15, (rows, 1))
+    data = base * load * rng.normal(1.0, 0.05, (rows, len(ANOMALY_FEATURES)))
+    data[:, 0] = 30 + 5 * load[:, 0] + rng.normal(0, 0.5, rows)  # temperature
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sensors", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=4096)
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    data = [_sensor_data(args.rows, rng) for _ in range(args.sensors)]
+
+    start = time.perf_counter()
+    single = train_chunk([(0, data[0])])
+    print(f"train one model ({args.rows} rows): {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        models = [m for chunk in pool.map(train_chunk, [[(i, d)] for i, d in enumerate(data)]) for m in chunk]
+    elapsed = time.perf_counter() - start
+    print(f"train {args.sensors} models on {args.workers} workers: {elapsed:.2f} s ({elapsed / args.sensors * 1000:.0f} ms/model)")
+
+    forest = FlatForest.from_bytes(single[0][1])
+    normal = data[0][rng.integers(args.rows, size=1000)] * rng.normal(1.0, 0.02, (1000, len(ANOMALY_FEATURES)))
+    outliers = data[0][rng.integers(args.rows, size=50)] * rng.uniform(1.5, 3.0, (50, len(ANOMALY_FEATURES)))
+    test = np.vstack([normal, outliers])
+
+    try:
+        from sklearn.ensemble import IsolationForest
+
+        reference = IsolationForest(n_estimators=N_ESTIMATORS, max_samples=MAX_SAMPLES, random_state=0).fit(data[0])
+        error = np.abs(100 * -reference.score_samples(test) - forest.score(test)).max()
+        print(f"max |flat - scikit-learn| score difference: {error:.2e}")
+    except ImportError:
+        pass
+
+    scores = forest.score(test)
+    print(f"mean score: normal {scores[:1000].mean():.1f}, outliers {scores[1000:].mean():.1f}; "
+          f"normal > 80: {(scores[:1000] > 80).mean():.1%}, outliers > 80: {(scores[1000:] > 80).mean():.1%}")
+
+    start = time.perf_counter()
+    for row in test[:1000]:
+        forest.score(row[None, :])
+    print(f"one at a time: {(time.perf_counter() - start) / 1000 * 1e6:.1f} µs/reading")
+
+    start = time.perf_counter()
+    for i in range(0, 1000, args.batch):
+        forest.score(test[i:i + args.batch])
+    print(f"batches of {args.batch}: {(time.perf_counter() - start) / 1000 * 1e6:.1f} µs/reading")
+
+
+if __name__ == "__main__":
+    main()
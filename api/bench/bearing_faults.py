@@ -0,0 +1,65 @@
+"""Throughput of bearing fault detection on synthetic FFT captures.
+
+    python -m bench.bearing_faults [--captures 5000] [--bins 2048] [--bearings 4] [--workers N]
+
+Reports captures/s on one core and captures/s/core across a process pool. No database needed.
+"""
+import argparse
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from app.services.bearing_faults import analyze_chunk
+
+
+# SKF 6310: FTF, BPFO, BPFI, BSF orders
+SKF_6310 = (0.383, 3.057, 4.943, 2.007)
+
+
+def _captures(count: int, bins: int, bearings: int, seed: int = 0) -> list[tuple]:
+    rng = np.random.default_rng(seed)
+    orders = np.array([SKF_6310] * bearings) * rng.uniform(0.8, 1.2, (bearings, 1))
+    odr, rpm = 6400, 1780
+    width = odr / 2 / bins
+    jobs = []
+    for capture_id in range(count):
+        spectrum = rng.rayleigh(0.01, bins).astype(np.float32)
+        if capture_id % 2:  # outer race damage: BPFO and two harmonics on the first bearing
+            for h in (1, 2, 3):
+                spectrum[int(round(orders[0, 1] * rpm / 60 * h / width))] += 0.2
+        blob = struct.pack(f"{bins}f", *spectrum)
+        jobs.append((capture_id, blob, odr, rpm, orders, list(range(bearings))))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--captures", type=int, default=5000)
+    parser.add_argument("--bins", type=int, default=2048)
+    parser.add_argument("--bearings", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    jobs = _captures(args.captures, args.bins, args.bearings)
+
+    start = time.perf_counter()
+    found = analyze_chunk(jobs)
+    single = args.captures / (time.perf_counter() - start)
+    print(f"1 core:    {single:,.0f} captures/s ({len(found)} detections)")
+
+    size = -(-len(jobs) // args.workers)
+    chunks = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(analyze_chunk, chunks[:1]))  # spin workers up outside the timing
+        start = time.perf_counter()
+        list(pool.map(analyze_chunk, chunks))
+        elapsed = time.perf_counter() - start
+    pooled = args.captures / elapsed
+    print(f"{args.workers} workers: {pooled:,.0f} captures/s, {pooled / args.workers:,.0f} captures/s/core")
+
+
+if __name__ == "__main__":
+    main()
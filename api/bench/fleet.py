@@ -0,0 +1,87 @@
+"""Bench fleets: a fresh org with an admin user, an ingest API key and registered sensors.
+
+Shared by `bench.load` and `bench.simulator`. Each crane gets up to three components with
+one sensor each; sensor types follow the list passed in. Bench orgs are left in place, so
+point DATABASE_URL at a scratch database.
+"""
+import math
+import secrets
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from app.auth import create_access_token, hash_password, pwd_context
+from app.db import async_session
+from app.models.api_key import ApiKey
+from app.models.component import Component
+from app.models.crane import Crane
+from app.models.facility import Facility
+from app.models.organization import Organization
+from app.models.sensor import Sensor
+from app.models.user import User
+
+
+COMPONENT_TYPES = ("hoist_motor", "bridge_motor", "gearbox")
+CRANES_PER_FACILITY = 20
+
+
+@dataclass
+class Fleet:
+    org_id: uuid.UUID
+    token: str
+    api_key: str
+    crane_ids: list[uuid.UUID]
+    sensor_ids: list[uuid.UUID]
+    macs: list[str]
+    sensor_types: list[int]
+    seed: dict = field(default_factory=dict)
+
+    @property
+    def sensors(self) -> int:
+        return len(self.sensor_ids)
+
+
+def bench_mac(i: int) -> str:
+    return ":".join(f"{b:02X}" for b in bytes([0xBE, 0x4C]) + i.to_bytes(6, "big"))
+
+
+async def provision_fleet(sensor_types: list[int], name: str | None = None) -> Fleet:
+    """Create an org holding one sensor per entry of `sensor_types`."""
+    now = datetime.now(timezone.utc)
+    async with async_session() as db:
+        org = Organization(name=name or f"bench-{len(sensor_types)}-{now:%Y%m%d%H%M%S}")
+        db.add(org)
+        await db.flush()
+        user = User(org_id=org.id, email=f"bench-{uuid.uuid4().hex[:12]}@example.com",
+                    password_hash=hash_password(secrets.token_urlsafe(16)), role="admin")
+        api_key = "bench_" + secrets.token_urlsafe(24)
+        db.add_all([user, ApiKey(org_id=org.id, key_hash=pwd_context.hash(api_key), label="bench")])
+
+        cranes_needed = math.ceil(len(sensor_types) / len(COMPONENT_TYPES))
+        facilities = [Facility(org_id=org.id, name=f"Bench plant {i + 1}")
+                      for i in range(math.ceil(cranes_needed / CRANES_PER_FACILITY))]
+        db.add_all(facilities)
+        await db.flush()
+        cranes = [Crane(facility_id=facilities[i // CRANES_PER_FACILITY].id, name=f"Crane {i + 1}",
+                        crane_type="overhead", capacity_tons=20) for i in range(cranes_needed)]
+        db.add_all(cranes)
+        await db.flush()
+        components = [Component(crane_id=crane.id, name=t.replace("_", " ").title(), component_type=t)
+                      for crane in cranes for t in COMPONENT_TYPES][:len(sensor_types)]
+        db.add_all(components)
+        await db.flush()
+        offset = int.from_bytes(secrets.token_bytes(4), "big") << 16
+        sensors = [Sensor(component_id=c.id, mac_address=bench_mac(offset + i), sensor_type=t, label=f"{c.name} {t}")
+                   for i, (c, t) in enumerate(zip(components, sensor_types))]
+        db.add_all(sensors)
+        await db.commit()
+
+    return Fleet(
+        org_id=org.id,
+        token=create_access_token(user.id, org.id),
+        api_key=api_key,
+        crane_ids=[c.id for c in cranes],
+        sensor_ids=[s.id for s in sensors],
+        macs=[s.mac_address for s in sensors],
+        sensor_types=list(sensor_types),
+    )
@@ -0,0 +1,515 @@
+"""API load and latency suite against a local Postgres (PRD §7 performance targets).
+
+    python -m bench.load [--fleets 20,200,2000] [--days 90] [--raw-days 30] [--duration 30]
+                         [--fft-captures 100000] [--requests 200] [--concurrency 8]
+                         [--ws-clients 50] [--url URL] [--out bench/results] [--compare OLD.json]
+
+For each fleet size, seeds a fresh org — one sensor per component, three components per
+crane, hourly rollups for --days, 30 s raw readings for the most recent --raw-days
+(capped at --max-raw-rows per fleet) and --fft-captures analyzed FFT captures with their
+features and peaks over the last 30 days — with COPY. Then starts the API under uvicorn
+(or uses --url, which must share the database) and measures, per fleet:
+
+  ingest      sustained POST /ingest with --concurrency clients for --duration seconds
+  fleet       GET /cranes/fleet
+  detail      GET /cranes/{id}/detail
+  readings    GET /readings, last 24 h of one sensor
+  readings_30d GET /readings, 30 days of one sensor (limit 10000)
+  trend       GET /readings/{id}/trend, 7-day change from in-memory rollups
+  search_peak GET /fft/search for the strongest peak near 1×/2×/3× running speed or a
+              fixed frequency, across every capture of the last 30 days
+  search_rms  GET /fft/search ranking the same captures by overall RMS
+  websocket   POST /ingest -> /ws delivery to --ws-clients listeners
+
+Results — latency percentiles, throughput, seed sizes and which PRD targets were met — are
+written as JSON named after the commit, and --compare prints the change against an earlier
+run. Point DATABASE_URL at a scratch, migrated database: bench orgs are left in place.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+import numpy as np
+import websockets
+from sqlalchemy import text
+
+from app.db import async_session
+from app.models.fft_capture import FFTCapture
+from app.models.fft_feature import FFTFeature
+from app.models.fft_feature_peak import FFTFeaturePeak
+from app.models.reading import Reading
+from app.models.reading_hourly import ReadingHourly
+from app.services.fft_features import FEATURE_BANDS_HZ, PEAK_COUNT, _peak_rows
+from app.services.sharding import bind_tenant
+from app.services.spectrum import SPECTRUM_DTYPE
+from bench.fleet import Fleet, provision_fleet
+
+
+API_DIR = Path(__file__).resolve().parent.parent
+RAW_INTERVAL = timedelta(seconds=30)
+AXES = ("x", "y", "z")
+
+TARGETS = {
+    "api_p95_ms": 200,         # API response time (p95)
+    "ingest_per_min": 400,     # ingest throughput (200-sensor headroom)
+    "readings_30d_p95_ms": 500,
+    "trend_p95_ms": 100,       # rollup-backed trends
+    "search_p95_ms": 1000,     # fleet FFT search over --fft-captures captures
+}
+FFT_SPAN = timedelta(days=30)  # the search endpoint's default window
+FFT_SEED_BATCH = 10_000
+
+
+# ── Seeding ──
+
+async def _copy(db, model, columns: list[str], records: list[tuple]) -> None:
+    connection = await db.connection(bind_arguments={"mapper": model})
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(model.__tablename__, columns=columns, records=records)
+
+
+def _sensor_profile(rng) -> np.ndarray:
+    """Baseline temperature, per-axis acceleration (g) and velocity (mm/s) of one sensor."""
+    return np.concatenate([[rng.uniform(25, 45)], rng.uniform(0.05, 0.4, 3), rng.uniform(0.5, 4.0, 3)])
+
+
+def _series(profile: np.ndarray, n: int, rng) -> np.ndarray:
+    """(n, 7) readings around `profile` with a slow duty cycle and noise."""
+    duty = 0.6 + 0.4 * np.sin(np.linspace(0, n / 120 * np.pi, n))[:, None]
+    noise = rng.lognormal(0.0, 0.15, (n, 7))
+    values = profile * duty * noise
+    values[:, 0] = profile[0] + 5 * duty[:, 0] + rng.normal(0, 0.5, n)
+    return values
+
+
+HOURLY_COLUMNS = [
+    "sensor_id", "hour", "reading_count",
+    "temperature_avg", "temperature_max",
+    "x_rms_ACC_G_avg", "x_rms_ACC_G_max", "y_rms_ACC_G_avg", "y_rms_ACC_G_max",
+    "z_rms_ACC_G_avg", "z_rms_ACC_G_max",
+    "x_velocity_mm_sec_avg", "x_velocity_mm_sec_max", "y_velocity_mm_sec_avg", "y_velocity_mm_sec_max",
+    "z_velocity_mm_sec_avg", "z_velocity_mm_sec_max",
+    "battery_percent_min",
+]
+RAW_COLUMNS = [
+    "sensor_id", "timestamp", "battery_percent", "temperature",
+    "x_rms_ACC_G", "y_rms_ACC_G", "z_rms_ACC_G",
+    "x_velocity_mm_sec", "y_velocity_mm_sec", "z_velocity_mm_sec",
+]
+
+
+CAPTURE_COLUMNS = ["id", "sensor_id", "timestamp", "axis", "odr", "num_bins", "spectrum_data", "analyzed_at"]
+FEATURE_COLUMNS = [
+    "fft_capture_id", "sensor_id", "timestamp", "axis", "rpm", "overall_rms",
+    "peak_frequencies_hz", "peak_amplitudes", "band_energies", "amp_1x", "amp_2x", "amp_3x",
+]
+PEAK_COLUMNS = ["fft_capture_id", "rank", "sensor_id", "timestamp", "frequency_hz", "shaft_order", "amplitude"]
+
+
+def _features(rpm: int, rng) -> dict:
+    """Peaks and scalar features of one capture: running-speed harmonics when RPM is known, plus noise peaks."""
+    frequencies = list(rng.uniform(5, 1600, PEAK_COUNT))
+    amplitudes = list(rng.lognormal(-2.5, 0.8, PEAK_COUNT))
+    orders = [None, None, None]
+    if rpm:
+        one_x = rng.lognormal(-1.0, 0.5)
+        orders = [one_x, one_x * rng.lognormal(-1.0, 0.7), one_x * rng.lognormal(-2.0, 0.7)]
+        frequencies[:3] = [k * rpm / 60 * rng.uniform(0.995, 1.005) for k in (1, 2, 3)]
+        amplitudes[:3] = orders
+    ranked = sorted(zip(amplitudes, frequencies), reverse=True)
+    return {
+        "rpm": rpm or None,
+        "overall_rms": float(np.sqrt(np.sum(np.square(amplitudes))) * 1.2),
+        "peak_frequencies_hz": [float(f) for _, f in ranked],
+        "peak_amplitudes": [float(a) for a, _ in ranked],
+        "band_energies": rng.lognormal(-3, 1, len(FEATURE_BANDS_HZ)).tolist(),
+        **{f"amp_{k}x": None if a is None else float(a) for k, a in zip((1, 2, 3), orders)},
+    }
+
+
+async def _seed_fft(db, fleet: Fleet, count: int, now: datetime, rng) -> None:
+    """`count` analyzed captures spread over FFT_SPAN, with their fft_features and fft_feature_peaks.
+
+    Search never decodes spectra, so each capture carries a short placeholder blob. Copied in
+    batches of FFT_SEED_BATCH captures, each well inside the statement timeout.
+    """
+    blob = np.zeros(64, dtype=SPECTRUM_DTYPE).tobytes()
+    for done in range(0, count, FFT_SEED_BATCH):
+        n = min(FFT_SEED_BATCH, count - done)
+        result = await db.execute(
+            text("SELECT nextval(pg_get_serial_sequence('fft_captures', 'id')) FROM generate_series(1, :n)"),
+            {"n": n}, bind_arguments={"mapper": FFTCapture},
+        )
+        sensors = rng.integers(fleet.sensors, size=n)
+        offsets = rng.uniform(0, FFT_SPAN.total_seconds(), n)
+        rpms = np.where(rng.random(n) < 0.7, rng.integers(600, 1800, n), 0)
+        captures, features, peaks = [], [], []
+        for capture_id, s, offset, rpm in zip(result.scalars(), sensors.tolist(), offsets.tolist(), rpms.tolist()):
+            sensor_id, ts, axis = fleet.sensor_ids[s], now - timedelta(seconds=offset), AXES[capture_id % 3]
+            captures.append((capture_id, sensor_id, ts, axis, 3200, 64, blob, now))
+            row = {"fft_capture_id": capture_id, "sensor_id": sensor_id, "timestamp": ts, "axis": axis, **_features(rpm, rng)}
+            features.append(tuple(row[c] for c in FEATURE_COLUMNS))
+            peaks.extend(tuple(p[c] for c in PEAK_COLUMNS) for p in _peak_rows(row))
+        await _copy(db, FFTCapture, CAPTURE_COLUMNS, captures)
+        await _copy(db, FFTFeature, FEATURE_COLUMNS, features)
+        await _copy(db, FFTFeaturePeak, PEAK_COLUMNS, peaks)
+
+
+async def seed_fleet(
+    sensors: int, days: int, raw_days: float, max_raw_rows: int, rng, fft_captures: int = 0,
+) -> Fleet:
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    per_day = int(timedelta(days=1) / RAW_INTERVAL)
+    raw_days = min(raw_days, max_raw_rows / (sensors * per_day))
+    started = time.perf_counter()
+    fleet = await provision_fleet([114] * sensors)
+
+    async with async_session() as db:
+        await bind_tenant(db, fleet.org_id)
+        hours = [now - timedelta(hours=h) for h in range(days * 24, 0, -1)]
+        raw_count = int(raw_days * per_day)
+        raw_times = [now - RAW_INTERVAL * i for i in range(raw_count, 0, -1)]
+        hourly_rows = raw_rows = 0
+        for sensor_id in fleet.sensor_ids:
+            profile = _sensor_profile(rng)
+            hourly = _series(profile, len(hours), rng)
+            peaks = hourly * rng.uniform(1.1, 1.6, hourly.shape)
+            await _copy(db, ReadingHourly, HOURLY_COLUMNS, [
+                (sensor_id, hour, 120, *(v for pair in zip(avg, peak) for v in pair), 90)
+                for hour, avg, peak in zip(hours, hourly.tolist(), peaks.tolist())
+            ])
+            hourly_rows += len(hours)
+            if raw_count:
+                raw = _series(profile, raw_count, rng)
+                await _copy(db, Reading, RAW_COLUMNS, [
+                    (sensor_id, ts, 90, *values) for ts, values in zip(raw_times, raw.tolist())
+                ])
+                raw_rows += raw_count
+        if fft_captures:
+            await _seed_fft(db, fleet, fft_captures, datetime.now(timezone.utc), rng)
+        await db.commit()
+        if fft_captures:
+            for model in (FFTCapture, FFTFeature, FFTFeaturePeak):
+                connection = await db.connection(bind_arguments={"mapper": model})
+                await connection.execute(text(f"ANALYZE {model.__tablename__}"))
+            await db.commit()
+
+    fleet.seed = {
+        "cranes": len(fleet.crane_ids), "hourly_rows": hourly_rows, "raw_rows": raw_rows, "fft_captures": fft_captures,
+        "raw_days": round(raw_days, 2), "seconds": round(time.perf_counter() - started, 1),
+    }
+    return fleet
+
+
+# ── Server ──
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def api_server(url: str | None):
+    """Yield the base URL of a running API, starting uvicorn unless `url` is given."""
+    if url:
+        yield url.rstrip("/")
+        return
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=API_DIR,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                if httpx.get(f"{base}/health", timeout=1).status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise SystemExit("API server did not start")
+            time.sleep(0.25)
+        yield base
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+# ── Measurement ──
+
+def summarize(latencies: list[float], errors: int, elapsed: float | None = None) -> dict:
+    ms = np.array(latencies) * 1000
+    summary = {"count": len(latencies), "errors": errors}
+    if len(ms):
+        summary.update({
+            "mean_ms": round(float(ms.mean()), 2),
+            "p50_ms": round(float(np.percentile(ms, 50)), 2),
+            "p95_ms": round(float(np.percentile(ms, 95)), 2),
+            "p99_ms": round(float(np.percentile(ms, 99)), 2),
+            "max_ms": round(float(ms.max()), 2),
+        })
+    if elapsed:
+        summary["per_min"] = round(len(latencies) / elapsed * 60, 1)
+    return summary
+
+
+async def measure(client: httpx.AsyncClient, requests: list[tuple[str, dict]], concurrency: int, headers: dict) -> dict:
+    latencies, errors = [], 0
+    queue = list(reversed(requests))
+
+    async def worker():
+        nonlocal errors
+        while queue:
+            path, params = queue.pop()
+            started = time.perf_counter()
+            response = await client.get(path, params=params, headers=headers)
+            if response.status_code == 200:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors)
+
+
+def _reading(mac: str, rng) -> dict:
+    values = _series(_sensor_profile(rng), 1, rng)[0]
+    return {
+        "addr": mac, "battery_percent": 90, "temperature": values[0],
+        **{f"{a}_rms_ACC_G": v for a, v in zip(AXES, values[1:4])},
+        **{f"{a}_velocity_mm_sec": v for a, v in zip(AXES, values[4:7])},
+    }
+
+
+async def measure_ingest(client: httpx.AsyncClient, fleet: Fleet, duration: float, concurrency: int, rng) -> dict:
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+    headers = {"X-API-Key": fleet.api_key}
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            body = _reading(fleet.macs[rng.integers(len(fleet.macs))], rng)
+            started = time.perf_counter()
+            response = await client.post("/api/v1/ingest", json=body, headers=headers)
+            if response.status_code == 200:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def measure_websocket(client: httpx.AsyncClient, base: str, fleet: Fleet, clients: int, samples: int, rng) -> dict:
+    """Time from sending an ingest to each listener receiving its sensor.reading event."""
+    arrivals: dict[int, list[float]] = {}
+
+    async def listen(ws):
+        async for message in ws:
+            event = json.loads(message)
+            if event.get("event") == "sensor.reading":
+                arrivals.setdefault(event["reading_id"], []).append(time.perf_counter())
+
+    ws_url = base.replace("http", "ws", 1) + "/ws"
+    sockets = [await websockets.connect(ws_url) for _ in range(clients)]
+    listeners = [asyncio.create_task(listen(ws)) for ws in sockets]
+    latencies, errors = [], 0
+    try:
+        for _ in range(samples):
+            body = _reading(fleet.macs[rng.integers(len(fleet.macs))], rng)
+            sent = time.perf_counter()
+            response = await client.post("/api/v1/ingest", json=body, headers={"X-API-Key": fleet.api_key})
+            if response.status_code != 200:
+                errors += 1
+                continue
+            reading_id = response.json()["reading_id"]
+            deadline = time.perf_counter() + 5
+            while len(arrivals.get(reading_id, ())) < clients and time.perf_counter() < deadline:
+                await asyncio.sleep(0.001)
+            received = arrivals.pop(reading_id, [])
+            errors += clients - len(received)
+            latencies.extend(t - sent for t in received)
+    finally:
+        for task in listeners:
+            task.cancel()
+        for ws in sockets:
+            await ws.close()
+    return summarize(latencies, errors)
+
+
+async def wait_for_trends(client: httpx.AsyncClient, fleet: Fleet, timeout: float = 300) -> None:
+    """Block until the API's rolling stats have loaded (the trend endpoint answers 503 before)."""
+    deadline = time.monotonic() + timeout
+    headers = {"Authorization": f"Bearer {fleet.token}"}
+    while time.monotonic() < deadline:
+        response = await client.get(f"/api/v1/readings/{fleet.sensor_ids[0]}/trend",
+                                    params={"metric": "x_velocity_mm_sec", "days": 7}, headers=headers)
+        if response.status_code != 503:
+            return
+        await asyncio.sleep(1)
+
+
+async def run_fleet(base: str, fleet: Fleet, args, rng) -> dict:
+    now = datetime.now(timezone.utc)
+    headers = {"Authorization": f"Bearer {fleet.token}"}
+
+    def pick(items):
+        return [items[i] for i in rng.integers(len(items), size=args.requests)]
+
+    async with httpx.AsyncClient(base_url=base, timeout=60) as client:
+        await wait_for_trends(client, fleet)
+        results = {"seed": fleet.seed}
+        results["fleet"] = await measure(client, [("/api/v1/cranes/fleet", {})] * args.requests, args.concurrency, headers)
+        results["detail"] = await measure(
+            client, [(f"/api/v1/cranes/{c}/detail", {}) for c in pick(fleet.crane_ids)], args.concurrency, headers,
+        )
+        results["readings"] = await measure(client, [
+            ("/api/v1/readings", {"sensor_id": str(s), "start": (now - timedelta(days=1)).isoformat(), "limit": 2880})
+            for s in pick(fleet.sensor_ids)
+        ], args.concurrency, headers)
+        results["readings_30d"] = await measure(client, [
+            ("/api/v1/readings", {"sensor_id": str(s), "start": (now - timedelta(days=30)).isoformat(), "limit": 10000})
+            for s in pick(fleet.sensor_ids)
+        ], args.concurrency, headers)
+        results["trend"] = await measure(client, [
+            (f"/api/v1/readings/{s}/trend", {"metric": "x_velocity_mm_sec", "days": 7})
+            for s in pick(fleet.sensor_ids)
+        ], args.concurrency, headers)
+        results["search_peak"] = await measure(client, [
+            ("/api/v1/fft/search", {"metric": "peak", **params, "min_value": 0.05})
+            for params in pick([{"order": 1}, {"order": 2}, {"order": 3}, {"frequency_hz": 50}, {"frequency_hz": 400}])
+        ], args.concurrency, headers)
+        results["search_rms"] = await measure(client, [
+            ("/api/v1/fft/search", {"metric": "overall_rms", **params})
+            for params in pick([{}, *({"axis": a} for a in AXES)])
+        ], args.concurrency, headers)
+        results["ingest"] = await measure_ingest(client, fleet, args.duration, args.concurrency, rng)
+        results["websocket"] = await measure_websocket(client, base, fleet, args.ws_clients, args.ws_samples, rng)
+    return results
+
+
+def checks(fleets: dict) -> list[dict]:
+    """Each PRD target against each fleet's results."""
+    out = []
+    for size, r in fleets.items():
+        for name in ("fleet", "detail", "readings"):
+            out.append({"fleet": size, "check": f"{name} p95", "value": r[name].get("p95_ms"), "target": TARGETS["api_p95_ms"]})
+        out.append({"fleet": size, "check": "readings_30d p95", "value": r["readings_30d"].get("p95_ms"), "target": TARGETS["readings_30d_p95_ms"]})
+        out.append({"fleet": size, "check": "trend p95", "value": r["trend"].get("p95_ms"), "target": TARGETS["trend_p95_ms"]})
+        for name in ("search_peak", "search_rms"):
+            out.append({"fleet": size, "check": f"{name} p95", "value": r[name].get("p95_ms"), "target": TARGETS["search_p95_ms"]})
+        out.append({"fleet": size, "check": "ingest per min", "value": r["ingest"].get("per_min"), "target": TARGETS["ingest_per_min"], "min": True})
+    for c in out:
+        value = c["value"]
+        c["ok"] = value is not None and (value >= c["target"] if c.pop("min", False) else value <= c["target"])
+    return out
+
+
+# ── Results ──
+
+def _git(*args: str) -> str | None:
+    try:
+        return subprocess.run(["git", *args], cwd=API_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old: dict, new: dict) -> None:
+    print(f"\nvs {(old.get('commit') or '?')[:10]} ({old.get('started_at')})")
+    for size, scenarios in new["fleets"].items():
+        before = old.get("fleets", {}).get(size, {})
+        for name, summary in scenarios.items():
+            key = "per_min" if "per_min" in summary else "p95_ms"
+            was, now = before.get(name, {}).get(key), summary.get(key)
+            if was and now is not None:
+                change = (now - was) / was * 100
+                worse = change < -10 if key == "per_min" else change > 10
+                print(f"  {size:>5} {name:<13} {key:<7} {was:>10.1f} -> {now:>10.1f}  {change:+6.1f}%{'  REGRESSION' if worse else ''}")
+
+
+def report(results: dict) -> None:
+    for size, scenarios in results["fleets"].items():
+        print(f"\n{size} sensors  (seeded {scenarios['seed']})")
+        for name, s in scenarios.items():
+            if name == "seed":
+                continue
+            extra = f"  {s['per_min']:.0f}/min" if "per_min" in s else ""
+            print(f"  {name:<13} n={s['count']:<6} err={s['errors']:<4} p50={s.get('p50_ms', '-')}  "
+                  f"p95={s.get('p95_ms', '-')}  p99={s.get('p99_ms', '-')} ms{extra}")
+    failed = [c for c in results["checks"] if not c["ok"]]
+    print(f"\n{len(results['checks']) - len(failed)}/{len(results['checks'])} targets met")
+    for c in failed:
+        print(f"  MISSED {c['fleet']} sensors {c['check']}: {c['value']} (target {c['target']})")
+
+
+async def run(args) -> dict:
+    rng = np.random.default_rng(args.seed)
+    sizes = [int(s) for s in args.fleets.split(",")]
+    fleets = []
+    for size in sizes:
+        print(f"Seeding {size} sensors ...", flush=True)
+        fleets.append(await seed_fleet(size, args.days, args.raw_days, args.max_raw_rows, rng, args.fft_captures))
+
+    results = {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("compare", "out")},
+        "targets": TARGETS,
+        "fleets": {},
+    }
+    with api_server(args.url) as base:
+        for fleet in fleets:
+            print(f"Measuring {fleet.sensors} sensors ...", flush=True)
+            results["fleets"][str(fleet.sensors)] = await run_fleet(base, fleet, args, rng)
+    results["checks"] = checks(results["fleets"])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fleets", default="20,200,2000", help="Comma-separated sensor counts")
+    parser.add_argument("--days", type=int, default=90, help="Days of hourly rollups per sensor")
+    parser.add_argument("--raw-days", type=float, default=30, help="Days of 30 s raw readings per sensor")
+    parser.add_argument("--max-raw-rows", type=int, default=20_000_000, help="Cap on raw rows per fleet")
+    parser.add_argument("--fft-captures", type=int, default=100_000, help="Analyzed FFT captures per fleet, for search")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per read scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30, help="Seconds of sustained ingest")
+    parser.add_argument("--ws-clients", type=int, default=50)
+    parser.add_argument("--ws-samples", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed for generated data")
+    parser.add_argument("--url", help="Use a running API instead of starting one")
+    parser.add_argument("--out", type=Path, default=API_DIR / "bench" / "results")
+    parser.add_argument("--compare", type=Path, help="Earlier results JSON to diff against")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    args.out.mkdir(parents=True, exist_ok=True)
+    path = args.out / f"load-{(results['commit'] or 'nogit')[:10]}-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}.json"
+    path.write_text(json.dumps(results, indent=2, default=str))
+    report(results)
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), results)
+    print(f"\nWrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+"""Asyncio sensor fleet simulator: realistic ingest traffic through the public API.
+
+    python -m bench.simulator --provision 2000 [--mix 114=70,39=10,47=8,52=6,28=6]
+    python -m bench.simulator --api-key KEY (--token JWT | --addr-file FILE)
+        [--url http://localhost:8000] [--interval 30] [--rate R] [--burstiness 0.5]
+        [--duration 300] [--degrading 0.05] [--spiky 0.1] [--fft-every 20] [--fft-bins 2048]
+        [--duplicates 0.01] [--out-of-order 0.01] [--connections 32] [--http2] [--out FILE]
+
+Every sensor is a task posting `SensorReading` payloads for its type (114 vibration, 39
+temperature, 47 tilt, 52 4-20 mA, 28 three-channel current) with a healthy, degrading or
+spiky profile. Vibration sensors attach an FFT capture every --fft-every readings. Send gaps
+average --interval seconds (or --rate readings/s for the whole fleet); --burstiness blends
+fixed spacing (0) into Poisson arrivals (1). Duplicates resend a payload with the same
+counter — the API should answer 409 — and out-of-order sends hold a reading back until
+after the next one.
+
+Sensors come from --provision (a new bench org in DATABASE_URL; prints its key and token),
+from GET /sensors with --token, or from --addr-file (`MAC[,sensor_type]` per line). All
+traffic shares one httpx connection pool (--connections keep-alive connections); --http2
+multiplexes over it where the server negotiates HTTP/2 (TLS/ALPN — uvicorn itself only
+speaks HTTP/1.1). Client-side latency histograms are printed every --report-every seconds
+and at exit, and written to --out as JSON.
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+from app.schemas.ingest import FFTPayload, SensorReading
+from bench.fleet import provision_fleet
+
+
+SENSOR_TYPES = (114, 39, 47, 52, 28)
+PROFILES = ("healthy", "degrading", "spiky")
+FFT_ODR = 25600
+SPIKE_CHANCE = 0.15  # per reading, for spiky sensors
+DEGRADE_SECONDS = 3600  # a degrading sensor reaches its worst level after this long
+
+
+# ── Latency histogram ──
+
+class LatencyHistogram:
+    """Log-bucketed latencies: 20 buckets per decade from 100 µs to 100 s (~12% resolution)."""
+
+    LOW, DECADES, PER_DECADE = 1e-4, 6, 20
+
+    def __init__(self):
+        self.counts = np.zeros(self.DECADES * self.PER_DECADE + 1, dtype=np.int64)
+        self.total = 0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        position = math.log10(max(seconds, self.LOW) / self.LOW) * self.PER_DECADE
+        self.counts[min(int(position), len(self.counts) - 1)] += 1
+        self.total += 1
+        self.max = max(self.max, seconds)
+
+    def upper(self, bucket: int) -> float:
+        return self.LOW * 10 ** ((bucket + 1) / self.PER_DECADE)
+
+    def quantile(self, q: float) -> float:
+        """Upper edge of the bucket holding the q-quantile, in seconds."""
+        if not self.total:
+            return 0.0
+        bucket = int(np.searchsorted(np.cumsum(self.counts), q * self.total))
+        return min(self.upper(bucket), self.max)
+
+    def summary(self) -> dict:
+        return {
+            "count": self.total,
+            **{f"p{label}_ms": round(self.quantile(q) * 1000, 2)
+               for label, q in (("50", 0.5), ("90", 0.9), ("99", 0.99), ("99.9", 0.999))},
+            "max_ms": round(self.max * 1000, 2),
+        }
+
+    def buckets(self) -> list[tuple[float, int]]:
+        """(upper edge ms, count) for every non-empty bucket."""
+        return [(round(self.upper(i) * 1000, 3), int(c)) for i, c in enumerate(self.counts) if c]
+
+
+# ── Sensors ──
+
+@dataclass
+class SimSensor:
+    addr: str
+    sensor_type: int
+    profile: str
+    base: np.ndarray
+    counter: int
+    started: float = field(default_factory=time.monotonic)
+    held: SensorReading | None = None  # out-of-order reading waiting for the next send
+
+    def severity(self, rng) -> float:
+        """Multiplier on the healthy signal: drifts up when degrading, jumps when spiky."""
+        if self.profile == "degrading":
+            return 1 + 3 * min((time.monotonic() - self.started) / DEGRADE_SECONDS, 1.0)
+        if self.profile == "spiky" and rng.random() < SPIKE_CHANCE:
+            return rng.uniform(3, 5)
+        return 1.0
+
+    def reading(self, rng, fft_every: int, fft_bins: int) -> SensorReading:
+        self.counter += 1
+        s = self.severity(rng)
+        spike = self.profile == "spiky" and s > 1
+        noise = rng.lognormal(0.0, 0.08, 3)
+        fields = {"addr": self.addr, "counter": self.counter, "sensor_type": self.sensor_type, "firmware": 10,
+                  "battery_percent": max(10, 95 - self.counter // 500 % 80), "rssi": int(rng.integers(-80, -50))}
+        if self.sensor_type == 114:
+            velocity = self.base * noise * s
+            fields.update(odr=800, rpm=1750, temperature=round(30 + 4 * s + rng.normal(0, 0.3), 1))
+            for axis, v in zip("xyz", velocity):
+                fields.update({
+                    f"{axis}_velocity_mm_sec": round(v, 3), f"{axis}_rms_ACC_G": round(v * 0.12, 4),
+                    f"{axis}_max_ACC_G": round(v * 0.3, 4), f"{axis}_displacement_mm": round(v * 0.006, 5),
+                    f"{axis}_peak_one_Hz": 29.2, f"{axis}_peak_two_Hz": 58.3, f"{axis}_peak_three_Hz": round(rng.uniform(90, 400), 1),
+                })
+            if fft_every and self.counter % fft_every == 0:
+                fields["fft"] = spectrum(rng, "xyz"[self.counter // fft_every % 3], fft_bins, s)
+        elif self.sensor_type == 39:
+            fields["temperature"] = round(self.base[0] * (1 + 0.5 * (s - 1)) + rng.normal(0, 0.3), 1)
+        elif self.sensor_type == 47:
+            roll, pitch = self.base[:2] * s + rng.normal(0, 0.05, 2)
+            fields.update(roll=round(roll, 2), pitch=round(pitch, 2))
+        elif self.sensor_type == 52:
+            # degrading loops drift past the top of the 4-20 mA band; spikes drop below it
+            fields["mA1"] = round(rng.uniform(0.0, 3.5) if spike else min(self.base[0] + 3 * (s - 1), 22.0), 3)
+        elif self.sensor_type == 28:
+            currents = self.base * noise * (1 if spike else s)
+            if spike:
+                currents[rng.integers(3)] = 0.0  # a dropped phase
+            fields.update({f"channel_{i + 1}": round(c, 2) for i, c in enumerate(currents)})
+        return SensorReading(**fields)
+
+
+def spectrum(rng, axis: str, bins: int, severity: float) -> FFTPayload:
+    """Noise floor with running-speed harmonics and a bearing tone that grows with `severity`."""
+    freqs = np.arange(bins) * (FFT_ODR / 2 / bins)
+    amplitude = rng.lognormal(np.log(0.002), 0.4, bins)
+    for hz, height in ((29.2, 0.2), (58.3, 0.08), (87.5, 0.04), (157.0, 0.02 * severity ** 2)):
+        amplitude += height * np.exp(-0.5 * ((freqs - hz) / (FFT_ODR / bins)) ** 2)
+    return FFTPayload(axis=axis, odr=FFT_ODR, num_bins=bins, data=np.round(amplitude, 6).tolist())
+
+
+def make_sensor(addr: str, sensor_type: int, args, rng) -> SimSensor:
+    profile = rng.choice(PROFILES, p=[1 - args.degrading - args.spiky, args.degrading, args.spiky])
+    base = {
+        114: rng.uniform(0.15, 0.6, 3),
+        39: rng.uniform(25, 45, 1),
+        47: rng.uniform(-0.8, 0.8, 2),
+        52: rng.uniform(8, 14, 1),
+        28: rng.uniform(5, 40, 1).repeat(3),
+    }.get(sensor_type, np.ones(3))
+    return SimSensor(addr, sensor_type, str(profile), base, counter=int(rng.integers(1_000, 1_000_000)))
+
+
+# ── Traffic ──
+
+@dataclass
+class Stats:
+    latency: dict[str, LatencyHistogram] = field(default_factory=lambda: {"reading": LatencyHistogram(), "fft": LatencyHistogram()})
+    window: LatencyHistogram = field(default_factory=LatencyHistogram)
+    status: Counter = field(default_factory=Counter)
+    http_versions: Counter = field(default_factory=Counter)
+    sent: int = 0
+    duplicates: int = 0
+    out_of_order: int = 0
+
+
+class Simulator:
+    def __init__(self, client: httpx.AsyncClient, sensors: list[SimSensor], args, rng):
+        self.client, self.sensors, self.args, self.rng = client, sensors, args, rng
+        self.interval = len(sensors) / args.rate if args.rate else args.interval
+        self.stats = Stats()
+        self.pending: set[asyncio.Task] = set()
+
+    def gap(self) -> float:
+        """Next send gap: fixed spacing blended with an exponential by `burstiness`."""
+        b = self.args.burstiness
+        return self.interval * (1 - b) + b * self.rng.exponential(self.interval)
+
+    async def send(self, reading: SensorReading) -> None:
+        started = time.perf_counter()
+        try:
+            response = await self.client.post("/api/v1/ingest", content=reading.model_dump_json(exclude_none=True))
+        except httpx.HTTPError as e:
+            self.stats.status[type(e).__name__] += 1
+            return
+        elapsed = time.perf_counter() - started
+        self.stats.sent += 1
+        self.stats.status[response.status_code] += 1
+        self.stats.http_versions[response.http_version] += 1
+        if response.status_code == 200:
+            self.stats.latency["fft" if reading.fft else "reading"].record(elapsed)
+            self.stats.window.record(elapsed)
+
+    def resend_later(self, reading: SensorReading) -> None:
+        """Send `reading` again within the API's 10-minute duplicate window."""
+        async def later():
+            await asyncio.sleep(self.rng.uniform(0, min(self.interval * 3, 300)))
+            await self.send(reading)
+
+        self.stats.duplicates += 1
+        task = asyncio.create_task(later())
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+
+    async def run_sensor(self, sensor: SimSensor, deadline: float) -> None:
+        await asyncio.sleep(self.rng.uniform(0, self.interval))  # spread start-up
+        while time.monotonic() < deadline:
+            reading = sensor.reading(self.rng, self.args.fft_every, self.args.fft_bins)
+            if sensor.held is None and self.rng.random() < self.args.out_of_order:
+                sensor.held = reading
+                self.stats.out_of_order += 1
+            else:
+                await self.send(reading)
+                if sensor.held is not None:
+                    await self.send(sensor.held)
+                    sensor.held = None
+            if self.rng.random() < self.args.duplicates:
+                self.resend_later(reading)
+            await asyncio.sleep(self.gap())
+
+    async def report(self, deadline: float) -> None:
+        last_sent, last_time = 0, time.monotonic()
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.args.report_every)
+            now, window = time.monotonic(), self.stats.window
+            rate = (self.stats.sent - last_sent) / (now - last_time)
+            errors = sum(n for code, n in self.stats.status.items() if code not in (200, 409))
+            print(f"  {rate:7.1f} req/s  sent={self.stats.sent}  errors={errors}  "
+                  f"p50={window.quantile(0.5) * 1000:.1f} ms  p99={window.quantile(0.99) * 1000:.1f} ms", flush=True)
+            self.stats.window = LatencyHistogram()
+            last_sent, last_time = self.stats.sent, now
+
+    async def run(self) -> float:
+        started = time.monotonic()
+        deadline = started + self.args.duration
+        reporter = asyncio.create_task(self.report(deadline))
+        await asyncio.gather(*(self.run_sensor(s, deadline) for s in self.sensors))
+        if self.pending:
+            await asyncio.gather(*self.pending, return_exceptions=True)
+        reporter.cancel()
+        return time.monotonic() - started
+
+
+# ── Setup ──
+
+def parse_mix(text: str) -> dict[int, float]:
+    mix = {int(t): float(w) for t, w in (part.split("=") for part in text.split(","))}
+    unknown = set(mix) - set(SENSOR_TYPES)
+    if unknown:
+        raise SystemExit(f"Unknown sensor types in --mix: {sorted(unknown)}")
+    total = sum(mix.values())
+    return {t: w / total for t, w in mix.items()}
+
+
+async def load_sensors(args, rng) -> tuple[list[tuple[str, int]], str]:
+    """(addr, sensor_type) pairs and the API key to ingest with."""
+    if args.provision:
+        mix = parse_mix(args.mix)
+        types = [int(t) for t in rng.choice(list(mix), size=args.provision, p=list(mix.values()))]
+        fleet = await provision_fleet(types)
+        print(f"Provisioned org {fleet.org_id}\n  API key: {fleet.api_key}\n  token:   {fleet.token}")
+        return list(zip(fleet.macs, types)), fleet.api_key
+    if not args.api_key:
+        raise SystemExit("--api-key is required unless --provision is used")
+    if args.addr_file:
+        pairs = []
+        for line in args.addr_file.read_text().splitlines():
+            if line.strip() and not line.startswith("#"):
+                addr, _, sensor_type = line.strip().partition(",")
+                pairs.append((addr, int(sensor_type or 114)))
+        return pairs, args.api_key
+    if not args.token:
+        raise SystemExit("Pass --token or --addr-file to choose the sensors")
+    response = httpx.get(f"{args.url}/api/v1/sensors", headers={"Authorization": f"Bearer {args.token}"}, timeout=30)
+    response.raise_for_status()
+    return [(s["mac_address"], s["sensor_type"]) for s in response.json()], args.api_key
+
+
+def report(stats: Stats, elapsed: float, sensors: list[SimSensor]) -> dict:
+    result = {
+        "elapsed_s": round(elapsed, 1),
+        "sensors": dict(Counter(f"{s.sensor_type}/{s.profile}" for s in sensors)),
+        "sent": stats.sent,
+        "per_s": round(stats.sent / elapsed, 1),
+        "status": {str(k): v for k, v in stats.status.items()},
+        "http_versions": dict(stats.http_versions),
+        "duplicates_injected": stats.duplicates,
+        "out_of_order_injected": stats.out_of_order,
+        "latency": {name: h.summary() for name, h in stats.latency.items()},
+        "histograms": {name: h.buckets() for name, h in stats.latency.items()},
+    }
+    print(f"\n{stats.sent} requests in {elapsed:.0f} s ({result['per_s']}/s) over {dict(stats.http_versions)}")
+    print(f"  status {result['status']}  duplicates injected={stats.duplicates} (expect 409)  out-of-order={stats.out_of_order}")
+    for name, histogram in stats.latency.items():
+        if not histogram.total:
+            continue
+        print(f"\n  {name}: " + "  ".join(f"{k}={v}" for k, v in histogram.summary().items()))
+        peak = max(c for _, c in histogram.buckets())
+        for upper, count in histogram.buckets():
+            print(f"    <= {upper:>9.2f} ms {count:>8}  {'#' * max(1, round(40 * count / peak))}")
+    return result
+
+
+async def main_async(args) -> None:
+    rng = np.random.default_rng(args.seed)
+    pairs, api_key = await load_sensors(args, rng)
+    if not pairs:
+        raise SystemExit("No sensors to simulate")
+    sensors = [make_sensor(addr, sensor_type, args, rng) for addr, sensor_type in pairs]
+
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    async with httpx.AsyncClient(
+        base_url=args.url, http2=args.http2, limits=limits,
+        timeout=httpx.Timeout(30, pool=None),
+        headers={"X-API-Key": api_key, "Content-Type": "application/json"},
+    ) as client:
+        simulator = Simulator(client, sensors, args, rng)
+        print(f"Simulating {len(sensors)} sensors, {len(sensors) / simulator.interval:.1f} readings/s "
+              f"for {args.duration:.0f} s against {args.url}", flush=True)
+        elapsed = await simulator.run()
+
+    result = report(simulator.stats, elapsed, sensors)
+    if args.out:
+        args.out.write_text(json.dumps({"config": {k: str(v) for k, v in vars(args).items()}, **result}, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--api-key")
+    parser.add_argument("--token", help="JWT used to list the org's sensors")
+    parser.add_argument("--addr-file", type=Path, help="MAC[,sensor_type] per line")
+    parser.add_argument("--provision", type=int, help="Create a bench org with this many sensors")
+    parser.add_argument("--mix", default="114=70,39=10,47=8,52=6,28=6", help="Sensor type weights for --provision")
+    parser.add_argument("--interval", type=float, default=30, help="Mean seconds between one sensor's readings")
+    parser.add_argument("--rate", type=float, help="Fleet-wide readings/s (overrides --interval)")
+    parser.add_argument("--burstiness", type=float, default=0.5, help="0 = fixed spacing, 1 = Poisson")
+    parser.add_argument("--duration", type=float, default=300, help="Seconds to run")
+    parser.add_argument("--degrading", type=float, default=0.05, help="Fraction of degrading sensors")
+    parser.add_argument("--spiky", type=float, default=0.1, help="Fraction of spiky sensors")
+    parser.add_argument("--fft-every", type=int, default=20, help="Vibration readings per FFT capture (0 = none)")
+    parser.add_argument("--fft-bins", type=int, default=2048)
+    parser.add_argument("--duplicates", type=float, default=0.01, help="Chance a reading is resent")
+    parser.add_argument("--out-of-order", type=float, default=0.01, help="Chance a reading is held back")
+    parser.add_argument("--connections", type=int, default=32, help="Pooled keep-alive connections")
+    parser.add_argument("--http2", action="store_true", help="Offer HTTP/2 (needs the h2 package, from requirements-dev.txt)")
+    parser.add_argument("--report-every", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, help="Write results JSON here")
+    args = parser.parse_args()
+    if not 0 <= args.burstiness <= 1 or args.degrading + args.spiky > 1:
+        parser.error("--burstiness must be in [0, 1] and --degrading + --spiky at most 1")
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Cold-start benchmark: import time and time to the first successful request.
+
+    python -m bench.startup [--runs 5] [--sensors 20] [--no-warmup]
+                            [--out bench/results] [--compare OLD.json]
+
+Each run measures, in fresh processes:
+
+  import        `import app.main` under -X importtime: total, and self time per top-level package
+  listen        spawn -> GET /health answers (uvicorn up, lifespan started)
+  first_fleet   spawn -> first 200 from GET /cranes/fleet, polled from the moment of spawn,
+                and the latency of that first successful request
+  ready         spawn -> GET /health/ready answers 200 (startup warmup finished)
+  warm_fleet    median latency of the next fleet requests, for comparison
+  first_ingest  latency of the first POST /ingest, then the median of the next ones
+
+--no-warmup starts the API with WARMUP_CONNECTIONS=0 and WARMUP_CACHES=false, so a pair of
+runs shows what the warmup buys. Results are written as JSON named after the commit (medians
+over runs), and --compare prints the change against an earlier run. Point DATABASE_URL at a
+scratch, migrated database: the bench org is left in place.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+from bench.fleet import Fleet, provision_fleet
+from bench.load import API_DIR, _free_port, _git, _reading
+
+
+WARM_REQUESTS = 20
+POLL_SECONDS = 0.02
+
+
+def import_profile() -> dict:
+    """Import app.main in a fresh interpreter and break the time down by top-level package."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=API_DIR, capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - started
+    packages: dict[str, int] = defaultdict(int)
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue  # header line
+        packages[name.strip().split(".")[0]] += int(own)
+        if name.strip() == "app.main":
+            total_us = int(cumulative)
+    top = sorted(packages.items(), key=lambda item: -item[1])[:12]
+    return {
+        "wall_ms": round(wall * 1000, 1),
+        "app_main_ms": round(total_us / 1000, 1),
+        "packages_ms": {name: round(us / 1000, 1) for name, us in top},
+    }
+
+
+def _poll(request, deadline: float, process: subprocess.Popen) -> tuple[float, float, httpx.Response]:
+    """Repeat `request` until it answers 2xx. Returns (when, latency, response)."""
+    while True:
+        started = time.perf_counter()
+        try:
+            response = request()
+            if response.is_success:
+                return time.perf_counter(), time.perf_counter() - started, response
+        except httpx.TransportError:
+            pass
+        if process.poll() is not None or time.monotonic() > deadline:
+            raise SystemExit("API server did not start")
+        time.sleep(POLL_SECONDS)
+
+
+def _timed(request) -> float:
+    started = time.perf_counter()
+    request().raise_for_status()
+    return time.perf_counter() - started
+
+
+def server_startup(fleet: Fleet, warmup: bool, rng) -> dict:
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = dict(os.environ)
+    if not warmup:
+        env.update(WARMUP_CONNECTIONS="0", WARMUP_CACHES="false")
+    auth = {"Authorization": f"Bearer {fleet.token}"}
+    key = {"X-API-Key": fleet.api_key}
+
+    with httpx.Client(base_url=base, timeout=30) as client:
+        def fleet_request():
+            return client.get("/api/v1/cranes/fleet", headers=auth)
+
+        def ingest_request():
+            mac = fleet.macs[int(rng.integers(len(fleet.macs)))]
+            return client.post("/api/v1/ingest", json=_reading(mac, rng), headers=key)
+
+        spawned = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=API_DIR, env=env,
+        )
+        try:
+            deadline = time.monotonic() + 120
+            listen, _, _ = _poll(lambda: client.get("/health"), deadline, process)
+            first_fleet, first_fleet_latency, _ = _poll(fleet_request, deadline, process)
+            ready, _, response = _poll(lambda: client.get("/health/ready"), deadline, process)
+            warm_fleet = [_timed(fleet_request) for _ in range(WARM_REQUESTS)]
+            first_ingest = _timed(ingest_request)
+            warm_ingest = [_timed(ingest_request) for _ in range(WARM_REQUESTS)]
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+    return {
+        "listen_ms": round((listen - spawned) * 1000, 1),
+        "first_fleet_ms": round((first_fleet - spawned) * 1000, 1),
+        "first_fleet_latency_ms": round(first_fleet_latency * 1000, 1),
+        "ready_ms": round((ready - spawned) * 1000, 1),
+        "warm_fleet_ms": round(statistics.median(warm_fleet) * 1000, 1),
+        "first_ingest_ms": round(first_ingest * 1000, 1),
+        "warm_ingest_ms": round(statistics.median(warm_ingest) * 1000, 1),
+        "warmup": response.json(),
+    }
+
+
+def _medians(runs: list[dict]) -> dict:
+    return {
+        key: round(statistics.median(run[key] for run in runs), 1)
+        for key, value in runs[0].items() if isinstance(value, (int, float))
+    }
+
+
+def compare(old: dict, new: dict) -> None:
+    print(f"\nvs {(old.get('commit') or '?')[:10]} ({old.get('started_at')})")
+    for section in ("import", "server"):
+        for key, now in new[section].items():
+            was = old.get(section, {}).get(key)
+            if was and now is not None:
+                change = (now - was) / was * 100
+                print(f"  {key:<24} {was:>9.1f} -> {now:>9.1f} ms  {change:+6.1f}%{'  REGRESSION' if change > 10 else ''}")
+
+
+def report(results: dict) -> None:
+    print(f"\nimport app.main  {results['import']['app_main_ms']} ms  (interpreter + import {results['import']['wall_ms']} ms)")
+    for name, ms in results["packages_ms"].items():
+        print(f"  {name:<24} {ms:>8.1f} ms")
+    print(f"\nserver ({'with' if results['config']['warmup'] else 'without'} warmup, median of {results['config']['runs']})")
+    for key, ms in results["server"].items():
+        print(f"  {key:<24} {ms:>8.1f} ms")
+
+
+def run(args) -> dict:
+    rng = np.random.default_rng(args.seed)
+    fleet = asyncio.run(provision_fleet([114] * args.sensors))
+    imports, servers = [], []
+    for i in range(args.runs):
+        print(f"Run {i + 1}/{args.runs} ...", flush=True)
+        imports.append(import_profile())
+        servers.append(server_startup(fleet, args.warmup, rng))
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("compare", "out")},
+        "import": _medians(imports),
+        "packages_ms": imports[-1]["packages_ms"],
+        "server": _medians(servers),
+        "warmup": servers[-1]["warmup"],
+        "runs": {"import": imports, "server": servers},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to measure")
+    parser.add_argument("--sensors", type=int, default=20, help="Sensors in the bench fleet")
+    parser.add_argument("--no-warmup", dest="warmup", action="store_false", help="Start the API with warmup disabled")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed for generated readings")
+    parser.add_argument("--out", type=Path, default=API_DIR / "bench" / "results")
+    parser.add_argument("--compare", type=Path, help="Earlier results JSON to diff against")
+    args = parser.parse_args()
+
+    results = run(args)
+    args.out.mkdir(parents=True, exist_ok=True)
+    path = args.out / f"startup-{(results['commit'] or 'nogit')[:10]}-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}.json"
+    path.write_text(json.dumps(results, indent=2, default=str))
+    report(results)
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Waterfall build throughput and memory on synthetic captures.
+
+    python -m bench.waterfall [--captures 5000] [--bins 4096] [--width 512] [--height 256]
+
+Feeds captures through `WaterfallBuilder` in CHUNK_SIZE chunks, as the endpoint streams
+them, and reports captures/s and peak traced memory. No database needed.
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.waterfall import CHUNK_SIZE, WaterfallBuilder, encode
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--captures", type=int, default=5000)
+    parser.add_argument("--bins", type=int, default=4096)
+    parser.add_argument("--width", type=int, default=512)
+    parser.add_argument("--height", type=int, default=256)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    end = start + timedelta(days=30)
+    spectra = [rng.random(args.bins).astype(np.float32).tobytes() for _ in range(64)]
+
+    def chunk(offset: int) -> list:
+        return [
+            SimpleNamespace(
+                timestamp=start + (end - start) * ((offset + i) / args.captures),
+                odr=25600,
+                spectrum_data=spectra[(offset + i) % len(spectra)],
+            )
+            for i in range(min(CHUNK_SIZE, args.captures - offset))
+        ]
+
+    tracemalloc.start()
+    builder = WaterfallBuilder(start, end, 0.0, 12800.0, args.width, args.height)
+    elapsed = 0.0
+    for offset in range(0, args.captures, CHUNK_SIZE):
+        rows = chunk(offset)
+        t0 = time.perf_counter()
+        builder.add(rows)
+        elapsed += time.perf_counter() - t0
+    data, _, _ = encode(builder.matrix, "uint8")
+    _, peak = tracemalloc.get_traced_memory()
+
+    raw = args.captures * args.bins * 4
+    print(f"{args.captures} captures x {args.bins} bins ({raw / 2**20:.0f} MB decoded) -> {args.height}x{args.width}")
+    print(f"build: {elapsed:.2f} s ({args.captures / elapsed:.0f} captures/s)")
+    print(f"peak traced memory: {peak / 2**20:.1f} MB; uint8 payload {len(data) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Maintenance commands for the time-series data.
+
+    python manage.py rollup [--hours 48]
+    python manage.py retention [--apply] [--org ORG_ID]
+    python manage.py init-shard NAME
+    python manage.py move-tenant ORG_ID SHARD
+    python manage.py bearing-faults [--batch-size 500] [--workers N]
+    python manage.py fft-features [--batch-size 500]
+    python manage.py anomaly-train [--sensor SENSOR_ID] [--batch-size 200] [--workers N]
+    python manage.py rul [--force] [--batch-size 200] [--workers N]
+    python manage.py operating-hours [--full]
+    python manage.py cohorts [--full]
+"""
+import argparse
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.db import async_session
+from app.models.organization import Organization
+from app.services.anomaly import train_models
+from app.services.bearing_faults import run_backlog
+from app.services.cohorts import recount as recount_cohorts, update_members
+from app.services.fft_features import backfill_features
+from app.services.retention import apply_retention, detach_expired_partitions
+from app.services.rollup import rollup_hours
+from app.services.rul import refit_estimates
+from app.services.operating_hours import rebuild as rebuild_operating_hours
+from app.services.ownership import ownership
+from app.services.sharding import bind_tenant, init_shard, move_tenant, shard_names
+
+
+def _fmt_bytes(n: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024:
+            return f"{n:.1f} {unit}" if unit != "B" else f"{n} B"
+        n /= 1024
+    return f"{n:.1f} TB"
+
+
+async def rollup(args):
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(hours=args.hours)
+    for shard in shard_names():
+        async with async_session(info={"shard": shard}) as db:
+            written = await rollup_hours(db, start, end)
+        print(f"Rolled up {written} sensor-hours since {start.isoformat()}" + (f" on {shard}" if shard else ""))
+
+
+async def retention(args):
+    dry_run = not args.apply
+    async with async_session() as db:
+        if args.org:
+            org_ids = [uuid.UUID(args.org)]
+        else:
+            result = await db.execute(select(Organization.id))
+            org_ids = list(result.scalars().all())
+
+        total = 0
+        for org_id in org_ids:
+            report = await apply_retention(org_id, db, dry_run=dry_run)
+            total += report.bytes_reclaimed
+            print(f"Org {org_id}")
+            for tier in report.tiers:
+                line = f"  {tier.table:<16} before {tier.cutoff:%Y-%m-%d}: {tier.rows} rows, {_fmt_bytes(tier.bytes)}"
+                if tier.uncovered_rows:
+                    line += f" ({tier.uncovered_rows} rows kept, hour not rolled up yet)"
+                print(line)
+
+    if not args.org:
+        for shard in shard_names():
+            async with async_session(info={"shard": shard}) as db:
+                parts = await detach_expired_partitions(db, dry_run=dry_run)
+            for part in parts:
+                total += part.bytes
+                action = "dropped" if part.dropped else "would drop"
+                print(f"  partition {part.partition} ({part.table}, < {part.upper_bound:%Y-%m-%d}): {action}, {_fmt_bytes(part.bytes)}")
+
+    verb = "Would reclaim" if dry_run else "Reclaimed"
+    print(f"{verb} ~{_fmt_bytes(total)}" + (" (dry run — pass --apply to delete)" if dry_run else ""))
+
+
+async def init_shard_command(args):
+    await init_shard(args.name)
+    print(f"Initialized time-series tables on shard {args.name}")
+
+
+async def move_tenant_command(args):
+    await move_tenant(uuid.UUID(args.org), args.shard, batch_size=args.batch_size)
+    print("Move complete")
+
+
+async def bearing_faults(args):
+    for shard in shard_names():
+        async with async_session(info={"shard": shard}) as db:
+            processed = await run_backlog(db, batch_size=args.batch_size, workers=args.workers)
+        print(f"Analyzed {processed} FFT captures" + (f" on {shard}" if shard else ""))
+
+
+async def fft_features(args):
+    for shard in shard_names():
+        async with async_session(info={"shard": shard}) as db:
+            written = await backfill_features(db, batch_size=args.batch_size)
+        print(f"Extracted features for {written} FFT captures" + (f" on {shard}" if shard else ""))
+
+
+async def anomaly_train(args):
+    if args.sensor:
+        sensor_id = uuid.UUID(args.sensor)
+        async with async_session() as db:
+            org_id = await ownership.sensor_org(sensor_id, db)
+            if org_id is None:
+                raise SystemExit(f"Sensor {sensor_id} not found")
+            await bind_tenant(db, org_id)
+            trained = await train_models(db, [sensor_id], workers=1)
+        print(f"Trained {trained} anomaly model(s)")
+        return
+    for shard in shard_names():
+        async with async_session(info={"shard": shard}) as db:
+            trained = await train_models(db, batch_size=args.batch_size, workers=args.workers)
+        print(f"Trained {trained} anomaly models" + (f" on {shard}" if shard else ""))
+
+
+async def rul(args):
+    for shard in shard_names():
+        async with async_session(info={"shard": shard}) as db:
+            fitted = await refit_estimates(db, batch_size=args.batch_size, workers=args.workers, force=args.force)
+        print(f"Refitted {fitted} RUL estimates" + (f" on {shard}" if shard else ""))
+
+
+async def operating_hours(args):
+    for shard in shard_names():
+        async with async_session(info={"shard": shard}) as db:
+            rebuilt = await rebuild_operating_hours(db, full=args.full)
+        print(f"Rebuilt run sessions for {rebuilt} sensors" + (f" on {shard}" if shard else ""))
+
+
+async def cohorts(args):
+    for shard in shard_names():
+        async with async_session(info={"shard": shard}) as db:
+            updated = await update_members(db, full=args.full)
+        print(f"Updated {updated} cohort members" + (f" on {shard}" if shard else ""))
+    async with async_session() as db:
+        counted = await recount_cohorts(db)
+    print(f"Recounted {counted} cohorts")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("rollup", help="Upsert hourly summaries into readings_hourly")
+    p.add_argument("--hours", type=int, default=48, help="How far back to (re)compute")
+    p.set_defaults(func=rollup)
+
+    p = sub.add_parser("retention", help="Enforce raw / FFT / hourly retention tiers")
+    p.add_argument("--apply", action="store_true", help="Delete data (default is a dry run)")
+    p.add_argument("--org", help="Limit to one organization id")
+    p.set_defaults(func=retention)
+
+    p = sub.add_parser("init-shard", help="Create time-series tables on a configured shard")
+    p.add_argument("name")
+    p.set_defaults(func=init_shard_command)
+
+    p = sub.add_parser("move-tenant", help="Move an org's time-series data to another shard (online)")
+    p.add_argument("org")
+    p.add_argument("shard")
+    p.add_argument("--batch-size", type=int, default=5000)
+    p.set_defaults(func=move_tenant_command)
+
+    p = sub.add_parser("bearing-faults", help="Run bearing fault detection over unanalyzed FFT captures")
+    p.add_argument("--batch-size", type=int, default=500)
+    p.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    p.set_defaults(func=bearing_faults)
+
+    p = sub.add_parser("fft-features", help="Backfill fft_features for captures the ingest pipeline missed")
+    p.add_argument("--batch-size", type=int, default=500)
+    p.set_defaults(func=fft_features)
+
+    p = sub.add_parser("anomaly-train", help="(Re)train per-sensor anomaly models")
+    p.add_argument("--sensor", help="Train one sensor (default: every sensor with 2+ weeks of data)")
+    p.add_argument("--batch-size", type=int, default=200, help="Sensors per training query")
+    p.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    p.set_defaults(func=anomaly_train)
+
+    p = sub.add_parser("rul", help="Refit RUL estimates for sensors with new hourly data")
+    p.add_argument("--force", action="store_true", help="Refit every eligible sensor, not just those with a day of new data")
+    p.add_argument("--batch-size", type=int, default=200, help="Sensors per query")
+    p.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    p.set_defaults(func=rul)
+
+    p = sub.add_parser("operating-hours", help="Re-derive run sessions for sensors with late readings")
+    p.add_argument("--full", action="store_true", help="Backfill every sensor's full history")
+    p.set_defaults(func=operating_hours)
+
+    p = sub.add_parser("cohorts", help="Refresh fleet cohort members with new hourly data and recount cohort histograms")
+    p.add_argument("--full", action="store_true", help="Recompute every active sensor, not just those with new data")
+    p.set_defaults(func=cohorts)
+
+    args = parser.parse_args()
+    asyncio.run(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
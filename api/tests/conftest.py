@@ -0,0 +1,51 @@
+"""Tests run against a scratch, migrated Postgres named by DATABASE_URL (as in CI)."""
+
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from app.auth import user_cache
+from app.db import async_session, dispose_engines
+from app.main import app
+from app.models.reading import Reading
+from app.services.ownership import ownership
+from app.services.sharding import bind_tenant, shard_map
+from bench.fleet import Fleet, provision_fleet
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+    # Each test runs on its own event loop; pooled connections can't outlive it
+    await dispose_engines()
+
+
+@pytest.fixture
+async def fleet() -> AsyncIterator[Fleet]:
+    """Three cranes with three sensors each and a few readings per sensor."""
+    fleet = await provision_fleet([114] * 9, name="test-fleet")
+    now = datetime.now(timezone.utc)
+    async with async_session() as db:
+        await bind_tenant(db, fleet.org_id)
+        db.add_all(
+            Reading(sensor_id=sensor_id, timestamp=now - timedelta(minutes=m), temperature=30.0, x_velocity_mm_sec=1.0)
+            for sensor_id in fleet.sensor_ids for m in range(3)
+        )
+        await db.commit()
+    yield fleet
+    await dispose_engines()
+
+
+@pytest.fixture
+def cold_caches():
+    user_cache._users.clear()
+    ownership.clear()
+    shard_map._shards.clear()
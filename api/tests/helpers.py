@@ -0,0 +1,21 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.config import settings
+from app.db import QueryStats, track_queries
+
+
+@contextmanager
+def assert_query_budget(statements: int) -> Iterator[QueryStats]:
+    """Fail if the block runs more than `statements` SQL statements.
+
+    Budget enforcement is on meanwhile, so a request that crosses its route's own
+    `query_budget` also fails: QueryBudgetExceeded escapes the in-process client.
+    """
+    enforce = settings.query_budget_enforce
+    settings.query_budget_enforce = True
+    try:
+        with track_queries(statements) as stats:
+            yield stats
+    finally:
+        settings.query_budget_enforce = enforce
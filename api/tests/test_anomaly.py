@@ -0,0 +1,50 @@
+"""The flattened isolation forest against scikit-learn, on synthetic data (no database)."""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import IsolationForest
+
+from app.services.anomaly import ANOMALY_FEATURES, MAX_SAMPLES, N_ESTIMATORS, FlatForest, fit_forest
+
+
+@pytest.fixture
+def training():
+    rng = np.random.default_rng(7)
+    return rng.lognormal(0.0, 0.3, (1000, len(ANOMALY_FEATURES)))
+
+
+@pytest.fixture
+def samples(training):
+    rng = np.random.default_rng(8)
+    normal = training[rng.integers(len(training), size=200)] * rng.normal(1.0, 0.02, (200, training.shape[1]))
+    outliers = training[rng.integers(len(training), size=20)] * rng.uniform(1.5, 3.0, (20, training.shape[1]))
+    return np.vstack([normal, outliers])
+
+
+def test_scores_match_scikit_learn(training, samples):
+    reference = IsolationForest(n_estimators=N_ESTIMATORS, max_samples=MAX_SAMPLES, random_state=0).fit(training)
+    flat = FlatForest.from_sklearn(reference, np.median(training, axis=0))
+    np.testing.assert_allclose(flat.score(samples), -100 * reference.score_samples(samples), rtol=1e-9)
+
+
+def test_outliers_score_higher(training, samples):
+    scores = fit_forest(training).score(samples)
+    assert scores[200:].mean() > scores[:200].mean() + 10
+
+
+def test_missing_values_use_training_medians(training, samples):
+    forest = fit_forest(training)
+    gappy = samples.copy()
+    gappy[:, 0] = np.nan
+    filled = samples.copy()
+    filled[:, 0] = forest.fill[0]
+    np.testing.assert_array_equal(forest.score(gappy), forest.score(filled))
+
+
+def test_serialization_round_trips(training, samples):
+    forest = fit_forest(training)
+    restored = FlatForest.from_bytes(forest.to_bytes())
+    assert (restored.depth, restored.norm) == (forest.depth, forest.norm)
+    for name in ("feature", "threshold", "left", "right", "path_length", "fill"):
+        np.testing.assert_array_equal(getattr(restored, name), getattr(forest, name))
+    np.testing.assert_array_equal(restored.score(samples), forest.score(samples))
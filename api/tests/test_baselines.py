@@ -0,0 +1,89 @@
+"""Spectrum baselines: layout learned from the stored blobs, and the band/histogram/scoring core."""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.db import async_session
+from app.models.fft_capture import FFTCapture
+from app.services.baselines import (
+    BASELINE_BANDS,
+    ENVELOPE_PERCENTILE,
+    MIN_BASELINE_CAPTURES,
+    BaselineHistogram,
+    Reference,
+    band_amplitudes,
+    band_centers_hz,
+    score_bands,
+    set_baseline,
+)
+from app.services.sharding import bind_tenant
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_layout_follows_blob_length_not_declared_bins(fleet):
+    sensor_id = fleet.sensor_ids[0]
+    now = datetime.now(timezone.utc)
+    rng = np.random.default_rng(0)
+    async with async_session() as db:
+        await bind_tenant(db, fleet.org_id)
+        db.add_all(
+            # Declared num_bins disagrees with the 64-value blob, as older gateways could send
+            FFTCapture(sensor_id=sensor_id, timestamp=now - timedelta(minutes=i), axis="x", odr=1000,
+                       num_bins=999, spectrum_data=rng.random(64, dtype=np.float32).tobytes())
+            for i in range(3)
+        )
+        await db.commit()
+        baseline = await set_baseline(sensor_id, "x", now - timedelta(hours=1), now + timedelta(minutes=1), db)
+    assert baseline.num_bins == 64
+    assert baseline.captures == 3
+
+
+# ── NumPy core ──
+
+@pytest.mark.parametrize("bins", [6400, 1000, 100])  # 100 < BASELINE_BANDS: bands repeat a bin
+def test_band_amplitudes_are_band_rms(bins):
+    block = np.random.default_rng(1).random((3, bins), dtype=np.float32)
+    bands = band_amplitudes(block)
+    assert bands.shape == (3, BASELINE_BANDS)
+    for band in range(BASELINE_BANDS):
+        lo = band * bins // BASELINE_BANDS
+        hi = max((band + 1) * bins // BASELINE_BANDS, lo + 1)
+        expected = np.sqrt(np.mean(np.square(block[:, lo:hi], dtype=np.float64), axis=1))
+        np.testing.assert_allclose(bands[:, band], expected, rtol=1e-12)
+
+
+def test_histogram_quantiles_track_the_samples():
+    rng = np.random.default_rng(2)
+    bands = 10 ** rng.normal(-2, 0.5, (2000, BASELINE_BANDS))
+    histogram = BaselineHistogram()
+    histogram.add(bands[:1000])
+    histogram.add(bands[1000:])
+    assert histogram.counts.sum() == bands.size
+
+    for q in (0.5, ENVELOPE_PERCENTILE / 100):
+        # Within one histogram level of the exact quantile
+        error = np.abs(np.log10(histogram.quantile(q)) - np.log10(np.quantile(bands, q, axis=0)))
+        assert error.max() <= BaselineHistogram.STEP
+
+    restored = BaselineHistogram.from_bytes(histogram.to_bytes())
+    np.testing.assert_array_equal(restored.counts, histogram.counts)
+
+
+def test_score_bands_measures_db_excess_over_median():
+    median = np.full(BASELINE_BANDS, 0.01)
+    reference = Reference(
+        window_start=datetime(2026, 1, 1, tzinfo=timezone.utc), window_end=datetime(2026, 2, 1, tzinfo=timezone.utc),
+        odr=1000, num_bins=6400, captures=MIN_BASELINE_CAPTURES, median=median, envelope=median * 2,
+    )
+    quiet, loud = median * 0.5, median.copy()
+    loud[40] *= 10  # +20 dB in one band
+    scores = score_bands(np.stack([quiet, loud]), reference)
+
+    np.testing.assert_allclose(scores["score"], [0.0, np.sqrt(20.0 ** 2 / BASELINE_BANDS)])
+    np.testing.assert_allclose(scores["max_ratio"], [0.5, 10.0])
+    assert scores["max_ratio_hz"][1] == band_centers_hz(1000, 6400)[40]
+    assert list(scores["bands_over_envelope"]) == [0, 1]
@@ -0,0 +1,65 @@
+"""Cohort histograms and rank lookups against exact ranks over the member values (no database)."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.cohorts import (
+    COHORT_LEVELS,
+    METRIC_SCALES,
+    CohortDistribution,
+    cohort_key,
+    histogram,
+    level_position,
+    parse_cohort_key,
+)
+
+
+def distribution(metric: str, values: np.ndarray) -> CohortDistribution:
+    row = SimpleNamespace(metric=metric, members=len(values), histogram=histogram(metric, values).astype("<u4").tobytes())
+    return CohortDistribution.from_row(row)
+
+
+@pytest.fixture(params=["temperature", "x_rms_ACC_G"])  # linear and log levels
+def members(request):
+    rng = np.random.default_rng(5)
+    if request.param == "temperature":
+        return request.param, rng.normal(45, 8, 400)
+    return request.param, 10 ** rng.normal(-1.5, 0.4, 400)
+
+
+def test_histogram_counts_every_member(members):
+    metric, values = members
+    counts = histogram(metric, np.append(values, [-1e9, 1e9]))  # out-of-range values clamp to the end levels
+    assert counts.shape == (COHORT_LEVELS,)
+    assert counts.sum() == len(values) + 2
+
+
+def test_percentile_rank_within_one_level(members):
+    metric, values = members
+    cohort = distribution(metric, values)
+    for value in np.quantile(values, [0.05, 0.25, 0.5, 0.75, 0.95]):
+        exact = 100.0 * (values < value).mean()
+        level = int(level_position(metric, value))
+        # Interpolation inside a level can only be off by that level's share of the cohort
+        assert abs(cohort.percentile_rank(value) - exact) <= 100.0 * cohort.counts[level] / len(values) + 1e-9
+
+
+def test_quantile_inverts_rank(members):
+    metric, values = members
+    cohort = distribution(metric, values)
+    scale, lo, hi = METRIC_SCALES[metric]
+    step = (hi - lo) / COHORT_LEVELS
+    for q in (0.1, 0.5, 0.9):
+        value = cohort.quantile(q)
+        exact = np.quantile(values, q)
+        if scale == "log":
+            value, exact = np.log10(value), np.log10(exact)
+        assert abs(value - exact) <= step
+        assert cohort.percentile_rank(cohort.quantile(q)) == pytest.approx(100 * q, abs=1e-6)
+
+
+def test_cohort_key_round_trip():
+    assert parse_cohort_key(cohort_key("Hoist Motor", None, 3)) == ("hoist motor", None, 3)
+    assert parse_cohort_key(cohort_key(None, "Gantry", 1)) == (None, "gantry", 1)
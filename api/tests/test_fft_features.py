@@ -0,0 +1,56 @@
+"""Feature extraction and its backfill, including captures too degenerate to analyze."""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+
+from app.db import async_session
+from app.models.fft_capture import FFTCapture
+from app.models.fft_feature import FFTFeature
+from app.schemas.ingest import FFTPayload
+from app.services.fft_features import backfill_features, extract_features
+from app.services.sharding import bind_tenant
+
+
+def test_band_energies_exclude_dc_and_empty_bands():
+    spectrum = np.arange(1, 9, dtype=np.float32)  # 8 bins of 20 Hz at odr 320
+    energies = extract_features(spectrum, 320, None)["band_energies"]
+    assert energies[0] == 0.0  # 0-10 Hz is narrower than a bin, and DC is in no band
+    assert energies[1] == pytest.approx(2**2 + 3**2 + 4**2 + 5**2)  # 20-80 Hz
+    assert energies[2] == pytest.approx(6**2 + 7**2 + 8**2)  # 100-140 Hz
+    assert energies[3:] == [0.0, 0.0, 0.0]
+
+
+@pytest.mark.parametrize("payload", [
+    {"axis": "x", "odr": 1000, "num_bins": 0, "data": []},
+    {"axis": "x", "odr": 0, "num_bins": 2, "data": [1.0, 2.0]},
+    {"axis": "x", "odr": 1000, "num_bins": 4, "data": [1.0, 2.0]},
+])
+def test_degenerate_payloads_are_rejected(payload):
+    with pytest.raises(ValidationError):
+        FFTPayload(**payload)
+
+
+@pytest.mark.anyio
+async def test_backfill_skips_degenerate_captures(fleet):
+    sensor_id = fleet.sensor_ids[0]
+    now = datetime.now(timezone.utc)
+    spectrum = np.linspace(0, 1, 64, dtype=np.float32).tobytes()
+    async with async_session() as db:
+        await bind_tenant(db, fleet.org_id)
+        empty = FFTCapture(sensor_id=sensor_id, timestamp=now, axis="x", odr=1000, num_bins=0, spectrum_data=b"")
+        good = FFTCapture(sensor_id=sensor_id, timestamp=now, axis="x", odr=1000, num_bins=64, spectrum_data=spectrum)
+        db.add(empty)
+        await db.flush()
+        db.add(good)
+        await db.commit()
+
+        await backfill_features(db, batch_size=1)
+        stored = await db.execute(
+            select(FFTFeature.fft_capture_id).where(FFTFeature.sensor_id == sensor_id),
+            bind_arguments={"mapper": FFTFeature},
+        )
+        assert set(stored.scalars()) == {good.id}
@@ -0,0 +1,70 @@
+"""Vectorized session derivation against the one-reading-at-a-time state machine (no database)."""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from app.services.operating_hours import MAX_GAP, derive_sessions, transition, union_seconds
+
+
+def stepwise(t: np.ndarray, running: np.ndarray) -> list[list]:
+    """[start, end, duration, open] per session, replaying `transition` like advance_run_state."""
+    as_time = lambda s: datetime.fromtimestamp(s, timezone.utc)  # noqa: E731
+    sessions, current = [], None
+    last_timestamp, last_running = as_time(t[0]), False
+    for ts, run in zip(map(as_time, t), running):
+        step = transition(last_timestamp, last_running, ts, bool(run))
+        if current is not None and step.credit:
+            current[1] = (last_timestamp + step.credit).timestamp()
+            current[2] += step.credit.total_seconds()
+        if current is not None and not step.continues:
+            current[3], current = False, None
+        if step.starts:
+            current = [ts.timestamp(), ts.timestamp(), 0.0, True]
+            sessions.append(current)
+        last_timestamp, last_running = ts, bool(run)
+    return sessions
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_derive_sessions_matches_transition(seed):
+    rng = np.random.default_rng(seed)
+    # 30 s cadence with occasional outages longer than MAX_GAP, and runs of each state
+    gaps = np.where(rng.random(500) < 0.05, rng.uniform(150, 3600, 500), rng.uniform(20, 40, 500))
+    t = 1.7e9 + np.cumsum(gaps)
+    running = np.repeat(rng.random(50) < 0.6, 10)
+
+    derived = derive_sessions(t, running)
+    expected = stepwise(t, running)
+
+    assert len(derived.start) == len(expected)
+    np.testing.assert_allclose(derived.start, [s[0] for s in expected])
+    np.testing.assert_allclose(derived.end, [s[1] for s in expected])
+    np.testing.assert_allclose(derived.duration, [s[2] for s in expected])
+    assert derived.open == (bool(expected) and expected[-1][3])
+
+
+def test_gap_caps_credit():
+    t = np.array([0.0, 30.0, 30.0 + 10 * MAX_GAP.total_seconds(), 60.0 + 10 * MAX_GAP.total_seconds()])
+    sessions = derive_sessions(t, np.array([True, True, True, False]))
+    # The outage ends the first session after MAX_GAP of credit; the second runs until the stop
+    np.testing.assert_allclose(sessions.duration, [30.0 + MAX_GAP.total_seconds(), 30.0])
+    assert not sessions.open
+
+
+def test_empty_and_idle():
+    assert len(derive_sessions(np.array([]), np.array([], dtype=bool)).start) == 0
+    idle = derive_sessions(np.arange(0.0, 300.0, 30.0), np.zeros(10, dtype=bool))
+    assert len(idle.start) == 0 and not idle.open
+
+
+def test_union_seconds_matches_timeline():
+    rng = np.random.default_rng(7)
+    start = rng.integers(0, 1000, 40).astype(float)
+    end = start + rng.integers(0, 120, 40)
+    covered = np.zeros(1200, dtype=bool)
+    for s, e in zip(start.astype(int), end.astype(int)):
+        covered[s:e] = True
+    assert union_seconds(start, end) == covered.sum()
+    assert union_seconds(np.array([]), np.array([])) == 0.0
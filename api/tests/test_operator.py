@@ -0,0 +1,43 @@
+"""Operator endpoints (/api/v1/admin/*, /metrics) answer to OPERATOR_TOKEN only, never to an org admin."""
+
+import pytest
+
+from app.config import settings
+
+
+pytestmark = pytest.mark.anyio
+
+TOKEN = "operator-test-token"
+
+
+@pytest.fixture
+def operator_token(monkeypatch):
+    monkeypatch.setattr(settings, "operator_token", TOKEN)
+
+
+async def test_org_admin_is_refused(client, fleet, operator_token):
+    response = await client.get("/api/v1/admin/profiler", headers={"Authorization": f"Bearer {fleet.token}"})
+    assert response.status_code == 403
+    response = await client.put(
+        "/api/v1/admin/profiler", json={"sample_one_in": 1}, headers={"Authorization": f"Bearer {fleet.token}"}
+    )
+    assert response.status_code == 403
+
+
+async def test_operator_token(client, operator_token):
+    response = await client.get("/api/v1/admin/profiler", headers={"Authorization": f"Bearer {TOKEN}"})
+    assert response.status_code == 200
+
+
+async def test_closed_without_configured_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "operator_token", "")
+    response = await client.get("/api/v1/admin/profiler", headers={"Authorization": f"Bearer {TOKEN}"})
+    assert response.status_code == 403
+
+
+async def test_metrics_need_operator_token(client, fleet, operator_token):
+    assert (await client.get("/metrics")).status_code == 401
+    assert (await client.get("/metrics", headers={"Authorization": f"Bearer {fleet.token}"})).status_code == 403
+    response = await client.get("/metrics", headers={"Authorization": f"Bearer {TOKEN}"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
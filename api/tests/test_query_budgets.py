@@ -0,0 +1,52 @@
+"""SQL statement counts of the dashboard endpoints, cold and warm.
+
+Cold requests must fit the route's declared budget, cache misses included; warm ones pin
+the count that an N+1 regression would push up.
+"""
+
+import pytest
+
+from app.db import COLD_CACHE_STATEMENTS
+from tests.helpers import assert_query_budget
+
+
+pytestmark = pytest.mark.anyio
+
+
+def _auth(fleet) -> dict:
+    return {"Authorization": f"Bearer {fleet.token}"}
+
+
+async def test_fleet(client, fleet, cold_caches):
+    with assert_query_budget(5 + COLD_CACHE_STATEMENTS):
+        response = await client.get("/api/v1/cranes/fleet", headers=_auth(fleet))
+    assert response.status_code == 200
+    assert len(response.json()["cranes"]) == 3
+
+    with assert_query_budget(5):
+        response = await client.get("/api/v1/cranes/fleet", headers=_auth(fleet))
+    assert response.status_code == 200
+
+
+async def test_crane_detail(client, fleet, cold_caches):
+    path = f"/api/v1/cranes/{fleet.crane_ids[0]}/detail"
+    with assert_query_budget(9 + COLD_CACHE_STATEMENTS):
+        response = await client.get(path, headers=_auth(fleet))
+    assert response.status_code == 200
+    assert len(response.json()["sensors"]) == 3
+
+    with assert_query_budget(8):
+        response = await client.get(path, headers=_auth(fleet))
+    assert response.status_code == 200
+
+
+async def test_readings(client, fleet, cold_caches):
+    params = {"sensor_id": str(fleet.sensor_ids[0])}
+    with assert_query_budget(2 + COLD_CACHE_STATEMENTS):
+        response = await client.get("/api/v1/readings", params=params, headers=_auth(fleet))
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+
+    with assert_query_budget(1):
+        response = await client.get("/api/v1/readings", params=params, headers=_auth(fleet))
+    assert response.status_code == 200
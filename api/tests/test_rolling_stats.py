@@ -0,0 +1,81 @@
+"""Hourly ring buckets against brute-force window stats over the raw readings (no database)."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.rolling_stats import RollingStats
+
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+RING_HOURS = 48
+
+
+@pytest.fixture
+def readings():
+    rng = np.random.default_rng(11)
+    sensor_id = uuid.uuid4()
+    offsets = np.sort(rng.uniform(0, 5 * 24 * 3600, 3000))  # five days: the ring wraps
+    return [
+        SimpleNamespace(
+            sensor_id=sensor_id,
+            timestamp=START + timedelta(seconds=float(o)),
+            temp=float(rng.normal(40, 5)),
+            rpm=None if rng.random() < 0.2 else float(rng.uniform(0, 1500)),
+        )
+        for o in offsets
+    ]
+
+
+def brute_force(readings, metric, hours, end):
+    last = end.replace(minute=0, second=0, microsecond=0)
+    values = [
+        getattr(r, metric) for r in readings
+        if last - timedelta(hours=hours - 1) <= r.timestamp < last + timedelta(hours=1)
+        and getattr(r, metric) is not None
+    ]
+    return len(values), (np.mean(values) if values else None), (max(values) if values else None)
+
+
+@pytest.mark.parametrize("metric", ["temp", "rpm"])
+@pytest.mark.parametrize("hours", [1, 24, RING_HOURS])
+def test_window_matches_readings(readings, metric, hours):
+    stats = RollingStats(RING_HOURS, ("temp", "rpm"))
+    for reading in readings:
+        stats.add(reading)
+    sensor_id = readings[0].sensor_id
+    # Windows ending earlier still have to fit inside the ring
+    for end in (readings[-1].timestamp, readings[-1].timestamp - timedelta(hours=(RING_HOURS - hours) // 2)):
+        window = stats.window(sensor_id, metric, hours, end)
+        count, mean, peak = brute_force(readings, metric, hours, end)
+        assert window.count == count
+        assert window.mean == pytest.approx(mean)
+        assert window.max == pytest.approx(peak, rel=1e-6)  # peaks are stored as float32
+
+
+def test_readings_older_than_the_ring_are_dropped(readings):
+    stats = RollingStats(RING_HOURS, ("temp", "rpm"))
+    for reading in readings:
+        stats.add(reading)
+    sensor_id = readings[0].sensor_id
+    end = readings[-1].timestamp
+    before = stats.window(sensor_id, "temp", RING_HOURS, end)
+    stats.add(SimpleNamespace(sensor_id=sensor_id, timestamp=end - timedelta(hours=RING_HOURS + 2), temp=1e6, rpm=None))
+    assert stats.window(sensor_id, "temp", RING_HOURS, end) == before
+
+
+def test_trend_compares_shifted_windows(readings):
+    stats = RollingStats(RING_HOURS, ("temp", "rpm"))
+    for reading in readings:
+        stats.add(reading)
+    now = readings[-1].timestamp
+    trend = stats.trend(readings[0].sensor_id, "temp", 1, window_hours=12, now=now)
+    assert trend.current == stats.window(readings[0].sensor_id, "temp", 12, now)
+    assert trend.previous == stats.window(readings[0].sensor_id, "temp", 12, now - timedelta(days=1))
+    assert trend.change_percent == pytest.approx(
+        (trend.current.mean - trend.previous.mean) / abs(trend.previous.mean) * 100
+    )
+    assert stats.window(uuid.uuid4(), "temp", 24, now).count == 0
@@ -0,0 +1,48 @@
+"""RoutingSession.get_bind across engine configurations (no database needed)."""
+
+import pytest
+
+from app import db
+from app.config import EngineSettings, Settings
+from app.db import LazyEngines, RoutingSession, engine_configs
+from app.models.reading import Reading
+from app.models.sensor import Sensor
+
+
+PRIMARY = "postgresql+asyncpg://app@primary/crane"
+REPLICA = "postgresql+asyncpg://app@replica/crane"
+TIMESERIES = "postgresql+asyncpg://app@timeseries/crane"
+
+
+def _host(session: RoutingSession, model) -> str:
+    return session.get_bind(mapper=model).url.host
+
+
+def _configure(monkeypatch, **engines):
+    config = Settings(database_url=PRIMARY, db_primary=EngineSettings(url=PRIMARY), **engines)
+    monkeypatch.setattr(db, "engines", LazyEngines(engine_configs(config)))
+    monkeypatch.setattr(db, "shard_engines", LazyEngines({}))
+
+
+@pytest.fixture
+def read_session():
+    return RoutingSession(info={"role": "replica"})
+
+
+def test_replica_only_reads_time_series_from_replica(monkeypatch, read_session):
+    _configure(monkeypatch, db_replica=EngineSettings(url=REPLICA))
+    assert _host(read_session, Reading) == "replica"
+    assert _host(read_session, Sensor) == "replica"
+    assert _host(RoutingSession(), Reading) == "primary"
+
+
+def test_dedicated_time_series_database_reads_from_it(monkeypatch, read_session):
+    _configure(monkeypatch, db_replica=EngineSettings(url=REPLICA), db_timeseries=EngineSettings(url=TIMESERIES))
+    assert _host(read_session, Reading) == "timeseries"
+    assert _host(read_session, Sensor) == "replica"
+
+
+def test_no_replica_reads_from_primary(monkeypatch, read_session):
+    _configure(monkeypatch)
+    assert _host(read_session, Reading) == "primary"
+    assert _host(read_session, Sensor) == "primary"
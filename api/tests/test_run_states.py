@@ -0,0 +1,60 @@
+"""Readings the run-state queue loses mark their sensor dirty for the periodic rebuild."""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.db import async_session
+from app.models.reading import Reading
+from app.models.run_state import RunState
+from app.services import operating_hours
+from app.services.operating_hours import process_reading, submit_reading
+from app.services.work_queue import WorkQueue
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def _dirty_since(sensor_id):
+    async with async_session() as db:
+        result = await db.execute(select(RunState.dirty_since).where(RunState.sensor_id == sensor_id))
+        return result.scalar_one_or_none()
+
+
+async def test_dropped_submit_marks_dirty(fleet):
+    # The queue isn't started here, so every submit is refused
+    ts = datetime.now(timezone.utc)
+    reading = Reading(sensor_id=fleet.sensor_ids[0], timestamp=ts, x_rms_ACC_G=1.0, y_rms_ACC_G=1.0, z_rms_ACC_G=1.0)
+    await submit_reading(reading, fleet.crane_ids[0], None)
+    assert await _dirty_since(fleet.sensor_ids[0]) == ts
+
+
+async def test_failed_handler_marks_dirty(fleet, monkeypatch):
+    async def fail(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(operating_hours, "advance_run_state", fail)
+    ts = datetime.now(timezone.utc)
+    with pytest.raises(RuntimeError):
+        await process_reading((fleet.sensor_ids[1], fleet.crane_ids[0], ts, True, None))
+    assert await _dirty_since(fleet.sensor_ids[1]) == ts
+
+
+async def test_stop_hands_off_pending_items():
+    abandoned = []
+
+    async def slow(item):
+        await asyncio.sleep(10)
+
+    async def collect(items):
+        abandoned.extend(items)
+
+    queue = WorkQueue("test", slow, workers=1, maxsize=10, on_abandoned=collect)
+    queue.start()
+    for i in range(3):
+        queue.submit(i)
+    await asyncio.sleep(0)
+    await queue.stop(drain_timeout=0.01)
+    assert sorted(abandoned) == [0, 1, 2]
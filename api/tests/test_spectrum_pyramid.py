@@ -0,0 +1,44 @@
+"""Pyramid levels and band slices on synthetic spectra (no database)."""
+
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from app.services.spectrum_pyramid import MIN_LEVEL_BINS, SpectrumPyramid, build_levels
+
+
+ODR = 25600
+
+
+@pytest.fixture
+def pyramid():
+    spectrum = np.random.default_rng(3).random(6401).astype(np.float32)  # odd length: tail bins carry over
+    return SpectrumPyramid(uuid.uuid4(), datetime.now(timezone.utc), "x", ODR, len(spectrum), build_levels(spectrum))
+
+
+def test_levels_are_pairwise_maxima(pyramid):
+    levels = pyramid.levels
+    assert len(levels[-1]) <= MIN_LEVEL_BINS < len(levels[-2])
+    for finer, coarser in zip(levels, levels[1:]):
+        assert len(coarser) == -(-len(finer) // 2)
+        assert coarser.max() == finer.max()
+        assert coarser[0] == max(finer[0], finer[1])
+
+
+@pytest.mark.parametrize("f_min, f_max, width", [
+    (0, ODR / 2, 800), (1000, 1200, 800), (1000, 1200, 10), (3000, 9000, 300), (12000, 20000, 100),
+])
+def test_slice_covers_band_at_requested_resolution(pyramid, f_min, f_max, width):
+    result = pyramid.slice(f_min, f_max, width)
+    base = ODR / 2 / pyramid.bins
+    lo, hi = int(f_min / base), min(pyramid.bins, int(np.ceil(f_max / base)))
+
+    assert result.bin_width == base * (1 << result.level)
+    assert result.f_start <= f_min
+    assert result.f_start + len(result.amplitudes) * result.bin_width >= min(f_max, ODR / 2)
+    # At least `width` bins unless the band is narrower than that at full resolution
+    assert len(result.amplitudes) >= min(width, hi - lo)
+    # Max-decimation never loses the band's peak
+    assert result.amplitudes.max() >= pyramid.levels[0][lo:hi].max()
@@ -7,8 +7,12 @@
  *
  * Usage:
  *   API_URL=https://your-api.com API_KEY=crane_xxx SERIAL_PORT=/dev/ttyUSB0 node bridge.js
+ *
+ * Optional:
+ *   TRACE_SAMPLE_RATIO=0.01   (fraction of readings sent with a sampled W3C traceparent)
  */
 
+const crypto = require("crypto");
 const WirelessSensor = require("@ncd-io/node-red-enterprise-sensors");
 
 // ── Config ──────────────────────────────────────────────
@@ -16,6 +20,13 @@ const API_URL = process.env.API_URL || "http://localhost:8000";
 const API_KEY = process.env.API_KEY || "";
 const SERIAL_PORT = process.env.SERIAL_PORT || "/dev/ttyUSB0";
 const BAUD_RATE = parseInt(process.env.BAUD_RATE || "115200");
+const TRACE_SAMPLE_RATIO = parseFloat(process.env.TRACE_SAMPLE_RATIO || "0");
+
+// W3C trace context: a sampled traceparent asks the API to trace this reading end to end
+function traceHeaders() {
+  if (Math.random() >= TRACE_SAMPLE_RATIO) return {};
+  return { traceparent: `00-${crypto.randomBytes(16).toString("hex")}-${crypto.randomBytes(8).toString("hex")}-01` };
+}
 
 if (!API_KEY) {
   console.error("ERROR: API_KEY environment variable is required");
@@ -77,6 +88,7 @@ sensor.on("sensor_data", async (data) => {
       headers: {
         "Content-Type": "application/json",
         "X-API-Key": API_KEY,
+        ...traceHeaders(),
       },
       body: JSON.stringify(payload),
     });
@@ -9,8 +9,10 @@
  *
  * Optional:
  *   MQTT_USER=username  MQTT_PASS=password   (if broker requires auth)
+ *   TRACE_SAMPLE_RATIO=0.01                  (fraction of readings sent with a sampled W3C traceparent)
  */
 
+const crypto = require("crypto");
 const mqtt = require("mqtt");
 
 const MQTT_URL = process.env.MQTT_URL || "";
@@ -19,6 +21,13 @@ const MQTT_USER = process.env.MQTT_USER || undefined;
 const MQTT_PASS = process.env.MQTT_PASS || undefined;
 const API_URL = process.env.API_URL || "https://crane-platform-production.up.railway.app";
 const API_KEY = process.env.API_KEY || "";
+const TRACE_SAMPLE_RATIO = parseFloat(process.env.TRACE_SAMPLE_RATIO || "0");
+
+// W3C trace context: a sampled traceparent asks the API to trace this reading end to end
+function traceHeaders() {
+  if (Math.random() >= TRACE_SAMPLE_RATIO) return {};
+  return { traceparent: `00-${crypto.randomBytes(16).toString("hex")}-${crypto.randomBytes(8).toString("hex")}-01` };
+}
 
 if (!MQTT_URL) {
   console.error("ERROR: MQTT_URL is required");
@@ -121,6 +130,7 @@ client.on("message", async (topic, message) => {
       headers: {
         "Content-Type": "application/json",
         "X-API-Key": API_KEY,
+        ...traceHeaders(),
       },
       body: JSON.stringify(payload),
     });